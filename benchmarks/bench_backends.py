@@ -0,0 +1,62 @@
+"""
+Compare per-diagram latency of the Graphviz backends
+
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --diagrams 500
+
+The subprocess backend pays the dot process start-up cost for every
+diagram, the inprocess backend calls libgvc through pygraphviz instead.
+The diagram source is built once so only the render step is timed.
+"""
+
+import argparse
+import statistics
+import time
+
+from graphviz import ExecutableNotFound
+
+from gdalgviz.main import detect_pipeline_type, workflow_diagram
+from gdalgviz.parser import parse_pipeline
+from gdalgviz.render import BACKENDS, inprocess_available, render_source
+
+PIPELINE = (
+    "gdal raster pipeline ! read n43.tif ! color-map --color-map color_file.txt "
+    "! tee [ write colored.tif --overwrite ] "
+    "! blend --operator=hsv-value --overlay [ read n43.tif ! hillshade -z 30 ] "
+    "! write colored-hillshade.tif --overwrite"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--diagrams", type=int, default=200)
+    parser.add_argument("--format", default="svg")
+    args = parser.parse_args()
+
+    steps = parse_pipeline(PIPELINE)
+    source = workflow_diagram(steps, args.format, detect_pipeline_type(steps)).source
+
+    print(f"{'backend':>12} {'median ms':>10} {'p95 ms':>8} {'diagrams/s':>11}")
+    for backend in BACKENDS:
+        if backend == "inprocess" and not inprocess_available():
+            print(f"{backend:>12} skipped, pygraphviz is not installed")
+            continue
+        try:
+            render_source(source, args.format, backend=backend)  # warm up
+        except ExecutableNotFound:
+            print(f"{backend:>12} skipped, dot is not on the PATH")
+            continue
+        timings = []
+        for _ in range(args.diagrams):
+            start = time.perf_counter()
+            render_source(source, args.format, backend=backend)
+            timings.append(time.perf_counter() - start)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(
+            f"{backend:>12} {statistics.median(timings) * 1000:>10.2f} "
+            f"{p95 * 1000:>8.2f} {len(timings) / sum(timings):>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measure the effect of label budgets on layout time and output size
+
+    python benchmarks/bench_labels.py
+    python benchmarks/bench_labels.py --backend subprocess
+
+Renders pipelines with long arguments with and without --max-arg-length,
+--max-label-length and --wrap-width and reports the median render time
+and SVG size.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from gdalgviz.main import detect_pipeline_type, workflow_diagram
+from gdalgviz.parser import parse_pipeline
+from gdalgviz.render import BACKENDS, render_source
+
+ROOT = Path(__file__).parent.parent
+
+SQL_PIPELINE = (
+    'gdal vector pipeline ! read in.gpkg ! sql --sql "SELECT '
+    + ", ".join(f"field_{i} AS alias_{i}" for i in range(250))
+    + ' FROM layer WHERE value > 1" ! write out.gpkg'
+)
+
+BUDGETS = {
+    "none": {},
+    "max-arg-length=40": {"max_arg_length": 40},
+    "max-label-length=80": {"max_label_length": 80},
+    "wrap-width=40": {"wrap_width": 40},
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=BACKENDS, default="inprocess")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pipelines = {
+        "test_expressions": json.loads(
+            (ROOT / "tests" / "reference" / "test_expressions.json").read_text()
+        ),
+        "sql-5kb": parse_pipeline(SQL_PIPELINE),
+    }
+
+    print(f"{'pipeline':>16} {'budget':>22} {'median ms':>10} {'svg bytes':>10}")
+    for name, steps in pipelines.items():
+        pipeline_type = detect_pipeline_type(steps)
+        for budget, options in BUDGETS.items():
+            source = workflow_diagram(steps, "svg", pipeline_type, **options).source
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                svg = render_source(source, "svg", backend=args.backend)
+                timings.append(time.perf_counter() - start)
+            median = statistics.median(timings) * 1000
+            print(f"{name:>16} {budget:>22} {median:>10.2f} {len(svg):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure how lineage indexing scales with the size of a catalog
+
+    python benchmarks/bench_lineage.py
+    python benchmarks/bench_lineage.py --sizes 1000 10000 50000
+
+Writes synthetic catalogs of chained pipelines to a temporary folder and
+reports the time to build the index from scratch, to update it when nothing
+changed, and to find the neighbourhood of a dataset.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from gdalgviz.lineage import build_index, neighbourhood
+
+
+def write_catalog(folder: Path, size: int) -> list:
+    fns = []
+    for i in range(size):
+        # each pipeline reads the outputs of two earlier pipelines
+        command_line = (
+            f"gdal raster pipeline ! read data/{i // 2}.tif ! reproject "
+            f"--dst-crs=EPSG:3857 ! blend --overlay [ read data/{i // 3}.tif ] "
+            f"! write data/{i + 1}.tif"
+        )
+        fn = folder / f"{i}.gdalg.json"
+        fn.write_text(json.dumps({"command_line": command_line}))
+        fns.append(str(fn))
+    return fns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'pipelines':>10} {'build s':>8} {'update s':>9} {'neighbours ms':>14}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            fns = write_catalog(Path(folder), size)
+
+            start = time.perf_counter()
+            index = build_index(fns, folder)
+            built = time.perf_counter() - start
+
+            start = time.perf_counter()
+            build_index(fns, folder, index)
+            updated = time.perf_counter() - start
+
+            start = time.perf_counter()
+            neighbourhood(index, f"data/{size // 2}.tif")
+            found = time.perf_counter() - start
+
+        print(f"{size:>10} {built:>8.2f} {updated:>9.2f} {found * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measure how building a diagram scales with the nesting depth and the
+number of nested inputs of a pipeline
+
+    python benchmarks/bench_nesting.py
+    python benchmarks/bench_nesting.py --depths 100 1000 10000 50000
+
+Builds the Graphviz source of machine-generated pipelines (without running
+Graphviz) and reports the time per step. Nested steps are added with an
+explicit stack, so depth is only limited by memory.
+"""
+
+import argparse
+import time
+
+from gdalgviz.main import workflow_diagram
+
+
+def _read(fn: str) -> dict:
+    return {"command": "read", "args": [{"type": "positional", "value": fn}]}
+
+
+def nested_pipeline(depth: int, inputs: int) -> list:
+    """
+    A blend step nested depth levels deep, each level with inputs nested
+    pipelines. Built directly as the parser limits nesting depth
+    """
+    step = _read("base.tif")
+    for level in range(depth):
+        pipelines = [
+            {"type": "nested", "pipeline": [_read(f"{level}-{i}.tif")]}
+            for i in range(inputs - 1)
+        ]
+        pipelines.append({"type": "nested", "pipeline": [_read("x.tif"), step]})
+        step = {"command": "blend", "args": [], "nested": pipelines}
+    return [_read("in.tif"), step, {"command": "write", "args": []}]
+
+
+def count_steps(depth: int, inputs: int) -> int:
+    return 3 + depth * (inputs + 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depths", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--inputs", type=int, nargs="+", default=[1, 3])
+    args = parser.parse_args()
+
+    print(f"{'depth':>8} {'inputs':>7} {'steps':>8} {'build s':>8} {'us/step':>8}")
+    for inputs in args.inputs:
+        for depth in args.depths:
+            steps = nested_pipeline(depth, inputs)
+            start = time.perf_counter()
+            workflow_diagram(steps, "svg", "raster")
+            built = time.perf_counter() - start
+            total = count_steps(depth, inputs)
+            print(
+                f"{depth:>8} {inputs:>7} {total:>8} {built:>8.2f} "
+                f"{built / total * 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
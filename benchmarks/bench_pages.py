@@ -0,0 +1,72 @@
+"""
+Compare the layout time of a long pipeline drawn as one diagram and split
+into pages
+
+    python benchmarks/bench_pages.py
+    python benchmarks/bench_pages.py --steps 200 1000 --page-size 50
+
+Each page is laid out as a separate, smaller graph, so the memory used by
+a dot process is bounded by the page size. The subprocess backend lays
+pages out in parallel, which only helps on machines with several cores;
+the inprocess backend lays them out one after another.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from graphviz import ExecutableNotFound
+
+from gdalgviz.main import generate_diagram
+from gdalgviz.render import BACKENDS, inprocess_available
+
+COMMANDS = ["reproject --dst-crs=EPSG:3857", "hillshade -z 2", "slope", "fill-nodata"]
+
+
+def long_pipeline(steps: int) -> str:
+    commands = " ! ".join(COMMANDS[i % len(COMMANDS)] for i in range(steps - 2))
+    return f"gdal raster pipeline ! read in.tif ! {commands} ! write out.tif"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, nargs="+", default=[100, 400])
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'backend':>12} {'steps':>6} {'pages':>6} {'single s':>9} {'paged s':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        output_fn = str(Path(folder) / "out.svg")
+        for backend in BACKENDS:
+            if backend == "inprocess" and not inprocess_available():
+                print(f"{backend:>12} skipped, pygraphviz is not installed")
+                continue
+            for steps in args.steps:
+                pipeline = long_pipeline(steps)
+                timings = []
+                try:
+                    for page_size in (None, args.page_size):
+                        start = time.perf_counter()
+                        generate_diagram(
+                            pipeline,
+                            output_fn,
+                            backend=backend,
+                            page_size=page_size,
+                            minify=True,
+                        )
+                        timings.append(time.perf_counter() - start)
+                except ExecutableNotFound:
+                    print(f"{backend:>12} skipped, dot is not on the PATH")
+                    break
+                pages = len(list(Path(folder).glob("out-*.svg")))
+                print(
+                    f"{backend:>12} {steps:>6} {pages:>6} "
+                    f"{timings[0]:>9.2f} {timings[1]:>8.2f}"
+                )
+                for fn in Path(folder).glob("out-*.svg"):
+                    fn.unlink()
+
+
+if __name__ == "__main__":
+    main()
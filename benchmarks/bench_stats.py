@@ -0,0 +1,62 @@
+"""
+Measure how catalog statistics scale with the size of a catalog and the
+number of worker processes
+
+    python benchmarks/bench_stats.py
+    python benchmarks/bench_stats.py --sizes 10000 100000 --workers 1 4 8
+
+Writes synthetic catalogs to a temporary folder and reports the time to
+count them, and the peak memory allocated by the main process, which
+should not grow with the size of the catalog. More workers only help on
+machines with several cores.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from gdalgviz.stats import catalog_stats
+
+COMMANDS = ["reproject --dst-crs=EPSG:3857", "hillshade -z 2", "slope", "fill-nodata"]
+
+
+def write_catalog(folder: Path, size: int) -> None:
+    for i in range(size):
+        steps = " ! ".join(COMMANDS[: i % len(COMMANDS) + 1])
+        command_line = (
+            f"gdal raster pipeline ! read data/{i}.tif ! {steps} "
+            f"! blend --overlay [ read data/{i // 2}.tif ] ! write out/{i}.tif"
+        )
+        fn = folder / f"{i}.gdalg.json"
+        fn.write_text(json.dumps({"command_line": command_line}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"{'pipelines':>10} {'workers':>8} {'seconds':>8} {'peak KB':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            write_catalog(Path(folder), size)
+            for workers in args.workers:
+                start = time.perf_counter()
+                stats = catalog_stats([folder], workers=workers)
+                elapsed = time.perf_counter() - start
+                assert stats["pipelines"] == size
+
+                # measured on a second run, as tracing slows parsing down
+                tracemalloc.start()
+                catalog_stats([folder], workers=workers)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{size:>10} {workers:>8} {elapsed:>8.2f} {peak // 1024:>8}")
+
+
+if __name__ == "__main__":
+    main()
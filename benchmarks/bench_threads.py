@@ -0,0 +1,66 @@
+"""
+Benchmark diagram throughput against the number of threads
+
+    python benchmarks/bench_threads.py
+    python benchmarks/bench_threads.py --render  # also run the dot layout
+
+Without --render only the parse and graph-build path is timed, which is
+CPU-bound Python and only scales on a free-threaded build (e.g. 3.13t).
+With --render most of the time is spent in dot subprocesses, which
+scale on any build.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from gdalgviz.main import detect_pipeline_type, generate_diagram, workflow_diagram
+from gdalgviz.parser import parse_pipeline
+
+PIPELINE = (
+    "gdal raster pipeline ! read n43.tif ! color-map --color-map color_file.txt "
+    "! tee [ write colored.tif --overwrite ] "
+    "! blend --operator=hsv-value --overlay [ read n43.tif ! hillshade -z 30 ] "
+    "! write colored-hillshade.tif --overwrite"
+)
+
+
+def build(i: int) -> str:
+    steps = parse_pipeline(PIPELINE)
+    return workflow_diagram(steps, "svg", detect_pipeline_type(steps)).source
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--render", action="store_true")
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--threads", default="1,2,4,8,16")
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        def render(i: int) -> None:
+            generate_diagram(PIPELINE, str(Path(tmp) / f"{i}.svg"))
+
+        job = render if args.render else build
+        jobs = args.jobs // 10 if args.render else args.jobs
+        baseline = None
+
+        print(f"{'threads':>8} {'diagrams/s':>12} {'speedup':>8}")
+        for threads in (int(t) for t in args.threads.split(",")):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(job, range(jobs)))
+            rate = jobs / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"{threads:>8} {rate:>12.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure the time to validate pipelines against the bundled GDAL usage
+
+    python benchmarks/bench_validate.py
+    python benchmarks/bench_validate.py --steps 10 100 1000
+
+Parsing is done once, so only the validation pass is timed. Pipelines
+without issues are not copied, so their time should grow linearly with
+the number of steps.
+"""
+
+import argparse
+import statistics
+import time
+
+from gdalgviz.parser import parse_pipeline
+from gdalgviz.validate import validate_pipeline
+
+COMMANDS = [
+    "reproject --dst-crs=EPSG:3857 -r cubic --size=1000,1000",
+    "hillshade -z 2 --variant=combined",
+    "slope --unit=percent",
+    "fill-nodata --max-distance 10",
+]
+
+
+def long_pipeline(steps: int, invalid: bool = False) -> str:
+    commands = [COMMANDS[i % len(COMMANDS)] for i in range(steps - 2)]
+    if invalid:
+        commands[0] = "reproject --dst-cr=EPSG:3857"
+    return (
+        f"gdal raster pipeline ! read in.tif ! {' ! '.join(commands)} ! write out.tif"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'steps':>6} {'valid us':>9} {'invalid us':>11} {'us/step':>8}")
+    for steps in args.steps:
+        medians = []
+        for invalid in (False, True):
+            parsed = parse_pipeline(long_pipeline(steps, invalid))
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                validate_pipeline(parsed)
+                timings.append(time.perf_counter() - start)
+            medians.append(statistics.median(timings) * 1e6)
+        print(
+            f"{steps:>6} {medians[0]:>9.1f} {medians[1]:>11.1f} "
+            f"{medians[0] / steps:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ $GVIZ_PATH = "C:\Program Files\Graphviz\bin"
 $env:PATH = "$GVIZ_PATH;$env:PATH"
 
 pip install -e .[dev]
+# regenerate the standalone parser after editing gdalgviz/pipeline.lark
+python scripts/generate_parser.py
 black .
 ruff check . --fix
 ruff check .
@@ -1,7 +1,9 @@
 __version__ = "0.2.1"
 
 from .main import generate_diagram
+from .notebook import PipelineDiagram
 
 __all__ = [
     "generate_diagram",
+    "PipelineDiagram",
 ]
@@ -0,0 +1,1776 @@
+# Written by hand from the GDAL 3.12 documentation of the pipeline steps, in
+# the format of scripts/generate_usage.py. Rerun the script with GDAL on the
+# PATH to replace it with the --json-usage output of that GDAL
+# Arguments are (type, min values, max values, packed, repeated)
+GDAL_VERSION = "3.12"
+USAGE: dict = {'raster': {'as-features': {'args': {'band': ('integer_list', 1, None, True, True),
+                                     'geometry-type': ('string', 1, 1, False, False),
+                                     'include-row-col': ('boolean', 0, 0, False, False),
+                                     'include-xy': ('boolean', 0, 0, False, False),
+                                     'output': ('dataset', 1, 1, False, False),
+                                     'output-layer': ('string', 1, 1, False, False),
+                                     'skip-nodata': ('boolean', 0, 0, False, False)},
+                            'choices': {'geometry-type': ('point', 'polygon')},
+                            'flags': {'--band': 'band',
+                                      '--geometry-type': 'geometry-type',
+                                      '--include-row-col': 'include-row-col',
+                                      '--include-xy': 'include-xy',
+                                      '--output': 'output',
+                                      '--output-layer': 'output-layer',
+                                      '--skip-nodata': 'skip-nodata',
+                                      '-b': 'band'},
+                            'input': 'raster',
+                            'output': 'vector',
+                            'position': None,
+                            'required': ()},
+            'aspect': {'args': {'band': ('integer', 1, 1, False, False),
+                                'convention': ('string', 1, 1, False, False),
+                                'gradient-alg': ('string', 1, 1, False, False),
+                                'no-edges': ('boolean', 0, 0, False, False),
+                                'zero-for-flat': ('boolean', 0, 0, False, False)},
+                       'choices': {'convention': ('azimuth', 'trigonometric-angle'),
+                                   'gradient-alg': ('Horn', 'ZevenbergenThorne')},
+                       'flags': {'--band': 'band',
+                                 '--convention': 'convention',
+                                 '--gradient-alg': 'gradient-alg',
+                                 '--no-edges': 'no-edges',
+                                 '--zero-for-flat': 'zero-for-flat',
+                                 '-b': 'band'},
+                       'input': 'raster',
+                       'output': 'raster',
+                       'position': None,
+                       'required': ()},
+            'blend': {'args': {'opacity': ('integer', 1, 1, False, False),
+                               'operator': ('string', 1, 1, False, False),
+                               'overlay': ('dataset', 1, 1, False, False)},
+                      'choices': {'operator': ('src-over',
+                                               'hsv-value',
+                                               'multiply',
+                                               'screen',
+                                               'overlay',
+                                               'hard-light',
+                                               'darken',
+                                               'lighten',
+                                               'color-burn',
+                                               'color-dodge')},
+                      'flags': {'--opacity': 'opacity',
+                                '--operator': 'operator',
+                                '--overlay': 'overlay'},
+                      'input': 'raster',
+                      'output': 'raster',
+                      'position': None,
+                      'required': ()},
+            'calc': {'args': {'calc': ('string_list', 1, None, False, True),
+                              'dialect': ('string', 1, 1, False, False),
+                              'flatten': ('boolean', 0, 0, False, False),
+                              'input': ('dataset_list', 0, None, True, True),
+                              'no-check-crs': ('boolean', 0, 0, False, False),
+                              'no-check-extent': ('boolean', 0, 0, False, False),
+                              'nodata': ('string', 1, 1, False, False),
+                              'output-data-type': ('string', 1, 1, False, False)},
+                     'choices': {'dialect': ('muparser', 'builtin'),
+                                 'output-data-type': ('Byte',
+                                                      'Int8',
+                                                      'UInt16',
+                                                      'Int16',
+                                                      'UInt32',
+                                                      'Int32',
+                                                      'UInt64',
+                                                      'Int64',
+                                                      'CInt16',
+                                                      'CInt32',
+                                                      'Float16',
+                                                      'Float32',
+                                                      'Float64',
+                                                      'CFloat16',
+                                                      'CFloat32',
+                                                      'CFloat64')},
+                     'flags': {'--calc': 'calc',
+                               '--datatype': 'output-data-type',
+                               '--dialect': 'dialect',
+                               '--flatten': 'flatten',
+                               '--input': 'input',
+                               '--no-check-crs': 'no-check-crs',
+                               '--no-check-extent': 'no-check-extent',
+                               '--nodata': 'nodata',
+                               '--ot': 'output-data-type',
+                               '--output-data-type': 'output-data-type'},
+                     'input': 'raster',
+                     'output': 'raster',
+                     'position': 'any',
+                     'required': ('calc',)},
+            'clean-collar': {'args': {'add-alpha': ('boolean', 0, 0, False, False),
+                                      'add-mask': ('boolean', 0, 0, False, False),
+                                      'algorithm': ('string', 1, 1, False, False),
+                                      'color': ('string_list', 1, None, False, True),
+                                      'color-threshold': ('integer',
+                                                          1,
+                                                          1,
+                                                          False,
+                                                          False),
+                                      'pixel-distance': ('integer',
+                                                         1,
+                                                         1,
+                                                         False,
+                                                         False)},
+                             'choices': {'algorithm': ('floodfill', 'twopasses')},
+                             'flags': {'--add-alpha': 'add-alpha',
+                                       '--add-mask': 'add-mask',
+                                       '--algorithm': 'algorithm',
+                                       '--color': 'color',
+                                       '--color-threshold': 'color-threshold',
+                                       '--pixel-distance': 'pixel-distance'},
+                             'input': 'raster',
+                             'output': 'raster',
+                             'position': None,
+                             'required': ()},
+            'clip': {'args': {'add-alpha': ('boolean', 0, 0, False, False),
+                              'allow-bbox-outside-source': ('boolean',
+                                                            0,
+                                                            0,
+                                                            False,
+                                                            False),
+                              'bbox': ('real_list', 4, 4, True, False),
+                              'bbox-crs': ('string', 1, 1, False, False),
+                              'geometry': ('string', 1, 1, False, False),
+                              'geometry-crs': ('string', 1, 1, False, False),
+                              'like': ('dataset', 1, 1, False, False),
+                              'like-layer': ('string', 1, 1, False, False),
+                              'like-sql': ('string', 1, 1, False, False),
+                              'like-where': ('string', 1, 1, False, False),
+                              'only-bbox': ('boolean', 0, 0, False, False),
+                              'window': ('integer_list', 4, 4, True, False)},
+                     'choices': {},
+                     'flags': {'--add-alpha': 'add-alpha',
+                               '--allow-bbox-outside-source': 'allow-bbox-outside-source',
+                               '--bbox': 'bbox',
+                               '--bbox-crs': 'bbox-crs',
+                               '--geometry': 'geometry',
+                               '--geometry-crs': 'geometry-crs',
+                               '--like': 'like',
+                               '--like-layer': 'like-layer',
+                               '--like-sql': 'like-sql',
+                               '--like-where': 'like-where',
+                               '--only-bbox': 'only-bbox',
+                               '--window': 'window'},
+                     'input': 'raster',
+                     'output': 'raster',
+                     'position': None,
+                     'required': ()},
+            'color-map': {'args': {'add-alpha': ('boolean', 0, 0, False, False),
+                                   'band': ('integer', 1, 1, False, False),
+                                   'color-map': ('string', 1, 1, False, False),
+                                   'color-selection': ('string', 1, 1, False, False)},
+                          'choices': {'color-selection': ('interpolate',
+                                                          'exact',
+                                                          'nearest')},
+                          'flags': {'--add-alpha': 'add-alpha',
+                                    '--band': 'band',
+                                    '--color-map': 'color-map',
+                                    '--color-selection': 'color-selection',
+                                    '-b': 'band'},
+                          'input': 'raster',
+                          'output': 'raster',
+                          'position': None,
+                          'required': ('color-map',)},
+            'contour': {'args': {'3d': ('boolean', 0, 0, False, False),
+                                 'band': ('integer', 1, 1, False, False),
+                                 'elevation-name': ('string', 1, 1, False, False),
+                                 'exp-base': ('real', 1, 1, False, False),
+                                 'group-transactions': ('integer', 1, 1, False, False),
+                                 'interval': ('real', 1, 1, False, False),
+                                 'levels': ('string_list', 1, None, True, True),
+                                 'max-name': ('string', 1, 1, False, False),
+                                 'min-name': ('string', 1, 1, False, False),
+                                 'offset': ('real', 1, 1, False, False),
+                                 'output': ('dataset', 1, 1, False, False),
+                                 'output-layer': ('string', 1, 1, False, False),
+                                 'polygonize': ('boolean', 0, 0, False, False),
+                                 'src-nodata': ('real', 1, 1, False, False)},
+                        'choices': {},
+                        'flags': {'--3d': '3d',
+                                  '--band': 'band',
+                                  '--elevation-name': 'elevation-name',
+                                  '--exp-base': 'exp-base',
+                                  '--group-transactions': 'group-transactions',
+                                  '--interval': 'interval',
+                                  '--levels': 'levels',
+                                  '--max-name': 'max-name',
+                                  '--min-name': 'min-name',
+                                  '--offset': 'offset',
+                                  '--output': 'output',
+                                  '--output-layer': 'output-layer',
+                                  '--polygonize': 'polygonize',
+                                  '--src-nodata': 'src-nodata',
+                                  '-b': 'band',
+                                  '-e': 'exp-base',
+                                  '-i': 'interval',
+                                  '-p': 'polygonize'},
+                        'input': 'raster',
+                        'output': 'vector',
+                        'position': None,
+                        'required': ()},
+            'edit': {'args': {'approx-stats': ('boolean', 0, 0, False, False),
+                              'bbox': ('real_list', 4, 4, True, False),
+                              'crs': ('string', 1, 1, False, False),
+                              'gcp': ('string_list', 1, None, False, True),
+                              'hist': ('boolean', 0, 0, False, False),
+                              'metadata': ('string_list', 1, None, False, True),
+                              'nodata': ('string', 1, 1, False, False),
+                              'stats': ('boolean', 0, 0, False, False),
+                              'unset-metadata': ('string_list', 1, None, False, True),
+                              'unset-nodata': ('boolean', 0, 0, False, False)},
+                     'choices': {},
+                     'flags': {'--approx-stats': 'approx-stats',
+                               '--bbox': 'bbox',
+                               '--crs': 'crs',
+                               '--gcp': 'gcp',
+                               '--hist': 'hist',
+                               '--metadata': 'metadata',
+                               '--nodata': 'nodata',
+                               '--stats': 'stats',
+                               '--unset-metadata': 'unset-metadata',
+                               '--unset-nodata': 'unset-nodata'},
+                     'input': 'raster',
+                     'output': 'raster',
+                     'position': None,
+                     'required': ()},
+            'fill-nodata': {'args': {'band': ('integer', 1, 1, False, False),
+                                     'mask': ('string', 1, 1, False, False),
+                                     'max-distance': ('real', 1, 1, False, False),
+                                     'smoothing-iterations': ('integer',
+                                                              1,
+                                                              1,
+                                                              False,
+                                                              False),
+                                     'strategy': ('string', 1, 1, False, False)},
+                            'choices': {'strategy': ('invdist', 'nearest')},
+                            'flags': {'--band': 'band',
+                                      '--mask': 'mask',
+                                      '--max-distance': 'max-distance',
+                                      '--smoothing-iterations': 'smoothing-iterations',
+                                      '--strategy': 'strategy',
+                                      '-b': 'band',
+                                      '-d': 'max-distance',
+                                      '-s': 'smoothing-iterations'},
+                            'input': 'raster',
+                            'output': 'raster',
+                            'position': None,
+                            'required': ()},
+            'footprint': {'args': {'absolute-path': ('boolean', 0, 0, False, False),
+                                   'band': ('integer_list', 1, None, True, True),
+                                   'combine-bands': ('string', 1, 1, False, False),
+                                   'convex-hull': ('boolean', 0, 0, False, False),
+                                   'coordinate-system': ('string', 1, 1, False, False),
+                                   'densify': ('real', 1, 1, False, False),
+                                   'dst-crs': ('string', 1, 1, False, False),
+                                   'location-field': ('string', 1, 1, False, False),
+                                   'max-points': ('string', 1, 1, False, False),
+                                   'min-ring-area': ('real', 1, 1, False, False),
+                                   'no-location-field': ('boolean', 0, 0, False, False),
+                                   'output': ('dataset', 1, 1, False, False),
+                                   'output-layer': ('string', 1, 1, False, False),
+                                   'overview': ('integer', 1, 1, False, False),
+                                   'simplify': ('real', 1, 1, False, False),
+                                   'split-multipolygons': ('boolean',
+                                                           0,
+                                                           0,
+                                                           False,
+                                                           False),
+                                   'src-nodata': ('real_list', 1, None, True, True)},
+                          'choices': {'combine-bands': ('union', 'intersection'),
+                                      'coordinate-system': ('georeferenced', 'pixel')},
+                          'flags': {'--absolute-path': 'absolute-path',
+                                    '--band': 'band',
+                                    '--combine-bands': 'combine-bands',
+                                    '--convex-hull': 'convex-hull',
+                                    '--coordinate-system': 'coordinate-system',
+                                    '--densify': 'densify',
+                                    '--dst-crs': 'dst-crs',
+                                    '--location-field': 'location-field',
+                                    '--max-points': 'max-points',
+                                    '--min-ring-area': 'min-ring-area',
+                                    '--no-location-field': 'no-location-field',
+                                    '--output': 'output',
+                                    '--output-layer': 'output-layer',
+                                    '--overview': 'overview',
+                                    '--simplify': 'simplify',
+                                    '--split-multipolygons': 'split-multipolygons',
+                                    '--src-nodata': 'src-nodata',
+                                    '-b': 'band'},
+                          'input': 'raster',
+                          'output': 'vector',
+                          'position': None,
+                          'required': ()},
+            'hillshade': {'args': {'altitude': ('real', 1, 1, False, False),
+                                   'azimuth': ('real', 1, 1, False, False),
+                                   'band': ('integer', 1, 1, False, False),
+                                   'gradient-alg': ('string', 1, 1, False, False),
+                                   'no-edges': ('boolean', 0, 0, False, False),
+                                   'variant': ('string', 1, 1, False, False),
+                                   'xscale': ('real', 1, 1, False, False),
+                                   'yscale': ('real', 1, 1, False, False),
+                                   'zfactor': ('real', 1, 1, False, False)},
+                          'choices': {'gradient-alg': ('Horn', 'ZevenbergenThorne'),
+                                      'variant': ('regular',
+                                                  'combined',
+                                                  'multidirectional',
+                                                  'Igor')},
+                          'flags': {'--altitude': 'altitude',
+                                    '--azimuth': 'azimuth',
+                                    '--band': 'band',
+                                    '--gradient-alg': 'gradient-alg',
+                                    '--no-edges': 'no-edges',
+                                    '--variant': 'variant',
+                                    '--xscale': 'xscale',
+                                    '--yscale': 'yscale',
+                                    '--zfactor': 'zfactor',
+                                    '-b': 'band',
+                                    '-z': 'zfactor'},
+                          'input': 'raster',
+                          'output': 'raster',
+                          'position': None,
+                          'required': ()},
+            'info': {'args': {'approx-stats': ('boolean', 0, 0, False, False),
+                              'checksum': ('boolean', 0, 0, False, False),
+                              'format': ('string', 1, 1, False, False),
+                              'hist': ('boolean', 0, 0, False, False),
+                              'list-mdd': ('boolean', 0, 0, False, False),
+                              'metadata-domain': ('string', 1, 1, False, False),
+                              'min-max': ('boolean', 0, 0, False, False),
+                              'no-ct': ('boolean', 0, 0, False, False),
+                              'no-fl': ('boolean', 0, 0, False, False),
+                              'no-gcp': ('boolean', 0, 0, False, False),
+                              'no-mask': ('boolean', 0, 0, False, False),
+                              'no-md': ('boolean', 0, 0, False, False),
+                              'no-nodata': ('boolean', 0, 0, False, False),
+                              'output-string': ('string', 1, 1, False, False),
+                              'stats': ('boolean', 0, 0, False, False),
+                              'subdataset': ('integer', 1, 1, False, False)},
+                     'choices': {'format': ('json', 'text')},
+                     'flags': {'--approx-stats': 'approx-stats',
+                               '--checksum': 'checksum',
+                               '--format': 'format',
+                               '--hist': 'hist',
+                               '--list-mdd': 'list-mdd',
+                               '--mdd': 'metadata-domain',
+                               '--metadata-domain': 'metadata-domain',
+                               '--min-max': 'min-max',
+                               '--mm': 'min-max',
+                               '--no-ct': 'no-ct',
+                               '--no-fl': 'no-fl',
+                               '--no-gcp': 'no-gcp',
+                               '--no-mask': 'no-mask',
+                               '--no-md': 'no-md',
+                               '--no-nodata': 'no-nodata',
+                               '--output-string': 'output-string',
+                               '--stats': 'stats',
+                               '--subdataset': 'subdataset',
+                               '-f': 'format'},
+                     'input': 'raster',
+                     'output': 'raster',
+                     'position': 'last',
+                     'required': ()},
+            'materialize': {'args': {'creation-option': ('string_list',
+                                                         1,
+                                                         None,
+                                                         False,
+                                                         True),
+                                     'output': ('dataset', 1, 1, False, False),
+                                     'output-format': ('string', 1, 1, False, False)},
+                            'choices': {},
+                            'flags': {'--co': 'creation-option',
+                                      '--creation-option': 'creation-option',
+                                      '--format': 'output-format',
+                                      '--of': 'output-format',
+                                      '--output': 'output',
+                                      '--output-format': 'output-format',
+                                      '-f': 'output-format'},
+                            'input': 'raster',
+                            'output': 'raster',
+                            'position': None,
+                            'required': ()},
+            'mosaic': {'args': {'absolute-path': ('boolean', 0, 0, False, False),
+                                'add-alpha': ('boolean', 0, 0, False, False),
+                                'band': ('integer_list', 1, None, True, True),
+                                'bbox': ('real_list', 4, 4, True, False),
+                                'dst-nodata': ('real_list', 1, None, True, True),
+                                'hide-nodata': ('boolean', 0, 0, False, False),
+                                'input': ('dataset_list', 1, None, True, True),
+                                'input-format': ('string_list', 1, None, True, True),
+                                'open-option': ('string_list', 1, None, False, True),
+                                'pixel-function': ('string', 1, 1, False, False),
+                                'pixel-function-arg': ('string_list',
+                                                       1,
+                                                       None,
+                                                       False,
+                                                       True),
+                                'resampling': ('string', 1, 1, False, False),
+                                'resolution': ('string', 1, 1, False, False),
+                                'src-nodata': ('real_list', 1, None, True, True),
+                                'target-aligned-pixels': ('boolean',
+                                                          0,
+                                                          0,
+                                                          False,
+                                                          False)},
+                       'choices': {'resampling': ('nearest',
+                                                  'bilinear',
+                                                  'cubic',
+                                                  'cubicspline',
+                                                  'lanczos',
+                                                  'average',
+                                                  'rms',
+                                                  'mode',
+                                                  'min',
+                                                  'max',
+                                                  'med')},
+                       'flags': {'--absolute-path': 'absolute-path',
+                                 '--add-alpha': 'add-alpha',
+                                 '--addalpha': 'add-alpha',
+                                 '--band': 'band',
+                                 '--bbox': 'bbox',
+                                 '--dst-nodata': 'dst-nodata',
+                                 '--dstnodata': 'dst-nodata',
+                                 '--hide-nodata': 'hide-nodata',
+                                 '--hidenodata': 'hide-nodata',
+                                 '--if': 'input-format',
+                                 '--input': 'input',
+                                 '--input-format': 'input-format',
+                                 '--oo': 'open-option',
+                                 '--open-option': 'open-option',
+                                 '--pixel-function': 'pixel-function',
+                                 '--pixel-function-arg': 'pixel-function-arg',
+                                 '--resampling': 'resampling',
+                                 '--resolution': 'resolution',
+                                 '--src-nodata': 'src-nodata',
+                                 '--srcnodata': 'src-nodata',
+                                 '--target-aligned-pixels': 'target-aligned-pixels',
+                                 '-b': 'band',
+                                 '-r': 'resampling'},
+                       'input': 'raster',
+                       'output': 'raster',
+                       'position': 'first',
+                       'required': ()},
+            'neighbors': {'args': {'band': ('integer', 1, 1, False, False),
+                                   'kernel': ('string_list', 1, None, False, True),
+                                   'method': ('string', 1, 1, False, False),
+                                   'nodata': ('real', 1, 1, False, False),
+                                   'output-data-type': ('string', 1, 1, False, False),
+                                   'size': ('integer', 1, 1, False, False)},
+                          'choices': {'method': ('sum',
+                                                 'mean',
+                                                 'min',
+                                                 'max',
+                                                 'stddev',
+                                                 'median',
+                                                 'mode'),
+                                      'output-data-type': ('Byte',
+                                                           'Int8',
+                                                           'UInt16',
+                                                           'Int16',
+                                                           'UInt32',
+                                                           'Int32',
+                                                           'UInt64',
+                                                           'Int64',
+                                                           'CInt16',
+                                                           'CInt32',
+                                                           'Float16',
+                                                           'Float32',
+                                                           'Float64',
+                                                           'CFloat16',
+                                                           'CFloat32',
+                                                           'CFloat64')},
+                          'flags': {'--band': 'band',
+                                    '--datatype': 'output-data-type',
+                                    '--kernel': 'kernel',
+                                    '--method': 'method',
+                                    '--nodata': 'nodata',
+                                    '--ot': 'output-data-type',
+                                    '--output-data-type': 'output-data-type',
+                                    '--size': 'size',
+                                    '-b': 'band'},
+                          'input': 'raster',
+                          'output': 'raster',
+                          'position': None,
+                          'required': ()},
+            'nodata-to-alpha': {'args': {'nodata': ('real_list', 1, None, True, True)},
+                                'choices': {},
+                                'flags': {'--nodata': 'nodata'},
+                                'input': 'raster',
+                                'output': 'raster',
+                                'position': None,
+                                'required': ()},
+            'pansharpen': {'args': {'bit-depth': ('integer', 1, 1, False, False),
+                                    'nodata': ('real', 1, 1, False, False),
+                                    'num-threads': ('string', 1, 1, False, False),
+                                    'resampling': ('string', 1, 1, False, False),
+                                    'spatial-extent-adjustment': ('string',
+                                                                  1,
+                                                                  1,
+                                                                  False,
+                                                                  False),
+                                    'spectral': ('dataset_list', 1, None, True, True),
+                                    'weights': ('real_list', 1, None, True, True)},
+                           'choices': {'resampling': ('nearest',
+                                                      'bilinear',
+                                                      'cubic',
+                                                      'cubicspline',
+                                                      'lanczos',
+                                                      'average'),
+                                       'spatial-extent-adjustment': ('union',
+                                                                     'intersection',
+                                                                     'none',
+                                                                     'none-without-warning')},
+                           'flags': {'--bit-depth': 'bit-depth',
+                                     '--nodata': 'nodata',
+                                     '--num-threads': 'num-threads',
+                                     '--resampling': 'resampling',
+                                     '--spatial-extent-adjustment': 'spatial-extent-adjustment',
+                                     '--spectral': 'spectral',
+                                     '--weights': 'weights',
+                                     '-j': 'num-threads',
+                                     '-r': 'resampling'},
+                           'input': 'raster',
+                           'output': 'raster',
+                           'position': None,
+                           'required': ('spectral',)},
+            'polygonize': {'args': {'attribute-name': ('string', 1, 1, False, False),
+                                    'band': ('integer', 1, 1, False, False),
+                                    'connect-diagonal-pixels': ('boolean',
+                                                                0,
+                                                                0,
+                                                                False,
+                                                                False),
+                                    'output': ('dataset', 1, 1, False, False),
+                                    'output-layer': ('string', 1, 1, False, False)},
+                           'choices': {},
+                           'flags': {'--attribute-name': 'attribute-name',
+                                     '--band': 'band',
+                                     '--connect-diagonal-pixels': 'connect-diagonal-pixels',
+                                     '--output': 'output',
+                                     '--output-layer': 'output-layer',
+                                     '-b': 'band',
+                                     '-c': 'connect-diagonal-pixels'},
+                           'input': 'raster',
+                           'output': 'vector',
+                           'position': None,
+                           'required': ()},
+            'read': {'args': {'input': ('dataset', 1, 1, False, False),
+                              'input-format': ('string_list', 1, None, True, True),
+                              'open-option': ('string_list', 1, None, False, True)},
+                     'choices': {},
+                     'flags': {'--if': 'input-format',
+                               '--input': 'input',
+                               '--input-format': 'input-format',
+                               '--oo': 'open-option',
+                               '--open-option': 'open-option'},
+                     'input': 'raster',
+                     'output': 'raster',
+                     'position': 'first',
+                     'required': ()},
+            'reclassify': {'args': {'mapping': ('string', 1, 1, False, False),
+                                    'output-data-type': ('string', 1, 1, False, False)},
+                           'choices': {'output-data-type': ('Byte',
+                                                            'Int8',
+                                                            'UInt16',
+                                                            'Int16',
+                                                            'UInt32',
+                                                            'Int32',
+                                                            'UInt64',
+                                                            'Int64',
+                                                            'CInt16',
+                                                            'CInt32',
+                                                            'Float16',
+                                                            'Float32',
+                                                            'Float64',
+                                                            'CFloat16',
+                                                            'CFloat32',
+                                                            'CFloat64')},
+                           'flags': {'--datatype': 'output-data-type',
+                                     '--mapping': 'mapping',
+                                     '--ot': 'output-data-type',
+                                     '--output-data-type': 'output-data-type',
+                                     '-m': 'mapping'},
+                           'input': 'raster',
+                           'output': 'raster',
+                           'position': None,
+                           'required': ('mapping',)},
+            'reproject': {'args': {'add-alpha': ('boolean', 0, 0, False, False),
+                                   'bbox': ('real_list', 4, 4, True, False),
+                                   'bbox-crs': ('string', 1, 1, False, False),
+                                   'dst-crs': ('string', 1, 1, False, False),
+                                   'dst-nodata': ('string_list', 1, None, True, True),
+                                   'error-threshold': ('real', 1, 1, False, False),
+                                   'num-threads': ('string', 1, 1, False, False),
+                                   'resampling': ('string', 1, 1, False, False),
+                                   'resolution': ('real_list', 2, 2, True, False),
+                                   'size': ('integer_list', 2, 2, True, False),
+                                   'src-crs': ('string', 1, 1, False, False),
+                                   'src-nodata': ('string_list', 1, None, True, True),
+                                   'target-aligned-pixels': ('boolean',
+                                                             0,
+                                                             0,
+                                                             False,
+                                                             False),
+                                   'transform-option': ('string_list',
+                                                        1,
+                                                        None,
+                                                        False,
+                                                        True),
+                                   'warp-option': ('string_list',
+                                                   1,
+                                                   None,
+                                                   False,
+                                                   True)},
+                          'choices': {'resampling': ('nearest',
+                                                     'bilinear',
+                                                     'cubic',
+                                                     'cubicspline',
+                                                     'lanczos',
+                                                     'average',
+                                                     'rms',
+                                                     'mode',
+                                                     'min',
+                                                     'max',
+                                                     'med',
+                                                     'q1',
+                                                     'q3',
+                                                     'sum')},
+                          'flags': {'--add-alpha': 'add-alpha',
+                                    '--bbox': 'bbox',
+                                    '--bbox-crs': 'bbox-crs',
+                                    '--dst-crs': 'dst-crs',
+                                    '--dst-nodata': 'dst-nodata',
+                                    '--error-threshold': 'error-threshold',
+                                    '--et': 'error-threshold',
+                                    '--num-threads': 'num-threads',
+                                    '--resampling': 'resampling',
+                                    '--resolution': 'resolution',
+                                    '--size': 'size',
+                                    '--src-crs': 'src-crs',
+                                    '--src-nodata': 'src-nodata',
+                                    '--target-aligned-pixels': 'target-aligned-pixels',
+                                    '--to': 'transform-option',
+                                    '--transform-option': 'transform-option',
+                                    '--warp-option': 'warp-option',
+                                    '--wo': 'warp-option',
+                                    '-d': 'dst-crs',
+                                    '-j': 'num-threads',
+                                    '-r': 'resampling',
+                                    '-s': 'src-crs'},
+                          'input': 'raster',
+                          'output': 'raster',
+                          'position': None,
+                          'required': ()},
+            'resize': {'args': {'resampling': ('string', 1, 1, False, False),
+                                'size': ('string_list', 2, 2, True, False)},
+                       'choices': {'resampling': ('nearest',
+                                                  'bilinear',
+                                                  'cubic',
+                                                  'cubicspline',
+                                                  'lanczos',
+                                                  'average',
+                                                  'rms',
+                                                  'mode')},
+                       'flags': {'--resampling': 'resampling',
+                                 '--size': 'size',
+                                 '-r': 'resampling'},
+                       'input': 'raster',
+                       'output': 'raster',
+                       'position': None,
+                       'required': ()},
+            'rgb-to-palette': {'args': {'color-count': ('integer', 1, 1, False, False),
+                                        'color-map': ('string', 1, 1, False, False),
+                                        'dst-nodata': ('integer', 1, 1, False, False),
+                                        'no-dither': ('boolean', 0, 0, False, False)},
+                               'choices': {},
+                               'flags': {'--color-count': 'color-count',
+                                         '--color-map': 'color-map',
+                                         '--dst-nodata': 'dst-nodata',
+                                         '--no-dither': 'no-dither'},
+                               'input': 'raster',
+                               'output': 'raster',
+                               'position': None,
+                               'required': ()},
+            'roughness': {'args': {'band': ('integer', 1, 1, False, False),
+                                   'no-edges': ('boolean', 0, 0, False, False)},
+                          'choices': {},
+                          'flags': {'--band': 'band',
+                                    '--no-edges': 'no-edges',
+                                    '-b': 'band'},
+                          'input': 'raster',
+                          'output': 'raster',
+                          'position': None,
+                          'required': ()},
+            'scale': {'args': {'band': ('integer', 1, 1, False, False),
+                               'dst-max': ('real', 1, 1, False, False),
+                               'dst-min': ('real', 1, 1, False, False),
+                               'exponent': ('real', 1, 1, False, False),
+                               'no-clip': ('boolean', 0, 0, False, False),
+                               'output-data-type': ('string', 1, 1, False, False),
+                               'src-max': ('real', 1, 1, False, False),
+                               'src-min': ('real', 1, 1, False, False)},
+                      'choices': {'output-data-type': ('Byte',
+                                                       'Int8',
+                                                       'UInt16',
+                                                       'Int16',
+                                                       'UInt32',
+                                                       'Int32',
+                                                       'UInt64',
+                                                       'Int64',
+                                                       'CInt16',
+                                                       'CInt32',
+                                                       'Float16',
+                                                       'Float32',
+                                                       'Float64',
+                                                       'CFloat16',
+                                                       'CFloat32',
+                                                       'CFloat64')},
+                      'flags': {'--band': 'band',
+                                '--datatype': 'output-data-type',
+                                '--dst-max': 'dst-max',
+                                '--dst-min': 'dst-min',
+                                '--exponent': 'exponent',
+                                '--no-clip': 'no-clip',
+                                '--ot': 'output-data-type',
+                                '--output-data-type': 'output-data-type',
+                                '--src-max': 'src-max',
+                                '--src-min': 'src-min',
+                                '-b': 'band'},
+                      'input': 'raster',
+                      'output': 'raster',
+                      'position': None,
+                      'required': ()},
+            'select': {'args': {'band': ('string_list', 1, None, True, True),
+                                'mask': ('string', 1, 1, False, False)},
+                       'choices': {},
+                       'flags': {'--band': 'band', '--mask': 'mask', '-b': 'band'},
+                       'input': 'raster',
+                       'output': 'raster',
+                       'position': None,
+                       'required': ()},
+            'set-type': {'args': {'output-data-type': ('string', 1, 1, False, False)},
+                         'choices': {'output-data-type': ('Byte',
+                                                          'Int8',
+                                                          'UInt16',
+                                                          'Int16',
+                                                          'UInt32',
+                                                          'Int32',
+                                                          'UInt64',
+                                                          'Int64',
+                                                          'CInt16',
+                                                          'CInt32',
+                                                          'Float16',
+                                                          'Float32',
+                                                          'Float64',
+                                                          'CFloat16',
+                                                          'CFloat32',
+                                                          'CFloat64')},
+                         'flags': {'--datatype': 'output-data-type',
+                                   '--ot': 'output-data-type',
+                                   '--output-data-type': 'output-data-type'},
+                         'input': 'raster',
+                         'output': 'raster',
+                         'position': None,
+                         'required': ('output-data-type',)},
+            'sieve': {'args': {'band': ('integer', 1, 1, False, False),
+                               'connect-diagonal-pixels': ('boolean',
+                                                           0,
+                                                           0,
+                                                           False,
+                                                           False),
+                               'mask': ('string', 1, 1, False, False),
+                               'size-threshold': ('integer', 1, 1, False, False)},
+                      'choices': {},
+                      'flags': {'--band': 'band',
+                                '--connect-diagonal-pixels': 'connect-diagonal-pixels',
+                                '--mask': 'mask',
+                                '--size-threshold': 'size-threshold',
+                                '-b': 'band',
+                                '-c': 'connect-diagonal-pixels',
+                                '-s': 'size-threshold'},
+                      'input': 'raster',
+                      'output': 'raster',
+                      'position': None,
+                      'required': ()},
+            'slope': {'args': {'band': ('integer', 1, 1, False, False),
+                               'gradient-alg': ('string', 1, 1, False, False),
+                               'no-edges': ('boolean', 0, 0, False, False),
+                               'unit': ('string', 1, 1, False, False),
+                               'xscale': ('real', 1, 1, False, False),
+                               'yscale': ('real', 1, 1, False, False)},
+                      'choices': {'gradient-alg': ('Horn', 'ZevenbergenThorne'),
+                                  'unit': ('degree', 'percent')},
+                      'flags': {'--band': 'band',
+                                '--gradient-alg': 'gradient-alg',
+                                '--no-edges': 'no-edges',
+                                '--unit': 'unit',
+                                '--xscale': 'xscale',
+                                '--yscale': 'yscale',
+                                '-b': 'band'},
+                      'input': 'raster',
+                      'output': 'raster',
+                      'position': None,
+                      'required': ()},
+            'stack': {'args': {'absolute-path': ('boolean', 0, 0, False, False),
+                               'band': ('integer_list', 1, None, True, True),
+                               'bbox': ('real_list', 4, 4, True, False),
+                               'dst-nodata': ('real_list', 1, None, True, True),
+                               'hide-nodata': ('boolean', 0, 0, False, False),
+                               'input': ('dataset_list', 1, None, True, True),
+                               'input-format': ('string_list', 1, None, True, True),
+                               'open-option': ('string_list', 1, None, False, True),
+                               'resampling': ('string', 1, 1, False, False),
+                               'resolution': ('string', 1, 1, False, False),
+                               'src-nodata': ('real_list', 1, None, True, True),
+                               'target-aligned-pixels': ('boolean',
+                                                         0,
+                                                         0,
+                                                         False,
+                                                         False)},
+                      'choices': {'resampling': ('nearest',
+                                                 'bilinear',
+                                                 'cubic',
+                                                 'cubicspline',
+                                                 'lanczos',
+                                                 'average',
+                                                 'rms',
+                                                 'mode',
+                                                 'min',
+                                                 'max',
+                                                 'med')},
+                      'flags': {'--absolute-path': 'absolute-path',
+                                '--band': 'band',
+                                '--bbox': 'bbox',
+                                '--dst-nodata': 'dst-nodata',
+                                '--dstnodata': 'dst-nodata',
+                                '--hide-nodata': 'hide-nodata',
+                                '--hidenodata': 'hide-nodata',
+                                '--if': 'input-format',
+                                '--input': 'input',
+                                '--input-format': 'input-format',
+                                '--oo': 'open-option',
+                                '--open-option': 'open-option',
+                                '--resampling': 'resampling',
+                                '--resolution': 'resolution',
+                                '--src-nodata': 'src-nodata',
+                                '--srcnodata': 'src-nodata',
+                                '--target-aligned-pixels': 'target-aligned-pixels',
+                                '-b': 'band',
+                                '-r': 'resampling'},
+                      'input': 'raster',
+                      'output': 'raster',
+                      'position': 'first',
+                      'required': ()},
+            'tee': {'args': {},
+                    'choices': {},
+                    'flags': {},
+                    'input': 'raster',
+                    'output': 'raster',
+                    'position': None,
+                    'required': ()},
+            'tile': {'args': {'add-alpha': ('boolean', 0, 0, False, False),
+                              'aux-xml': ('boolean', 0, 0, False, False),
+                              'convention': ('string', 1, 1, False, False),
+                              'copy-src-metadata': ('boolean', 0, 0, False, False),
+                              'copyright': ('string', 1, 1, False, False),
+                              'creation-option': ('string_list', 1, None, False, True),
+                              'dst-nodata': ('real', 1, 1, False, False),
+                              'excluded-values': ('string', 1, 1, False, False),
+                              'excluded-values-pct-threshold': ('real',
+                                                                1,
+                                                                1,
+                                                                False,
+                                                                False),
+                              'kml': ('boolean', 0, 0, False, False),
+                              'max-zoom': ('integer', 1, 1, False, False),
+                              'metadata': ('string_list', 1, None, False, True),
+                              'min-zoom': ('integer', 1, 1, False, False),
+                              'no-alpha': ('boolean', 0, 0, False, False),
+                              'nodata-values-pct-threshold': ('real',
+                                                              1,
+                                                              1,
+                                                              False,
+                                                              False),
+                              'num-threads': ('string', 1, 1, False, False),
+                              'output': ('dataset', 1, 1, False, False),
+                              'output-format': ('string', 1, 1, False, False),
+                              'overview-resampling': ('string', 1, 1, False, False),
+                              'resampling': ('string', 1, 1, False, False),
+                              'resume': ('boolean', 0, 0, False, False),
+                              'skip-blank': ('boolean', 0, 0, False, False),
+                              'tile-size': ('integer', 1, 1, False, False),
+                              'tiling-scheme': ('string', 1, 1, False, False),
+                              'title': ('string', 1, 1, False, False),
+                              'url': ('string', 1, 1, False, False),
+                              'webviewer': ('string_list', 1, None, True, True)},
+                     'choices': {'convention': ('xyz', 'tms'),
+                                 'resampling': ('nearest',
+                                                'bilinear',
+                                                'cubic',
+                                                'cubicspline',
+                                                'lanczos',
+                                                'average',
+                                                'rms',
+                                                'mode',
+                                                'min',
+                                                'max',
+                                                'med',
+                                                'q1',
+                                                'q3',
+                                                'sum')},
+                     'flags': {'--add-alpha': 'add-alpha',
+                               '--aux-xml': 'aux-xml',
+                               '--co': 'creation-option',
+                               '--convention': 'convention',
+                               '--copy-src-metadata': 'copy-src-metadata',
+                               '--copyright': 'copyright',
+                               '--creation-option': 'creation-option',
+                               '--dst-nodata': 'dst-nodata',
+                               '--excluded-values': 'excluded-values',
+                               '--excluded-values-pct-threshold': 'excluded-values-pct-threshold',
+                               '--format': 'output-format',
+                               '--kml': 'kml',
+                               '--max-zoom': 'max-zoom',
+                               '--metadata': 'metadata',
+                               '--min-zoom': 'min-zoom',
+                               '--no-alpha': 'no-alpha',
+                               '--nodata-values-pct-threshold': 'nodata-values-pct-threshold',
+                               '--num-threads': 'num-threads',
+                               '--of': 'output-format',
+                               '--output': 'output',
+                               '--output-format': 'output-format',
+                               '--overview-resampling': 'overview-resampling',
+                               '--resampling': 'resampling',
+                               '--resume': 'resume',
+                               '--skip-blank': 'skip-blank',
+                               '--tile-size': 'tile-size',
+                               '--tiling-scheme': 'tiling-scheme',
+                               '--title': 'title',
+                               '--url': 'url',
+                               '--webviewer': 'webviewer',
+                               '-f': 'output-format',
+                               '-j': 'num-threads',
+                               '-r': 'resampling'},
+                     'input': 'raster',
+                     'output': 'raster',
+                     'position': 'last',
+                     'required': ()},
+            'tpi': {'args': {'band': ('integer', 1, 1, False, False),
+                             'no-edges': ('boolean', 0, 0, False, False)},
+                    'choices': {},
+                    'flags': {'--band': 'band', '--no-edges': 'no-edges', '-b': 'band'},
+                    'input': 'raster',
+                    'output': 'raster',
+                    'position': None,
+                    'required': ()},
+            'tri': {'args': {'algorithm': ('string', 1, 1, False, False),
+                             'band': ('integer', 1, 1, False, False),
+                             'no-edges': ('boolean', 0, 0, False, False)},
+                    'choices': {'algorithm': ('Riley', 'Wilson')},
+                    'flags': {'--algorithm': 'algorithm',
+                              '--band': 'band',
+                              '--no-edges': 'no-edges',
+                              '-b': 'band'},
+                    'input': 'raster',
+                    'output': 'raster',
+                    'position': None,
+                    'required': ()},
+            'unscale': {'args': {'band': ('integer', 1, 1, False, False),
+                                 'output-data-type': ('string', 1, 1, False, False)},
+                        'choices': {'output-data-type': ('Byte',
+                                                         'Int8',
+                                                         'UInt16',
+                                                         'Int16',
+                                                         'UInt32',
+                                                         'Int32',
+                                                         'UInt64',
+                                                         'Int64',
+                                                         'CInt16',
+                                                         'CInt32',
+                                                         'Float16',
+                                                         'Float32',
+                                                         'Float64',
+                                                         'CFloat16',
+                                                         'CFloat32',
+                                                         'CFloat64')},
+                        'flags': {'--band': 'band',
+                                  '--datatype': 'output-data-type',
+                                  '--ot': 'output-data-type',
+                                  '--output-data-type': 'output-data-type',
+                                  '-b': 'band'},
+                        'input': 'raster',
+                        'output': 'raster',
+                        'position': None,
+                        'required': ()},
+            'update': {'args': {'error-threshold': ('real', 1, 1, False, False),
+                                'no-update-overviews': ('boolean', 0, 0, False, False),
+                                'output': ('dataset', 1, 1, False, False),
+                                'resampling': ('string', 1, 1, False, False),
+                                'transform-option': ('string_list',
+                                                     1,
+                                                     None,
+                                                     False,
+                                                     True),
+                                'warp-option': ('string_list', 1, None, False, True)},
+                       'choices': {'resampling': ('nearest',
+                                                  'bilinear',
+                                                  'cubic',
+                                                  'cubicspline',
+                                                  'lanczos',
+                                                  'average',
+                                                  'rms',
+                                                  'mode',
+                                                  'min',
+                                                  'max',
+                                                  'med',
+                                                  'q1',
+                                                  'q3',
+                                                  'sum')},
+                       'flags': {'--error-threshold': 'error-threshold',
+                                 '--et': 'error-threshold',
+                                 '--no-update-overviews': 'no-update-overviews',
+                                 '--output': 'output',
+                                 '--resampling': 'resampling',
+                                 '--to': 'transform-option',
+                                 '--transform-option': 'transform-option',
+                                 '--warp-option': 'warp-option',
+                                 '--wo': 'warp-option',
+                                 '-r': 'resampling'},
+                       'input': 'raster',
+                       'output': 'raster',
+                       'position': 'last',
+                       'required': ()},
+            'viewshed': {'args': {'band': ('integer', 1, 1, False, False),
+                                  'curvature-coefficient': ('real', 1, 1, False, False),
+                                  'dst-nodata': ('real', 1, 1, False, False),
+                                  'height': ('real', 1, 1, False, False),
+                                  'invisible-value': ('real', 1, 1, False, False),
+                                  'max-distance': ('real', 1, 1, False, False),
+                                  'mode': ('string', 1, 1, False, False),
+                                  'num-threads': ('string', 1, 1, False, False),
+                                  'observer-spacing': ('integer', 1, 1, False, False),
+                                  'out-of-range-value': ('real', 1, 1, False, False),
+                                  'position': ('real_list', 2, 3, True, False),
+                                  'target-height': ('real', 1, 1, False, False),
+                                  'visible-value': ('real', 1, 1, False, False)},
+                         'choices': {'mode': ('normal', 'DEM', 'ground', 'cumulative')},
+                         'flags': {'--band': 'band',
+                                   '--curvature-coefficient': 'curvature-coefficient',
+                                   '--dst-nodata': 'dst-nodata',
+                                   '--height': 'height',
+                                   '--invisible-value': 'invisible-value',
+                                   '--max-distance': 'max-distance',
+                                   '--mode': 'mode',
+                                   '--num-threads': 'num-threads',
+                                   '--observer-spacing': 'observer-spacing',
+                                   '--out-of-range-value': 'out-of-range-value',
+                                   '--position': 'position',
+                                   '--target-height': 'target-height',
+                                   '--visible-value': 'visible-value',
+                                   '-b': 'band',
+                                   '-j': 'num-threads',
+                                   '-p': 'position',
+                                   '-z': 'height'},
+                         'input': 'raster',
+                         'output': 'raster',
+                         'position': None,
+                         'required': ('position',)},
+            'write': {'args': {'append': ('boolean', 0, 0, False, False),
+                               'creation-option': ('string_list', 1, None, False, True),
+                               'output': ('dataset', 1, 1, False, False),
+                               'output-format': ('string', 1, 1, False, False),
+                               'overwrite': ('boolean', 0, 0, False, False)},
+                      'choices': {},
+                      'flags': {'--append': 'append',
+                                '--co': 'creation-option',
+                                '--creation-option': 'creation-option',
+                                '--format': 'output-format',
+                                '--of': 'output-format',
+                                '--output': 'output',
+                                '--output-format': 'output-format',
+                                '--overwrite': 'overwrite',
+                                '-f': 'output-format'},
+                      'input': 'raster',
+                      'output': 'raster',
+                      'position': 'last',
+                      'required': ()},
+            'zonal-stats': {'args': {'band': ('integer_list', 1, None, True, True),
+                                     'include-field': ('string_list',
+                                                       1,
+                                                       None,
+                                                       True,
+                                                       True),
+                                     'memory': ('string', 1, 1, False, False),
+                                     'output': ('dataset', 1, 1, False, False),
+                                     'output-layer': ('string', 1, 1, False, False),
+                                     'pixels': ('string', 1, 1, False, False),
+                                     'stat': ('string_list', 1, None, True, True),
+                                     'strategy': ('string', 1, 1, False, False),
+                                     'weights': ('dataset', 1, 1, False, False),
+                                     'weights-band': ('integer', 1, 1, False, False),
+                                     'zones': ('dataset', 1, 1, False, False),
+                                     'zones-band': ('integer', 1, 1, False, False),
+                                     'zones-layer': ('string', 1, 1, False, False)},
+                            'choices': {'pixels': ('default',
+                                                   'fractional',
+                                                   'all-touched'),
+                                        'stat': ('center_x',
+                                                 'center_y',
+                                                 'count',
+                                                 'coverage',
+                                                 'frac',
+                                                 'majority',
+                                                 'max',
+                                                 'max_center_x',
+                                                 'max_center_y',
+                                                 'mean',
+                                                 'median',
+                                                 'min',
+                                                 'min_center_x',
+                                                 'min_center_y',
+                                                 'minority',
+                                                 'mode',
+                                                 'stdev',
+                                                 'sum',
+                                                 'unique',
+                                                 'values',
+                                                 'variance',
+                                                 'variety',
+                                                 'weighted_mean',
+                                                 'weighted_stdev',
+                                                 'weighted_sum',
+                                                 'weighted_variance',
+                                                 'weights'),
+                                        'strategy': ('feature', 'raster')},
+                            'flags': {'--band': 'band',
+                                      '--include-field': 'include-field',
+                                      '--memory': 'memory',
+                                      '--output': 'output',
+                                      '--output-layer': 'output-layer',
+                                      '--pixels': 'pixels',
+                                      '--stat': 'stat',
+                                      '--stats': 'stat',
+                                      '--strategy': 'strategy',
+                                      '--weights': 'weights',
+                                      '--weights-band': 'weights-band',
+                                      '--zones': 'zones',
+                                      '--zones-band': 'zones-band',
+                                      '--zones-layer': 'zones-layer',
+                                      '-b': 'band'},
+                            'input': 'raster',
+                            'output': 'vector',
+                            'position': None,
+                            'required': ('zones',)}},
+ 'vector': {'buffer': {'args': {'active-geometry': ('string', 1, 1, False, False),
+                                'active-layer': ('string', 1, 1, False, False),
+                                'distance': ('real', 1, 1, False, False),
+                                'endcap-style': ('string', 1, 1, False, False),
+                                'join-style': ('string', 1, 1, False, False),
+                                'mitre-limit': ('real', 1, 1, False, False),
+                                'quadrant-segments': ('integer', 1, 1, False, False),
+                                'side': ('string', 1, 1, False, False)},
+                       'choices': {'endcap-style': ('round', 'flat', 'square'),
+                                   'join-style': ('round', 'mitre', 'bevel'),
+                                   'side': ('both', 'left', 'right')},
+                       'flags': {'--active-geometry': 'active-geometry',
+                                 '--active-layer': 'active-layer',
+                                 '--distance': 'distance',
+                                 '--endcap-style': 'endcap-style',
+                                 '--join-style': 'join-style',
+                                 '--mitre-limit': 'mitre-limit',
+                                 '--quadrant-segments': 'quadrant-segments',
+                                 '--side': 'side'},
+                       'input': 'vector',
+                       'output': 'vector',
+                       'position': None,
+                       'required': ()},
+            'check-coverage': {'args': {'active-layer': ('string', 1, 1, False, False),
+                                        'geometry-name': ('string', 1, 1, False, False),
+                                        'include-valid': ('boolean',
+                                                          0,
+                                                          0,
+                                                          False,
+                                                          False),
+                                        'maximum-gap-width': ('real',
+                                                              1,
+                                                              1,
+                                                              False,
+                                                              False)},
+                               'choices': {},
+                               'flags': {'--active-layer': 'active-layer',
+                                         '--geometry-name': 'geometry-name',
+                                         '--include-valid': 'include-valid',
+                                         '--maximum-gap-width': 'maximum-gap-width'},
+                               'input': 'vector',
+                               'output': 'vector',
+                               'position': None,
+                               'required': ()},
+            'check-geometry': {'args': {'active-geometry': ('string',
+                                                            1,
+                                                            1,
+                                                            False,
+                                                            False),
+                                        'active-layer': ('string', 1, 1, False, False),
+                                        'geometry-name': ('string', 1, 1, False, False),
+                                        'include-field': ('string_list',
+                                                          1,
+                                                          None,
+                                                          True,
+                                                          True),
+                                        'include-valid': ('boolean',
+                                                          0,
+                                                          0,
+                                                          False,
+                                                          False)},
+                               'choices': {},
+                               'flags': {'--active-geometry': 'active-geometry',
+                                         '--active-layer': 'active-layer',
+                                         '--geometry-name': 'geometry-name',
+                                         '--include-field': 'include-field',
+                                         '--include-valid': 'include-valid'},
+                               'input': 'vector',
+                               'output': 'vector',
+                               'position': None,
+                               'required': ()},
+            'clean-coverage': {'args': {'active-layer': ('string', 1, 1, False, False),
+                                        'maximum-gap-width': ('real',
+                                                              1,
+                                                              1,
+                                                              False,
+                                                              False),
+                                        'merge-strategy': ('string',
+                                                           1,
+                                                           1,
+                                                           False,
+                                                           False),
+                                        'snapping-distance': ('real',
+                                                              1,
+                                                              1,
+                                                              False,
+                                                              False)},
+                               'choices': {'merge-strategy': ('longest-border',
+                                                              'max-area',
+                                                              'min-area',
+                                                              'min-index')},
+                               'flags': {'--active-layer': 'active-layer',
+                                         '--maximum-gap-width': 'maximum-gap-width',
+                                         '--merge-strategy': 'merge-strategy',
+                                         '--snapping-distance': 'snapping-distance'},
+                               'input': 'vector',
+                               'output': 'vector',
+                               'position': None,
+                               'required': ()},
+            'clip': {'args': {'active-layer': ('string', 1, 1, False, False),
+                              'bbox': ('real_list', 4, 4, True, False),
+                              'bbox-crs': ('string', 1, 1, False, False),
+                              'geometry': ('string', 1, 1, False, False),
+                              'geometry-crs': ('string', 1, 1, False, False),
+                              'like': ('dataset', 1, 1, False, False),
+                              'like-layer': ('string', 1, 1, False, False),
+                              'like-sql': ('string', 1, 1, False, False),
+                              'like-where': ('string', 1, 1, False, False)},
+                     'choices': {},
+                     'flags': {'--active-layer': 'active-layer',
+                               '--bbox': 'bbox',
+                               '--bbox-crs': 'bbox-crs',
+                               '--geometry': 'geometry',
+                               '--geometry-crs': 'geometry-crs',
+                               '--like': 'like',
+                               '--like-layer': 'like-layer',
+                               '--like-sql': 'like-sql',
+                               '--like-where': 'like-where'},
+                     'input': 'vector',
+                     'output': 'vector',
+                     'position': None,
+                     'required': ()},
+            'concat': {'args': {'dst-crs': ('string', 1, 1, False, False),
+                                'field-strategy': ('string', 1, 1, False, False),
+                                'input': ('dataset_list', 1, None, True, True),
+                                'input-format': ('string_list', 1, None, True, True),
+                                'mode': ('string', 1, 1, False, False),
+                                'open-option': ('string_list', 1, None, False, True),
+                                'output-layer': ('string', 1, 1, False, False),
+                                'source-layer-field-content': ('string',
+                                                               1,
+                                                               1,
+                                                               False,
+                                                               False),
+                                'source-layer-field-name': ('string',
+                                                            1,
+                                                            1,
+                                                            False,
+                                                            False),
+                                'src-crs': ('string', 1, 1, False, False)},
+                       'choices': {'field-strategy': ('union', 'intersection'),
+                                   'mode': ('merge-per-layer-name', 'stack', 'single')},
+                       'flags': {'--dst-crs': 'dst-crs',
+                                 '--field-strategy': 'field-strategy',
+                                 '--if': 'input-format',
+                                 '--input': 'input',
+                                 '--input-format': 'input-format',
+                                 '--mode': 'mode',
+                                 '--oo': 'open-option',
+                                 '--open-option': 'open-option',
+                                 '--output-layer': 'output-layer',
+                                 '--source-layer-field-content': 'source-layer-field-content',
+                                 '--source-layer-field-name': 'source-layer-field-name',
+                                 '--src-crs': 'src-crs',
+                                 '-d': 'dst-crs',
+                                 '-s': 'src-crs'},
+                       'input': 'vector',
+                       'output': 'vector',
+                       'position': 'first',
+                       'required': ()},
+            'edit': {'args': {'active-layer': ('string', 1, 1, False, False),
+                              'crs': ('string', 1, 1, False, False),
+                              'geometry-type': ('string', 1, 1, False, False),
+                              'layer-metadata': ('string_list', 1, None, False, True),
+                              'metadata': ('string_list', 1, None, False, True),
+                              'unset-fid': ('boolean', 0, 0, False, False),
+                              'unset-layer-metadata': ('string_list',
+                                                       1,
+                                                       None,
+                                                       False,
+                                                       True),
+                              'unset-metadata': ('string_list', 1, None, False, True)},
+                     'choices': {},
+                     'flags': {'--active-layer': 'active-layer',
+                               '--crs': 'crs',
+                               '--geometry-type': 'geometry-type',
+                               '--layer-metadata': 'layer-metadata',
+                               '--metadata': 'metadata',
+                               '--unset-fid': 'unset-fid',
+                               '--unset-layer-metadata': 'unset-layer-metadata',
+                               '--unset-metadata': 'unset-metadata'},
+                     'input': 'vector',
+                     'output': 'vector',
+                     'position': None,
+                     'required': ()},
+            'explode-collections': {'args': {'active-geometry': ('string',
+                                                                 1,
+                                                                 1,
+                                                                 False,
+                                                                 False),
+                                             'active-layer': ('string',
+                                                              1,
+                                                              1,
+                                                              False,
+                                                              False),
+                                             'geometry-type': ('string',
+                                                               1,
+                                                               1,
+                                                               False,
+                                                               False),
+                                             'skip-on-type-mismatch': ('boolean',
+                                                                       0,
+                                                                       0,
+                                                                       False,
+                                                                       False)},
+                                    'choices': {},
+                                    'flags': {'--active-geometry': 'active-geometry',
+                                              '--active-layer': 'active-layer',
+                                              '--geometry-type': 'geometry-type',
+                                              '--skip-on-type-mismatch': 'skip-on-type-mismatch'},
+                                    'input': 'vector',
+                                    'output': 'vector',
+                                    'position': None,
+                                    'required': ()},
+            'filter': {'args': {'active-layer': ('string', 1, 1, False, False),
+                                'bbox': ('real_list', 4, 4, True, False),
+                                'where': ('string', 1, 1, False, False)},
+                       'choices': {},
+                       'flags': {'--active-layer': 'active-layer',
+                                 '--bbox': 'bbox',
+                                 '--where': 'where'},
+                       'input': 'vector',
+                       'output': 'vector',
+                       'position': None,
+                       'required': ()},
+            'info': {'args': {'dialect': ('string', 1, 1, False, False),
+                              'features': ('boolean', 0, 0, False, False),
+                              'format': ('string', 1, 1, False, False),
+                              'layer': ('string_list', 1, None, True, True),
+                              'limit': ('integer', 1, 1, False, False),
+                              'output-string': ('string', 1, 1, False, False),
+                              'sql': ('string', 1, 1, False, False),
+                              'summary': ('boolean', 0, 0, False, False),
+                              'where': ('string', 1, 1, False, False)},
+                     'choices': {'format': ('json', 'text')},
+                     'flags': {'--dialect': 'dialect',
+                               '--features': 'features',
+                               '--format': 'format',
+                               '--layer': 'layer',
+                               '--limit': 'limit',
+                               '--output-string': 'output-string',
+                               '--sql': 'sql',
+                               '--summary': 'summary',
+                               '--where': 'where',
+                               '-f': 'format',
+                               '-l': 'layer'},
+                     'input': 'vector',
+                     'output': 'vector',
+                     'position': 'last',
+                     'required': ()},
+            'make-point': {'args': {'dst-crs': ('string', 1, 1, False, False),
+                                    'm': ('string', 1, 1, False, False),
+                                    'x': ('string', 1, 1, False, False),
+                                    'y': ('string', 1, 1, False, False),
+                                    'z': ('string', 1, 1, False, False)},
+                           'choices': {},
+                           'flags': {'--dst-crs': 'dst-crs',
+                                     '--m': 'm',
+                                     '--x': 'x',
+                                     '--y': 'y',
+                                     '--z': 'z'},
+                           'input': 'vector',
+                           'output': 'vector',
+                           'position': None,
+                           'required': ('x', 'y')},
+            'make-valid': {'args': {'active-geometry': ('string', 1, 1, False, False),
+                                    'active-layer': ('string', 1, 1, False, False),
+                                    'keep-lower-dim': ('boolean', 0, 0, False, False),
+                                    'method': ('string', 1, 1, False, False)},
+                           'choices': {'method': ('linework', 'structure')},
+                           'flags': {'--active-geometry': 'active-geometry',
+                                     '--active-layer': 'active-layer',
+                                     '--keep-lower-dim': 'keep-lower-dim',
+                                     '--method': 'method'},
+                           'input': 'vector',
+                           'output': 'vector',
+                           'position': None,
+                           'required': ()},
+            'materialize': {'args': {'creation-option': ('string_list',
+                                                         1,
+                                                         None,
+                                                         False,
+                                                         True),
+                                     'layer-creation-option': ('string_list',
+                                                               1,
+                                                               None,
+                                                               False,
+                                                               True),
+                                     'output': ('dataset', 1, 1, False, False),
+                                     'output-format': ('string', 1, 1, False, False)},
+                            'choices': {},
+                            'flags': {'--co': 'creation-option',
+                                      '--creation-option': 'creation-option',
+                                      '--format': 'output-format',
+                                      '--layer-creation-option': 'layer-creation-option',
+                                      '--lco': 'layer-creation-option',
+                                      '--of': 'output-format',
+                                      '--output': 'output',
+                                      '--output-format': 'output-format',
+                                      '-f': 'output-format'},
+                            'input': 'vector',
+                            'output': 'vector',
+                            'position': None,
+                            'required': ()},
+            'rasterize': {'args': {'3d': ('boolean', 0, 0, False, False),
+                                   'add': ('boolean', 0, 0, False, False),
+                                   'all-touched': ('boolean', 0, 0, False, False),
+                                   'attribute-name': ('string', 1, 1, False, False),
+                                   'band': ('integer_list', 1, None, True, True),
+                                   'burn': ('real_list', 1, None, True, True),
+                                   'crs': ('string', 1, 1, False, False),
+                                   'dialect': ('string', 1, 1, False, False),
+                                   'extent': ('real_list', 4, 4, True, False),
+                                   'init': ('real_list', 1, None, True, True),
+                                   'invert': ('boolean', 0, 0, False, False),
+                                   'layer-name': ('string', 1, 1, False, False),
+                                   'nodata': ('real', 1, 1, False, False),
+                                   'optimization': ('string', 1, 1, False, False),
+                                   'output': ('dataset', 1, 1, False, False),
+                                   'output-data-type': ('string', 1, 1, False, False),
+                                   'resolution': ('real_list', 2, 2, True, False),
+                                   'size': ('integer_list', 2, 2, True, False),
+                                   'sql': ('string', 1, 1, False, False),
+                                   'target-aligned-pixels': ('boolean',
+                                                             0,
+                                                             0,
+                                                             False,
+                                                             False),
+                                   'transformer-option': ('string_list',
+                                                          1,
+                                                          None,
+                                                          False,
+                                                          True),
+                                   'where': ('string', 1, 1, False, False)},
+                          'choices': {'optimization': ('AUTO', 'RASTER', 'VECTOR'),
+                                      'output-data-type': ('Byte',
+                                                           'Int8',
+                                                           'UInt16',
+                                                           'Int16',
+                                                           'UInt32',
+                                                           'Int32',
+                                                           'UInt64',
+                                                           'Int64',
+                                                           'CInt16',
+                                                           'CInt32',
+                                                           'Float16',
+                                                           'Float32',
+                                                           'Float64',
+                                                           'CFloat16',
+                                                           'CFloat32',
+                                                           'CFloat64')},
+                          'flags': {'--3d': '3d',
+                                    '--add': 'add',
+                                    '--all-touched': 'all-touched',
+                                    '--attribute-name': 'attribute-name',
+                                    '--band': 'band',
+                                    '--burn': 'burn',
+                                    '--crs': 'crs',
+                                    '--datatype': 'output-data-type',
+                                    '--dialect': 'dialect',
+                                    '--extent': 'extent',
+                                    '--init': 'init',
+                                    '--invert': 'invert',
+                                    '--layer-name': 'layer-name',
+                                    '--nodata': 'nodata',
+                                    '--optimization': 'optimization',
+                                    '--ot': 'output-data-type',
+                                    '--output': 'output',
+                                    '--output-data-type': 'output-data-type',
+                                    '--resolution': 'resolution',
+                                    '--size': 'size',
+                                    '--sql': 'sql',
+                                    '--target-aligned-pixels': 'target-aligned-pixels',
+                                    '--transformer-option': 'transformer-option',
+                                    '--where': 'where',
+                                    '-a': 'attribute-name',
+                                    '-b': 'band',
+                                    '-l': 'layer-name'},
+                          'input': 'vector',
+                          'output': 'raster',
+                          'position': None,
+                          'required': ()},
+            'read': {'args': {'input': ('dataset', 1, 1, False, False),
+                              'input-format': ('string_list', 1, None, True, True),
+                              'input-layer': ('string_list', 1, None, True, True),
+                              'open-option': ('string_list', 1, None, False, True)},
+                     'choices': {},
+                     'flags': {'--if': 'input-format',
+                               '--input': 'input',
+                               '--input-format': 'input-format',
+                               '--input-layer': 'input-layer',
+                               '--layer': 'input-layer',
+                               '--oo': 'open-option',
+                               '--open-option': 'open-option',
+                               '-l': 'input-layer'},
+                     'input': 'vector',
+                     'output': 'vector',
+                     'position': 'first',
+                     'required': ()},
+            'reproject': {'args': {'active-layer': ('string', 1, 1, False, False),
+                                   'dst-crs': ('string', 1, 1, False, False),
+                                   'src-crs': ('string', 1, 1, False, False)},
+                          'choices': {},
+                          'flags': {'--active-layer': 'active-layer',
+                                    '--dst-crs': 'dst-crs',
+                                    '--src-crs': 'src-crs',
+                                    '-d': 'dst-crs',
+                                    '-s': 'src-crs'},
+                          'input': 'vector',
+                          'output': 'vector',
+                          'position': None,
+                          'required': ('dst-crs',)},
+            'segmentize': {'args': {'active-geometry': ('string', 1, 1, False, False),
+                                    'active-layer': ('string', 1, 1, False, False),
+                                    'max-length': ('real', 1, 1, False, False)},
+                           'choices': {},
+                           'flags': {'--active-geometry': 'active-geometry',
+                                     '--active-layer': 'active-layer',
+                                     '--max-length': 'max-length'},
+                           'input': 'vector',
+                           'output': 'vector',
+                           'position': None,
+                           'required': ('max-length',)},
+            'select': {'args': {'active-layer': ('string', 1, 1, False, False),
+                                'exclude': ('boolean', 0, 0, False, False),
+                                'fields': ('string_list', 1, None, True, True),
+                                'ignore-missing-fields': ('boolean',
+                                                          0,
+                                                          0,
+                                                          False,
+                                                          False)},
+                       'choices': {},
+                       'flags': {'--active-layer': 'active-layer',
+                                 '--exclude': 'exclude',
+                                 '--fields': 'fields',
+                                 '--ignore-missing-fields': 'ignore-missing-fields'},
+                       'input': 'vector',
+                       'output': 'vector',
+                       'position': None,
+                       'required': ()},
+            'set-field-type': {'args': {'active-layer': ('string', 1, 1, False, False),
+                                        'field-name': ('string', 1, 1, False, False),
+                                        'field-type': ('string', 1, 1, False, False),
+                                        'src-field-type': ('string',
+                                                           1,
+                                                           1,
+                                                           False,
+                                                           False)},
+                               'choices': {},
+                               'flags': {'--active-layer': 'active-layer',
+                                         '--dst-field-type': 'field-type',
+                                         '--field-name': 'field-name',
+                                         '--field-type': 'field-type',
+                                         '--src-field-type': 'src-field-type'},
+                               'input': 'vector',
+                               'output': 'vector',
+                               'position': None,
+                               'required': ()},
+            'set-geom-type': {'args': {'active-geometry': ('string',
+                                                           1,
+                                                           1,
+                                                           False,
+                                                           False),
+                                       'active-layer': ('string', 1, 1, False, False),
+                                       'curve': ('boolean', 0, 0, False, False),
+                                       'geometry-type': ('string', 1, 1, False, False),
+                                       'linear': ('boolean', 0, 0, False, False),
+                                       'multi': ('boolean', 0, 0, False, False),
+                                       'single': ('boolean', 0, 0, False, False),
+                                       'skip': ('boolean', 0, 0, False, False),
+                                       'xy': ('boolean', 0, 0, False, False),
+                                       'xym': ('boolean', 0, 0, False, False),
+                                       'xyz': ('boolean', 0, 0, False, False),
+                                       'xyzm': ('boolean', 0, 0, False, False)},
+                              'choices': {},
+                              'flags': {'--active-geometry': 'active-geometry',
+                                        '--active-layer': 'active-layer',
+                                        '--curve': 'curve',
+                                        '--geometry-type': 'geometry-type',
+                                        '--linear': 'linear',
+                                        '--multi': 'multi',
+                                        '--single': 'single',
+                                        '--skip': 'skip',
+                                        '--xy': 'xy',
+                                        '--xym': 'xym',
+                                        '--xyz': 'xyz',
+                                        '--xyzm': 'xyzm'},
+                              'input': 'vector',
+                              'output': 'vector',
+                              'position': None,
+                              'required': ()},
+            'simplify': {'args': {'active-geometry': ('string', 1, 1, False, False),
+                                  'active-layer': ('string', 1, 1, False, False),
+                                  'tolerance': ('real', 1, 1, False, False)},
+                         'choices': {},
+                         'flags': {'--active-geometry': 'active-geometry',
+                                   '--active-layer': 'active-layer',
+                                   '--tolerance': 'tolerance'},
+                         'input': 'vector',
+                         'output': 'vector',
+                         'position': None,
+                         'required': ('tolerance',)},
+            'simplify-coverage': {'args': {'active-layer': ('string',
+                                                            1,
+                                                            1,
+                                                            False,
+                                                            False),
+                                           'preserve-boundary': ('boolean',
+                                                                 0,
+                                                                 0,
+                                                                 False,
+                                                                 False),
+                                           'tolerance': ('real', 1, 1, False, False)},
+                                  'choices': {},
+                                  'flags': {'--active-layer': 'active-layer',
+                                            '--preserve-boundary': 'preserve-boundary',
+                                            '--tolerance': 'tolerance'},
+                                  'input': 'vector',
+                                  'output': 'vector',
+                                  'position': None,
+                                  'required': ('tolerance',)},
+            'sort': {'args': {'active-geometry': ('string', 1, 1, False, False),
+                              'active-layer': ('string', 1, 1, False, False),
+                              'method': ('string', 1, 1, False, False),
+                              'use-tempfile': ('boolean', 0, 0, False, False)},
+                     'choices': {'method': ('hilbert', 'strtree')},
+                     'flags': {'--active-geometry': 'active-geometry',
+                               '--active-layer': 'active-layer',
+                               '--method': 'method',
+                               '--use-tempfile': 'use-tempfile'},
+                     'input': 'vector',
+                     'output': 'vector',
+                     'position': None,
+                     'required': ()},
+            'sql': {'args': {'dialect': ('string', 1, 1, False, False),
+                             'output-layer': ('string_list', 1, None, True, True),
+                             'sql': ('string_list', 1, None, False, True)},
+                    'choices': {},
+                    'flags': {'--dialect': 'dialect',
+                              '--output-layer': 'output-layer',
+                              '--sql': 'sql'},
+                    'input': 'vector',
+                    'output': 'vector',
+                    'position': None,
+                    'required': ()},
+            'swap-xy': {'args': {'active-geometry': ('string', 1, 1, False, False),
+                                 'active-layer': ('string', 1, 1, False, False)},
+                        'choices': {},
+                        'flags': {'--active-geometry': 'active-geometry',
+                                  '--active-layer': 'active-layer'},
+                        'input': 'vector',
+                        'output': 'vector',
+                        'position': None,
+                        'required': ()},
+            'tee': {'args': {},
+                    'choices': {},
+                    'flags': {},
+                    'input': 'vector',
+                    'output': 'vector',
+                    'position': None,
+                    'required': ()},
+            'update': {'args': {'input-layer': ('string', 1, 1, False, False),
+                                'key': ('string_list', 1, None, True, True),
+                                'mode': ('string', 1, 1, False, False),
+                                'output': ('dataset', 1, 1, False, False),
+                                'output-layer': ('string', 1, 1, False, False)},
+                       'choices': {'mode': ('merge', 'update-only', 'append-only')},
+                       'flags': {'--input-layer': 'input-layer',
+                                 '--key': 'key',
+                                 '--mode': 'mode',
+                                 '--output': 'output',
+                                 '--output-layer': 'output-layer'},
+                       'input': 'vector',
+                       'output': 'vector',
+                       'position': 'last',
+                       'required': ()},
+            'write': {'args': {'append': ('boolean', 0, 0, False, False),
+                               'creation-option': ('string_list', 1, None, False, True),
+                               'layer-creation-option': ('string_list',
+                                                         1,
+                                                         None,
+                                                         False,
+                                                         True),
+                               'output': ('dataset', 1, 1, False, False),
+                               'output-format': ('string', 1, 1, False, False),
+                               'output-layer': ('string', 1, 1, False, False),
+                               'overwrite': ('boolean', 0, 0, False, False),
+                               'overwrite-layer': ('boolean', 0, 0, False, False),
+                               'skip-errors': ('boolean', 0, 0, False, False),
+                               'update': ('boolean', 0, 0, False, False)},
+                      'choices': {},
+                      'flags': {'--append': 'append',
+                                '--co': 'creation-option',
+                                '--creation-option': 'creation-option',
+                                '--format': 'output-format',
+                                '--layer-creation-option': 'layer-creation-option',
+                                '--lco': 'layer-creation-option',
+                                '--nln': 'output-layer',
+                                '--of': 'output-format',
+                                '--output': 'output',
+                                '--output-format': 'output-format',
+                                '--output-layer': 'output-layer',
+                                '--overwrite': 'overwrite',
+                                '--overwrite-layer': 'overwrite-layer',
+                                '--skip-errors': 'skip-errors',
+                                '--update': 'update',
+                                '-f': 'output-format',
+                                '-l': 'output-layer'},
+                      'input': 'vector',
+                      'output': 'vector',
+                      'position': 'last',
+                      'required': ()}}}
@@ -0,0 +1,255 @@
+from typing import Any, Dict, List, Set, Tuple
+
+from gdalgviz.commands import COMMAND_COSTS, CPU_BOUND
+from gdalgviz.cost import cost_level
+from gdalgviz.hashing import hash_steps, prefix_hashes
+from gdalgviz.parser import (
+    copy_steps,
+    get_command,
+    get_nested_pipelines,
+    is_pipeline_header,
+    iter_steps,
+)
+
+# CPU-bound steps that are expensive to run again, by impact class
+EXPENSIVE_COMMANDS = {
+    cmd: cost_level(cost["weight"])
+    for cmd, cost in COMMAND_COSTS.items()
+    if cost["bound"] == CPU_BOUND and cost_level(cost["weight"]) != "low"
+}
+
+IMPACT_CLASSES = ["low", "medium", "high"]
+IMPACT_WEIGHTS = {"medium": 2, "high": 4}
+
+# note colours for suggested materialize steps in diagrams
+ADVICE_COLORS = {"low": "#e2e3e5", "medium": "#fff3cd", "high": "#f8d7da"}
+
+# steps that start a new stream rather than reading the piped dataset
+SOURCE_COMMANDS = ("read", "concat", "mosaic", "stack")
+
+
+def impact_class(recomputed: List[str], extra_runs: int) -> str:
+    """
+    Estimate the impact of running the recomputed commands extra_runs more times
+    """
+    score = extra_runs * sum(
+        IMPACT_WEIGHTS.get(EXPENSIVE_COMMANDS.get(cmd, ""), 0) for cmd in recomputed
+    )
+    if score >= IMPACT_WEIGHTS["high"]:
+        return "high"
+    if score >= IMPACT_WEIGHTS["medium"]:
+        return "medium"
+    return "low"
+
+
+def _expensive(steps: List[Dict]) -> List[str]:
+    return [
+        get_command(step)
+        for step in iter_steps(steps)
+        if get_command(step) in EXPENSIVE_COMMANDS
+    ]
+
+
+def _suggest(step: Dict, entry: Dict, advice: List[Dict]) -> None:
+    """
+    Record a suggestion to materialize the output of step, annotating the step
+    with the most severe suggestion for it
+    """
+    advice.append(entry)
+    current = step.get("materialize")
+    if current is None or IMPACT_CLASSES.index(entry["impact"]) > IMPACT_CLASSES.index(
+        current["impact"]
+    ):
+        step["materialize"] = {"impact": entry["impact"], "reason": entry["reason"]}
+
+
+def _advise_fan_out(steps: List[Dict], advice: List[Dict]) -> None:
+    """
+    Find tee steps whose output is read by several consumers while expensive
+    steps are still streamed since the last materialize
+    """
+    # chains being walked, as (remaining numbered steps, the chain, the steps
+    # streamed into it since the last materialize, location prefix)
+    stack: List[Tuple[Any, List[Dict], List[Dict], str]] = [
+        (enumerate(steps), steps, [], "")
+    ]
+    while stack:
+        numbered, chain, upstream, prefix = stack[-1]
+        item = next(numbered, None)
+        if item is None:
+            stack.pop()
+            continue
+        i, step = item
+        cmd = get_command(step)
+        location = f"{prefix}step {i + 1} ({cmd})"
+        if cmd == "materialize":
+            upstream.clear()
+            continue
+        nested_pipelines = get_nested_pipelines(step)
+        if cmd != "tee":
+            # nested inputs are separate streams
+            for n in range(len(nested_pipelines), 0, -1):
+                nested_steps = nested_pipelines[n - 1]
+                stack.append(
+                    (
+                        enumerate(nested_steps),
+                        nested_steps,
+                        [],
+                        f"{location} > input {n} > ",
+                    )
+                )
+            upstream.append(step)
+            continue
+
+        consumers = len(nested_pipelines) + (1 if i < len(chain) - 1 else 0)
+        recomputed = _expensive(upstream) if consumers > 1 and i > 0 else []
+        branch_upstream = upstream
+        if recomputed:
+            previous = chain[i - 1]
+            reason = (
+                f"{consumers} consumers read the output of tee, "
+                f"running {', '.join(recomputed)} {consumers} times"
+            )
+            entry = {
+                "location": f"{prefix}step {i} ({get_command(previous)})",
+                "impact": impact_class(recomputed, consumers - 1),
+                "recomputed": recomputed,
+                "runs": consumers,
+                "reason": reason,
+            }
+            _suggest(previous, entry, advice)
+            branch_upstream = []
+        for n in range(len(nested_pipelines), 0, -1):
+            branch = nested_pipelines[n - 1]
+            stack.append(
+                (
+                    enumerate(branch),
+                    branch,
+                    list(branch_upstream),
+                    f"{location} > branch {n} > ",
+                )
+            )
+
+
+def _collect_streams(steps: List[Dict]) -> List[Tuple[str, List[Dict]]]:
+    """
+    Collect the pipelines that start from a source, with their location
+    """
+    streams = []
+    stack = [("", steps)]
+    while stack:
+        prefix, chain = stack.pop()
+        if chain and get_command(chain[0]) in SOURCE_COMMANDS:
+            streams.append((prefix, chain))
+        nested = []
+        for i, step in enumerate(chain):
+            cmd = get_command(step)
+            kind = "branch" if cmd == "tee" else "input"
+            for n, nested_steps in enumerate(get_nested_pipelines(step)):
+                location = f"{prefix}step {i + 1} ({cmd}) > {kind} {n + 1} > "
+                nested.append((location, nested_steps))
+        stack.extend(reversed(nested))
+    return streams
+
+
+def _with_expensive(steps: List[Dict]) -> Set[int]:
+    """
+    Return the ids of the steps that are expensive or have expensive nested steps
+    """
+    found: Set[int] = set()
+    # nested steps are walked before the steps containing them
+    for step in reversed(list(iter_steps(steps))):
+        if get_command(step) in EXPENSIVE_COMMANDS or any(
+            id(nested_step) in found
+            for nested_steps in get_nested_pipelines(step)
+            for nested_step in nested_steps
+        ):
+            found.add(id(step))
+    return found
+
+
+def _advise_shared_streams(steps: List[Dict], advice: List[Dict]) -> None:
+    """
+    Find identical streams (e.g. the same file read and reprojected in two
+    nested inputs) that compute expensive steps more than once
+    """
+    streams = _collect_streams(steps)
+    hashes = {
+        id(step): hashed["hash"]
+        for step, hashed in zip(iter_steps(steps), iter_steps(hash_steps(steps)))
+    }
+    with_expensive = _with_expensive(steps)
+
+    # occurrences of each stream prefix, as (stream index, prefix length)
+    prefixes: Dict[str, List[Tuple[int, int]]] = {}
+    for s, (_, stream_steps) in enumerate(streams):
+        expensive = False
+        keys = prefix_hashes([hashes[id(step)] for step in stream_steps])
+        for length, (step, key) in enumerate(zip(stream_steps, keys), start=1):
+            expensive = expensive or id(step) in with_expensive
+            if expensive:
+                prefixes.setdefault(key, []).append((s, length))
+
+    shared = [found for found in prefixes.values() if len(found) > 1]
+    # only report the longest shared prefix of each stream
+    longest: Dict[int, int] = {}
+    for found in shared:
+        for s, length in found:
+            longest[s] = max(longest.get(s, 0), length)
+
+    for found in shared:
+        if any(length < longest[s] for s, length in found):
+            continue
+        length = found[0][1]
+        prefix, stream_steps = streams[found[0][0]]
+        last = stream_steps[length - 1]
+        recomputed = _expensive(stream_steps[:length])
+        others = ", ".join(
+            streams[s][0].rstrip(" >") or "main pipeline" for s, _ in found[1:]
+        )
+        entry = {
+            "location": f"{prefix}step {length} ({get_command(last)})",
+            "impact": impact_class(recomputed, len(found) - 1),
+            "recomputed": recomputed,
+            "runs": len(found),
+            "reason": (
+                f"the same stream is computed {len(found)} times "
+                f"(also in {others}), running {', '.join(recomputed)} each time"
+            ),
+        }
+        _suggest(last, entry, advice)
+
+
+def advise_materialize(steps: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Find places where a pipeline streams expensive steps more than once,
+    because a tee has several consumers or identical streams are repeated
+    in nested inputs, and inserting a materialize step would avoid the
+    recomputation.
+    Returns a copy of the steps with a "materialize" annotation on the steps
+    to materialize after, and a list of suggestions with their location,
+    estimated impact class, recomputed commands and reason
+    """
+    annotated = copy_steps(steps)
+    display_steps = annotated
+    if annotated and is_pipeline_header(annotated[0]):
+        display_steps = annotated[1:]
+
+    advice: List[Dict] = []
+    _advise_fan_out(display_steps, advice)
+    _advise_shared_streams(display_steps, advice)
+    return annotated, advice
+
+
+def format_advice(advice: List[Dict]) -> str:
+    """
+    Format materialize suggestions as a text report, most severe first
+    """
+    if not advice:
+        return "No materialize suggestions"
+    ordered = sorted(advice, key=lambda a: -IMPACT_CLASSES.index(a["impact"]))
+    lines = [
+        f"[{a['impact']}] materialize after {a['location']}: {a['reason']}"
+        for a in ordered
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,227 @@
+import logging
+import re
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+from gdalgviz.main import (
+    SVG_FORMATS,
+    detect_pipeline_type,
+    get_output_format,
+    render_steps,
+    workflow_diagram,
+)
+from gdalgviz._pipeline_parser import LarkError
+from gdalgviz.gallery import GalleryEntry, gallery_entry, write_gallery
+from gdalgviz.interactive import add_interactivity
+from gdalgviz.manifest import manifest_entry, update_manifest
+from gdalgviz.mermaid import MERMAID_FORMATS, mermaid_output
+from gdalgviz.parser import parse_pipeline
+from gdalgviz.postprocess import encode_svg, write_if_changed
+from gdalgviz.render import RenderLimitError, render_source
+
+logger = logging.getLogger(__name__)
+
+# number of diagrams laid out by each dot process
+DEFAULT_CHUNK_SIZE = 50
+
+# errors rendering a diagram that only fail the diagram itself. A missing
+# layout engine (ExecutableNotFound) fails every diagram, so stops the batch
+RENDER_ERRORS = (
+    RenderLimitError,
+    subprocess.CalledProcessError,
+    subprocess.TimeoutExpired,
+)
+
+# each graph in a multi-graph dot run produces a complete SVG document
+_SVG_END_RE = re.compile(rb"(?<=</svg>)\s*")
+
+
+def _split_svgs(output: bytes) -> List[bytes]:
+    """
+    Split the output of a multi-graph dot run into one SVG per graph.
+    Labels are HTML-escaped, so a closing svg tag can only end a document
+    """
+    return [svg for svg in _SVG_END_RE.split(output) if svg.strip()]
+
+
+def _chunk_limits(limits: Dict[str, Any], size: int) -> Dict[str, Any]:
+    """
+    Scale the time limits of a single diagram to a dot run laying out size
+    graphs. Graphs are laid out one after another, so the memory limit of a
+    single graph still applies
+    """
+    scaled = dict(limits)
+    for name in ("timeout", "max_cpu_time"):
+        if limits.get(name) is not None:
+            scaled[name] = limits[name] * size
+    return scaled
+
+
+def _render_chunk(
+    jobs: List[Tuple[str, List[Dict], str]],
+    limits: Dict[str, Any],
+    engine: str,
+) -> List[Tuple[str, List[Dict], Optional[bytes]]]:
+    """
+    Render a chunk of (output_fn, steps, source) jobs in a single dot run,
+    with the time limits of a single diagram scaled to the size of the chunk.
+    If the run fails the chunk is split in half and each half retried, so a
+    failing graph only affects itself. Returns None for graphs that need to
+    be rendered on their own.
+    """
+    if len(jobs) == 1:
+        return [(jobs[0][0], jobs[0][1], None)]
+
+    source = "\n".join(job_source for _, _, job_source in jobs)
+    try:
+        svgs = _split_svgs(
+            render_source(
+                source, "svg", engine=engine, **_chunk_limits(limits, len(jobs))
+            )
+        )
+    except RENDER_ERRORS as e:
+        logger.debug("chunk of %d graphs failed: %s", len(jobs), e)
+        svgs = []
+
+    if len(svgs) == len(jobs):
+        return [(fn, steps, svg) for (fn, steps, _), svg in zip(jobs, svgs)]
+
+    middle = len(jobs) // 2
+    return _render_chunk(jobs[:middle], limits, engine) + _render_chunk(
+        jobs[middle:], limits, engine
+    )
+
+
+def _write_output(data: bytes, output_fn: str, skip_unchanged: bool) -> None:
+    if skip_unchanged:
+        write_if_changed(data, output_fn)
+    else:
+        Path(output_fn).write_bytes(data)
+
+
+def render_batch(
+    jobs: List[Tuple[str, str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    minify: bool = False,
+    engine: str = "dot",
+    timeout: Optional[float] = None,
+    max_memory: Optional[int] = None,
+    max_cpu_time: Optional[int] = None,
+    skip_unchanged: bool = True,
+    manifest: Optional[str] = None,
+    gallery: Optional[str] = None,
+    gallery_inline: bool = False,
+    **diagram_options: Any,
+) -> Dict[str, str]:
+    """
+    Render many (pipeline, output_fn) jobs to SVG or SVGZ, laying out
+    chunk_size diagrams per dot process instead of starting one per diagram.
+    Other keyword arguments are passed to workflow_diagram, and interactive
+    SVG diagrams get the script of add_interactivity.
+    timeout, max_memory and max_cpu_time are the limits of each diagram.
+    Jobs with a .mmd or .md output are written as Mermaid flowcharts without
+    running dot, see mermaid_output, and are not added to the gallery.
+
+    A pipeline that fails to parse or render does not stop the rest of its
+    chunk. Graphs that hit the render limits are re-rendered on their own
+    with a simplified layout. Files with identical content are not rewritten
+    unless skip_unchanged is False, and rendered diagrams are recorded in the
+    manifest file if one is given. If gallery is given, an HTML page showing
+    every rendered diagram is written to it, with the SVGs embedded in the
+    page if gallery_inline is True (SVGZ files are always embedded).
+    Returns a dict of output_fn to error message for the diagrams that could
+    not be rendered. ExecutableNotFound is raised if the layout engine is
+    not installed.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    limits: Dict[str, Any] = dict(
+        timeout=timeout, max_memory=max_memory, max_cpu_time=max_cpu_time
+    )
+    # recorded in the manifest, as they change the output as much as the pipeline
+    render_options = dict(diagram_options, minify=minify, engine=engine)
+    interactive = diagram_options.get("interactive", False)
+    errors: Dict[str, str] = {}
+    entries: Dict[str, Dict[str, str]] = {}
+    gallery_entries: List[GalleryEntry] = []
+    pipelines = {}
+    prepared = []
+
+    for pipeline, output_fn in jobs:
+        try:
+            output_format = get_output_format(output_fn, SVG_FORMATS + MERMAID_FORMATS)
+            steps = parse_pipeline(pipeline)
+            if output_format in MERMAID_FORMATS and interactive:
+                raise ValueError(
+                    "Interactive output is only supported for SVG output, "
+                    f"not '{output_format}'"
+                )
+            if output_format in MERMAID_FORMATS:
+                # laid out by the viewer, so written without running dot
+                data = mermaid_output(steps, output_format, **diagram_options)
+            else:
+                diagram = workflow_diagram(
+                    steps, "svg", detect_pipeline_type(steps), **diagram_options
+                )
+        except (LarkError, ValueError) as e:
+            # e.g. invalid output extension or pipeline syntax
+            errors[output_fn] = str(e)
+            continue
+        if output_format in MERMAID_FORMATS:
+            _write_output(data, output_fn, skip_unchanged)
+            if manifest is not None:
+                entries[output_fn] = manifest_entry(data, pipeline, diagram_options)
+            continue
+        pipelines[output_fn] = pipeline
+        prepared.append((output_fn, steps, diagram.source))
+
+    for i in range(0, len(prepared), chunk_size):
+        chunk = prepared[i : i + chunk_size]
+        for output_fn, steps, svg in _render_chunk(chunk, limits, engine):
+            if svg is None:
+                # on its own the graph can fall back to a simplified layout
+                try:
+                    svg = render_steps(
+                        steps,
+                        "svg",
+                        output_fn,
+                        engine=engine,
+                        **limits,
+                        **diagram_options,
+                    )
+                except RENDER_ERRORS as e:
+                    errors[output_fn] = str(e)
+                    continue
+            if interactive:
+                svg = add_interactivity(svg)
+            data = encode_svg(svg, output_fn, minify=minify)
+            _write_output(data, output_fn, skip_unchanged)
+            if manifest is not None:
+                entries[output_fn] = manifest_entry(
+                    data, pipelines[output_fn], render_options
+                )
+            if gallery is not None:
+                # browsers only show compressed files served with an encoding
+                inline = gallery_inline or Path(output_fn).suffix.lower() == ".svgz"
+                gallery_entries.append(
+                    gallery_entry(
+                        output_fn,
+                        steps,
+                        gallery,
+                        encode_svg(svg, "inline.svg", minify) if inline else None,
+                    )
+                )
+
+    if manifest is not None and entries:
+        update_manifest(manifest, entries)
+
+    if gallery is not None:
+        write_gallery(gallery_entries, gallery, skip_unchanged=skip_unchanged)
+
+    for output_fn, message in errors.items():
+        logger.warning("%s: failed - %s", output_fn, message)
+
+    return errors
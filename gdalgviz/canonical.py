@@ -0,0 +1,166 @@
+import json
+import re
+from typing import Any, Dict, Iterator, List, Union
+
+from gdalgviz.parser import get_nested_pipelines, is_pipeline_header, parse_pipeline
+
+# keywords of a pipeline header, e.g. gdal raster pipeline
+HEADER_KEYWORDS = ("raster", "vector", "pipeline")
+
+# values that can be written without quotes, matching BARE_VALUE in pipeline.lark
+_BARE_VALUE_RE = re.compile(r"(?!-)(?![=\[\]!\s\"'])[^\[\]!\s\"']+")
+# values that can be written in double or single quotes, matching QUOTED_STRING
+_DOUBLE_QUOTED_RE = re.compile(r'(?:[^"\\]|\\.)*')
+_SINGLE_QUOTED_RE = re.compile(r"(?:[^'\\]|\\.)*")
+
+GDALG_TYPE = "gdal_streamed_alg"
+
+
+def _canonical_args(args: List[Dict]) -> List[Dict]:
+    """
+    Positional arguments first, in their original order, then flags
+    ordered by name. Repeated flags keep their relative order
+    """
+    positionals = [
+        {"type": "positional", "value": str(arg["value"])}
+        for arg in args
+        if arg["type"] == "positional"
+    ]
+    flags = [
+        {
+            "type": arg["type"],
+            "flag": arg["flag"].lstrip("-"),
+            "value": None if arg.get("value") is None else str(arg["value"]),
+        }
+        for arg in args
+        if arg["type"] != "positional"
+    ]
+    return positionals + sorted(flags, key=lambda arg: arg["flag"])
+
+
+def canonical_steps(steps: Union[List[Dict], Dict]) -> List[Dict]:
+    """
+    Return the normal form of parsed steps, so equivalent pipelines have
+    equal steps however they were written:
+
+    - a "gdal pipeline" header is added if missing, with lowercase keywords
+    - positional arguments come first, then flags ordered by name
+      (GDAL does not depend on the order of named arguments)
+    - nested blocks and single-step pipelines have the shape produced by
+      parse_pipeline, and empty nested pipelines are dropped
+    - other keys added by annotations (e.g. "hash" or "cost") are removed
+
+    The input is not modified
+    """
+    if isinstance(steps, dict):
+        # a pipeline of a single step without a header is parsed to a dict
+        steps = [steps]
+    canonical: List[Dict] = [{} for _ in steps]
+    # (step, its canonical copy) still to fill in, in any order as each
+    # copy is created when its parent is, so nesting depth is unlimited
+    work = list(zip(steps, canonical))
+    while work:
+        step, target = work.pop()
+        target["command"] = step["command"]
+        target["args"] = _canonical_args(step.get("args", []))
+        blocks = []
+        for nested_steps in get_nested_pipelines(step):
+            if not nested_steps:
+                continue
+            nested_copies: List[Dict] = [{} for _ in nested_steps]
+            work.extend(zip(nested_steps, nested_copies))
+            pipeline = nested_copies if len(nested_copies) > 1 else nested_copies[0]
+            blocks.append({"type": "nested", "pipeline": pipeline})
+        if blocks:
+            target["nested"] = blocks if len(blocks) > 1 else blocks[0]
+
+    if canonical and is_pipeline_header(canonical[0]):
+        header = canonical[0]
+        header["command"] = "gdal"
+        for arg in header["args"]:
+            if arg["type"] == "positional" and arg["value"].lower() in HEADER_KEYWORDS:
+                arg["value"] = arg["value"].lower()
+    else:
+        header = {
+            "command": "gdal",
+            "args": [{"type": "positional", "value": "pipeline"}],
+        }
+        canonical.insert(0, header)
+    return canonical
+
+
+def quote_value(value: str) -> str:
+    """
+    Write a value so it is parsed back unchanged, quoting it only if needed.
+    Raises ValueError for values no quoting can represent, which are never
+    produced by parse_pipeline
+    """
+    if _BARE_VALUE_RE.fullmatch(value):
+        return value
+    if _DOUBLE_QUOTED_RE.fullmatch(value):
+        return f'"{value}"'
+    if _SINGLE_QUOTED_RE.fullmatch(value):
+        return f"'{value}'"
+    raise ValueError(f"Value cannot be written in a pipeline: {value!r}")
+
+
+def _arg_text(arg: Dict) -> str:
+    if arg["type"] == "positional":
+        return quote_value(arg["value"])
+    # e.g. write --overwrite o.tif is parsed as --overwrite with the value
+    # o.tif, so --flag=value would not run if the flag is a boolean
+    prefix = "-" if arg["type"] == "short_arg" else "--"
+    if arg["value"] is None:
+        return f"{prefix}{arg['flag']}"
+    return f"{prefix}{arg['flag']} {quote_value(arg['value'])}"
+
+
+def serialize_pipeline(steps: List[Dict]) -> str:
+    """
+    Write steps as a pipeline command line, e.g.
+    gdal raster pipeline ! read in.tif ! blend --overlay [ read b.tif ] ! write out.tif
+    Flags are written as --flag value, values are only quoted when
+    needed, and nested pipelines follow the arguments of their step.
+    For canonical steps parse_pipeline(serialize_pipeline(steps)) == steps
+    """
+    parts: List[str] = []
+    # iterators over the steps of each pipeline being written, with whether a
+    # step of it was written yet, and brackets to write between them
+    stack: List[Union[str, List[Any]]] = [[iter(steps), False]]
+    while stack:
+        top = stack[-1]
+        if isinstance(top, str):
+            parts.append(top)
+            stack.pop()
+            continue
+        remaining: Iterator[Dict] = top[0]
+        step = next(remaining, None)
+        if step is None:
+            stack.pop()
+            continue
+        if top[1]:
+            parts.append("!")
+        top[1] = True
+        parts.append(step["command"])
+        parts.extend(_arg_text(arg) for arg in step.get("args", []))
+        for nested_steps in reversed(get_nested_pipelines(step)):
+            stack.extend(["]", [iter(nested_steps), False], "["])
+    return " ".join(parts)
+
+
+def canonical_pipeline(pipeline: Union[str, List[Dict], Dict]) -> str:
+    """
+    Return the canonical command line of a pipeline string or parsed steps,
+    the same for every equivalent way of writing the pipeline, e.g. for
+    keying caches
+    """
+    steps = parse_pipeline(pipeline) if isinstance(pipeline, str) else pipeline
+    return serialize_pipeline(canonical_steps(steps))
+
+
+def to_gdalg(pipeline: Union[str, List[Dict], Dict]) -> str:
+    """
+    Return the canonical GDALG JSON of a pipeline string or parsed steps
+    """
+    gdalg = {"type": GDALG_TYPE, "command_line": canonical_pipeline(pipeline)}
+    return json.dumps(gdalg, indent=4) + "\n"
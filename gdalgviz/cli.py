@@ -1,12 +1,30 @@
 import argparse
+import logging
 import re
 import sys
-import json
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from gdalgviz import __version__
-from gdalgviz.main import generate_diagram, DOCS_ROOT
+from gdalgviz.advisor import advise_materialize, format_advice
+from gdalgviz.cost import load_cost_overrides
+from gdalgviz.batch import DEFAULT_CHUNK_SIZE, render_batch
+from gdalgviz.lineage import generate_lineage_diagram
+from gdalgviz.main import generate_diagram, generate_diff_diagram, DOCS_ROOT
+from gdalgviz.merge import format_merged, merge_subpipelines
+from gdalgviz.mermaid import MERMAID_FORMATS, generate_mermaid
+from gdalgviz.parser import parse_file, parse_pipeline
+from gdalgviz.render import BACKENDS, RenderLimitError
+from gdalgviz.resolve import DEFAULT_MAX_DEPTH, resolve_references
+from gdalgviz.stats import (
+    DEFAULT_STATS_CHUNK_SIZE,
+    DEFAULT_TOP,
+    STATS_FORMATS,
+    catalog_stats,
+    format_stats,
+)
+from gdalgviz.timings import HEATMAP_METRICS, apply_timings, load_timings
+from gdalgviz.validate import format_issues, validate_pipeline
 
 
 def validate_color(color: str) -> str:
@@ -32,21 +50,372 @@ def parse_kv(value: str) -> dict:
     return result
 
 
-def parse_file(fn: str) -> str:
+def add_label_arguments(parser: argparse.ArgumentParser) -> None:
     """
-    Open a file and return its pipeline command.
-    If the file is JSON (.json or .JSON), then the JSON is parsed data['command_line'] is returned.
-    Otherwise, the raw text content is returned.
+    Add the options limiting the size of node labels
     """
-    file_path = Path(fn)
+    parser.add_argument(
+        "--max-arg-length",
+        type=int,
+        default=None,
+        metavar="CHARS",
+        help="Elide arguments longer than this, showing them in full in the node tooltip",
+    )
+    parser.add_argument(
+        "--max-label-length",
+        type=int,
+        default=None,
+        metavar="CHARS",
+        help="Elide arguments once a node's arguments exceed this many characters in total",
+    )
+    parser.add_argument(
+        "--wrap-width",
+        type=int,
+        default=None,
+        metavar="CHARS",
+        help="Wrap arguments longer than this onto several lines",
+    )
+
+
+def add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options controlling how output files are written
+    """
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        default=False,
+        help="Always write output files, even if an existing file is identical "
+        "(by default identical files are not rewritten)",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        metavar="PATH",
+        help="JSON file recording the content hash, input hash and gdalgviz version of each output",
+    )
+
+
+def diff_main(argv: list[str]) -> int:
+    """
+    Entry point for gdalgviz diff, comparing two pipelines.
+    Returns an exit code: 0 = success, non-zero = error.
+    """
+    parser = argparse.ArgumentParser(
+        prog="gdalgviz diff",
+        description="Compare two GDALG pipelines and highlight changed, added and removed steps",
+    )
+    parser.add_argument("old_path", help="Path to the original GDALG pipeline")
+    parser.add_argument("new_path", help="Path to the changed GDALG pipeline")
+    parser.add_argument(
+        "output_path", help="Path to save the generated diagram (e.g., diff.svg)"
+    )
+    parser.add_argument(
+        "--vertical",
+        action="store_true",
+        default=False,
+        help="Render the diagram top-to-bottom instead of left-to-right",
+    )
+    parser.add_argument(
+        "--font",
+        default="Helvetica",
+        help="Font name for diagram nodes (default: Helvetica)",
+    )
+    parser.add_argument(
+        "--docs-root",
+        default=None,
+        help=("Root URL for GDAL documentation links" f"(default: {DOCS_ROOT})"),
+    )
+
+    args = parser.parse_args(argv)
+
+    for fn in (args.old_path, args.new_path):
+        if not Path(fn).exists():
+            print(f"Error: File '{fn}' does not exist.", file=sys.stderr)
+            return 1
+
+    summary = generate_diff_diagram(
+        parse_file(args.old_path),
+        parse_file(args.new_path),
+        args.output_path,
+        vertical=args.vertical,
+        fontname=args.font,
+        docs_root=args.docs_root or DOCS_ROOT,
+    )
+    print(", ".join(f"{count} {status}" for status, count in summary.items()))
+    return 0
+
+
+def lineage_main(argv: list[str]) -> int:
+    """
+    Entry point for gdalgviz lineage, showing how datasets flow between
+    the pipelines of a catalog.
+    Returns an exit code: 0 = success, non-zero = error.
+    """
+    parser = argparse.ArgumentParser(
+        prog="gdalgviz lineage",
+        description="Show the datasets written and read by a catalog of GDALG pipelines",
+    )
+    parser.add_argument(
+        "input_paths",
+        nargs="+",
+        help="GDALG pipelines, or folders searched for *.gdalg.json files",
+    )
+    parser.add_argument(
+        "output_path", help="Path to save the generated diagram (e.g., lineage.svg)"
+    )
+    parser.add_argument(
+        "--index",
+        default=None,
+        metavar="PATH",
+        help="JSON file to keep the lineage index in, so only changed pipelines are parsed again",
+    )
+    parser.add_argument(
+        "--dataset",
+        default=None,
+        metavar="PATH",
+        help="Only show the pipelines upstream and downstream of this dataset",
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of pipelines to follow in each direction from --dataset",
+    )
+    parser.add_argument(
+        "--vertical",
+        action="store_true",
+        default=False,
+        help="Render the diagram top-to-bottom instead of left-to-right",
+    )
+    parser.add_argument(
+        "--font",
+        default="Helvetica",
+        help="Font name for diagram nodes (default: Helvetica)",
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    for input_fn in args.input_paths:
+        if not Path(input_fn).exists():
+            print(f"Error: File '{input_fn}' does not exist.", file=sys.stderr)
+            return 1
+
+    index = generate_lineage_diagram(
+        args.input_paths,
+        args.output_path,
+        index_fn=args.index,
+        dataset=args.dataset,
+        depth=args.depth,
+        vertical=args.vertical,
+        fontname=args.font,
+    )
+    print(f"Indexed {len(index['pipelines'])} pipelines")
+    return 0
+
 
-    if file_path.suffix.lower() == ".json":
-        with file_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data.get("command_line")
+def batch_output_path(input_fn: str, output_dir: str, output_format: str) -> str:
+    """
+    Get the output path for a batch input, e.g. pipelines/tee.json -> out/tee.svg
+    """
+    name = Path(input_fn).name
+    for suffix in (".json", ".txt", ".gdalg"):
+        if name.lower().endswith(suffix):
+            name = name[: -len(suffix)]
+    return str(Path(output_dir) / f"{name}.{output_format}")
+
+
+def batch_main(argv: list[str]) -> int:
+    """
+    Entry point for gdalgviz batch, rendering many pipelines at once.
+    Returns an exit code: 0 = success, non-zero = one or more diagrams failed.
+    """
+    parser = argparse.ArgumentParser(
+        prog="gdalgviz batch",
+        description="Render many GDALG pipelines, laying out several diagrams per Graphviz process",
+    )
+    parser.add_argument(
+        "input_paths",
+        nargs="+",
+        help="Paths to GDALG pipelines in JSON or text format",
+    )
+    parser.add_argument(
+        "--output-dir",
+        required=True,
+        help="Folder to save the generated diagrams in",
+    )
+    parser.add_argument(
+        "--format",
+        default="svg",
+        choices=["svg", "svgz"] + MERMAID_FORMATS,
+        help="Output format, mmd and md write Mermaid flowcharts without Graphviz "
+        "(default: svg)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Number of diagrams laid out by each Graphviz process (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        default=False,
+        help="Minify SVG output",
+    )
+    parser.add_argument(
+        "--vertical",
+        action="store_true",
+        default=False,
+        help="Render the diagrams top-to-bottom instead of left-to-right",
+    )
+    parser.add_argument(
+        "--font",
+        default="Helvetica",
+        help="Font name for diagram nodes (default: Helvetica)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Wall-clock time limit for the layout of each diagram",
+    )
+    parser.add_argument(
+        "--gallery",
+        default=None,
+        metavar="PATH",
+        help="Also write an HTML page for browsing and searching the diagrams",
+    )
+    parser.add_argument(
+        "--gallery-inline",
+        action="store_true",
+        default=False,
+        help="Embed the diagrams in the gallery page instead of linking to the files",
+    )
+    add_label_arguments(parser)
+    add_output_arguments(parser)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.gallery and args.format in MERMAID_FORMATS:
+        parser.error("--gallery requires SVG or SVGZ output")
+
+    for input_fn in args.input_paths:
+        if not Path(input_fn).exists():
+            print(f"Error: File '{input_fn}' does not exist.", file=sys.stderr)
+            return 1
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    jobs = []
+    for input_fn in args.input_paths:
+        output_fn = batch_output_path(input_fn, args.output_dir, args.format)
+        jobs.append((parse_file(input_fn), output_fn))
+
+    errors = render_batch(
+        jobs,
+        chunk_size=args.chunk_size,
+        minify=args.minify,
+        timeout=args.timeout,
+        vertical=args.vertical,
+        fontname=args.font,
+        max_arg_length=args.max_arg_length,
+        max_label_length=args.max_label_length,
+        wrap_width=args.wrap_width,
+        skip_unchanged=not args.force,
+        manifest=args.manifest,
+        gallery=args.gallery,
+        gallery_inline=args.gallery_inline,
+    )
+    print(f"Rendered {len(jobs) - len(errors)} diagrams, {len(errors)} failed")
+    return 1 if errors else 0
+
+
+def stats_main(argv: list[str]) -> int:
+    """
+    Entry point for gdalgviz stats, counting the commands and flags used by
+    a catalog of pipelines.
+    Returns an exit code: 0 = success, non-zero = error.
+    """
+    parser = argparse.ArgumentParser(
+        prog="gdalgviz stats",
+        description="Count the commands and flags used by a catalog of GDALG pipelines, "
+        "and list its longest, deepest and most input-heavy pipelines",
+    )
+    parser.add_argument(
+        "input_paths",
+        nargs="+",
+        help="GDALG pipelines, or folders searched for *.gdalg.json files",
+    )
+    parser.add_argument(
+        "--format",
+        default="json",
+        choices=STATS_FORMATS,
+        help="Output format (default: json)",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        metavar="PATH",
+        help="File to write the statistics to (default: standard output)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP,
+        metavar="N",
+        help=f"Number of pipelines listed in each ranking (default: {DEFAULT_TOP})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of processes parsing pipelines (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_STATS_CHUNK_SIZE,
+        help=f"Number of files parsed by a process at a time (default: {DEFAULT_STATS_CHUNK_SIZE})",
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    for input_fn in args.input_paths:
+        if not Path(input_fn).exists():
+            print(f"Error: File '{input_fn}' does not exist.", file=sys.stderr)
+            return 1
+
+    stats = catalog_stats(
+        args.input_paths,
+        workers=args.workers,
+        top=args.top,
+        chunk_size=args.chunk_size,
+    )
+    text = format_stats(stats, args.format)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
     else:
-        with file_path.open("r", encoding="utf-8") as f:
-            return f.read()
+        sys.stdout.write(text)
+    print(
+        f"Counted {stats['pipelines']} pipelines, {stats['failed']} failed",
+        file=sys.stderr,
+    )
+    return 0
+
+
+# subcommands, e.g. gdalgviz diff old.json new.json diff.svg
+SUBCOMMANDS = {
+    "diff": diff_main,
+    "batch": batch_main,
+    "lineage": lineage_main,
+    "stats": stats_main,
+}
 
 
 def main(argv: Optional[list[str]] = None) -> int:
@@ -54,9 +423,19 @@ def main(argv: Optional[list[str]] = None) -> int:
     CLI entry point for gdalgviz.
     Returns an exit code: 0 = success, non-zero = error.
     """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
     parser = argparse.ArgumentParser(
         prog="gdalgviz",
         description="Visualize GDAL datasets from the command line",
+        epilog=(
+            "Use 'gdalgviz diff OLD NEW OUTPUT' to compare two pipelines, "
+            "'gdalgviz batch INPUT... --output-dir DIR' to render many, "
+            "'gdalgviz lineage INPUT... OUTPUT' to show how they are connected, "
+            "or 'gdalgviz stats INPUT...' to count the commands they use"
+        ),
     )
 
     parser.add_argument(
@@ -67,7 +446,8 @@ def main(argv: Optional[list[str]] = None) -> int:
 
     parser.add_argument(
         "output_path",
-        help="Path to save the generated diagram (e.g., output.svg)",
+        help="Path to save the generated diagram (e.g., output.svg, or output.mmd "
+        "for a Mermaid flowchart)",
     )
 
     parser.add_argument(
@@ -120,7 +500,120 @@ def main(argv: Optional[list[str]] = None) -> int:
         help="Graphviz node attributes e.g. --node-attr fontsize=12,fontname=Courier",
     )
 
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        default=False,
+        help="Minify SVG output (use a .svgz output path to also gzip compress it)",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Wall-clock time limit for the Graphviz layout",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        default=None,
+        metavar="MB",
+        help="Memory limit for the Graphviz layout process (POSIX only)",
+    )
+    parser.add_argument(
+        "--max-cpu-time",
+        type=int,
+        default=None,
+        metavar="SECONDS",
+        help="CPU time limit for the Graphviz layout process (POSIX only)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="subprocess",
+        help="Run Graphviz as a subprocess or in-process with pygraphviz "
+        "(requires the inprocess extra)",
+    )
+    add_label_arguments(parser)
+    add_output_arguments(parser)
+    parser.add_argument(
+        "--advise",
+        action="store_true",
+        default=False,
+        help="Report and annotate where a materialize step would avoid recomputing "
+        "expensive steps. Exits with code 1 if there are any suggestions",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        default=False,
+        help="Check steps and arguments against the bundled usage of GDAL, and "
+        "highlight any issues. Exits with code 1 if there are any issues",
+    )
+    parser.add_argument(
+        "--costs",
+        action="store_true",
+        default=False,
+        help="Badge nodes with their estimated cost and highlight the most expensive path",
+    )
+    parser.add_argument(
+        "--cost-file",
+        default=None,
+        metavar="PATH",
+        help="JSON file overriding the estimated cost of commands (implies --costs)",
+    )
+    parser.add_argument(
+        "--timings",
+        default=None,
+        metavar="PATH",
+        help="JSON file of measured step times and peak memory, "
+        "shown as a heatmap on the diagram",
+    )
+    parser.add_argument(
+        "--heatmap",
+        choices=HEATMAP_METRICS,
+        default="time",
+        help="Measurement used to colour nodes when --timings is given",
+    )
+    parser.add_argument(
+        "--resolve",
+        action="store_true",
+        default=False,
+        help="Expand reads of other .gdalg.json files into nested pipelines",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=DEFAULT_MAX_DEPTH,
+        metavar="N",
+        help=f"Levels of referenced files expanded by --resolve (default: {DEFAULT_MAX_DEPTH})",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        default=False,
+        help="Draw repeated identical nested pipelines once, and report the nodes "
+        "and reads they repeat",
+    )
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        default=False,
+        help="Embed a script in SVG output to collapse and expand nested pipelines "
+        "by clicking, and to zoom and pan",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Split pipelines of more than N steps into linked diagrams, "
+        "written to OUTPUT_PATH with the page number added, e.g. out-1.svg",
+    )
+
     args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     # validate that input_path exists if not using --pipeline
     if not args.pipeline and not Path(args.input_path).exists():
@@ -133,6 +626,19 @@ def main(argv: Optional[list[str]] = None) -> int:
     except argparse.ArgumentTypeError as e:
         parser.error(str(e))
 
+    cost_overrides = None
+    if args.cost_file:
+        try:
+            cost_overrides = load_cost_overrides(args.cost_file)
+        except (OSError, ValueError) as e:
+            parser.error(f"Invalid cost file: {e}")
+
+    if args.page_size is not None:
+        if args.page_size < 1:
+            parser.error("--page-size must be at least 1")
+        if Path(args.output_path).suffix.lower().lstrip(".") in MERMAID_FORMATS:
+            parser.error("--page-size is not supported for Mermaid output")
+
     # get the pipeline text
     if args.pipeline:
         pipeline = args.pipeline
@@ -143,17 +649,106 @@ def main(argv: Optional[list[str]] = None) -> int:
         parser.print_help()
         return 1
 
-    exit_code = generate_diagram(
-        pipeline=pipeline,
-        output_fn=args.output_path,
-        vertical=args.vertical,
-        fontname=args.font,
-        header_color=args.header_color,
-        docs_root=args.docs_root or DOCS_ROOT,
-        graph_attr=graph_attr,
-        node_attr=node_attr,
-    )
+    source_fn = None if args.pipeline else args.input_path
+    steps: list[dict] = []
+    drawn: Union[str, list[dict]] = pipeline
+    resolve = args.resolve
+    if args.timings or args.advise or args.validate or args.merge:
+        # checks and reports use the steps that are drawn, so the pipeline is
+        # parsed and resolved once here and the steps passed down
+        steps = parse_pipeline(pipeline)
+        if args.resolve:
+            steps = resolve_references(steps, source_fn, args.max_depth)
+        drawn, resolve = steps, False
+
+    timings = None
+    if args.timings:
+        try:
+            timings = load_timings(args.timings)
+            # check the timings match the steps before rendering
+            apply_timings(steps, timings)
+        except (OSError, ValueError) as e:
+            parser.error(f"Invalid timings file: {e}")
 
+    advice: list[dict] = []
+    if args.advise:
+        _, advice = advise_materialize(steps)
+        print(format_advice(advice))
+
+    issues: list[dict] = []
+    if args.validate:
+        _, issues = validate_pipeline(steps)
+        print(format_issues(issues))
+
+    if args.merge:
+        _, merged = merge_subpipelines(steps)
+        print(format_merged(merged))
+
+    if Path(args.output_path).suffix.lower().lstrip(".") in MERMAID_FORMATS:
+        # laid out by the viewer, so only the options of the flowchart apply
+        generate_mermaid(
+            pipeline=drawn,
+            output_fn=args.output_path,
+            vertical=args.vertical,
+            fontname=args.font,
+            header_color=args.header_color,
+            docs_root=args.docs_root or DOCS_ROOT,
+            max_arg_length=args.max_arg_length,
+            max_label_length=args.max_label_length,
+            wrap_width=args.wrap_width,
+            skip_unchanged=not args.force,
+            manifest=args.manifest,
+            resolve=resolve,
+            source_fn=source_fn,
+            max_depth=args.max_depth,
+            merge=args.merge,
+        )
+        return 1 if advice or issues else 0
+
+    try:
+        exit_code = generate_diagram(
+            pipeline=drawn,
+            output_fn=args.output_path,
+            vertical=args.vertical,
+            fontname=args.font,
+            header_color=args.header_color,
+            docs_root=args.docs_root or DOCS_ROOT,
+            graph_attr=graph_attr,
+            node_attr=node_attr,
+            minify=args.minify,
+            timeout=args.timeout,
+            max_memory=args.max_memory,
+            max_cpu_time=args.max_cpu_time,
+            backend=args.backend,
+            max_arg_length=args.max_arg_length,
+            max_label_length=args.max_label_length,
+            wrap_width=args.wrap_width,
+            skip_unchanged=not args.force,
+            manifest=args.manifest,
+            advise=args.advise,
+            show_costs=args.costs or cost_overrides is not None,
+            cost_overrides=cost_overrides,
+            timings=timings,
+            heatmap=args.heatmap,
+            resolve=resolve,
+            source_fn=source_fn,
+            max_depth=args.max_depth,
+            merge=args.merge,
+            interactive=args.interactive,
+            page_size=args.page_size,
+            validate=args.validate,
+        )
+    except RenderLimitError as e:
+        # the simplified diagram rendered after a first failure also hit a limit
+        print(
+            f"Error: {e}, even with a simplified layout. "
+            "Increase --timeout, --max-memory or --max-cpu-time.",
+            file=sys.stderr,
+        )
+        return 1
+
+    if advice or issues:
+        return 1
     return exit_code
 
 
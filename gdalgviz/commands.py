@@ -1,3 +1,5 @@
+from typing import Optional
+
 # Raster commands
 RASTER_COMMANDS = {
     "raster": "Entry point for raster commands",
@@ -127,3 +129,127 @@ COMMANDS.update(MDIM_COMMANDS)
 COMMANDS.update(DATASET_COMMANDS)
 COMMANDS.update(VSI_COMMANDS)
 COMMANDS.update(DRIVER_COMMANDS)
+
+# command families, in the order a command is looked up in them
+COMMAND_FAMILIES = {
+    "raster": RASTER_COMMANDS,
+    "vector": VECTOR_COMMANDS,
+    "mdim": MDIM_COMMANDS,
+    "dataset": DATASET_COMMANDS,
+    "vsi": VSI_COMMANDS,
+    "driver": DRIVER_COMMANDS,
+}
+# family of commands not listed in any family, such as tee in an untyped pipeline
+OTHER_FAMILY = "other"
+
+
+def command_family(command: str, pipeline_type: Optional[str] = None) -> str:
+    """
+    Get the family of a pipeline step, e.g. "raster". Steps of a raster or
+    vector pipeline belong to its family, as for their docs pages, and
+    other steps to the first family listing the command
+    """
+    if pipeline_type is not None and pipeline_type in COMMAND_FAMILIES:
+        return pipeline_type
+    for family, commands in COMMAND_FAMILIES.items():
+        if command in commands:
+            return family
+    return OTHER_FAMILY
+
+
+# Cost classes of pipeline steps, used to estimate where time goes
+IO_BOUND = "io"
+CPU_BOUND = "cpu"
+STREAMING = "streaming"
+BLOCKING = "blocking"
+
+
+def _cost(
+    bound: str, mode: str = STREAMING, memory_heavy: bool = False, weight: float = 1
+) -> dict:
+    return {
+        "bound": bound,
+        "mode": mode,
+        "memory_heavy": memory_heavy,
+        "weight": weight,
+    }
+
+
+# Relative cost of each pipeline step. "bound" is the resource limiting it, "mode"
+# whether it streams blocks or needs the whole dataset before producing output,
+# and "weight" its relative cost, from 1 (metadata change) to 10
+COMMAND_COSTS = {
+    # sources, sinks and operators
+    "read": _cost(IO_BOUND, weight=2),
+    "write": _cost(IO_BOUND, weight=3),
+    "tee": _cost(IO_BOUND, weight=1),
+    "materialize": _cost(IO_BOUND, BLOCKING, weight=3),
+    # raster
+    "as-features": _cost(CPU_BOUND, weight=4),
+    "aspect": _cost(CPU_BOUND, weight=3),
+    "blend": _cost(CPU_BOUND, weight=2),
+    "calc": _cost(CPU_BOUND, weight=3),
+    "clean-collar": _cost(CPU_BOUND, BLOCKING, weight=4),
+    "clip": _cost(IO_BOUND, weight=1),
+    "color-map": _cost(CPU_BOUND, weight=2),
+    "compare": _cost(CPU_BOUND, weight=3),
+    "contour": _cost(CPU_BOUND, BLOCKING, weight=4),
+    "convert": _cost(IO_BOUND, weight=2),
+    "create": _cost(IO_BOUND, weight=1),
+    "edit": _cost(IO_BOUND, weight=1),
+    "fill-nodata": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=7),
+    "footprint": _cost(CPU_BOUND, BLOCKING, weight=4),
+    "hillshade": _cost(CPU_BOUND, weight=3),
+    "index": _cost(IO_BOUND, weight=2),
+    "info": _cost(IO_BOUND, weight=1),
+    "mosaic": _cost(IO_BOUND, weight=2),
+    "neighbors": _cost(CPU_BOUND, weight=6),
+    "nodata-to-alpha": _cost(CPU_BOUND, weight=1),
+    "overview": _cost(IO_BOUND, BLOCKING, weight=5),
+    "pansharpen": _cost(CPU_BOUND, memory_heavy=True, weight=6),
+    "pixel-info": _cost(IO_BOUND, weight=1),
+    "polygonize": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=7),
+    "reclassify": _cost(CPU_BOUND, weight=2),
+    "reproject": _cost(CPU_BOUND, memory_heavy=True, weight=8),
+    "resize": _cost(CPU_BOUND, weight=3),
+    "rgb-to-palette": _cost(CPU_BOUND, BLOCKING, weight=4),
+    "roughness": _cost(CPU_BOUND, weight=3),
+    "scale": _cost(CPU_BOUND, weight=1),
+    "select": _cost(IO_BOUND, weight=1),
+    "set-type": _cost(CPU_BOUND, weight=1),
+    "sieve": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=4),
+    "slope": _cost(CPU_BOUND, weight=3),
+    "stack": _cost(IO_BOUND, weight=2),
+    "tile": _cost(IO_BOUND, BLOCKING, weight=5),
+    "tpi": _cost(CPU_BOUND, weight=3),
+    "tri": _cost(CPU_BOUND, weight=3),
+    "unscale": _cost(CPU_BOUND, weight=1),
+    "update": _cost(IO_BOUND, weight=3),
+    "viewshed": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=9),
+    "zonal-stats": _cost(CPU_BOUND, BLOCKING, weight=6),
+    # vector
+    "buffer": _cost(CPU_BOUND, weight=4),
+    "check-coverage": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=5),
+    "check-geometry": _cost(CPU_BOUND, weight=3),
+    "clean-coverage": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=8),
+    "concat": _cost(IO_BOUND, weight=2),
+    "explode-collections": _cost(CPU_BOUND, weight=1),
+    "filter": _cost(CPU_BOUND, weight=1),
+    "grid": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=6),
+    "layer-algebra": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=8),
+    "make-point": _cost(CPU_BOUND, weight=1),
+    "make-valid": _cost(CPU_BOUND, weight=4),
+    "partition": _cost(IO_BOUND, weight=3),
+    "rasterize": _cost(CPU_BOUND, BLOCKING, weight=6),
+    "segmentize": _cost(CPU_BOUND, weight=2),
+    "set-field-type": _cost(CPU_BOUND, weight=1),
+    "set-geom-type": _cost(CPU_BOUND, weight=1),
+    "simplify": _cost(CPU_BOUND, weight=3),
+    "simplify-coverage": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=5),
+    "sort": _cost(CPU_BOUND, BLOCKING, memory_heavy=True, weight=4),
+    "sql": _cost(CPU_BOUND, weight=3),
+    "swap-xy": _cost(CPU_BOUND, weight=1),
+}
+
+# used for commands not in COMMAND_COSTS
+DEFAULT_COST = _cost(CPU_BOUND, weight=1)
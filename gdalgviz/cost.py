@@ -0,0 +1,197 @@
+import copy
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from gdalgviz.commands import (
+    BLOCKING,
+    COMMAND_COSTS,
+    CPU_BOUND,
+    DEFAULT_COST,
+    IO_BOUND,
+    STREAMING,
+)
+from gdalgviz.parser import (
+    copy_steps,
+    get_command,
+    get_nested_pipelines,
+    is_pipeline_header,
+    iter_steps,
+)
+
+# allowed values of each cost field, weights can be any positive number
+COST_FIELDS = {
+    "bound": (IO_BOUND, CPU_BOUND),
+    "mode": (STREAMING, BLOCKING),
+    "memory_heavy": (True, False),
+    "weight": None,
+}
+
+# weights at or above which a step is a medium or high cost
+COST_LEVELS = {"medium": 3, "high": 6}
+COST_COLORS = {"low": "#d1e7dd", "medium": "#fff3cd", "high": "#f8d7da"}
+
+CRITICAL_COLOR = "#dc3545"
+CRITICAL_EDGE_ATTR = {"color": CRITICAL_COLOR, "penwidth": "2.5"}
+
+# the critical path reaches a step from its main flow parent, or from the
+# nested input with this index
+CRITICAL_PARENT = "parent"
+
+# a path through the pipeline as (total weight, last link), where each link
+# is (step, how it was reached, previous link) so paths can share links
+CostPath = Tuple[float, Optional[Tuple[Dict, Union[str, int], Any]]]
+
+
+def cost_level(weight: float) -> str:
+    """
+    Classify a cost weight as low, medium or high
+    """
+    if weight >= COST_LEVELS["high"]:
+        return "high"
+    if weight >= COST_LEVELS["medium"]:
+        return "medium"
+    return "low"
+
+
+def _validate_cost(cmd: str, cost: Dict) -> None:
+    for field, value in cost.items():
+        if field not in COST_FIELDS:
+            raise ValueError(
+                f"Invalid cost field '{field}' for '{cmd}', "
+                f"expected one of {list(COST_FIELDS)}"
+            )
+        allowed = COST_FIELDS[field]
+        if allowed is None:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Cost weight for '{cmd}' must be a number")
+            if value <= 0:
+                raise ValueError(f"Cost weight for '{cmd}' must be positive")
+        elif value not in allowed:
+            raise ValueError(
+                f"Invalid cost {field} '{value}' for '{cmd}', "
+                f"expected one of {list(allowed)}"
+            )
+
+
+def load_cost_overrides(fn: str) -> Dict[str, Dict]:
+    """
+    Load per-command cost overrides from a JSON file, e.g.
+    {"reproject": {"weight": 12}, "my-step": {"bound": "io", "weight": 2}}
+    Fields that are not given keep their default values.
+    Raises ValueError if a field or value is invalid.
+    """
+    with Path(fn).open("r", encoding="utf-8") as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError("Cost overrides must be a JSON object of command names")
+    for cmd, cost in overrides.items():
+        if not isinstance(cost, dict):
+            raise ValueError(f"Cost override for '{cmd}' must be a JSON object")
+        _validate_cost(cmd, cost)
+    return overrides
+
+
+def get_costs(overrides: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """
+    Return the cost of each command, with any overrides applied
+    """
+    costs = copy.deepcopy(COMMAND_COSTS)
+    for cmd, cost in (overrides or {}).items():
+        costs[cmd] = {**costs.get(cmd, DEFAULT_COST), **cost}
+    return costs
+
+
+def format_cost(cost: Dict) -> str:
+    """
+    Summarize a cost as a short badge, e.g. "cpu · blocking · memory · 7"
+    """
+    parts = [cost["bound"], cost["mode"]]
+    if cost["memory_heavy"]:
+        parts.append("memory")
+    parts.append(f"{cost['weight']:g}")
+    return " · ".join(parts)
+
+
+def _critical_paths(steps: List[Dict], costs: Dict[str, Dict]) -> List[CostPath]:
+    """
+    Return the most expensive paths ending at the last step of the pipeline
+    and of each tee branch. A step is reached by the most expensive of the
+    main flow and each of its nested inputs. Ends are returned in the order
+    their chains are finished, with tee branches before the chain they leave
+    """
+    ends: List[CostPath] = []
+    # chains being walked, as [remaining steps, path so far, index of the
+    # nested input the chain is or None for the main flow and tee branches,
+    # and a step waiting for its nested inputs as [step, remaining inputs,
+    # best path into the step, where the best path comes from]]
+    stack: List[List[Any]] = [[iter(steps), (0, None), None, None]]
+    while stack:
+        frame = stack[-1]
+        chain, current, _, waiting = frame
+        if waiting is not None:
+            step, inputs, best, via = waiting
+            item = next(inputs, None)
+            if item is not None:
+                n, nested_steps = item
+                stack.append([iter(nested_steps), (0, None), n, None])
+                continue
+            weight = costs.get(get_command(step), DEFAULT_COST)["weight"]
+            frame[1] = (best[0] + weight, (step, via, best[1]))
+            frame[3] = None
+            continue
+
+        step = next(chain, None)
+        if step is None:
+            stack.pop()
+            if frame[2] is None:
+                ends.append(current)
+                continue
+            # compare the nested input with the other ways into its step
+            parent_waiting = stack[-1][3]
+            if current[0] > parent_waiting[2][0]:
+                parent_waiting[2], parent_waiting[3] = current, frame[2]
+            continue
+
+        nested_pipelines = get_nested_pipelines(step)
+        if get_command(step) == "tee":
+            weight = costs.get("tee", DEFAULT_COST)["weight"]
+            current = (current[0] + weight, (step, CRITICAL_PARENT, current[1]))
+            frame[1] = current
+            for branch in reversed(nested_pipelines):
+                stack.append([iter(branch), current, None, None])
+            continue
+        frame[3] = [step, enumerate(nested_pipelines), current, CRITICAL_PARENT]
+    return ends
+
+
+def _path_steps(path: CostPath) -> Iterator[Tuple[Dict, Union[str, int]]]:
+    link = path[1]
+    while link is not None:
+        step, via, link = link
+        yield step, via
+
+
+def analyze_costs(
+    steps: List[Dict], overrides: Optional[Dict[str, Dict]] = None
+) -> Tuple[List[Dict], float]:
+    """
+    Return a copy of the steps with the "cost" of each step added, and
+    "critical" set on the steps of the most expensive path through the
+    pipeline, including nested inputs and tee branches. Its value is
+    CRITICAL_PARENT or the index of the nested input the path comes from.
+    Also returns the total weight of the critical path.
+    """
+    costs = get_costs(overrides)
+    annotated = copy_steps(steps)
+    display_steps = annotated
+    if annotated and is_pipeline_header(annotated[0]):
+        display_steps = annotated[1:]
+
+    for step in iter_steps(display_steps):
+        step["cost"] = dict(costs.get(get_command(step), DEFAULT_COST))
+
+    path = max(_critical_paths(display_steps, costs), key=lambda end: end[0])
+    for step, via in _path_steps(path):
+        step["critical"] = via
+    return annotated, path[0]
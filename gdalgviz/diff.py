@@ -0,0 +1,191 @@
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from gdalgviz.hashing import hash_steps
+from gdalgviz.parser import get_nested_pipelines, is_pipeline_header, iter_steps
+
+# diff status of a step compared to the old pipeline
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+ADDED = "added"
+REMOVED = "removed"
+
+# header colours used to highlight differences in diagrams
+DIFF_COLORS = {
+    CHANGED: "#fff3cd",
+    ADDED: "#d1e7dd",
+    REMOVED: "#f8d7da",
+}
+
+
+def _mark(steps: List[Dict], status: str) -> List[Dict]:
+    """
+    Set the diff status on a list of hashed steps and all of their nested steps
+    """
+    for step in iter_steps(steps):
+        step["diff"] = status
+    return steps
+
+
+def _with_nested(step: Dict, blocks: List[List[Dict]]) -> Dict:
+    """
+    Return a copy of a step with its nested pipelines replaced
+    """
+    nested = [{"type": "nested", "pipeline": b if len(b) > 1 else b[0]} for b in blocks]
+    return {**step, "nested": nested if len(nested) > 1 else nested[0]}
+
+
+def _diff_changed(old: Dict, new: Dict) -> Dict:
+    """
+    Diff two steps running the same command, pairing up their nested pipelines
+    """
+    old_blocks = get_nested_pipelines(old)
+    new_blocks = get_nested_pipelines(new)
+    if not old_blocks and not new_blocks:
+        return {**new, "diff": CHANGED}
+
+    blocks = [_diff_chain(o, n) for o, n in zip(old_blocks, new_blocks)]
+    blocks += [_mark(b, REMOVED) for b in old_blocks[len(new_blocks) :]]
+    blocks += [_mark(b, ADDED) for b in new_blocks[len(old_blocks) :]]
+    # args may be identical if only the nested pipelines changed
+    return {**_with_nested(new, blocks), "diff": CHANGED}
+
+
+def _longest_increasing(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Return the longest run of (old, new) position pairs, sorted by old
+    position, whose new positions also increase (patience sorting)
+    """
+    tails: List[int] = []  # smallest new position ending a run of each length
+    tail_pairs: List[int] = []
+    previous: List[Optional[int]] = [None] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        n = bisect_left(tails, j)
+        if n:
+            previous[k] = tail_pairs[n - 1]
+        if n == len(tails):
+            tails.append(j)
+            tail_pairs.append(k)
+        else:
+            tails[n] = j
+            tail_pairs[n] = k
+
+    run = []
+    last = tail_pairs[-1] if tail_pairs else None
+    while last is not None:
+        run.append(pairs[last])
+        last = previous[last]
+    return run[::-1]
+
+
+def _unique_anchors(
+    old: List[str], new: List[str], i1: int, i2: int, j1: int, j2: int
+) -> List[Tuple[int, int]]:
+    """
+    Match the hashes found exactly once in both old[i1:i2] and new[j1:j2],
+    keeping the longest set of matches in the same order in both
+    """
+    old_counts = Counter(old[i1:i2])
+    new_counts = Counter(new[j1:j2])
+    new_positions = {
+        new[j]: j
+        for j in range(j1, j2)
+        if new_counts[new[j]] == 1 and old_counts[new[j]] == 1
+    }
+    pairs = [
+        (i, new_positions[old[i]]) for i in range(i1, i2) if old[i] in new_positions
+    ]
+    return _longest_increasing(pairs)
+
+
+def _matching_pairs(old: List[str], new: List[str]) -> List[Tuple[int, int]]:
+    """
+    Return the sorted (old, new) positions of matching hashes. Common leading
+    and trailing hashes are matched first, then hashes unique to both lists
+    are used as anchors and the gaps between them matched in the same way.
+    Only gaps without unique hashes are compared with difflib, so its
+    quadratic worst case is limited to runs of repeated steps
+    """
+    pairs: List[Tuple[int, int]] = []
+    gaps = [(0, len(old), 0, len(new))]
+    while gaps:
+        i1, i2, j1, j2 = gaps.pop()
+        while i1 < i2 and j1 < j2 and old[i1] == new[j1]:
+            pairs.append((i1, j1))
+            i1, j1 = i1 + 1, j1 + 1
+        while i1 < i2 and j1 < j2 and old[i2 - 1] == new[j2 - 1]:
+            i2, j2 = i2 - 1, j2 - 1
+            pairs.append((i2, j2))
+        if i1 == i2 or j1 == j2:
+            continue
+
+        anchors = _unique_anchors(old, new, i1, i2, j1, j2)
+        if not anchors:
+            matcher = SequenceMatcher(None, old[i1:i2], new[j1:j2], autojunk=False)
+            pairs.extend(
+                (i1 + i + k, j1 + j + k)
+                for i, j, size in matcher.get_matching_blocks()
+                for k in range(size)
+            )
+            continue
+
+        pairs.extend(anchors)
+        bounds = [(i1 - 1, j1 - 1)] + anchors + [(i2, j2)]
+        for (start_i, start_j), (end_i, end_j) in zip(bounds, bounds[1:]):
+            gaps.append((start_i + 1, end_i, start_j + 1, end_j))
+
+    return sorted(pairs)
+
+
+def _diff_chain(old_steps: List[Dict], new_steps: List[Dict]) -> List[Dict]:
+    """
+    Align two lists of hashed steps and merge them into a single list
+    where every step has a diff status
+    """
+    pairs = _matching_pairs(
+        [s["hash"] for s in old_steps], [s["hash"] for s in new_steps]
+    )
+    merged: List[Dict] = []
+    i = j = 0
+    for next_i, next_j in pairs + [(len(old_steps), len(new_steps))]:
+        old_slice, new_slice = old_steps[i:next_i], new_steps[j:next_j]
+        for old, new in zip(old_slice, new_slice):
+            if old["command"] == new["command"]:
+                merged.append(_diff_changed(old, new))
+            else:
+                merged.extend(_mark([old], REMOVED))
+                merged.extend(_mark([new], ADDED))
+        merged.extend(_mark(old_slice[len(new_slice) :], REMOVED))
+        merged.extend(_mark(new_slice[len(old_slice) :], ADDED))
+
+        if next_j < len(new_steps):
+            # identical hashes mean the nested pipelines are identical too
+            merged.extend(_mark([new_steps[next_j]], UNCHANGED))
+        i, j = next_i + 1, next_j + 1
+
+    return merged
+
+
+def diff_pipelines(old_steps: List[Dict], new_steps: List[Dict]) -> List[Dict]:
+    """
+    Compare two parsed pipelines and return a merged list of hashed steps.
+    Every step has a "diff" status of unchanged, changed, added or removed,
+    and removed steps are kept in place so they can be shown in a diagram.
+    Matching uses the structural hashes, so identical nested pipelines
+    are skipped without being compared step by step.
+    """
+    return _diff_chain(hash_steps(old_steps), hash_steps(new_steps))
+
+
+def diff_summary(merged_steps: List[Dict]) -> Dict[str, int]:
+    """
+    Count the steps with each diff status, including nested steps.
+    The pipeline header is not counted
+    """
+    summary = {CHANGED: 0, ADDED: 0, REMOVED: 0, UNCHANGED: 0}
+    for step in iter_steps(merged_steps):
+        if not is_pipeline_header(step):
+            summary[step["diff"]] += 1
+    return summary
@@ -0,0 +1,213 @@
+import html
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from gdalgviz.main import detect_pipeline_type, step_arg_texts
+from gdalgviz.parser import get_command, is_pipeline_header, iter_steps
+from gdalgviz.postprocess import write_if_changed
+
+# group headings, in the order they are shown
+GALLERY_GROUPS = ["raster", "vector", "other"]
+
+# number of diagrams added to the page each time the end of it is reached
+GALLERY_PAGE_SIZE = 100
+
+# a diagram in the gallery page, see gallery_entry
+GalleryEntry = Dict[str, Optional[str]]
+
+GALLERY_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; margin: 0 1rem 2rem; }
+header { position: sticky; top: 0; background: #fff; padding: .5rem 0;
+  border-bottom: 1px solid #dee2e6; z-index: 1; }
+input { width: 100%; max-width: 40rem; padding: .4rem; font-size: 1rem; }
+h2 { text-transform: capitalize; margin: 1.5rem 0 .5rem; }
+figure { margin: 0 0 1rem; padding: .5rem; border: 1px solid #dee2e6;
+  border-radius: 4px; overflow-x: auto; }
+figcaption { font-size: .85rem; color: #495057; margin-bottom: .25rem; }
+figure img, figure svg { max-width: 100%; height: auto; }
+</style>
+</head>
+<body>
+<header>
+<h1>$title</h1>
+<input id="search" type="search" placeholder="Filter by command or argument" autofocus>
+<span id="count"></span>
+</header>
+<main id="gallery"></main>
+<div id="more"></div>
+<script id="entries" type="application/json">$entries</script>
+<script>
+(function () {
+  var PAGE_SIZE = $page_size;
+  var entries = JSON.parse(document.getElementById("entries").textContent);
+  var gallery = document.getElementById("gallery");
+  var count = document.getElementById("count");
+  var more = document.getElementById("more");
+  var shown = [], next = 0, group = null;
+
+  function card(entry) {
+    var figure = document.createElement("figure");
+    var caption = document.createElement("figcaption");
+    caption.textContent = entry.name + " \\u2014 " + entry.commands;
+    figure.appendChild(caption);
+    if (entry.svg !== null) {
+      var holder = document.createElement("div");
+      holder.innerHTML = entry.svg;
+      figure.appendChild(holder);
+    } else {
+      var img = document.createElement("img");
+      img.loading = "lazy";
+      img.alt = entry.commands;
+      img.src = entry.src;
+      figure.appendChild(img);
+    }
+    return figure;
+  }
+
+  function addPage() {
+    var fragment = document.createDocumentFragment();
+    var end = Math.min(next + PAGE_SIZE, shown.length);
+    for (; next < end; next++) {
+      var entry = shown[next];
+      if (entry.group !== group) {
+        group = entry.group;
+        var heading = document.createElement("h2");
+        heading.textContent = group;
+        fragment.appendChild(heading);
+      }
+      fragment.appendChild(card(entry));
+    }
+    gallery.appendChild(fragment);
+  }
+
+  function filter() {
+    var terms = document.getElementById("search").value.toLowerCase()
+      .split(/\\s+/).filter(Boolean);
+    shown = entries.filter(function (entry) {
+      return terms.every(function (term) {
+        return entry.search.indexOf(term) !== -1;
+      });
+    });
+    gallery.textContent = "";
+    next = 0;
+    group = null;
+    count.textContent = shown.length + " of " + entries.length + " diagrams";
+    addPage();
+  }
+
+  new IntersectionObserver(function (observed) {
+    if (observed[0].isIntersecting && next < shown.length) {
+      addPage();
+    }
+  }, { rootMargin: "1000px" }).observe(more);
+
+  var timer;
+  document.getElementById("search").addEventListener("input", function () {
+    clearTimeout(timer);
+    timer = setTimeout(filter, 150);
+  });
+  filter();
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def search_text(steps: List[Dict]) -> str:
+    """
+    Return the lowercase command names and arguments of every step of a
+    pipeline, including nested steps, for filtering the gallery
+    """
+    words = []
+    for step in iter_steps(steps):
+        if is_pipeline_header(step):
+            continue
+        words.append(get_command(step))
+        words += step_arg_texts(step.get("args", []))
+    return " ".join(words).lower()
+
+
+def _inline_svg(svg: bytes) -> str:
+    """
+    Drop the XML declaration and DOCTYPE of an SVG document for embedding
+    """
+    text = svg.decode("utf-8")
+    return text[text.find("<svg") :] if "<svg" in text else text
+
+
+def gallery_entry(
+    output_fn: str,
+    steps: List[Dict],
+    gallery_fn: str,
+    svg: Optional[bytes] = None,
+) -> GalleryEntry:
+    """
+    Describe a rendered diagram for the gallery page. If svg is given it is
+    embedded in the page, otherwise the page links to output_fn relative to
+    the folder of gallery_fn
+    """
+    src = os.path.relpath(
+        os.path.abspath(output_fn), Path(gallery_fn).parent.absolute()
+    )
+    commands = [get_command(step) for step in steps if not is_pipeline_header(step)]
+    return {
+        "name": Path(output_fn).name,
+        "group": detect_pipeline_type(steps) or "other",
+        "commands": " ! ".join(commands),
+        "search": f"{Path(output_fn).name.lower()} {search_text(steps)}",
+        "src": Path(src).as_posix(),
+        "svg": _inline_svg(svg) if svg is not None else None,
+    }
+
+
+def gallery_html(entries: List[GalleryEntry], title: str = "GDALG diagrams") -> str:
+    """
+    Build a self-contained HTML page showing the diagrams grouped by pipeline
+    type. Diagrams are added to the page as it is scrolled, so only the
+    entry data is parsed when it opens, and can be filtered by command names
+    and arguments
+    """
+    ordered = sorted(
+        entries,
+        key=lambda entry: (
+            (
+                GALLERY_GROUPS.index(entry["group"])
+                if entry["group"] in GALLERY_GROUPS
+                else len(GALLERY_GROUPS)
+            ),
+            entry["name"],
+        ),
+    )
+    # a closing tag inside the JSON would end the script element early
+    data = json.dumps(ordered, separators=(",", ":")).replace("</", "<\\/")
+    return (
+        GALLERY_TEMPLATE.replace("$title", html.escape(title))
+        .replace("$page_size", str(GALLERY_PAGE_SIZE))
+        .replace("$entries", data)
+    )
+
+
+def write_gallery(
+    entries: List[GalleryEntry],
+    gallery_fn: str,
+    title: str = "GDALG diagrams",
+    skip_unchanged: bool = True,
+) -> bool:
+    """
+    Write the gallery page for a list of entries, unless skip_unchanged is
+    False and the file already has identical content.
+    Returns True if the file was written
+    """
+    data = gallery_html(entries, title).encode("utf-8")
+    if skip_unchanged:
+        return write_if_changed(data, gallery_fn)
+    Path(gallery_fn).write_bytes(data)
+    return True
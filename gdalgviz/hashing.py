@@ -0,0 +1,101 @@
+import hashlib
+from typing import Dict, Iterator, List
+
+from gdalgviz.parser import get_nested_pipelines, iter_steps
+
+# size in bytes of structural hashes (shown as twice as many hex characters)
+HASH_SIZE = 8
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.blake2b(digest_size=HASH_SIZE)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _arg_key(arg: Dict) -> str:
+    return repr((arg.get("type"), arg.get("flag"), arg.get("value")))
+
+
+def pipeline_hash(hashed_steps: List[Dict]) -> str:
+    """
+    Combine the hashes of a list of steps returned by hash_steps
+    """
+    return _digest("pipeline", *(step["hash"] for step in hashed_steps))
+
+
+def prefix_hashes(step_hashes: List[str]) -> Iterator[str]:
+    """
+    Yield the pipeline_hash of each prefix of a list of step hashes,
+    hashing each step once
+    """
+    h = hashlib.blake2b(digest_size=HASH_SIZE)
+    h.update(b"pipeline\0")
+    for step_hash in step_hashes:
+        h.update(step_hash.encode("utf-8"))
+        h.update(b"\0")
+        yield h.hexdigest()
+
+
+def hash_steps(steps: List[Dict]) -> List[Dict]:
+    """
+    Return copies of parsed steps with a Merkle-style structural "hash" added
+    to each step and nested block. A step's hash covers its command, its
+    arguments and the hashes of its nested pipelines, so two steps have the
+    same hash only if everything they contain is identical.
+    """
+    hashed = [dict(step) for step in steps]
+    # (step copy, copies of its nested pipelines) in pre-order, so walking it
+    # backwards hashes nested steps before the steps containing them
+    ordered = []
+    stack = [hashed]
+    while stack:
+        for step_copy in stack.pop():
+            nested = [
+                [dict(nested_step) for nested_step in nested_steps]
+                for nested_steps in get_nested_pipelines(step_copy)
+            ]
+            ordered.append((step_copy, nested))
+            stack.extend(nested)
+
+    for step_copy, nested in reversed(ordered):
+        nested_hashes = []
+        nested_blocks = []
+        for hashed_nested in nested:
+            block_hash = pipeline_hash(hashed_nested)
+            nested_hashes.append(block_hash)
+            pipeline = hashed_nested if len(hashed_nested) > 1 else hashed_nested[0]
+            nested_blocks.append(
+                {"type": "nested", "pipeline": pipeline, "hash": block_hash}
+            )
+
+        if nested_blocks:
+            step_copy["nested"] = (
+                nested_blocks if len(nested_blocks) > 1 else nested_blocks[0]
+            )
+
+        step_copy["hash"] = _digest(
+            step_copy["command"],
+            *(_arg_key(arg) for arg in step_copy.get("args", [])),
+            *nested_hashes,
+        )
+    return hashed
+
+
+def assign_node_ids(hashed_steps: List[Dict]) -> List[Dict]:
+    """
+    Set a stable "node_id" on each step returned by hash_steps, based on
+    its structural hash rather than its position in the pipeline.
+    Identical steps are numbered in the order they appear in the diagram.
+    Steps that already have a node id (e.g. from resolve_references) keep it.
+    """
+    seen: Dict[str, int] = {}
+    for step in iter_steps(hashed_steps):
+        if "node_id" in step:
+            continue
+        count = seen.get(step["hash"], 0) + 1
+        seen[step["hash"]] = count
+        step["node_id"] = step["hash"] if count == 1 else f"{step['hash']}-{count}"
+    return hashed_steps
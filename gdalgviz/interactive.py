@@ -0,0 +1,116 @@
+import re
+
+# classes of the SVG groups of nodes and clusters inside a nested block, and
+# of the nodes owning nested blocks, followed by the id of the block
+BLOCK_CLASS = "gdalg-in-"
+OWNER_CLASS = "gdalg-owner-"
+
+INTERACTIVE_STYLE = """<style>
+g.node[class*="gdalg-owner-"] { cursor: pointer; }
+g.gdalg-collapsed polygon { stroke-width: 3px; stroke-dasharray: 6 3; }
+</style>"""
+
+# minify_svg leaves CDATA sections as they are, so the script keeps its lines
+INTERACTIVE_SCRIPT = """<script><![CDATA[
+(function () {
+  var script = document.currentScript;
+  var svg = script.ownerSVGElement || script.closest("svg");
+  var box = svg.viewBox.baseVal;
+  var collapsed = {};
+  var start = null, moved = false;
+
+  function blocks(el, prefix) {
+    var found = [];
+    el.classList.forEach(function (name) {
+      if (name.indexOf(prefix) === 0) { found.push(name.slice(prefix.length)); }
+    });
+    return found;
+  }
+
+  function isCollapsed(block) { return collapsed[block] === true; }
+
+  function update() {
+    var hidden = {};
+    svg.querySelectorAll("g.node, g.cluster").forEach(function (el) {
+      var hide = blocks(el, "BLOCK_CLASS").some(isCollapsed);
+      el.style.display = hide ? "none" : "";
+      var title = el.querySelector("title");
+      if (hide && title) { hidden[title.textContent] = true; }
+      var owned = blocks(el, "OWNER_CLASS");
+      el.classList.toggle("gdalg-collapsed", owned.length !== 0 && owned.every(isCollapsed));
+    });
+    svg.querySelectorAll("g.edge").forEach(function (el) {
+      var ends = el.querySelector("title").textContent.split("->");
+      el.style.display = hidden[ends[0]] || hidden[ends[1]] ? "none" : "";
+    });
+  }
+
+  function scale() {
+    var rect = svg.getBoundingClientRect();
+    return Math.max(box.width / rect.width, box.height / rect.height);
+  }
+
+  function point(event) {
+    var rect = svg.getBoundingClientRect(), s = scale();
+    return [
+      box.x - (rect.width * s - box.width) / 2 + (event.clientX - rect.left) * s,
+      box.y - (rect.height * s - box.height) / 2 + (event.clientY - rect.top) * s
+    ];
+  }
+
+  svg.addEventListener("click", function (event) {
+    if (moved) { event.preventDefault(); return; }
+    var node = event.target.closest("g.node");
+    if (!node || event.ctrlKey || event.metaKey) { return; }
+    var owned = blocks(node, "OWNER_CLASS");
+    if (owned.length === 0) { return; }
+    event.preventDefault();
+    var collapse = !owned.every(isCollapsed);
+    owned.forEach(function (block) { collapsed[block] = collapse; });
+    update();
+  });
+
+  svg.addEventListener("wheel", function (event) {
+    event.preventDefault();
+    var p = point(event), factor = event.deltaY > 0 ? 1.1 : 1 / 1.1;
+    box.x = p[0] - (p[0] - box.x) * factor;
+    box.y = p[1] - (p[1] - box.y) * factor;
+    box.width *= factor;
+    box.height *= factor;
+  }, { passive: false });
+
+  svg.addEventListener("pointerdown", function (event) {
+    start = [event.clientX, event.clientY];
+    moved = false;
+  });
+  svg.addEventListener("pointermove", function (event) {
+    if (start === null) { return; }
+    var dx = event.clientX - start[0], dy = event.clientY - start[1];
+    if (Math.abs(dx) + Math.abs(dy) >= 3) { moved = true; }
+    if (!moved) { return; }
+    var s = scale();
+    box.x -= dx * s;
+    box.y -= dy * s;
+    start = [event.clientX, event.clientY];
+  });
+  window.addEventListener("pointerup", function () { start = null; });
+})();
+]]></script>""".replace("BLOCK_CLASS", BLOCK_CLASS).replace("OWNER_CLASS", OWNER_CLASS)
+
+_SVG_CLOSE_RE = re.compile(rb"</svg>\s*$")
+
+
+def add_interactivity(svg: bytes) -> bytes:
+    """
+    Embed a dependency-free script in an SVG diagram built with
+    interactive=True, so clicking a tee or a step with nested inputs
+    collapses or expands its nested pipelines (ctrl-click follows the docs
+    link instead), and the wheel and dragging zoom and pan the diagram.
+    Scripts only run when the SVG is opened directly or embedded with
+    <object> or inline, not with <img>
+    """
+    match = _SVG_CLOSE_RE.search(svg)
+    if match is None:
+        raise ValueError("Not an SVG document")
+    extra = f"{INTERACTIVE_STYLE}\n{INTERACTIVE_SCRIPT}\n".encode("utf-8")
+    return svg[: match.start()] + extra + svg[match.start() :]
@@ -0,0 +1,339 @@
+import json
+import logging
+import os
+from collections import deque
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from graphviz import Digraph
+
+from gdalgviz.main import VALID_FORMATS, get_output_format, step_label_html
+from gdalgviz.manifest import content_hash
+from gdalgviz.parser import (
+    get_command,
+    is_pipeline_header,
+    iter_step_paths,
+    parse_file,
+    parse_pipeline,
+    step_dataset,
+)
+from gdalgviz.postprocess import write_if_changed
+
+logger = logging.getLogger(__name__)
+
+# bumped if the layout of the index file changes
+INDEX_VERSION = 1
+
+# files found when a folder is given as part of a catalog
+CATALOG_PATTERNS = ("*.gdalg.json",)
+
+DATASET_COLOR = "#e9ecef"
+FOCUS_COLOR = "#ffe69c"
+MAX_COMMANDS_LENGTH = 60
+
+# a step reading or writing a dataset, as (pipeline key, step path)
+StepRef = Tuple[str, str]
+
+
+def dataset_key(dataset: str, pipeline_dir: str, root: str) -> str:
+    """
+    Identify a dataset by its path relative to root, resolving relative paths
+    from the folder of the pipeline. URLs and GDAL virtual file systems are
+    kept as they are
+    """
+    if "://" in dataset or dataset.startswith("/vsi"):
+        return dataset
+    path = os.path.abspath(os.path.join(pipeline_dir, dataset))
+    try:
+        path = os.path.relpath(path, root)
+    except ValueError:
+        # on a different drive on Windows
+        pass
+    return Path(path).as_posix()
+
+
+def pipeline_lineage(steps: List[Dict], pipeline_dir: str, root: str) -> Dict:
+    """
+    Return the commands of a pipeline, and the datasets read and written by
+    its steps, including nested pipelines, as lists of [dataset, step path]
+    """
+    display_steps = steps
+    if steps and is_pipeline_header(steps[0]):
+        display_steps = steps[1:]
+
+    lineage: Dict[str, List] = {
+        "commands": [get_command(step) for step in display_steps],
+        "reads": [],
+        "writes": [],
+    }
+    for path, step in iter_step_paths(display_steps):
+        dataset = step_dataset(step)
+        if dataset:
+            kind = "reads" if get_command(step) == "read" else "writes"
+            lineage[kind].append([dataset_key(dataset, pipeline_dir, root), path])
+    return lineage
+
+
+def _index_entry(fn: str, root: str, previous: Optional[Dict]) -> Tuple[Dict, bool]:
+    """
+    Index a pipeline file, reusing the previous entry if the file is unchanged.
+    Also returns whether the file was parsed
+    """
+    stat = os.stat(fn)
+    if (
+        previous
+        and previous["size"] == stat.st_size
+        and previous["mtime_ns"] == stat.st_mtime_ns
+    ):
+        return previous, False
+
+    with open(fn, "rb") as f:
+        file_hash = content_hash(f.read())
+    entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": file_hash}
+    if previous and previous["hash"] == file_hash:
+        # touched but not changed
+        return {**previous, **entry}, False
+
+    try:
+        steps = parse_pipeline(parse_file(fn))
+    except Exception as e:
+        # e.g. invalid JSON or pipeline syntax
+        logger.warning("%s: could not be indexed - %s", fn, e)
+        return {
+            **entry,
+            "error": str(e),
+            "commands": [],
+            "reads": [],
+            "writes": [],
+        }, True
+    pipeline_dir = os.path.dirname(os.path.abspath(fn))
+    return {**entry, **pipeline_lineage(steps, pipeline_dir, root)}, True
+
+
+def iter_catalog_files(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the pipeline files of a list of catalog paths, expanding folders
+    while they are walked. Unlike Path.rglob, entries are read one at a
+    time, so a folder of many files is never held in memory as a whole.
+    Files are yielded in the order they are found, which depends on the
+    file system
+    """
+    for path in paths:
+        if not Path(path).is_dir():
+            yield path
+            continue
+        folders = [path]
+        while folders:
+            with os.scandir(folders.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.path)
+                    elif any(fnmatch(entry.name, p) for p in CATALOG_PATTERNS):
+                        yield entry.path
+
+
+def build_index(
+    pipeline_fns: Iterable[str], root: str = ".", index: Optional[Dict] = None
+) -> Dict:
+    """
+    Index the datasets read and written by each pipeline file, keyed by the
+    path of the file relative to root. Files that are unchanged since a
+    previous index (same size and modification time, or same content) are
+    not parsed again, and files no longer in the catalog are dropped.
+    """
+    root = os.path.abspath(root)
+    previous = (index or {}).get("pipelines", {})
+    pipelines = {}
+    parsed = 0
+    for fn in pipeline_fns:
+        key = dataset_key(fn, os.getcwd(), root)
+        pipelines[key], was_parsed = _index_entry(fn, root, previous.get(key))
+        parsed += was_parsed
+    logger.info("indexed %d pipelines (%d parsed)", len(pipelines), parsed)
+    return {"index_version": INDEX_VERSION, "pipelines": pipelines}
+
+
+def load_index(index_fn: str) -> Dict:
+    """
+    Load a lineage index, or return an empty index if it does not exist yet
+    or was written by an incompatible version
+    """
+    index_path = Path(index_fn)
+    if not index_path.exists():
+        return {"index_version": INDEX_VERSION, "pipelines": {}}
+    with index_path.open("r", encoding="utf-8") as f:
+        index = json.load(f)
+    if index.get("index_version") != INDEX_VERSION:
+        return {"index_version": INDEX_VERSION, "pipelines": {}}
+    return index
+
+
+def save_index(index: Dict, index_fn: str) -> bool:
+    """
+    Save a lineage index, only rewriting the file if it changed.
+    Returns True if written
+    """
+    data = (json.dumps(index, indent=1, sort_keys=True) + "\n").encode("utf-8")
+    return write_if_changed(data, index_fn)
+
+
+def dataset_index(
+    index: Dict,
+) -> Tuple[Dict[str, List[StepRef]], Dict[str, List[StepRef]]]:
+    """
+    Invert a lineage index into the steps producing and consuming each dataset.
+    A pipeline file read by another pipeline is produced by itself
+    """
+    producers: Dict[str, List[StepRef]] = {}
+    consumers: Dict[str, List[StepRef]] = {}
+    for key, entry in index["pipelines"].items():
+        for dataset, path in entry["reads"]:
+            consumers.setdefault(dataset, []).append((key, path))
+        for dataset, path in entry["writes"]:
+            producers.setdefault(dataset, []).append((key, path))
+    for dataset in consumers:
+        if dataset in index["pipelines"]:
+            producers.setdefault(dataset, []).append((dataset, ""))
+    return producers, consumers
+
+
+def neighbourhood(
+    index: Dict, dataset: str, depth: Optional[int] = None
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Return the pipelines and datasets upstream and downstream of a dataset,
+    up to depth pipelines away in each direction (unlimited if None).
+    Each pipeline and dataset is visited once, so this is linear in the size
+    of the neighbourhood
+    """
+    producers, consumers = dataset_index(index)
+    pipelines = index["pipelines"]
+
+    def inputs(key: str) -> List[str]:
+        return [linked for linked, _ in pipelines[key]["reads"]]
+
+    def outputs(key: str) -> List[str]:
+        linked = [linked for linked, _ in pipelines[key]["writes"]]
+        # a pipeline file read by other pipelines is also one of its outputs
+        return linked + [key] if key in consumers else linked
+
+    found_pipelines: Set[str] = set()
+    found_datasets = {dataset}
+    for links, follow in ((producers, inputs), (consumers, outputs)):
+        visited_pipelines: Set[str] = set()
+        visited_datasets = {dataset}
+        queue = deque([(dataset, 0)])
+        while queue:
+            current, distance = queue.popleft()
+            if depth is not None and distance >= depth:
+                continue
+            for key, _ in links.get(current, []):
+                if key in visited_pipelines:
+                    continue
+                visited_pipelines.add(key)
+                found_pipelines.add(key)
+                for linked in follow(key):
+                    if linked not in visited_datasets:
+                        visited_datasets.add(linked)
+                        found_datasets.add(linked)
+                        queue.append((linked, distance + 1))
+    return found_pipelines, found_datasets
+
+
+def lineage_diagram(
+    index: Dict,
+    dataset: Optional[str] = None,
+    depth: Optional[int] = None,
+    output_format: str = "svg",
+    vertical: bool = False,
+    fontname: str = "Helvetica",
+    header_color: str = "#cfe2ff",
+) -> Digraph:
+    """
+    Build a diagram of the datasets and pipelines of a lineage index, with
+    edges from each dataset to the pipelines reading it and from each
+    pipeline to the datasets it writes. If a dataset is given, only the
+    pipelines upstream and downstream of it are shown
+    """
+    pipelines = index["pipelines"]
+    keys = set(pipelines)
+    if dataset is not None:
+        keys, _ = neighbourhood(index, dataset, depth)
+
+    g = Digraph(
+        name="GDALG Lineage",
+        format=output_format,
+        graph_attr={"rankdir": "TB" if vertical else "LR"},
+        node_attr={"fontname": fontname},
+    )
+
+    pipeline_ids = {key: f"p{i}" for i, key in enumerate(sorted(keys))}
+    for key, pipeline_id in pipeline_ids.items():
+        entry = pipelines[key]
+        commands = entry.get("commands") or ["could not be parsed"]
+        label = step_label_html(
+            Path(key).name,
+            [{"type": "positional", "value": " ! ".join(commands)}],
+            header_color=header_color,
+            max_arg_length=MAX_COMMANDS_LENGTH,
+        )
+        g.node(pipeline_id, label=label, shape="plain", tooltip=key)
+
+    dataset_ids: Dict[str, str] = {}
+
+    def dataset_node(key: str) -> str:
+        if key in pipeline_ids:
+            # a pipeline file read by another pipeline
+            return pipeline_ids[key]
+        if key not in dataset_ids:
+            dataset_ids[key] = f"d{len(dataset_ids)}"
+            g.node(
+                dataset_ids[key],
+                label=Path(key).name or key,
+                tooltip=key,
+                shape="cylinder",
+                style="filled",
+                fillcolor=FOCUS_COLOR if key == dataset else DATASET_COLOR,
+            )
+        return dataset_ids[key]
+
+    if dataset is not None:
+        dataset_node(dataset)
+    for key, pipeline_id in pipeline_ids.items():
+        for linked, path in pipelines[key]["reads"]:
+            g.edge(dataset_node(linked), pipeline_id, tooltip=f"step {path}")
+        for linked, path in pipelines[key]["writes"]:
+            g.edge(pipeline_id, dataset_node(linked), tooltip=f"step {path}")
+    return g
+
+
+def generate_lineage_diagram(
+    catalog: Iterable[str],
+    output_fn: str,
+    index_fn: Optional[str] = None,
+    dataset: Optional[str] = None,
+    depth: Optional[int] = None,
+    **kwargs: Any,
+) -> Dict:
+    """
+    Index a catalog of pipeline files and folders and render their lineage.
+    If index_fn is given the index is loaded from it, updated for changed
+    files only, and saved again, with paths relative to its folder.
+    The dataset to focus on is given relative to the same folder (or the
+    working directory). Other keyword arguments are passed to lineage_diagram.
+    Returns the index
+    """
+    root = str(Path(index_fn).parent) if index_fn else "."
+    previous = load_index(index_fn) if index_fn else None
+    # the index is built in full anyway, so sort it for a stable diagram
+    index = build_index(sorted(iter_catalog_files(catalog)), root, previous)
+    if index_fn:
+        save_index(index, index_fn)
+
+    if dataset is not None:
+        dataset = dataset_key(dataset, os.getcwd(), os.path.abspath(root))
+    output_format = get_output_format(output_fn, VALID_FORMATS)
+    diagram = lineage_diagram(index, dataset, depth, output_format, **kwargs)
+    diagram.render(Path(output_fn).with_suffix(""), cleanup=True)
+    return index
@@ -1,11 +1,63 @@
-﻿from pathlib import Path
-from typing import List, Dict, Optional
+﻿import logging
+import os
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, Dict, Optional, Tuple, Union
 from graphviz import Digraph
+from gdalgviz.advisor import ADVICE_COLORS, advise_materialize
 from gdalgviz.commands import RASTER_COMMANDS
-from gdalgviz.parser import parse_pipeline
+from gdalgviz.cost import (
+    COST_COLORS,
+    CRITICAL_COLOR,
+    CRITICAL_EDGE_ATTR,
+    CRITICAL_PARENT,
+    analyze_costs,
+    cost_level,
+    format_cost,
+)
+from gdalgviz.diff import DIFF_COLORS, diff_pipelines, diff_summary
+from gdalgviz.hashing import assign_node_ids, hash_steps
+from gdalgviz.interactive import BLOCK_CLASS, OWNER_CLASS, add_interactivity
+from gdalgviz.merge import merge_subpipelines
+from gdalgviz.parser import (
+    get_command,
+    get_nested_pipelines,
+    is_pipeline_header,
+    iter_steps,
+    parse_pipeline,
+)
+from gdalgviz.manifest import manifest_entry, update_manifest
+from gdalgviz.postprocess import encode_svg, write_if_changed
+from gdalgviz.resolve import (
+    DEFAULT_MAX_DEPTH,
+    REFERENCE_CLUSTER_ATTR,
+    REFERENCE_EDGE_ATTR,
+    RESOLVED,
+    SHARED,
+    resolve_references,
+)
+from gdalgviz.validate import INVALID_COLOR, validate_pipeline
+from gdalgviz.timings import (
+    Timings,
+    apply_timings,
+    format_timing,
+    heat_color,
+    load_timings,
+)
+from gdalgviz.render import (
+    DEGRADED_GRAPH_ATTR,
+    DEGRADED_MAX_ARG_LENGTH,
+    RenderLimitError,
+    render_source,
+)
+
+logger = logging.getLogger(__name__)
 
 # supported by Graphviz
-VALID_FORMATS = ["svg", "png", "pdf", "jpg"]
+VALID_FORMATS = ["svg", "svgz", "png", "pdf", "jpg"]
+# formats that can be post-processed after rendering
+SVG_FORMATS = ["svg", "svgz"]
 # URL to GDAL command documentation
 DOCS_ROOT = "https://gdal.org/en/latest/programs"
 COMMAND_TEMPLATE = "gdal_{cmd_type}_{command}.html"
@@ -13,13 +65,19 @@ COMMAND_TEMPLATE = "gdal_{cmd_type}_{command}.html"
 # general commands that don't have dedicated docs pages
 GDAL_OPERATORS = "tee"
 
+ELLIPSIS = "..."
 
-def _is_pipeline_header(step: Dict) -> bool:
-    """
-    Return True if this step is just a pipeline declaration with no real args
-    """
-    cmd = step.get("command", "").strip().lower()
-    return bool(cmd == "gdal")
+# a link to a page of a paginated diagram, as (page number, URL)
+PageLink = Tuple[int, str]
+# nodes linking the pages of a paginated diagram
+PAGE_NODE_ATTR = {
+    "shape": "cds",
+    "style": "filled,dashed",
+    "fillcolor": "#e9ecef",
+    "fontsize": "10",
+}
+PREVIOUS_PAGE_ID = "page-previous"
+NEXT_PAGE_ID = "page-next"
 
 
 def get_output_format(filename: str, valid_formats: list[str]) -> str:
@@ -52,30 +110,6 @@ def get_command_type(cmd: str):
         return "vector"
 
 
-def _run_nested_pipeline(
-    g: Digraph,
-    steps: List[Dict],
-    parent_ids: List[Optional[str]],
-    node_counter: List[int],
-    pipeline_type: Optional[str],
-    header_color: str = "#cfe2ff",
-    docs_root: str = DOCS_ROOT,
-) -> List[str]:
-    """Chain a list of steps sequentially, returning the final node ids."""
-    current_parents = parent_ids
-    for step in steps:
-        current_parents = add_step_node(
-            g,
-            step,
-            parent_ids=current_parents,
-            node_counter=node_counter,
-            pipeline_type=pipeline_type,
-            header_color=header_color,
-            docs_root=docs_root,
-        )
-    return current_parents
-
-
 def build_docs_url(docs_root: str, cmd_type: str, command: str) -> str:
     """
     Build a docs URL from a root and command
@@ -86,7 +120,7 @@ def build_docs_url(docs_root: str, cmd_type: str, command: str) -> str:
     return f"{root}/{filename}"
 
 
-def add_step_node(
+def _step_node(
     g: Digraph,
     step_dict: Dict,
     parent_ids: List[Optional[str]],
@@ -94,65 +128,269 @@ def add_step_node(
     pipeline_type: Optional[str] = None,
     header_color: str = "#cfe2ff",
     docs_root: str = DOCS_ROOT,
-) -> List[str]:
-    cmd = _extract_cmd(step_dict)
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+    css_class: Optional[str] = None,
+) -> str:
+    """
+    Add the node of a step and the edges from its parents, without its
+    nested pipelines. css_class is set as the class of its SVG group.
+    Returns the node id
+    """
+    cmd = get_command(step_dict)
     args = step_dict.get("args", [])
-    label = step_label_html(cmd, args, header_color=header_color)
+    # colour steps measured by apply_timings by their share of the total
+    timing = step_dict.get("timing")
+    step_color = heat_color(timing["heat"]) if timing else header_color
+    # highlight steps annotated by diff_pipelines
+    step_color = DIFF_COLORS.get(step_dict.get("diff", ""), step_color)
+    # and steps and arguments with issues found by validate_pipeline
+    invalid = step_dict.get("invalid", [])
+    if any(issue["arg"] is None for issue in invalid):
+        step_color = INVALID_COLOR
+    label = step_label_html(
+        cmd,
+        args,
+        header_color=step_color,
+        max_arg_length=max_arg_length,
+        max_label_length=max_label_length,
+        wrap_width=wrap_width,
+        cost=step_dict.get("cost"),
+        critical="critical" in step_dict,
+        timing=timing,
+        invalid_args=[issue["arg"] for issue in invalid if issue["arg"] is not None],
+    )
+    # elided arguments are shown in full in the tooltip, with any timings
+    # and validation issues
+    arg_texts = step_arg_texts(args)
+    _, truncated = fit_arg_texts(arg_texts, max_arg_length, max_label_length)
+    tooltip = None
+    if truncated or timing or invalid:
+        tooltip = step_tooltip(
+            cmd,
+            arg_texts if truncated else [],
+            (format_timing(timing) if timing else [])
+            + [issue["message"] for issue in invalid],
+        )
 
-    node_id = str(node_counter[0])
+    # use stable ids set by assign_node_ids if available
+    node_id = step_dict.get("node_id") or str(node_counter[0])
     node_counter[0] += 1
 
     cmd_type = pipeline_type or get_command_type(cmd)
+    class_attr = {"class": css_class} if css_class else {}
 
     # create the node
     if cmd_type and cmd.lower() not in GDAL_OPERATORS:
         url = build_docs_url(docs_root, cmd_type, cmd)
-        g.node(node_id, label=label, URL=url, tooltip=url, target="_blank")
+        g.node(
+            node_id,
+            label=label,
+            URL=url,
+            tooltip=tooltip or url,
+            target="_blank",
+            **class_attr,
+        )
+    elif tooltip:
+        g.node(node_id, label=label, tooltip=tooltip, **class_attr)
     else:
-        g.node(node_id, label=label)
+        g.node(node_id, label=label, **class_attr)
+
+    # suggestion added by advise_materialize
+    advice = step_dict.get("materialize")
+    if advice:
+        add_advice_node(g, node_id, advice, css_class)
 
-    # connect to all parents
+    # connect to all parents, highlighting the critical path set by analyze_costs
+    parent_edge_attr = (
+        CRITICAL_EDGE_ATTR if step_dict.get("critical") == CRITICAL_PARENT else {}
+    )
     for pid in parent_ids:
         if pid is not None:
-            g.edge(pid, node_id)
+            g.edge(pid, node_id, **parent_edge_attr)
+
+    # a GDALG file read again after resolve_references expanded it
+    reference = step_dict.get("reference", {})
+    if reference.get("status") == SHARED:
+        g.edge(reference["source_id"], node_id, **REFERENCE_EDGE_ATTR)
+
+    return node_id
 
-    # handle nested block
-    nested = step_dict.get("nested")
-    if not nested:
-        return [node_id]
 
-    nested_pipeline = nested["pipeline"]
-    nested_steps = (
-        nested_pipeline if isinstance(nested_pipeline, list) else [nested_pipeline]
+def add_pipeline_nodes(
+    g: Digraph,
+    steps: List[Dict],
+    parent_ids: List[Optional[str]],
+    node_counter: List[int],
+    pipeline_type: Optional[str] = None,
+    header_color: str = "#cfe2ff",
+    docs_root: str = DOCS_ROOT,
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+    interactive: bool = False,
+) -> List[str]:
+    """
+    Chain a list of steps sequentially, including any number of nested
+    pipelines per step, returning the final node ids.
+    Nested pipelines are followed with an explicit stack rather than by
+    recursion, so pipelines nested to any depth can be drawn.
+    If interactive is True, each nested pipeline is a block with an id,
+    and nodes and clusters get SVG classes naming the blocks they are in
+    and the blocks they own, see add_interactivity
+    """
+    style: Dict[str, Any] = dict(
+        pipeline_type=pipeline_type,
+        header_color=header_color,
+        docs_root=docs_root,
+        max_arg_length=max_arg_length,
+        max_label_length=max_label_length,
+        wrap_width=wrap_width,
     )
+    # each frame chains the steps of one pipeline. A frame for a nested input
+    # ends with edges into the node it feeds, and a frame for the steps of a
+    # referenced GDALG file may close the cluster grouping them
+    stack: List[Dict[str, Any]] = [
+        {"graph": g, "steps": iter(steps), "parents": parent_ids, "blocks": []}
+    ]
+    final_ids: List[str] = []
+    block_count = 0
+    while stack:
+        frame = stack[-1]
+        step = next(frame["steps"], None)
+        if step is None:
+            stack.pop()
+            if "cluster" in frame:
+                frame["outer"].subgraph(frame["cluster"])
+            if "into" in frame:
+                for nid in frame["parents"]:
+                    frame["outer"].edge(nid, frame["into"], **frame["edge_attr"])
+            elif not stack:
+                final_ids = frame["parents"]
+            continue
+
+        graph = frame["graph"]
+        nested_pipelines = get_nested_pipelines(step)
+        # blocks containing the step, and the blocks of its nested pipelines
+        outer_blocks = frame["blocks"]
+        block_ids = []
+        css_class = None
+        if interactive:
+            block_ids = [f"b{block_count + n}" for n in range(len(nested_pipelines))]
+            block_count += len(block_ids)
+            classes = [BLOCK_CLASS + b for b in outer_blocks]
+            classes += [OWNER_CLASS + b for b in block_ids]
+            css_class = " ".join(classes) or None
 
-    if cmd == "tee":
-        # tee: nested steps are dead-end side outputs, main flow continues
-        _run_nested_pipeline(
-            g,
-            nested_steps,
-            parent_ids=[node_id],
-            node_counter=node_counter,
-            pipeline_type=pipeline_type,
-            header_color=header_color,
-            docs_root=docs_root,
+        node_id = _step_node(
+            graph, step, frame["parents"], node_counter, css_class=css_class, **style
         )
-        return [node_id]
+        frame["parents"] = [node_id]
+
+        if not nested_pipelines:
+            continue
+
+        if get_command(step) == "tee":
+            # tee: nested steps are dead-end side outputs, main flow continues
+            branches = [
+                {
+                    "graph": graph,
+                    "steps": iter(nested_steps),
+                    "parents": [node_id],
+                    "blocks": outer_blocks + block_ids[n : n + 1],
+                }
+                for n, nested_steps in enumerate(nested_pipelines)
+            ]
+            stack.extend(reversed(branches))
+            continue
+
+        # the steps of a referenced GDALG file are grouped in a cluster
+        reference = step.get("reference", {})
+        nested_g = graph
+        if reference.get("status") == RESOLVED:
+            cluster_attr = {"label": reference["path"], **REFERENCE_CLUSTER_ATTR}
+            if interactive:
+                cluster_attr["class"] = " ".join(
+                    BLOCK_CLASS + b for b in outer_blocks + block_ids
+                )
+            nested_g = Digraph(
+                name=f"cluster_{reference['source_id']}", graph_attr=cluster_attr
+            )
+
+        # blend/overlay style: each nested pipeline feeds INTO this node,
+        # with inputs merged by merge_subpipelines linked to their first copy
+        merged = step.get("merged", {})
+        inputs = []
+        for n, nested_steps in enumerate(nested_pipelines):
+            inputs.append(
+                {
+                    "graph": nested_g,
+                    "steps": iter([] if n in merged else nested_steps),
+                    "parents": [merged[n]] if n in merged else [],
+                    "outer": graph,
+                    "into": node_id,
+                    "edge_attr": (
+                        CRITICAL_EDGE_ATTR if step.get("critical") == n else {}
+                    ),
+                    "blocks": outer_blocks + block_ids[n : n + 1],
+                }
+            )
+        if nested_g is not graph:
+            # added to the outer graph once all of its steps have been drawn
+            inputs[-1]["cluster"] = nested_g
+        stack.extend(reversed(inputs))
+
+    return final_ids
+
 
-    # blend/overlay style: nested pipeline feeds INTO this node
-    final_ids = _run_nested_pipeline(
+def add_step_node(
+    g: Digraph,
+    step_dict: Dict,
+    parent_ids: List[Optional[str]],
+    node_counter: List[int],
+    pipeline_type: Optional[str] = None,
+    header_color: str = "#cfe2ff",
+    docs_root: str = DOCS_ROOT,
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+) -> List[str]:
+    """
+    Add a step and its nested pipelines, returning the id of its node
+    """
+    return add_pipeline_nodes(
         g,
-        nested_steps,
-        parent_ids=[],
-        node_counter=node_counter,
+        [step_dict],
+        parent_ids,
+        node_counter,
         pipeline_type=pipeline_type,
         header_color=header_color,
         docs_root=docs_root,
+        max_arg_length=max_arg_length,
+        max_label_length=max_label_length,
+        wrap_width=wrap_width,
     )
-    for nid in final_ids:
-        g.edge(nid, node_id)
 
-    return [node_id]
+
+def add_advice_node(
+    g: Digraph, node_id: str, advice: Dict, css_class: Optional[str] = None
+) -> None:
+    """
+    Attach a note suggesting a materialize step after a node
+    """
+    advice_id = f"{node_id}-materialize"
+    g.node(
+        advice_id,
+        label=f"materialize?\\n{advice['impact']} impact",
+        tooltip=advice["reason"],
+        shape="note",
+        style="dashed,filled",
+        fillcolor=ADVICE_COLORS[advice["impact"]],
+        fontsize="10",
+        **({"class": css_class} if css_class else {}),
+    )
+    g.edge(node_id, advice_id, style="dashed", arrowhead="none")
 
 
 def _html_escape(text: str) -> str:
@@ -164,43 +402,269 @@ def _html_escape(text: str) -> str:
     )
 
 
-def step_label_html(cmd: str, args: List[Dict], header_color: str = "#cfe2ff") -> str:
+def step_arg_texts(args: List[Dict]) -> List[str]:
     """
-    Create an HTML-like Graphviz label for a node
+    Format the arguments of a step as they are written on the command line
     """
-    rows = [f'<TR><TD BGCOLOR="{header_color}" ALIGN="CENTER"><B>{cmd}</B></TD></TR>']
-
+    texts = []
     for arg in args:
         t = arg["type"]
         if t == "positional":
-            text = _html_escape(arg["value"])
+            text = arg["value"]
         elif t == "short_arg":
             val = f" {arg['value']}" if arg["value"] else ""
-            text = _html_escape(f"-{arg['flag']}{val}")
+            text = f"-{arg['flag']}{val}"
         elif t == "long_arg":
             val = arg["value"] or ""
             if val.startswith("="):
-                text = _html_escape(f"--{arg['flag']}{val}")
+                text = f"--{arg['flag']}{val}"
             elif val:
-                text = _html_escape(f"--{arg['flag']} {val}")
+                text = f"--{arg['flag']} {val}"
             else:
-                text = _html_escape(f"--{arg['flag']}")
+                text = f"--{arg['flag']}"
         else:
             continue
-        rows.append(f'<TR><TD ALIGN="LEFT">{text}</TD></TR>')
+        texts.append(text)
+    return texts
+
+
+def _elide(text: str, length: int) -> str:
+    return text[: max(length - len(ELLIPSIS), 0)] + ELLIPSIS
+
+
+def step_tooltip(
+    cmd: str, arg_texts: List[str], extra: Optional[List[str]] = None
+) -> str:
+    """
+    Create a tooltip with the full text of a step, one argument per line,
+    followed by any extra lines
+    Backslashes are escaped so Graphviz does not expand them (e.g. \\N)
+    """
+    lines = [cmd] + [text.replace("\\", "\\\\") for text in arg_texts]
+    return "\\n".join(lines + (extra or []))
+
+
+def fit_arg_texts(
+    texts: List[str],
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+) -> Tuple[List[str], bool]:
+    """
+    Apply the per-argument and per-node character budgets to argument texts
+    Arguments over budget are elided, and once the node budget is used up the
+    remaining arguments are replaced by a count. Also returns whether anything
+    was elided
+    """
+    fitted = []
+    truncated = False
+    remaining = max_label_length
+    for i, text in enumerate(texts):
+        if max_arg_length is not None and len(text) > max_arg_length:
+            text = _elide(text, max_arg_length)
+            truncated = True
+        if remaining is not None:
+            if remaining <= len(ELLIPSIS):
+                fitted.append(f"({len(texts) - i} more)")
+                return fitted, True
+            if len(text) > remaining:
+                text = _elide(text, remaining)
+                truncated = True
+            remaining -= len(text)
+        fitted.append(text)
+    return fitted, truncated
+
+
+def step_label_html(
+    cmd: str,
+    args: List[Dict],
+    header_color: str = "#cfe2ff",
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+    cost: Optional[Dict] = None,
+    critical: bool = False,
+    timing: Optional[Dict] = None,
+    invalid_args: Optional[List[int]] = None,
+) -> str:
+    """
+    Create an HTML-like Graphviz label for a node
+    Arguments longer than max_arg_length characters are truncated, as are
+    arguments beyond a total of max_label_length characters.
+    Arguments longer than wrap_width are wrapped onto several lines
+    A cost from analyze_costs is shown as a badge coloured by its level,
+    and nodes on the critical path get a thick border
+    Measurements from apply_timings are shown below the arguments
+    Arguments at the indexes in invalid_args are highlighted, see
+    validate_pipeline
+    """
+    rows = [f'<TR><TD BGCOLOR="{header_color}" ALIGN="CENTER"><B>{cmd}</B></TD></TR>']
 
+    texts, _ = fit_arg_texts(step_arg_texts(args), max_arg_length, max_label_length)
+    for i, text in enumerate(texts):
+        if wrap_width is not None and len(text) > wrap_width:
+            lines = textwrap.wrap(text, wrap_width, break_on_hyphens=False)
+            text = '<BR ALIGN="LEFT"/>'.join(_html_escape(line) for line in lines)
+            text += '<BR ALIGN="LEFT"/>'
+        else:
+            text = _html_escape(text)
+        if invalid_args and i in invalid_args:
+            rows.append(
+                f'<TR><TD BGCOLOR="{INVALID_COLOR}" ALIGN="LEFT">{text}</TD></TR>'
+            )
+        else:
+            rows.append(f'<TR><TD ALIGN="LEFT">{text}</TD></TR>')
+
+    if timing:
+        text = _html_escape(" · ".join(format_timing(timing)))
+        rows.append(
+            f'<TR><TD ALIGN="RIGHT"><FONT POINT-SIZE="9">{text}</FONT></TD></TR>'
+        )
+
+    if cost:
+        badge_color = COST_COLORS[cost_level(cost["weight"])]
+        rows.append(
+            f'<TR><TD BGCOLOR="{badge_color}" ALIGN="RIGHT">'
+            f'<FONT POINT-SIZE="9">{_html_escape(format_cost(cost))}</FONT></TD></TR>'
+        )
+
+    border = f'BORDER="3" COLOR="{CRITICAL_COLOR}"' if critical else 'BORDER="0"'
     return f"""<
-<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0" CELLPADDING="6">
+<TABLE {border} CELLBORDER="1" CELLSPACING="0" CELLPADDING="6">
     {''.join(rows)}
 </TABLE>
 >"""
 
 
-def _extract_cmd(step_dict: Dict) -> str:
+def annotate_steps(
+    steps: List[Dict],
+    advise: bool = False,
+    show_costs: bool = False,
+    cost_overrides: Optional[Dict[str, Dict]] = None,
+    timings: Optional[Timings] = None,
+    heatmap: str = "time",
+    validate: bool = False,
+) -> List[Dict]:
     """
-    Get the command from a step dict (last word of command field)
+    Return the steps annotated with the suggestions, costs, measurements
+    and validation issues drawn by workflow_diagram, see advise_materialize,
+    analyze_costs, apply_timings and validate_pipeline. The input is not
+    modified
     """
-    return step_dict["command"].split()[-1]
+    if validate:
+        steps, _ = validate_pipeline(steps)
+
+    if advise:
+        steps, _ = advise_materialize(steps)
+
+    if show_costs:
+        steps, _ = analyze_costs(steps, cost_overrides)
+
+    if timings is not None:
+        steps = apply_timings(steps, timings, heatmap)
+
+    return steps
+
+
+def page_fn(output_fn: str, number: int) -> str:
+    """
+    Get the path of a page of a paginated diagram, e.g. out.svg -> out-2.svg
+    """
+    path = Path(output_fn)
+    return str(path.with_name(f"{path.stem}-{number}{path.suffix}"))
+
+
+def remove_stale_pages(output_fn: str, first_number: int) -> List[str]:
+    """
+    Delete the pages of an earlier rendering of a longer pipeline, from page
+    first_number up to the first missing page, and return their paths
+    """
+    removed = []
+    number = first_number
+    while True:
+        fn = page_fn(output_fn, number)
+        try:
+            Path(fn).unlink()
+        except FileNotFoundError:
+            break
+        logger.info("%s: removed page of an earlier diagram", fn)
+        removed.append(fn)
+        number += 1
+    return removed
+
+
+def paginate_steps(
+    steps: List[Dict], page_size: int, page_url: Callable[[int], str]
+) -> List[Tuple[List[Dict], Dict]]:
+    """
+    Split a pipeline into pages of at most page_size steps, counting nested
+    steps, so each page can be laid out as a separate diagram. Only the main
+    chain is split, so a step is on the same page as its nested pipelines,
+    and a step with more nested steps than page_size has a page of its own.
+    Each page keeps the pipeline header.
+
+    Returns (steps, page) for each page, where page has the page "number",
+    links to the "previous" and "next" pages, and "elsewhere", links to the
+    pages drawing the GDALG files read again on this page (see
+    resolve_references) by node id. Links are (number, page_url(number))
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    header = steps[:1] if steps and is_pipeline_header(steps[0]) else []
+    chunks: List[List[Dict]] = []
+    size = 0
+    for step in steps[len(header) :]:
+        count = sum(1 for _ in iter_steps([step]))
+        if not chunks or size + count > page_size:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(step)
+        size += count
+    if not chunks:
+        chunks = [[]]
+
+    # pages of the steps other steps can link to
+    node_pages = {
+        step["node_id"]: number
+        for number, chunk in enumerate(chunks, start=1)
+        for step in iter_steps(chunk)
+        if "node_id" in step
+    }
+
+    def link(number: int) -> PageLink:
+        return number, page_url(number)
+
+    pages = []
+    for number, chunk in enumerate(chunks, start=1):
+        elsewhere = {}
+        for step in iter_steps(chunk):
+            reference = step.get("reference", {})
+            if reference.get("status") != SHARED:
+                continue
+            source_page = node_pages.get(reference["source_id"])
+            if source_page is not None and source_page != number:
+                elsewhere[reference["source_id"]] = link(source_page)
+        page = {
+            "number": number,
+            "previous": link(number - 1) if number > 1 else None,
+            "next": link(number + 1) if number < len(chunks) else None,
+            "elsewhere": elsewhere,
+        }
+        pages.append((header + chunk, page))
+    return pages
+
+
+def add_page_node(g: Digraph, node_id: str, text: str, link: PageLink) -> None:
+    """
+    Add a node linking to another page of a paginated diagram
+    """
+    number, url = link
+    g.node(
+        node_id,
+        label=f"{text}\\npage {number}",
+        URL=url,
+        tooltip=url,
+        **PAGE_NODE_ATTR,
+    )
 
 
 def workflow_diagram(
@@ -214,13 +678,54 @@ def workflow_diagram(
     docs_root: str = DOCS_ROOT,
     graph_attr: Optional[Dict] = None,
     node_attr: Optional[Dict] = None,
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+    stable_ids: bool = False,
+    advise: bool = False,
+    show_costs: bool = False,
+    cost_overrides: Optional[Dict[str, Dict]] = None,
+    timings: Optional[Timings] = None,
+    heatmap: str = "time",
+    merge: bool = False,
+    interactive: bool = False,
+    page: Optional[Dict] = None,
+    validate: bool = False,
 ) -> Digraph:
     """
     Build a Graphviz diagram from a structured pipeline dict list
+    If stable_ids is True, node ids are based on structural hashes of
+    the steps rather than their order, so they do not change when
+    unrelated steps are added or removed
+    If advise is True, suggested materialize steps are shown as notes
+    If show_costs is True, nodes are badged with their cost and the most
+    expensive path is highlighted, see analyze_costs
+    If timings are given, nodes are coloured by their share of the heatmap
+    metric and labelled with their measurements, see apply_timings
+    If merge is True, repeated identical nested inputs are drawn once,
+    see merge_subpipelines
+    If interactive is True, nested pipelines are marked as SVG groups that
+    can be collapsed, see add_interactivity
+    If page is given, the steps are a page of a longer pipeline, and are
+    linked to the other pages, see paginate_steps
+    If validate is True, steps and arguments that do not match the usage of
+    the GDAL pipeline steps are highlighted, see validate_pipeline
     """
 
+    steps = annotate_steps(
+        steps, advise, show_costs, cost_overrides, timings, heatmap, validate
+    )
+
+    if merge:
+        steps, _ = merge_subpipelines(steps)
+
+    if stable_ids:
+        steps = assign_node_ids(
+            steps if steps and "hash" in steps[0] else hash_steps(steps)
+        )
+
     display_steps = steps
-    if steps and _is_pipeline_header(steps[0]):
+    if steps and is_pipeline_header(steps[0]):
         display_steps = steps[1:]
 
     rankdir = "TB" if vertical else "LR"
@@ -236,19 +741,33 @@ def workflow_diagram(
         node_attr=_node_attr,
     )
 
-    node_counter = [0]
-    last_ids: List[str] = []
-
-    for step in display_steps:
-        last_ids = add_step_node(
-            g,
-            step,
-            parent_ids=last_ids or [None],
-            node_counter=node_counter,
-            pipeline_type=pipeline_type,
-            header_color=header_color,
-            docs_root=docs_root,
-        )
+    parent_ids: List[Optional[str]] = [None]
+    if page and page["previous"]:
+        add_page_node(g, PREVIOUS_PAGE_ID, "continued from", page["previous"])
+        parent_ids = [PREVIOUS_PAGE_ID]
+
+    final_ids = add_pipeline_nodes(
+        g,
+        display_steps,
+        parent_ids=parent_ids,
+        node_counter=[0],
+        pipeline_type=pipeline_type,
+        header_color=header_color,
+        docs_root=docs_root,
+        max_arg_length=max_arg_length,
+        max_label_length=max_label_length,
+        wrap_width=wrap_width,
+        interactive=interactive,
+    )
+
+    if page:
+        if page["next"]:
+            add_page_node(g, NEXT_PAGE_ID, "continued on", page["next"])
+            for nid in final_ids:
+                g.edge(nid, NEXT_PAGE_ID)
+        # the sources of links from this page drawn on other pages
+        for node_id, link in page["elsewhere"].items():
+            add_page_node(g, node_id, "expanded on", link)
 
     return g
 
@@ -270,7 +789,7 @@ def detect_pipeline_type(steps: List[Dict]) -> Optional[str]:
 
 
 def generate_diagram(
-    pipeline: str,
+    pipeline: Union[str, List[Dict]],
     output_fn: str,
     vertical: bool = False,
     fontname: str = "Helvetica",
@@ -278,30 +797,310 @@ def generate_diagram(
     docs_root: str = DOCS_ROOT,
     graph_attr: Optional[Dict] = None,
     node_attr: Optional[Dict] = None,
+    minify: bool = False,
+    timeout: Optional[float] = None,
+    max_memory: Optional[int] = None,
+    max_cpu_time: Optional[int] = None,
+    stable_ids: bool = False,
+    backend: str = "subprocess",
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+    skip_unchanged: bool = True,
+    manifest: Optional[str] = None,
+    advise: bool = False,
+    show_costs: bool = False,
+    cost_overrides: Optional[Dict[str, Dict]] = None,
+    timings: Optional[Union[str, Timings]] = None,
+    heatmap: str = "time",
+    resolve: bool = False,
+    source_fn: Optional[str] = None,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    merge: bool = False,
+    interactive: bool = False,
+    page_size: Optional[int] = None,
+    validate: bool = False,
 ):
     """
     Parse a GDAL pipeline string and generate a workflow diagram.
+    Already parsed steps can be passed instead of a string.
+    SVG output can optionally be minified, and .svgz output is gzip compressed.
+
+    timeout (seconds), max_memory (MB) and max_cpu_time (seconds) limit the
+    Graphviz layout process. If a limit is hit the diagram is rendered again
+    with a simpler layout and truncated labels, and a warning is logged.
+    RenderLimitError is raised if the simplified diagram also hits a limit.
+    backend selects how Graphviz is run, see gdalgviz.render.BACKENDS.
+
+    max_arg_length and max_label_length are character budgets for each argument
+    and for all arguments of a node. Elided arguments are shown in full in the
+    node tooltip. Arguments longer than wrap_width are wrapped instead.
+
+    An existing output file with identical content is not rewritten, so its
+    modification time is kept, unless skip_unchanged is False. If a manifest
+    path is given, the output and input hashes are recorded in it.
+    If advise is True, steps where a materialize step would avoid recomputing
+    expensive streamed steps are annotated, see advise_materialize.
+    If show_costs is True, nodes are badged with their estimated cost and the
+    most expensive path is highlighted. cost_overrides replace the costs of
+    gdalgviz.commands.COMMAND_COSTS, see load_cost_overrides.
+    timings is a path to a JSON file of measured step times and peak memory,
+    or its loaded content, see load_timings. Nodes are coloured by their
+    share of the total time or memory, selected by heatmap.
+    If resolve is True, reads of other GDALG files are expanded into nested
+    pipelines, up to max_depth levels deep. Relative paths are resolved from
+    the directory of source_fn, see resolve_references.
+    If merge is True, repeated identical nested inputs are drawn once with
+    an edge to each step they feed, see merge_subpipelines.
+    If interactive is True, SVG output embeds a script to collapse and expand
+    nested pipelines, and to pan and zoom, see add_interactivity.
+    If page_size is given, pipelines of more than page_size steps are split
+    into pages laid out in parallel and written to output_fn with the page
+    number added, e.g. out-1.svg and out-2.svg, see paginate_steps. Pages left
+    from an earlier rendering of a longer pipeline are deleted, including all
+    pages if the pipeline now fits in output_fn.
+    If validate is True, steps and arguments that do not match the usage of
+    the GDAL pipeline steps are highlighted, see validate_pipeline.
     """
     output_format = get_output_format(output_fn, VALID_FORMATS)
+    if minify and output_format not in SVG_FORMATS:
+        raise ValueError(
+            f"Minification is only supported for SVG output, not '{output_format}'"
+        )
+    if interactive and output_format not in SVG_FORMATS:
+        raise ValueError(
+            f"Interactive output is only supported for SVG output, not '{output_format}'"
+        )
 
     # parse into structured dict using lark
-    steps = parse_pipeline(pipeline)
+    steps = parse_pipeline(pipeline) if isinstance(pipeline, str) else pipeline
+    if resolve:
+        steps = resolve_references(steps, source_fn, max_depth)
+    if isinstance(timings, str):
+        timings = load_timings(timings)
 
-    pipeline_type = detect_pipeline_type(steps)
-    diagram = workflow_diagram(
-        steps,
-        output_format,
-        pipeline_type,
+    diagram_options: Dict[str, Any] = dict(
         vertical=vertical,
         fontname=fontname,
         header_color=header_color,
         docs_root=docs_root,
         graph_attr=graph_attr,
         node_attr=node_attr,
+        stable_ids=stable_ids,
+        max_arg_length=max_arg_length,
+        max_label_length=max_label_length,
+        wrap_width=wrap_width,
+        advise=advise,
+        show_costs=show_costs,
+        cost_overrides=cost_overrides,
+        timings=timings,
+        heatmap=heatmap,
+        merge=merge,
+        interactive=interactive,
+        validate=validate,
+    )
+    # recorded in the manifest, as they change the output as much as the pipeline
+    render_options = dict(
+        diagram_options,
+        minify=minify,
+        resolve=resolve,
+        max_depth=max_depth,
+        page_size=page_size,
+    )
+    limits: Dict[str, Any] = dict(
+        timeout=timeout, max_memory=max_memory, max_cpu_time=max_cpu_time
+    )
+    post_process = minify or output_format == "svgz"
+    render_format = "svg" if output_format in SVG_FORMATS else output_format
+
+    pages: List[Tuple[List[Dict], Dict]] = []
+    if page_size is not None:
+        # annotated before splitting, as they depend on the whole pipeline,
+        # e.g. the critical path or each step's share of the total time
+        steps = annotate_steps(
+            steps, advise, show_costs, cost_overrides, timings, heatmap, validate
+        )
+        diagram_options.update(
+            advise=False, show_costs=False, timings=None, validate=False
+        )
+        pages = paginate_steps(
+            steps, page_size, lambda number: Path(page_fn(output_fn, number)).name
+        )
+
+    if len(pages) > 1:
+        page_fns = [page_fn(output_fn, page["number"]) for _, page in pages]
+
+        def render_page(page_steps: List[Dict], page: Dict, fn: str) -> bytes:
+            data = render_steps(
+                page_steps,
+                render_format,
+                fn,
+                backend=backend,
+                page=page,
+                **limits,
+                **diagram_options,
+            )
+            return _write_diagram(
+                data, fn, post_process, minify, interactive, skip_unchanged
+            )
+
+        # each page is a separate graph, so pages are laid out in parallel
+        with ThreadPoolExecutor(min(len(pages), os.cpu_count() or 1)) as pool:
+            outputs = list(
+                pool.map(
+                    render_page,
+                    [page_steps for page_steps, _ in pages],
+                    [page for _, page in pages],
+                    page_fns,
+                )
+            )
+        removed = remove_stale_pages(output_fn, len(pages) + 1)
+        if manifest is not None:
+            update_manifest(
+                manifest,
+                {
+                    fn: manifest_entry(out, pipeline, render_options)
+                    for fn, out in zip(page_fns, outputs)
+                },
+                removed,
+            )
+        return
+
+    if (
+        not post_process
+        and not interactive
+        and backend == "subprocess"
+        and all(v is None for v in limits.values())
+        and not skip_unchanged
+        and manifest is None
+    ):
+        pipeline_type = detect_pipeline_type(steps)
+        diagram = workflow_diagram(
+            steps, output_format, pipeline_type, **diagram_options
+        )
+        output_stem = Path(output_fn).with_suffix("")
+        diagram.render(output_stem, cleanup=True)
+        if page_size is not None:
+            remove_stale_pages(output_fn, 1)
+        return
+
+    data = render_steps(
+        steps,
+        render_format,
+        output_fn,
+        backend=backend,
+        **limits,
+        **diagram_options,
+    )
+    output = _write_diagram(
+        data, output_fn, post_process, minify, interactive, skip_unchanged
+    )
+    # e.g. the pages of an earlier rendering of a longer pipeline
+    removed = remove_stale_pages(output_fn, 1) if page_size is not None else []
+
+    if manifest is not None:
+        update_manifest(
+            manifest,
+            {output_fn: manifest_entry(output, pipeline, render_options)},
+            removed,
+        )
+
+
+def _write_diagram(
+    data: bytes,
+    output_fn: str,
+    post_process: bool,
+    minify: bool = False,
+    interactive: bool = False,
+    skip_unchanged: bool = False,
+) -> bytes:
+    """
+    Post-process a rendered diagram and write it, returning the data written
+    """
+    if interactive:
+        data = add_interactivity(data)
+
+    output = data
+    if post_process:
+        output = encode_svg(data, output_fn, minify=minify)
+        saved = len(data) - len(output)
+        logger.info(
+            "%s: %d bytes (saved %d bytes, %.0f%%)",
+            output_fn,
+            len(output),
+            saved,
+            100 * saved / len(data) if data else 0,
+        )
+
+    if skip_unchanged:
+        write_if_changed(output, output_fn)
+    else:
+        Path(output_fn).write_bytes(output)
+    return output
+
+
+def render_steps(
+    steps: List[Dict],
+    output_format: str,
+    name: str = "diagram",
+    engine: str = "dot",
+    timeout: Optional[float] = None,
+    max_memory: Optional[int] = None,
+    max_cpu_time: Optional[int] = None,
+    backend: str = "subprocess",
+    **diagram_options: Any,
+) -> bytes:
+    """
+    Build a diagram from parsed steps and render it with Graphviz,
+    returning the output. Other keyword arguments are passed to workflow_diagram.
+    If a render limit is hit the diagram is rendered again with a simpler
+    layout and truncated labels, and a warning with its name is logged.
+    RenderLimitError is raised if the simplified diagram also hits a limit.
+    """
+    pipeline_type = detect_pipeline_type(steps)
+    limits: Dict[str, Any] = dict(
+        timeout=timeout, max_memory=max_memory, max_cpu_time=max_cpu_time
     )
+    diagram = workflow_diagram(steps, output_format, pipeline_type, **diagram_options)
+    try:
+        return render_source(
+            diagram.source, output_format, engine, backend=backend, **limits
+        )
+    except RenderLimitError as e:
+        logger.warning("%s: %s - rendering a simplified diagram", name, e)
 
-    output_stem = Path(output_fn).with_suffix("")
-    diagram.render(output_stem, cleanup=True)
+    graph_attr = {**(diagram_options.get("graph_attr") or {}), **DEGRADED_GRAPH_ATTR}
+    diagram = workflow_diagram(
+        steps,
+        output_format,
+        pipeline_type,
+        **{
+            **diagram_options,
+            "graph_attr": graph_attr,
+            "max_arg_length": min(
+                diagram_options.get("max_arg_length") or DEGRADED_MAX_ARG_LENGTH,
+                DEGRADED_MAX_ARG_LENGTH,
+            ),
+        },
+    )
+    return render_source(
+        diagram.source, output_format, engine, backend=backend, **limits
+    )
+
+
+def generate_diff_diagram(
+    old_pipeline: str, new_pipeline: str, output_fn: str, **kwargs: Any
+) -> Dict[str, int]:
+    """
+    Generate a diagram of the new pipeline highlighting the steps that were
+    changed or added, with removed steps shown in their old positions.
+    Node ids are based on structural hashes so they are stable between runs.
+    Other keyword arguments are passed to generate_diagram.
+    Returns the number of steps with each diff status.
+    """
+    merged = diff_pipelines(parse_pipeline(old_pipeline), parse_pipeline(new_pipeline))
+    generate_diagram(merged, output_fn, stable_ids=True, **kwargs)
+    return diff_summary(merged)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from gdalgviz import __version__
+from gdalgviz.postprocess import write_if_changed
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# bumped if the layout of the manifest file changes
+MANIFEST_VERSION = 1
+
+# serializes manifest updates from threads of this process
+_manifest_lock = threading.Lock()
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Return the SHA-256 hex digest of rendered output
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def input_hash(
+    pipeline: Union[str, List[Dict]], options: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Return the SHA-256 hex digest of a pipeline string or its parsed steps,
+    and of the options it was rendered with if given
+    """
+    if not isinstance(pipeline, str):
+        pipeline = json.dumps(pipeline, sort_keys=True)
+    if options:
+        # e.g. the same pipeline drawn vertically is a different output
+        pipeline += "\0" + json.dumps(options, sort_keys=True, default=str)
+    return content_hash(pipeline.encode("utf-8"))
+
+
+def manifest_entry(
+    data: bytes,
+    pipeline: Union[str, List[Dict]],
+    options: Optional[Dict[str, Any]] = None,
+) -> Dict[str, str]:
+    """
+    Describe a diagram rendered from pipeline with options for the output
+    manifest
+    """
+    return {
+        "hash": content_hash(data),
+        "input_hash": input_hash(pipeline, options),
+        "gdalgviz_version": __version__,
+    }
+
+
+def _manifest_key(output_fn: str, manifest_fn: str) -> str:
+    """
+    Output paths are stored relative to the manifest so the folder can be moved
+    """
+    manifest_dir = Path(manifest_fn).resolve().parent
+    try:
+        key = os.path.relpath(Path(output_fn).resolve(), manifest_dir)
+    except ValueError:
+        # on a different drive on Windows
+        key = str(Path(output_fn).resolve())
+    return Path(key).as_posix()
+
+
+def load_manifest(manifest_fn: str) -> Dict[str, Dict[str, str]]:
+    """
+    Return the outputs recorded in a manifest, keyed by their path relative
+    to the manifest, or an empty dict if it does not exist yet
+    """
+    manifest_path = Path(manifest_fn)
+    if not manifest_path.exists():
+        return {}
+    with manifest_path.open("r", encoding="utf-8") as f:
+        return json.load(f).get("outputs", {})
+
+
+@contextmanager
+def _locked(manifest_fn: str) -> Iterator[None]:
+    """
+    Hold the manifest lock of this process, and where fcntl is available an
+    exclusive lock on the folder of the manifest, shared with other
+    processes. The manifest itself is replaced when written, so cannot be
+    locked, and locking the folder leaves no lock file behind
+    """
+    with _manifest_lock:
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(Path(manifest_fn).resolve().parent, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            # closing the folder releases the lock
+            os.close(fd)
+
+
+def update_manifest(
+    manifest_fn: str,
+    entries: Dict[str, Dict[str, str]],
+    removed: Iterable[str] = (),
+) -> bool:
+    """
+    Merge entries (output path -> manifest_entry) into the manifest file,
+    and drop the entries of the removed output paths.
+    The file is sorted and only rewritten if its content changes, so it
+    can be synced incrementally like the diagrams. Returns True if written.
+    Concurrent updates are serialized, and the file is replaced atomically
+    so readers never see a partly written manifest.
+    """
+    with _locked(manifest_fn):
+        outputs = load_manifest(manifest_fn)
+        for output_fn, entry in entries.items():
+            outputs[_manifest_key(output_fn, manifest_fn)] = entry
+        for output_fn in removed:
+            outputs.pop(_manifest_key(output_fn, manifest_fn), None)
+
+        manifest = {"manifest_version": MANIFEST_VERSION, "outputs": outputs}
+        data = (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8")
+        return write_if_changed(data, manifest_fn, atomic=True)
@@ -0,0 +1,101 @@
+from typing import Dict, List, Tuple
+
+from gdalgviz.hashing import hash_steps
+from gdalgviz.parser import (
+    get_command,
+    get_nested_pipelines,
+    is_pipeline_header,
+    iter_steps,
+    step_dataset,
+)
+
+
+def merge_subpipelines(steps: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Return hashed copies of the steps (see hash_steps) where nested inputs
+    that are structurally identical to an earlier nested input are drawn
+    once. A step with a repeated input gets "merged", a dict of the index of
+    the input to the node id of the last step of its first occurrence, which
+    then has an edge to every step it feeds.
+
+    Also returns a list of the merged inputs, with the "location" of each
+    repeated input and its "source" as step paths (see iter_step_paths), the
+    number of "steps" no longer drawn, and the datasets it "reads" again.
+    Tee branches and the steps of referenced GDALG files are not merged.
+    """
+    hashed = hash_steps(steps)
+    display_steps = hashed
+    if hashed and is_pipeline_header(hashed[0]):
+        display_steps = hashed[1:]
+
+    # first occurrence of each nested input, as (path, steps), by block hash
+    first: Dict[str, Tuple[str, List[Dict]]] = {}
+    merged: List[Dict] = []
+    # walked in the order steps are drawn, so first occurrences are drawn first
+    stack = [("", enumerate(display_steps, start=1))]
+    while stack:
+        prefix, numbered = stack[-1]
+        item = next(numbered, None)
+        if item is None:
+            stack.pop()
+            continue
+        i, step = item
+        path = f"{prefix}{i}"
+        nested = step.get("nested")
+        if not nested:
+            continue
+        blocks = nested if isinstance(nested, list) else [nested]
+        nested_pipelines = get_nested_pipelines(step)
+        kept = []
+        for n, (block, nested_steps) in enumerate(zip(blocks, nested_pipelines)):
+            location = f"{path}.{n + 1}"
+            if get_command(step) == "tee" or "reference" in step:
+                kept.append((location, nested_steps))
+                continue
+            if block["hash"] not in first:
+                first[block["hash"]] = (location, nested_steps)
+                kept.append((location, nested_steps))
+                continue
+
+            source, source_steps = first[block["hash"]]
+            last = source_steps[-1]
+            last.setdefault("node_id", f"merged-{len(merged)}")
+            step.setdefault("merged", {})[n] = last["node_id"]
+            repeated = list(iter_steps(nested_steps))
+            merged.append(
+                {
+                    "location": location,
+                    "source": source,
+                    "steps": len(repeated),
+                    "reads": [
+                        step_dataset(s)
+                        for s in repeated
+                        if get_command(s) == "read" and step_dataset(s)
+                    ],
+                }
+            )
+        for location, nested_steps in reversed(kept):
+            stack.append((f"{location}.", enumerate(nested_steps, start=1)))
+
+    return hashed, merged
+
+
+def format_merged(merged: List[Dict]) -> str:
+    """
+    Format the nested inputs merged by merge_subpipelines as a text report
+    """
+    if not merged:
+        return "No repeated nested pipelines"
+    removed = sum(entry["steps"] for entry in merged)
+    reads = sum(len(entry["reads"]) for entry in merged)
+    lines = [
+        f"Merged {len(merged)} repeated nested pipelines, "
+        f"removing {removed} nodes and {reads} repeated reads"
+    ]
+    for entry in merged:
+        read_text = f", reads {', '.join(entry['reads'])}" if entry["reads"] else ""
+        lines.append(
+            f"  step {entry['location']} repeats step {entry['source']} "
+            f"({entry['steps']} steps{read_text})"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,257 @@
+import json
+import textwrap
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from gdalgviz.main import (
+    DOCS_ROOT,
+    GDAL_OPERATORS,
+    build_docs_url,
+    detect_pipeline_type,
+    fit_arg_texts,
+    get_command_type,
+    get_output_format,
+    step_arg_texts,
+)
+from gdalgviz.manifest import manifest_entry, update_manifest
+from gdalgviz.merge import merge_subpipelines
+from gdalgviz.parser import (
+    get_command,
+    get_nested_pipelines,
+    is_pipeline_header,
+    parse_pipeline,
+)
+from gdalgviz.postprocess import write_if_changed
+from gdalgviz.resolve import DEFAULT_MAX_DEPTH, RESOLVED, SHARED, resolve_references
+
+# rendered by the viewer rather than laid out by Graphviz. .md wraps the
+# flowchart in a fenced block, shown as a diagram by Git hosts
+MERMAID_FORMATS = ["mmd", "md"]
+
+INDENT = "    "
+
+
+def _mermaid_escape(text: str) -> str:
+    """
+    Replace characters with a meaning in Mermaid labels by entity codes
+    """
+    return (
+        text.replace("#", "#35;")
+        .replace("&", "#amp;")
+        .replace('"', "#quot;")
+        .replace("<", "#lt;")
+        .replace(">", "#gt;")
+    )
+
+
+def mermaid_label(
+    cmd: str,
+    args: List[Dict],
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+) -> str:
+    """
+    Create the label of a Mermaid node, with the command in bold and one
+    argument per line, using the same budgets as step_label_html
+    """
+    rows = [f"<b>{_mermaid_escape(cmd)}</b>"]
+    texts, _ = fit_arg_texts(step_arg_texts(args), max_arg_length, max_label_length)
+    for text in texts:
+        lines = [text]
+        if wrap_width is not None and len(text) > wrap_width:
+            lines = textwrap.wrap(text, wrap_width, break_on_hyphens=False)
+        rows.append("<br/>".join(_mermaid_escape(line) for line in lines))
+    return "<br/>".join(rows)
+
+
+def mermaid_flowchart(
+    steps: List[Dict],
+    pipeline_type: Optional[str] = None,
+    vertical: bool = False,
+    fontname: Optional[str] = None,
+    header_color: str = "#cfe2ff",
+    docs_root: str = DOCS_ROOT,
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+    merge: bool = False,
+) -> str:
+    """
+    Build a Mermaid flowchart from a structured pipeline dict list, drawn
+    like workflow_diagram: tee branches are side outputs, nested pipelines
+    feed into their step, steps of resolved GDALG files are grouped in a
+    subgraph, and nodes link to the GDAL docs. Needs no Graphviz layout,
+    as the flowchart is laid out by the viewer.
+    If merge is True, repeated identical nested inputs are drawn once,
+    see merge_subpipelines
+    """
+    if merge:
+        steps, _ = merge_subpipelines(steps)
+
+    display_steps = steps
+    if steps and is_pipeline_header(steps[0]):
+        display_steps = steps[1:]
+
+    lines = []
+    if fontname:
+        init = {"themeVariables": {"fontFamily": fontname}}
+        lines.append(f"%%{{init: {json.dumps(init)}}}%%")
+    lines.append(f"flowchart {'TB' if vertical else 'LR'}")
+    lines.append(f"{INDENT}classDef default fill:{header_color}")
+
+    # edges and links are written after all nodes, so a node is in the
+    # subgraph it was declared in, and refer to nodes by their internal ids
+    edges: List[Tuple[str, str, str]] = []
+    links = []
+    # internal node ids (stable ids, merged and referenced steps) to Mermaid ids
+    ids: Dict[str, str] = {}
+    stack: List[Dict[str, Any]] = [
+        {"steps": iter(display_steps), "parents": [], "indent": INDENT}
+    ]
+    while stack:
+        frame = stack[-1]
+        step = next(frame["steps"], None)
+        if step is None:
+            stack.pop()
+            if "into" in frame:
+                edges.extend((pid, frame["into"], "-->") for pid in frame["parents"])
+            if frame.get("cluster"):
+                lines.append(f"{frame['outer_indent']}end")
+            continue
+
+        indent = frame["indent"]
+        cmd = get_command(step)
+        args = step.get("args", [])
+        mermaid_id = f"n{len(ids)}"
+        node_id = step.get("node_id") or mermaid_id
+        ids[node_id] = mermaid_id
+
+        label = mermaid_label(cmd, args, max_arg_length, max_label_length, wrap_width)
+        lines.append(f'{indent}{mermaid_id}["{label}"]')
+
+        cmd_type = pipeline_type or get_command_type(cmd)
+        if cmd_type and cmd.lower() not in GDAL_OPERATORS:
+            url = build_docs_url(docs_root, cmd_type, cmd)
+            # elided arguments are shown in full in the tooltip
+            arg_texts = step_arg_texts(args)
+            _, truncated = fit_arg_texts(arg_texts, max_arg_length, max_label_length)
+            tooltip = ""
+            if truncated:
+                text = " ".join([cmd] + arg_texts).replace('"', "'")
+                tooltip = f' "{text}"'
+            links.append(f'{INDENT}click {mermaid_id} href "{url}"{tooltip} _blank')
+
+        edges.extend((pid, node_id, "-->") for pid in frame["parents"])
+        # a GDALG file read again after resolve_references expanded it
+        reference = step.get("reference", {})
+        if reference.get("status") == SHARED:
+            edges.append((reference["source_id"], node_id, "-.->"))
+        frame["parents"] = [node_id]
+
+        nested_pipelines = get_nested_pipelines(step)
+        if not nested_pipelines:
+            continue
+
+        if cmd == "tee":
+            # tee: nested steps are dead-end side outputs, main flow continues
+            stack.extend(
+                {"steps": iter(nested_steps), "parents": [node_id], "indent": indent}
+                for nested_steps in reversed(nested_pipelines)
+            )
+            continue
+
+        # blend/overlay style: each nested pipeline feeds INTO this node,
+        # with inputs merged by merge_subpipelines linked to their first copy
+        merged = step.get("merged", {})
+        nested_indent = indent
+        cluster = reference.get("status") == RESOLVED
+        if cluster:
+            title = _mermaid_escape(reference["path"])
+            lines.append(f'{indent}subgraph c{mermaid_id}["{title}"]')
+            nested_indent = indent + INDENT
+        inputs = [
+            {
+                "steps": iter([] if n in merged else nested_steps),
+                "parents": [merged[n]] if n in merged else [],
+                "indent": nested_indent,
+                "into": node_id,
+            }
+            for n, nested_steps in enumerate(nested_pipelines)
+        ]
+        if cluster:
+            # closed once all of its steps have been declared
+            inputs[-1].update(cluster=True, outer_indent=indent)
+        stack.extend(reversed(inputs))
+
+    lines.extend(f"{INDENT}{ids[a]} {arrow} {ids[b]}" for a, b, arrow in edges)
+    lines.extend(links)
+    return "\n".join(lines) + "\n"
+
+
+def mermaid_output(
+    steps: List[Dict], output_format: str = "mmd", **flowchart_options: Any
+) -> bytes:
+    """
+    Build the content of a .mmd file, or of a .md file with the flowchart
+    in a fenced block. Keyword arguments are passed to mermaid_flowchart
+    """
+    text = mermaid_flowchart(steps, detect_pipeline_type(steps), **flowchart_options)
+    if output_format == "md":
+        text = f"```mermaid\n{text}```\n"
+    return text.encode("utf-8")
+
+
+def generate_mermaid(
+    pipeline: Union[str, List[Dict]],
+    output_fn: str,
+    vertical: bool = False,
+    fontname: Optional[str] = None,
+    header_color: str = "#cfe2ff",
+    docs_root: str = DOCS_ROOT,
+    max_arg_length: Optional[int] = None,
+    max_label_length: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+    skip_unchanged: bool = True,
+    manifest: Optional[str] = None,
+    resolve: bool = False,
+    source_fn: Optional[str] = None,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    merge: bool = False,
+) -> None:
+    """
+    Parse a GDAL pipeline string and write it as a Mermaid flowchart to a
+    .mmd file, or to a .md file as a fenced mermaid block.
+    Already parsed steps can be passed instead of a string. The other
+    options are those of generate_diagram that apply to Mermaid output, and
+    like there an identical file is not rewritten unless skip_unchanged is
+    False
+    """
+    output_format = get_output_format(output_fn, MERMAID_FORMATS)
+    steps = parse_pipeline(pipeline) if isinstance(pipeline, str) else pipeline
+    if resolve:
+        steps = resolve_references(steps, source_fn, max_depth)
+
+    flowchart_options: Dict[str, Any] = dict(
+        vertical=vertical,
+        fontname=fontname,
+        header_color=header_color,
+        docs_root=docs_root,
+        max_arg_length=max_arg_length,
+        max_label_length=max_label_length,
+        wrap_width=wrap_width,
+        merge=merge,
+    )
+    output = mermaid_output(steps, output_format, **flowchart_options)
+
+    if skip_unchanged:
+        write_if_changed(output, output_fn)
+    else:
+        Path(output_fn).write_bytes(output)
+
+    if manifest is not None:
+        # recorded in the manifest, as they change the output as much as the pipeline
+        options = dict(flowchart_options, resolve=resolve, max_depth=max_depth)
+        update_manifest(
+            manifest, {output_fn: manifest_entry(output, pipeline, options)}
+        )
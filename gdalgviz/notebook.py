@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from gdalgviz.main import SVG_FORMATS, VALID_FORMATS, get_output_format, render_steps
+from gdalgviz.parser import parse_pipeline
+from gdalgviz.postprocess import encode_svg
+
+
+class PipelineDiagram:
+    """
+    A pipeline diagram for Jupyter notebooks, rendered only when it is
+    displayed or saved. Rendered output is cached for each format and style,
+    so displaying the diagram again does not run Graphviz.
+    Keyword arguments are passed to workflow_diagram, e.g. vertical=True
+
+        PipelineDiagram("gdal raster pipeline ! read in.tif ! write out.tif")
+    """
+
+    def __init__(
+        self,
+        pipeline: Union[str, List[Dict]],
+        backend: str = "inprocess",
+        **diagram_options: Any,
+    ):
+        self.pipeline = pipeline
+        self.backend = backend
+        self.diagram_options = diagram_options
+        self._steps: Optional[List[Dict]] = None
+        # rendered output by format and style, shared with restyled copies
+        self._cache: Dict[str, bytes] = {}
+
+    @property
+    def steps(self) -> List[Dict]:
+        """
+        The parsed steps of the pipeline, parsed on first use
+        """
+        if self._steps is None:
+            if isinstance(self.pipeline, str):
+                self._steps = parse_pipeline(self.pipeline)
+            else:
+                self._steps = self.pipeline
+        return self._steps
+
+    def style(self, **diagram_options: Any) -> "PipelineDiagram":
+        """
+        Return a copy of the diagram with other workflow_diagram options,
+        sharing the parsed steps and render cache of this one
+        """
+        diagram = PipelineDiagram(
+            self.pipeline, self.backend, **{**self.diagram_options, **diagram_options}
+        )
+        diagram._steps = self._steps
+        diagram._cache = self._cache
+        return diagram
+
+    def _cache_key(self, output_format: str) -> str:
+        options = {"format": output_format, **self.diagram_options}
+        return json.dumps(options, sort_keys=True, default=str)
+
+    def render(self, output_format: str = "svg") -> bytes:
+        """
+        Render the diagram, or return the cached output if it was already
+        rendered in this format and style
+        """
+        key = self._cache_key(output_format)
+        if key not in self._cache:
+            self._cache[key] = render_steps(
+                self.steps,
+                output_format,
+                backend=self.backend,
+                **self.diagram_options,
+            )
+        return self._cache[key]
+
+    def save(self, output_fn: str, minify: bool = False) -> None:
+        """
+        Save the diagram, in the format given by the file extension
+        """
+        output_format = get_output_format(output_fn, VALID_FORMATS)
+        if output_format in SVG_FORMATS:
+            data = encode_svg(self.render("svg"), output_fn, minify=minify)
+        else:
+            data = self.render(output_format)
+        Path(output_fn).write_bytes(data)
+
+    def _repr_svg_(self) -> str:
+        return self.render("svg").decode("utf-8")
+
+    def _repr_mimebundle_(
+        self, include: Optional[Any] = None, exclude: Optional[Any] = None
+    ) -> Dict[str, str]:
+        return {"image/svg+xml": self._repr_svg_(), "text/plain": repr(self)}
+
+    def __repr__(self) -> str:
+        source = self.pipeline if isinstance(self.pipeline, str) else "parsed steps"
+        return f"PipelineDiagram({source!r})"
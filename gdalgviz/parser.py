@@ -1,11 +1,34 @@
+import json
 import re
-from lark import Lark, Transformer
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# standalone LALR parser generated from pipeline.lark by scripts/generate_parser.py
+from gdalgviz._pipeline_parser import Lark, Lark_StandAlone, Transformer
 
 _PIPELINE_PREFIX_RE = re.compile(
-    r"(^\s*gdal\s+(?:raster\s+|vector\s+)?pipeline)(\s+)(?!\s*!)",
+    r"(^\s*gdal\s+(?:raster\s+|vector\s+)?pipeline)(\s+)(?![\s!])",
     re.IGNORECASE | re.DOTALL,
 )
 
+# limits on untrusted input, so parsing time stays proportional to its size
+MAX_PIPELINE_LENGTH = 1_000_000
+MAX_NESTING_DEPTH = 32
+
+# flags naming the dataset of a read or write step
+DATASET_FLAGS = {"read": ("input", "i"), "write": ("output", "o")}
+
+# characters that change the bracket depth or start a quoted string
+_DEPTH_CHARS_RE = re.compile(r"[\[\]\"'\\]")
+
+
+class ParseLimitError(ValueError):
+    """
+    Raised when a pipeline is too long, too deeply nested or takes too long to parse
+    """
+
 
 class PipelineTransformer(Transformer):
 
@@ -79,17 +102,223 @@ def normalize_pipeline(text: str) -> str:
     return _PIPELINE_PREFIX_RE.sub(r"\1\2! ", text)
 
 
-def parse_pipeline(command_line):
+# parsers are created per thread so parsing never shares mutable state
+_thread_local = threading.local()
+
+
+def get_parser() -> Lark:
+    """
+    Load the pregenerated pipeline parser (no grammar compilation required)
+    Each thread gets its own parser instance
+    """
+    parser = getattr(_thread_local, "parser", None)
+    if parser is None:
+        parser = _thread_local.parser = Lark_StandAlone()
+    return parser
+
+
+def nesting_depth(command_line: str) -> int:
+    """
+    Return the deepest level of nested [ ] pipelines, ignoring brackets in
+    quoted strings. Only special characters are visited, so this is linear
+    even for unterminated quotes
+    """
+    depth = max_depth = 0
+    quote = None
+    escaped = -1
+    for match in _DEPTH_CHARS_RE.finditer(command_line):
+        char, pos = match.group(), match.start()
+        if pos == escaped:
+            continue
+        if quote:
+            if char == "\\":
+                escaped = pos + 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "[":
+            depth += 1
+            max_depth = max(max_depth, depth)
+        elif char == "]":
+            depth -= 1
+    return max_depth
+
+
+def check_limits(
+    command_line: str,
+    max_length: int = MAX_PIPELINE_LENGTH,
+    max_depth: int = MAX_NESTING_DEPTH,
+) -> None:
+    """
+    Raise ParseLimitError if a pipeline is longer than max_length characters
+    or has nested pipelines more than max_depth levels deep
+    """
+    if len(command_line) > max_length:
+        raise ParseLimitError(
+            f"Pipeline is {len(command_line)} characters long, "
+            f"the limit is {max_length}"
+        )
+    depth = nesting_depth(command_line)
+    if depth > max_depth:
+        raise ParseLimitError(
+            f"Pipeline has nested pipelines {depth} levels deep, "
+            f"the limit is {max_depth}"
+        )
+
+
+def parse_pipeline(
+    command_line: str,
+    max_length: int = MAX_PIPELINE_LENGTH,
+    max_depth: int = MAX_NESTING_DEPTH,
+    timeout: Optional[float] = None,
+) -> List[Dict]:
+    """
+    Parse a pipeline string into a list of step dicts.
+    Safe to call concurrently from multiple threads.
+    Raises ParseLimitError if the pipeline exceeds max_length or max_depth
+    (see check_limits), or if parsing takes more than timeout seconds.
+    """
+    check_limits(command_line, max_length, max_depth)
     command_line = normalize_pipeline(command_line)
-    # load grammar from pipeline.lark in the same directory
-    parser = Lark.open("pipeline.lark", rel_to=__file__, parser="lalr")
-    tree = parser.parse(command_line)
-    # print(tree.pretty())
+
+    if timeout is None:
+        tree = get_parser().parse(command_line)
+    else:
+        # check the time budget as each token is parsed
+        deadline = time.monotonic() + timeout
+        interactive = get_parser().parse_interactive(command_line)
+        token = None
+        for token in interactive.iter_parse():
+            if time.monotonic() > deadline:
+                raise ParseLimitError(
+                    f"Parsing took longer than {timeout}s, stopped at "
+                    f"line {token.line} column {token.column}"
+                )
+        tree = interactive.feed_eof(token)
 
     transformer = PipelineTransformer()
-    result = transformer.transform(tree)
+    return transformer.transform(tree)
+
+
+def parse_file(fn: str) -> str:
+    """
+    Open a file and return its pipeline command.
+    If the file is JSON (.json or .JSON), then the JSON is parsed data['command_line'] is returned.
+    Otherwise, the raw text content is returned.
+    """
+    file_path = Path(fn)
+
+    if file_path.suffix.lower() == ".json":
+        with file_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("command_line")
+    else:
+        with file_path.open("r", encoding="utf-8") as f:
+            return f.read()
+
+
+def get_nested_pipelines(step: Dict) -> List[List[Dict]]:
+    """
+    Return the nested pipelines of a step as lists of steps.
+    A step can have several bracketed inputs, and a nested pipeline
+    with a single step is not wrapped in a list by the parser
+    """
+    nested = step.get("nested")
+    if not nested:
+        return []
+    blocks = nested if isinstance(nested, list) else [nested]
+    return [
+        b["pipeline"] if isinstance(b["pipeline"], list) else [b["pipeline"]]
+        for b in blocks
+    ]
+
+
+def iter_steps(steps: List[Dict]) -> Iterator[Dict]:
+    """
+    Yield every step of a pipeline, including nested steps,
+    in the order they are added to a diagram
+    """
+    for _, step in iter_step_paths(steps):
+        yield step
+
+
+def iter_step_paths(steps: List[Dict], prefix: str = "") -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield (path, step) for every step of a pipeline in the same order as
+    iter_steps. Paths are 1-based step numbers, with nested steps numbered
+    within their parent step and nested pipeline, e.g. "4.1.2" is the second
+    step of the first nested pipeline of step 4
+    """
+    # (prefix, remaining numbered steps) of each pipeline being walked,
+    # so deeply nested pipelines do not hit the recursion limit
+    stack = [(prefix, enumerate(steps, start=1))]
+    while stack:
+        current_prefix, numbered = stack[-1]
+        item = next(numbered, None)
+        if item is None:
+            stack.pop()
+            continue
+        i, step = item
+        path = f"{current_prefix}{i}"
+        yield path, step
+        nested = get_nested_pipelines(step)
+        for n in range(len(nested), 0, -1):
+            stack.append((f"{path}.{n}.", enumerate(nested[n - 1], start=1)))
+
+
+def copy_steps(steps: List[Dict]) -> List[Dict]:
+    """
+    Return a deep copy of parsed steps. Unlike copy.deepcopy this does not
+    recurse, so it works on pipelines nested any number of levels deep.
+    Objects shared between steps are shared between the copied steps too
+    """
+    copied: List[Dict] = [{}] * len(steps)
+    copies: Dict[int, Any] = {id(steps): copied}
+    # (original, copy) of each dict and list still to be filled in
+    stack: List[Tuple[Any, Any]] = [(steps, copied)]
+    while stack:
+        original, target = stack.pop()
+        items = original.items() if isinstance(original, dict) else enumerate(original)
+        for key, value in items:
+            if isinstance(value, (dict, list)):
+                value_copy = copies.get(id(value))
+                if value_copy is None:
+                    value_copy = {} if isinstance(value, dict) else [None] * len(value)
+                    copies[id(value)] = value_copy
+                    stack.append((value, value_copy))
+                value = value_copy
+            target[key] = value
+    return copied
+
+
+def step_dataset(step: Dict) -> Optional[str]:
+    """
+    Return the dataset read or written by a read or write step, or None
+    """
+    flags = DATASET_FLAGS.get(get_command(step))
+    if flags is None:
+        return None
+    for arg in step.get("args", []):
+        if arg["type"] == "positional":
+            return arg["value"]
+        if arg["type"] == "long_arg" and arg["flag"] in flags and arg["value"]:
+            return arg["value"].lstrip("=")
+        if arg["type"] == "short_arg" and arg["flag"] in flags and arg["value"]:
+            return arg["value"]
+    return None
+
+
+def is_pipeline_header(step: Dict) -> bool:
+    """
+    Return True if this step is just a pipeline declaration with no real args
+    """
+    cmd = step.get("command", "").strip().lower()
+    return bool(cmd == "gdal")
 
-    # import pprint
-    # pprint.pprint(result)
 
-    return result
+def get_command(step: Dict) -> str:
+    """
+    Get the command from a step dict (last word of command field)
+    """
+    return step["command"].split()[-1]
@@ -0,0 +1,131 @@
+import gzip
+import logging
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# attributes containing only coordinates or sizes, safe to round
+NUMERIC_ATTRS = ("points", "d", "x", "y", "viewBox", "transform", "font-size")
+# text attributes that are hoisted to the root <svg> element when repeated
+HOISTED_ATTRS = ("font-family", "font-size")
+
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_DOCTYPE_RE = re.compile(r"<!DOCTYPE[^>]*>", re.DOTALL)
+# tags with any whitespace-only text following them, and CDATA sections,
+# which are left as they are
+_MARKUP_RE = re.compile(r"(<!\[CDATA\[.*?\]\]>|<[^>]*>)(\s+(?=<))?", re.DOTALL)
+_TAG_NEWLINE_RE = re.compile(r"\s*\n\s*")
+_DECIMAL_RE = re.compile(r"-?\d+\.\d+")
+_SVG_OPEN_RE = re.compile(r"<svg\b")
+
+
+def _round_number(match: re.Match, precision: int) -> str:
+    text = f"{float(match.group(0)):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _round_attr_values(svg: str, attr: str, precision: int) -> str:
+    def _round_value(m: re.Match) -> str:
+        value = _DECIMAL_RE.sub(lambda n: _round_number(n, precision), m.group(2))
+        return f'{m.group(1)}"{value}"'
+
+    return re.sub(rf'(\s{attr}=)"([^"]*)"', _round_value, svg)
+
+
+def _hoist_attr(svg: str, attr: str) -> str:
+    """
+    Move the most common value of a text attribute to the root <svg> element,
+    where it is inherited, and remove it from every <text> that repeats it
+    """
+    attr_re = re.compile(rf'\s{attr}="([^"]*)"')
+    values = Counter(
+        m.group(1)
+        for text_tag in re.findall(r"<text\b[^>]*>", svg)
+        for m in attr_re.finditer(text_tag)
+    )
+    if not values:
+        return svg
+
+    value, _ = values.most_common(1)[0]
+    repeated = f' {attr}="{value}"'
+
+    svg = re.sub(r"<text\b[^>]*>", lambda m: m.group(0).replace(repeated, ""), svg)
+    return _SVG_OPEN_RE.sub(lambda m: f"<svg{repeated}", svg, count=1)
+
+
+def _collapse_markup(m: re.Match) -> str:
+    markup = m.group(1)
+    if markup.startswith("<![CDATA["):
+        return markup
+    # newlines inside tags are between attributes
+    return _TAG_NEWLINE_RE.sub(" ", markup)
+
+
+def minify_svg(svg: str, precision: int = 1) -> str:
+    """
+    Reduce the size of a Graphviz SVG without changing how it displays.
+    Comments and the DOCTYPE are removed, whitespace between tags collapsed
+    (text content and CDATA sections are kept as they are),
+    coordinates rounded to precision decimal places, and repeated font
+    attributes moved to the root element. Links and tooltips are left as-is.
+    """
+    svg = _COMMENT_RE.sub("", svg)
+    svg = _DOCTYPE_RE.sub("", svg)
+    svg = _MARKUP_RE.sub(_collapse_markup, svg)
+
+    for attr in NUMERIC_ATTRS:
+        svg = _round_attr_values(svg, attr, precision)
+
+    for attr in HOISTED_ATTRS:
+        svg = _hoist_attr(svg, attr)
+
+    return svg.strip()
+
+
+def encode_svg(svg: bytes, output_fn: str, minify: bool = False) -> bytes:
+    """
+    Post-process SVG output for writing to output_fn, optionally minified,
+    and gzip compressed if the output file has an .svgz extension.
+    """
+    data = svg
+    if minify:
+        data = minify_svg(svg.decode("utf-8")).encode("utf-8")
+
+    if Path(output_fn).suffix.lower() == ".svgz":
+        # fixed mtime so identical diagrams produce identical files
+        data = gzip.compress(data, mtime=0)
+
+    return data
+
+
+def write_if_changed(data: bytes, output_fn: str, atomic: bool = False) -> bool:
+    """
+    Write data to output_fn unless the file already has identical content,
+    leaving its modification time untouched. Returns True if it was written.
+    If atomic is True the data is written to a temporary file that then
+    replaces output_fn.
+    """
+    output_path = Path(output_fn)
+    try:
+        if output_path.stat().st_size == len(data) and output_path.read_bytes() == data:
+            logger.debug("%s: unchanged, not written", output_fn)
+            return False
+    except FileNotFoundError:
+        pass
+    if not atomic:
+        output_path.write_bytes(data)
+        return True
+
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    try:
+        temp_path.write_bytes(data)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return True
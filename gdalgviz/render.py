@@ -0,0 +1,192 @@
+import errno
+import logging
+import signal
+import subprocess
+import threading
+from typing import List, Optional, Tuple
+
+from graphviz import ExecutableNotFound
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+try:
+    import pygraphviz
+except ImportError:  # pragma: no cover - optional dependency
+    pygraphviz = None
+
+# pygraphviz 1.x runs the layout engine in a subprocess from AGraph.draw
+if pygraphviz is not None and int(pygraphviz.__version__.split(".")[0]) < 2:
+    pygraphviz = None  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+# "subprocess" runs the Graphviz executables, "inprocess" calls libgvc
+# through pygraphviz and avoids the process start-up cost per diagram
+BACKENDS = ["subprocess", "inprocess"]
+
+# libgvc keeps global state and is not safe to call from several threads
+_gvc_lock = threading.Lock()
+
+# cheaper Graphviz settings used when a diagram exceeds its render limits
+DEGRADED_GRAPH_ATTR = {
+    "splines": "line",
+    "nslimit": "1",
+    "nslimit1": "1",
+    "mclimit": "0.1",
+    "remincross": "false",
+}
+# arguments longer than this are truncated in degraded diagrams
+DEGRADED_MAX_ARG_LENGTH = 40
+
+
+# signals the layout process is killed with when it hits its limits: SIGXCPU
+# at the CPU time limit, and SIGSEGV, SIGABRT or SIGKILL (by the kernel) when
+# memory cannot be allocated under the address space limit
+LIMIT_SIGNALS = {
+    getattr(signal, name)
+    for name in ("SIGXCPU", "SIGKILL", "SIGSEGV", "SIGABRT")
+    if hasattr(signal, name)
+}
+
+# exit code of the shell when the layout engine cannot be found
+_SHELL_NOT_FOUND = 127
+
+
+class RenderLimitError(RuntimeError):
+    """
+    Raised when the layout subprocess exceeds its time or resource limits
+    """
+
+
+def _resource_limits(
+    max_memory: Optional[int], max_cpu_time: Optional[int]
+) -> List[Tuple[int, int]]:
+    """
+    Return (resource, limit) pairs to apply to the layout process,
+    or an empty list if the platform does not support rlimits
+    """
+    if resource is None:
+        if max_memory is not None or max_cpu_time is not None:
+            logger.warning("Resource limits are not supported on this platform")
+        return []
+    limits = []
+    if max_memory is not None:
+        limits.append((resource.RLIMIT_AS, max_memory * 1024 * 1024))
+    if max_cpu_time is not None:
+        limits.append((resource.RLIMIT_CPU, max_cpu_time))
+    return limits
+
+
+def _ulimit_command(cmd: List[str], limits: List[Tuple[int, int]]) -> List[str]:
+    """
+    Wrap a command in a shell applying the limits with ulimit before running
+    it. Used where prlimit is unavailable (e.g. macOS), as preexec_fn is not
+    safe when the parent process has other threads
+    """
+    options = {resource.RLIMIT_AS: "-v", resource.RLIMIT_CPU: "-t"}
+    # ulimit -v is in KB
+    scale = {resource.RLIMIT_AS: 1024}
+    script = "".join(
+        f"ulimit {options[res]} {limit // scale.get(res, 1)}; " for res, limit in limits
+    )
+    return ["sh", "-c", script + 'exec "$0" "$@"'] + cmd
+
+
+def _hit_limit(returncode: int) -> bool:
+    """
+    Return True if the exit code of the layout process shows it was stopped
+    by its limits: killed by one of LIMIT_SIGNALS, or exiting with ENOMEM
+    """
+    return -returncode in LIMIT_SIGNALS or returncode == errno.ENOMEM
+
+
+def inprocess_available() -> bool:
+    """
+    Return True if the in-process backend can be used
+    """
+    return pygraphviz is not None
+
+
+def _render_inprocess(source: str, output_format: str, engine: str) -> bytes:
+    """
+    Lay out and render DOT source with libgvc inside the current process
+    """
+    # the cgraph parser is not reentrant either, so parse under the lock
+    with _gvc_lock:
+        graph = pygraphviz.AGraph(string=source)
+        return graph.draw(format=output_format, prog=engine)
+
+
+def render_source(
+    source: str,
+    output_format: str,
+    engine: str = "dot",
+    timeout: Optional[float] = None,
+    max_memory: Optional[int] = None,
+    max_cpu_time: Optional[int] = None,
+    backend: str = "subprocess",
+) -> bytes:
+    """
+    Run a Graphviz layout engine on DOT source and return the rendered output.
+    timeout is the wall-clock limit in seconds, max_memory the address space
+    limit in MB and max_cpu_time the CPU time limit in seconds.
+    Raises RenderLimitError if any of the limits are hit.
+    The "inprocess" backend falls back to a subprocess when pygraphviz is not
+    installed or when limits are set, as they can only be enforced on a
+    separate process.
+    Safe to call concurrently from multiple threads.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    if backend == "inprocess":
+        if not inprocess_available():
+            logger.debug("pygraphviz is not installed, rendering in a subprocess")
+        elif timeout is not None or max_memory is not None or max_cpu_time is not None:
+            logger.debug("Render limits are set, rendering in a subprocess")
+        else:
+            return _render_inprocess(source, output_format, engine)
+
+    cmd = [engine, f"-T{output_format}"]
+    limits = _resource_limits(max_memory, max_cpu_time)
+    use_prlimit = hasattr(resource, "prlimit")
+    run_cmd = cmd if not limits or use_prlimit else _ulimit_command(cmd, limits)
+    try:
+        proc = subprocess.Popen(
+            run_cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError as e:
+        raise ExecutableNotFound(cmd) from e
+
+    with proc:
+        if limits and use_prlimit:
+            # the engine is blocked reading stdin, so nothing runs before this
+            try:
+                for res, limit in limits:
+                    resource.prlimit(proc.pid, res, (limit, limit))
+            except ProcessLookupError:
+                pass  # already exited
+        try:
+            stdout, stderr = proc.communicate(source.encode("utf-8"), timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            proc.kill()
+            proc.communicate()
+            raise RenderLimitError(f"{engine} exceeded the {timeout}s timeout") from e
+
+    if proc.returncode != 0:
+        if run_cmd is not cmd and proc.returncode == _SHELL_NOT_FOUND:
+            raise ExecutableNotFound(cmd)
+        if limits and _hit_limit(proc.returncode):
+            raise RenderLimitError(
+                f"{engine} exceeded its resource limits (exit code {proc.returncode})"
+            )
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, output=stdout, stderr=stderr
+        )
+
+    return stdout
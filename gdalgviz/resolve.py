@@ -0,0 +1,195 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from gdalgviz.parser import (
+    copy_steps,
+    get_command,
+    get_nested_pipelines,
+    is_pipeline_header,
+    parse_pipeline,
+)
+
+logger = logging.getLogger(__name__)
+
+GDALG_SUFFIX = ".gdalg.json"
+
+# how many levels of referenced files are expanded by default
+DEFAULT_MAX_DEPTH = 8
+
+# status of a read step pointing to a GDALG file, set by resolve_references
+RESOLVED = "resolved"  # expanded into a nested pipeline
+SHARED = "shared"  # already expanded elsewhere in the diagram
+CYCLE = "cycle"  # the file (indirectly) reads itself
+DEPTH = "depth"  # beyond the depth limit
+MISSING = "missing"  # the file could not be read or parsed
+
+# style of the clusters of expanded files, and of links to shared expansions
+REFERENCE_CLUSTER_ATTR = {"style": "dashed", "color": "#6c757d", "fontsize": "10"}
+REFERENCE_EDGE_ATTR = {"style": "dashed"}
+
+
+def load_gdalg(fn: str) -> str:
+    """
+    Return the command line of a GDALG file
+    """
+    with Path(fn).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    command_line = data.get("command_line") if isinstance(data, dict) else None
+    if not isinstance(command_line, str):
+        raise ValueError(f"{fn} has no command_line")
+    return command_line
+
+
+def gdalg_reference(step: Dict) -> Optional[str]:
+    """
+    Return the GDALG file read by a read step, or None
+    """
+    if get_command(step) != "read":
+        return None
+    for arg in step.get("args", []):
+        value = arg.get("value") or ""
+        if arg["type"] == "long_arg":
+            if arg["flag"] not in ("input", "i"):
+                continue
+            value = value.lstrip("=")
+        elif arg["type"] != "positional":
+            continue
+        if value.lower().endswith(GDALG_SUFFIX):
+            return value
+    return None
+
+
+def _parse_gdalg(
+    path: Path, memo: Dict[Path, Optional[List[Dict]]]
+) -> Optional[List[Dict]]:
+    """
+    Parse a GDALG file once, returning its steps without the pipeline header,
+    or None if it cannot be read
+    """
+    if path not in memo:
+        try:
+            steps = parse_pipeline(load_gdalg(str(path)))
+        except Exception as e:
+            # e.g. a missing file or invalid pipeline
+            logger.warning("%s: could not be resolved - %s", path, e)
+            memo[path] = None
+        else:
+            if steps and is_pipeline_header(steps[0]):
+                steps = steps[1:]
+            memo[path] = steps
+    return memo[path]
+
+
+def _resolve(
+    steps: List[Dict],
+    base_dir: Path,
+    max_depth: int,
+    memo: Dict[Path, Optional[List[Dict]]],
+    files: List[Path],
+) -> None:
+    """
+    Expand the GDALG reads of a list of steps in place. files holds the files
+    being expanded. Nested pipelines and referenced files are followed with
+    an explicit stack rather than by recursion, so deeply nested pipelines
+    do not hit the recursion limit
+    """
+    # the node id each expanded file was linked from
+    expanded: Dict[Path, str] = {}
+    # each frame walks the steps of one pipeline, or checks the reference of
+    # a step once its nested pipelines are done. A frame for the steps of a
+    # referenced file ends by nesting them in the step reading the file
+    stack: List[Dict[str, Any]] = [
+        {"steps": iter(steps), "base_dir": base_dir, "depth": 0}
+    ]
+    while stack:
+        frame = stack[-1]
+        if "steps" in frame:
+            step = next(frame["steps"], None)
+            if step is not None:
+                context = {"base_dir": frame["base_dir"], "depth": frame["depth"]}
+                stack.append({**context, "step": step})
+                stack.extend(
+                    {**context, "steps": iter(nested_steps)}
+                    for nested_steps in reversed(get_nested_pipelines(step))
+                )
+                continue
+            stack.pop()
+            if "reference" in frame:
+                path, step, referenced = frame["reference"]
+                files.pop()
+                # later reads of the same file link to the last step of this one
+                source_id = f"gdalg-{len(expanded) + 1}"
+                referenced[-1]["node_id"] = source_id
+                expanded[path] = source_id
+                step["reference"].update(status=RESOLVED, source_id=source_id)
+                step["nested"] = {"type": "nested", "pipeline": referenced}
+            continue
+
+        stack.pop()
+        step, depth = frame["step"], frame["depth"]
+        reference = gdalg_reference(step)
+        if reference is None:
+            continue
+        path = (frame["base_dir"] / reference).resolve()
+        info: Dict = {"path": reference}
+        step["reference"] = info
+
+        if path in files:
+            logger.warning("%s: circular reference to %s", reference, path)
+            info["status"] = CYCLE
+        elif path in expanded:
+            info["status"] = SHARED
+            info["source_id"] = expanded[path]
+        elif depth >= max_depth:
+            info["status"] = DEPTH
+        else:
+            referenced = _parse_gdalg(path, memo)
+            if not referenced:
+                info["status"] = MISSING
+                continue
+            referenced = copy_steps(referenced)
+            files.append(path)
+            stack.append(
+                {
+                    "steps": iter(referenced),
+                    "base_dir": path.parent,
+                    "depth": depth + 1,
+                    "reference": (path, step, referenced),
+                }
+            )
+
+
+def resolve_references(
+    steps: List[Dict],
+    source_fn: Optional[str] = None,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    memo: Optional[Dict[Path, Optional[List[Dict]]]] = None,
+) -> List[Dict]:
+    """
+    Return a copy of the steps where read steps of GDALG files are expanded
+    into a nested pipeline with the steps of the referenced file, recursively.
+    Relative paths are resolved from the directory of source_fn, the file the
+    steps were read from (or the working directory if None), and then from the
+    directory of each referenced file.
+
+    Each read step of a GDALG file gets a "reference" with the path and one
+    of the statuses above. A file read several times is only expanded once,
+    and later reads link to the last step of its expansion ("source_id").
+    Files are parsed once and cached in memo, which can be shared between
+    calls. Reads beyond max_depth levels, and reads that would form a cycle,
+    are not expanded.
+    """
+    resolved = copy_steps(steps)
+    display_steps = resolved
+    if resolved and is_pipeline_header(resolved[0]):
+        display_steps = resolved[1:]
+
+    # the source file counts as being expanded, so reading it is a cycle
+    files = [Path(source_fn).resolve()] if source_fn else []
+    base_dir = files[0].parent if files else Path.cwd()
+    _resolve(
+        display_steps, base_dir, max_depth, memo if memo is not None else {}, files
+    )
+    return resolved
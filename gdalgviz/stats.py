@@ -0,0 +1,320 @@
+import csv
+import io
+import json
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from gdalgviz.commands import command_family
+from gdalgviz.lineage import iter_catalog_files
+from gdalgviz.main import detect_pipeline_type
+from gdalgviz.parser import (
+    get_command,
+    is_pipeline_header,
+    iter_step_paths,
+    parse_file,
+    parse_pipeline,
+)
+
+# number of pipelines of each ranking kept, e.g. the 10 longest
+DEFAULT_TOP = 10
+
+# number of pipeline files parsed by a worker process per task
+DEFAULT_STATS_CHUNK_SIZE = 100
+
+# rankings of pipelines, with the measure each is ordered by
+RANKINGS = {"longest": "steps", "deepest": "depth", "most_inputs": "inputs"}
+
+STATS_FORMATS = ["json", "csv"]
+CSV_FIELDS = ["section", "family", "command", "flag", "path", "value", "pipelines"]
+
+# totals of a catalog, see empty_stats
+CatalogStats = Dict[str, Any]
+
+
+def empty_stats() -> CatalogStats:
+    """
+    Create the running totals of a catalog. Commands are counted by
+    (family, command) and flags by (family, command, flag), so their size
+    depends on the distinct commands used, and each ranking keeps its top
+    [measure, path] entries only
+    """
+    return {
+        "pipelines": 0,
+        "steps": 0,
+        "failed": 0,
+        "families": Counter(),
+        "family_pipelines": Counter(),
+        "commands": Counter(),
+        "command_pipelines": Counter(),
+        "flags": Counter(),
+        "flag_pipelines": Counter(),
+        **{ranking: [] for ranking in RANKINGS},
+        "errors": [],
+    }
+
+
+def _flag_name(arg: Dict) -> Optional[str]:
+    if arg["type"] == "long_arg":
+        return f"--{arg['flag']}"
+    if arg["type"] == "short_arg":
+        return f"-{arg['flag']}"
+    return None
+
+
+def _keep_top(entries: List[List], top: int) -> List[List]:
+    """
+    Keep the top [measure, path] entries, largest first then by path, so
+    the result does not depend on the order pipelines were counted in
+    """
+    return sorted(entries, key=lambda entry: (-entry[0], entry[1]))[:top]
+
+
+def add_pipeline(
+    stats: CatalogStats, steps: List[Dict], path: str, top: int = DEFAULT_TOP
+) -> None:
+    """
+    Count the commands, flags, steps, nesting depth and read steps of a
+    parsed pipeline, including its nested pipelines
+    """
+    pipeline_type = detect_pipeline_type(steps)
+    display_steps = steps
+    if steps and is_pipeline_header(steps[0]):
+        display_steps = steps[1:]
+
+    count = depth = inputs = 0
+    families: Set[str] = set()
+    commands: Set[Tuple[str, str]] = set()
+    flags: Set[Tuple[str, str, str]] = set()
+    for step_path, step in iter_step_paths(display_steps):
+        cmd = get_command(step)
+        family = command_family(cmd, pipeline_type)
+        count += 1
+        # e.g. "4.1.2" is a step of a pipeline nested one level deep
+        depth = max(depth, step_path.count(".") // 2)
+        inputs += cmd == "read"
+        stats["families"][family] += 1
+        stats["commands"][family, cmd] += 1
+        families.add(family)
+        commands.add((family, cmd))
+        for arg in step.get("args", []):
+            flag = _flag_name(arg)
+            if flag is not None:
+                stats["flags"][family, cmd, flag] += 1
+                flags.add((family, cmd, flag))
+
+    stats["pipelines"] += 1
+    stats["steps"] += count
+    stats["family_pipelines"].update(families)
+    stats["command_pipelines"].update(commands)
+    stats["flag_pipelines"].update(flags)
+    measures = {"steps": count, "depth": depth, "inputs": inputs}
+    for ranking, measure in RANKINGS.items():
+        stats[ranking] = _keep_top(stats[ranking] + [[measures[measure], path]], top)
+
+
+def add_failure(
+    stats: CatalogStats, path: str, message: str, top: int = DEFAULT_TOP
+) -> None:
+    """
+    Count a pipeline that could not be parsed, keeping the first errors by path
+    """
+    stats["failed"] += 1
+    stats["errors"] = sorted(stats["errors"] + [[path, message]])[:top]
+
+
+def merge_stats(
+    stats: CatalogStats, other: CatalogStats, top: int = DEFAULT_TOP
+) -> None:
+    """
+    Add the totals of other to stats
+    """
+    for key in ("pipelines", "steps", "failed"):
+        stats[key] += other[key]
+    for key in (
+        "families",
+        "family_pipelines",
+        "commands",
+        "command_pipelines",
+        "flags",
+        "flag_pipelines",
+    ):
+        stats[key].update(other[key])
+    for ranking in RANKINGS:
+        stats[ranking] = _keep_top(stats[ranking] + other[ranking], top)
+    stats["errors"] = sorted(stats["errors"] + other["errors"])[:top]
+
+
+def file_stats(pipeline_fns: List[str], top: int = DEFAULT_TOP) -> CatalogStats:
+    """
+    Parse a list of pipeline files and return their totals.
+    Files that cannot be read or parsed are counted as failed
+    """
+    stats = empty_stats()
+    for fn in pipeline_fns:
+        try:
+            steps = parse_pipeline(parse_file(fn))
+        except Exception as e:
+            # e.g. invalid JSON, pipeline syntax or a pipeline over the limits
+            add_failure(stats, fn, (str(e) or repr(e)).splitlines()[0], top)
+            continue
+        add_pipeline(stats, steps, fn, top)
+    return stats
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def catalog_stats(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    top: int = DEFAULT_TOP,
+    chunk_size: int = DEFAULT_STATS_CHUNK_SIZE,
+) -> CatalogStats:
+    """
+    Count the commands and flags used by a catalog of pipeline files, and
+    rank its longest and most deeply nested pipelines and those with the
+    most read steps. Folders are searched for *.gdalg.json files.
+
+    Files are parsed by workers processes (one per CPU by default) in
+    chunks of chunk_size files, with only a few chunks queued per worker,
+    so memory use depends on the distinct commands and flags rather than
+    on the size of the catalog
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(iter_catalog_files(paths), chunk_size)
+    stats = empty_stats()
+
+    if workers == 1:
+        for chunk in chunks:
+            merge_stats(stats, file_stats(chunk, top), top)
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Set[Future] = set()
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge_stats(stats, future.result(), top)
+            pending.add(pool.submit(file_stats, chunk, top))
+        for future in pending:
+            merge_stats(stats, future.result(), top)
+    return stats
+
+
+def stats_report(stats: CatalogStats) -> Dict[str, Any]:
+    """
+    Convert catalog totals to a JSON-compatible report, with families,
+    commands and flags ordered by how many steps use them
+    """
+
+    def by_count(counter: Counter) -> List:
+        return sorted(counter, key=lambda key: (-counter[key], key))
+
+    flags: Dict[Tuple[str, str], List[Dict]] = {}
+    for family, cmd, flag in by_count(stats["flags"]):
+        flags.setdefault((family, cmd), []).append(
+            {
+                "flag": flag,
+                "uses": stats["flags"][family, cmd, flag],
+                "pipelines": stats["flag_pipelines"][family, cmd, flag],
+            }
+        )
+    return {
+        "pipelines": stats["pipelines"],
+        "steps": stats["steps"],
+        "failed": stats["failed"],
+        "families": [
+            {
+                "family": family,
+                "steps": stats["families"][family],
+                "pipelines": stats["family_pipelines"][family],
+            }
+            for family in by_count(stats["families"])
+        ],
+        "commands": [
+            {
+                "family": family,
+                "command": cmd,
+                "steps": stats["commands"][family, cmd],
+                "pipelines": stats["command_pipelines"][family, cmd],
+                "flags": flags.get((family, cmd), []),
+            }
+            for family, cmd in by_count(stats["commands"])
+        ],
+        **{
+            ranking: [{"path": path, measure: value} for value, path in stats[ranking]]
+            for ranking, measure in RANKINGS.items()
+        },
+        "errors": [{"path": path, "error": error} for path, error in stats["errors"]],
+    }
+
+
+def format_stats(stats: CatalogStats, output_format: str = "json") -> str:
+    """
+    Format catalog totals as JSON, or as CSV with a row per total, family,
+    command, flag, ranked pipeline and error
+    """
+    if output_format not in STATS_FORMATS:
+        raise ValueError(
+            f"Invalid stats format '{output_format}'. Must be one of {STATS_FORMATS}"
+        )
+    report = stats_report(stats)
+    if output_format == "json":
+        return json.dumps(report, indent=2) + "\n"
+
+    output = io.StringIO()
+    writer = csv.DictWriter(output, CSV_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for key in ("pipelines", "steps", "failed"):
+        writer.writerow({"section": "total", "command": key, "value": report[key]})
+    for entry in report["families"]:
+        writer.writerow(
+            {
+                "section": "family",
+                "family": entry["family"],
+                "value": entry["steps"],
+                "pipelines": entry["pipelines"],
+            }
+        )
+    for entry in report["commands"]:
+        command = {"family": entry["family"], "command": entry["command"]}
+        writer.writerow(
+            {
+                "section": "command",
+                **command,
+                "value": entry["steps"],
+                "pipelines": entry["pipelines"],
+            }
+        )
+        for flag in entry["flags"]:
+            writer.writerow(
+                {
+                    "section": "flag",
+                    **command,
+                    "flag": flag["flag"],
+                    "value": flag["uses"],
+                    "pipelines": flag["pipelines"],
+                }
+            )
+    for ranking, measure in RANKINGS.items():
+        for entry in report[ranking]:
+            writer.writerow(
+                {"section": ranking, "path": entry["path"], "value": entry[measure]}
+            )
+    for entry in report["errors"]:
+        writer.writerow(
+            {"section": "error", "path": entry["path"], "value": entry["error"]}
+        )
+    return output.getvalue()
@@ -0,0 +1,145 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from gdalgviz.parser import copy_steps, is_pipeline_header, iter_step_paths
+
+# measurements that can be shown as a heatmap
+HEATMAP_METRICS = ["time", "memory"]
+
+# heatmap colours for a share of 0 and 1 of the total
+HEAT_COLD = (255, 245, 235)
+HEAT_HOT = (217, 72, 1)
+
+Timings = Union[List, Dict[str, object]]
+
+
+def load_timings(fn: str) -> Timings:
+    """
+    Load step timings from a JSON file, either a list with one entry per step
+    in diagram order or an object keyed by step path (see iter_step_paths).
+    Entries are {"time": seconds, "memory": peak MB}, a number of seconds,
+    or null for steps without measurements.
+    """
+    with Path(fn).open("r", encoding="utf-8") as f:
+        timings = json.load(f)
+    if not isinstance(timings, (list, dict)):
+        raise ValueError("Timings must be a JSON list or object")
+    return timings
+
+
+def _measurement(key: str, entry: object) -> Optional[Dict[str, float]]:
+    """
+    Normalize a timings entry to a dict of measurements
+    """
+    if entry is None:
+        return None
+    if isinstance(entry, (int, float)) and not isinstance(entry, bool):
+        entry = {"time": entry}
+    if not isinstance(entry, dict):
+        raise ValueError(f"Invalid timings entry for step {key}: {entry!r}")
+
+    measurement = {}
+    for metric, value in entry.items():
+        if metric not in HEATMAP_METRICS:
+            raise ValueError(
+                f"Invalid measurement '{metric}' for step {key}, "
+                f"expected one of {HEATMAP_METRICS}"
+            )
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"Invalid {metric} for step {key}: {value!r}")
+        measurement[metric] = float(value)
+    return measurement
+
+
+def apply_timings(
+    steps: List[Dict], timings: Timings, heatmap: str = "time"
+) -> List[Dict]:
+    """
+    Return a copy of the steps with a "timing" added to each measured step,
+    holding the measurements and their share of the total of all steps,
+    e.g. {"time": 2.0, "time_share": 0.5, "heat": 1.0}. "heat" is the share
+    of the heatmap metric relative to the largest share, used to colour the node.
+    A timings list must have one entry per step, in the order of iter_steps,
+    with or without the pipeline header.
+    Raises ValueError if the timings do not match the steps.
+    """
+    if heatmap not in HEATMAP_METRICS:
+        raise ValueError(
+            f"Invalid heatmap '{heatmap}', expected one of {HEATMAP_METRICS}"
+        )
+    annotated = copy_steps(steps)
+    display_steps = annotated
+    if annotated and is_pipeline_header(annotated[0]):
+        display_steps = annotated[1:]
+    paths = dict(iter_step_paths(display_steps))
+
+    if isinstance(timings, list):
+        if len(timings) == len(paths) + 1 and len(annotated) > len(display_steps):
+            timings = timings[1:]  # includes the pipeline header
+        if len(timings) != len(paths):
+            raise ValueError(
+                f"Timings list has {len(timings)} entries but the pipeline "
+                f"has {len(paths)} steps"
+            )
+        timings = dict(zip(paths, timings))
+
+    unknown = sorted(set(timings) - set(paths))
+    if unknown:
+        raise ValueError(f"Timings for unknown steps: {', '.join(unknown)}")
+
+    measured = {}
+    for path, entry in timings.items():
+        measurement = _measurement(path, entry)
+        if measurement:
+            measured[path] = measurement
+
+    for metric in HEATMAP_METRICS:
+        total = sum(m.get(metric, 0) for m in measured.values())
+        for measurement in measured.values():
+            if metric in measurement:
+                share = measurement[metric] / total if total else 0
+                measurement[f"{metric}_share"] = share
+
+    # scale the heat so the most expensive step is the hottest colour
+    hottest = max((m.get(f"{heatmap}_share", 0) for m in measured.values()), default=0)
+    for path, measurement in measured.items():
+        share = measurement.get(f"{heatmap}_share", 0)
+        measurement["heat"] = share / hottest if hottest else 0.0
+        paths[path]["timing"] = measurement
+    return annotated
+
+
+def heat_color(share: float) -> str:
+    """
+    Return a colour between HEAT_COLD and HEAT_HOT for a share from 0 to 1
+    """
+    share = min(max(share, 0.0), 1.0)
+    rgb = (round(c + (h - c) * share) for c, h in zip(HEAT_COLD, HEAT_HOT))
+    return "#{:02x}{:02x}{:02x}".format(*rgb)
+
+
+def _format_time(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    if seconds < 120:
+        return f"{seconds:.1f} s"
+    return f"{seconds / 60:.1f} min"
+
+
+def _format_memory(mb: float) -> str:
+    if mb >= 1024:
+        return f"{mb / 1024:.1f} GB"
+    return f"{mb:.0f} MB"
+
+
+def format_timing(timing: Dict[str, float]) -> List[str]:
+    """
+    Format the measurements of a step, e.g. ["1.2 s (34%)", "512 MB (20%)"]
+    """
+    formatters = {"time": _format_time, "memory": _format_memory}
+    return [
+        f"{formatters[metric](timing[metric])} ({timing[f'{metric}_share']:.0%})"
+        for metric in HEATMAP_METRICS
+        if metric in timing
+    ]
@@ -0,0 +1,376 @@
+import difflib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from gdalgviz._gdal_usage import GDAL_VERSION, USAGE
+from gdalgviz.parser import (
+    copy_steps,
+    get_command,
+    get_nested_pipelines,
+    is_pipeline_header,
+    iter_steps,
+)
+
+# pipeline types of the usage index, in the order steps of untyped pipelines
+# are looked up in
+PIPELINE_TYPES = ["raster", "vector"]
+
+# where a step can appear in a chain of steps: "first" steps start a new
+# stream (e.g. read), "last" steps consume it (e.g. write), "any" steps can
+# do either, and other steps need a piped input
+FIRST = "first"
+LAST = "last"
+ANYWHERE = "any"
+
+# GDAL argument types that take no value, one value, or a list of values
+BOOLEAN = "boolean"
+NUMBER_TYPES = {"integer": int, "real": float}
+
+# steps running a sub-command given as their first argument, e.g. geom buffer,
+# with the steps of the usage index each sub-command is checked as. GDAL 3.12
+# deprecated geom in favour of these steps, which take the same arguments
+SUBCOMMANDS = {
+    "geom": {
+        "buffer": "buffer",
+        "explode-collections": "explode-collections",
+        "make-valid": "make-valid",
+        "segmentize": "segmentize",
+        "set-type": "set-geom-type",
+        "simplify": "simplify",
+        "swap-xy": "swap-xy",
+    }
+}
+
+# label colour of steps and arguments with validation issues in diagrams
+INVALID_COLOR = "#f8d7da"
+
+# compiled usage of the steps of each pipeline type, see compile_usage
+UsageIndex = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+def _arg_spec(arg: Dict) -> Tuple[str, int, Optional[int], bool, bool]:
+    """
+    Compact a --json-usage argument to (type, min values, max values,
+    packed, repeated). Lists of values may be packed with commas and/or
+    given by repeating the argument; max values is None if unlimited
+    """
+    arg_type = arg["type"]
+    if arg_type == BOOLEAN:
+        return arg_type, 0, 0, False, False
+    if not arg_type.endswith("_list"):
+        return arg_type, 1, 1, False, False
+    max_count = arg.get("max_count")
+    return (
+        arg_type,
+        arg.get("min_count", 1),
+        None if max_count is None or max_count >= 2**31 - 1 else max_count,
+        arg.get("packed_values_allowed", True),
+        arg.get("repeated_arg_allowed", True),
+    )
+
+
+def _dataset_type(arg: Optional[Dict], default: str) -> str:
+    types = (arg or {}).get("dataset_type") or [default]
+    return types[0]
+
+
+def compile_usage(usage: Dict) -> UsageIndex:
+    """
+    Compile the output of e.g. gdal raster pipeline --json-usage into an
+    index of the steps of the pipeline, with the command line forms of their
+    flags (including aliases and short names), the value arity and type of
+    each argument, the choices of arguments with a fixed set of values,
+    required arguments that cannot be given positionally, the dataset types
+    read and written, and where the step can appear in a pipeline
+    """
+    pipeline_type = usage["full_path"][-2]
+    steps = {}
+    for step in usage.get("pipeline_algorithms", []):
+        args = [
+            arg
+            for section in (
+                "input_arguments",
+                "output_arguments",
+                "input_output_arguments",
+            )
+            for arg in step.get(section, [])
+        ]
+        by_name = {arg["name"]: arg for arg in args}
+        flags = {}
+        for arg in args:
+            name = arg["name"]
+            for alias in [name] + arg.get("aliases", []):
+                flags[f"--{alias}"] = name
+            if arg.get("short_name"):
+                flags[f"-{arg['short_name']}"] = name
+
+        # e.g. read has an input dataset, write an output dataset, and info
+        # returns its output as a string. Steps with an optional input
+        # dataset read it or the piped dataset
+        output = by_name.get("output")
+        if "input" in by_name:
+            position = FIRST if by_name["input"].get("required") else ANYWHERE
+        elif (output and output.get("required")) or "output-string" in by_name:
+            position = LAST
+        else:
+            position = None
+
+        steps[step["name"]] = {
+            "position": position,
+            "input": _dataset_type(by_name.get("input"), pipeline_type),
+            "output": _dataset_type(output, pipeline_type),
+            "flags": flags,
+            "args": {arg["name"]: _arg_spec(arg) for arg in args},
+            "choices": {
+                arg["name"]: tuple(arg["choices"]) for arg in args if "choices" in arg
+            },
+            "required": tuple(
+                arg["name"]
+                for arg in args
+                if arg.get("required") and not arg.get("positional")
+            ),
+        }
+    return {pipeline_type: steps}
+
+
+def _flag(arg: Dict) -> Optional[str]:
+    if arg["type"] == "long_arg":
+        return f"--{arg['flag']}"
+    if arg["type"] == "short_arg":
+        return f"-{arg['flag']}"
+    return None
+
+
+def _did_you_mean(name: str, candidates: Iterable[str]) -> str:
+    matches = difflib.get_close_matches(name, list(candidates), n=1)
+    return f", did you mean {matches[0]}?" if matches else ""
+
+
+def _check_value(value: str, spec: Tuple, choices: Tuple[str, ...]) -> Optional[str]:
+    """
+    Check a single value of an argument against its type and choices
+    """
+    number_type = NUMBER_TYPES.get(spec[0].replace("_list", ""))
+    if number_type is not None:
+        try:
+            number_type(value)
+        except ValueError:
+            return f"expects {'an integer' if number_type is int else 'a number'}"
+    if choices and value.lower() not in {choice.lower() for choice in choices}:
+        return f"must be one of {', '.join(choices)}"
+    return None
+
+
+def _check_args(step: Dict, usage: Dict) -> List[Tuple[Optional[int], str]]:
+    """
+    Check the arguments of a step against the usage of its command,
+    returning (argument index, message) for each issue
+    """
+    issues: List[Tuple[Optional[int], str]] = []
+    given: Dict[str, List[int]] = {}
+    has_nested = bool(get_nested_pipelines(step))
+    args = step.get("args", [])
+    for i, arg in enumerate(args):
+        flag = _flag(arg)
+        if flag is None:
+            continue
+        name = usage["flags"].get(flag)
+        if name is None:
+            suggestion = _did_you_mean(flag, usage["flags"])
+            issues.append((i, f"unknown argument {flag}{suggestion}"))
+            continue
+        given.setdefault(name, []).append(i)
+        spec = usage["args"][name]
+        value = arg.get("value")
+        if spec[0] == BOOLEAN:
+            # the parser takes the next word as the value of any flag, but
+            # GDAL reads it as a positional argument after a boolean flag
+            continue
+        if value is None:
+            # e.g. --overlay [ read b.tif ] takes its value from a nested pipeline
+            if not (spec[0].startswith("dataset") and has_nested):
+                issues.append((i, f"{flag} expects a value"))
+            continue
+        values = value.split(",") if spec[3] else [value]
+        for v in values:
+            message = _check_value(v, spec, usage["choices"].get(name, ()))
+            if message:
+                issues.append((i, f"{flag} {message}, not '{v}'"))
+                break
+
+    for name, indexes in given.items():
+        arg_type, min_count, max_count, packed, repeated = usage["args"][name]
+        if len(indexes) > 1 and not (arg_type.endswith("_list") and repeated):
+            issues.append((indexes[-1], f"--{name} is given more than once"))
+            continue
+        if arg_type == BOOLEAN or not arg_type.endswith("_list"):
+            continue
+        count = 0
+        for i in indexes:
+            value = args[i].get("value")
+            count += len(value.split(",")) if value and packed else 1
+        if count < min_count or (max_count is not None and count > max_count):
+            expected = (
+                str(min_count) if min_count == max_count else f"{min_count} or more"
+            )
+            if max_count is not None and min_count != max_count:
+                expected = f"{min_count} to {max_count}"
+            issues.append((indexes[0], f"--{name} expects {expected} values"))
+
+    for name in usage["required"]:
+        if name not in given:
+            issues.append((None, f"--{name} is required"))
+    return issues
+
+
+def _subcommand(step: Dict) -> Tuple[str, Dict, int, Optional[str]]:
+    """
+    Return the command a step is checked as, the step with the arguments of
+    that command, the index of its first argument in the step, and an issue
+    if the step needs a sub-command it does not have
+    """
+    cmd = get_command(step)
+    subcommands = SUBCOMMANDS.get(cmd)
+    if subcommands is None:
+        return cmd, step, 0, None
+    args = step.get("args", [])
+    sub = args[0]["value"] if args and args[0]["type"] == "positional" else None
+    if sub not in subcommands:
+        message = f"{cmd} needs one of the sub-commands {', '.join(subcommands)}"
+        if sub is not None:
+            suggestion = _did_you_mean(sub, subcommands)
+            message = f"unknown {cmd} sub-command {sub}{suggestion}"
+        return cmd, step, 0, message
+    return subcommands[sub], {**step, "args": args[1:]}, 1, None
+
+
+def _lookup(
+    cmd: str, stream_type: Optional[str], usage_index: UsageIndex
+) -> List[Dict]:
+    """
+    Find the usage of a step for the type of its input, or in every
+    pipeline type if the type is not known
+    """
+    types = [stream_type] if stream_type else list(usage_index)
+    return [usage_index[t][cmd] for t in types if cmd in usage_index.get(t, {})]
+
+
+def validate_pipeline(
+    steps: List[Dict], usage_index: Optional[UsageIndex] = None
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Check a parsed pipeline against the usage of the GDAL pipeline steps,
+    without running GDAL: unknown steps and arguments, missing or invalid
+    values, missing required arguments, and steps in an invalid order, such
+    as a read in the middle of a pipeline or a vector step reading a raster.
+    Uses the bundled usage of GDAL_VERSION unless a usage_index from
+    compile_usage is given.
+    Returns a copy of the steps with an "invalid" list of {"arg", "message"}
+    on each step with issues, where arg is the index of the argument or None,
+    and a list of issues with their location, step, argument and message.
+    Pipelines without issues are returned as they are, without a copy
+    """
+    usage_index = USAGE if usage_index is None else usage_index
+    display_steps = steps
+    stream_type = None
+    if steps and is_pipeline_header(steps[0]):
+        display_steps = steps[1:]
+        header_args = [a.get("value", "") for a in steps[0].get("args", [])]
+        stream_type = next((t for t in header_args if t in usage_index), None)
+
+    # (step, location, argument index, message) of each issue
+    found: List[Tuple[Dict, str, Optional[int], str]] = []
+
+    # chains of steps to check, with their location, the type of the
+    # dataset piped into them, and whether they start a new stream
+    stack: List[Tuple[List[Dict], str, Optional[str], bool]] = [
+        (display_steps, "", stream_type, True)
+    ]
+    while stack:
+        chain, prefix, stream_type, new_stream = stack.pop()
+        for i, step in enumerate(chain):
+            cmd, checked, offset, sub_issue = _subcommand(step)
+            step_issues: List[Tuple[Optional[int], str]] = []
+            candidates = _lookup(cmd, stream_type, usage_index)
+            usage = None
+            if sub_issue:
+                step_issues.append((None, sub_issue))
+            elif not candidates:
+                all_commands = {
+                    c for commands in usage_index.values() for c in commands
+                }
+                if stream_type and cmd in all_commands:
+                    message = f"{cmd} is not a {stream_type} step"
+                else:
+                    message = f"unknown step {cmd}{_did_you_mean(cmd, all_commands)}"
+                step_issues.append((None, message))
+            else:
+                usage = candidates[0]
+                arg_issues = _check_args(checked, usage)
+                if arg_issues and len(candidates) > 1:
+                    # in untyped pipelines, use the usage the step matches best
+                    matches = [(_check_args(checked, u), u) for u in candidates]
+                    arg_issues, usage = min(matches, key=lambda c: len(c[0]))
+                step_issues.extend(
+                    (None if arg is None else arg + offset, message)
+                    for arg, message in arg_issues
+                )
+
+                position = usage["position"]
+                starts = i == 0 and new_stream
+                if starts and position not in (FIRST, ANYWHERE):
+                    step_issues.append((None, f"a pipeline cannot start with {cmd}"))
+                elif not starts and position == FIRST:
+                    step_issues.append((None, f"{cmd} must be the first step"))
+                if position == LAST and i < len(chain) - 1:
+                    step_issues.append((None, f"{cmd} must be the last step"))
+
+            location = f"{prefix}step {i + 1} ({get_command(step)})"
+            found.extend((step, location, arg, msg) for arg, msg in step_issues)
+
+            nested_pipelines = get_nested_pipelines(step)
+            kind = "branch" if cmd == "tee" else "input"
+            for n, nested_steps in reversed(list(enumerate(nested_pipelines))):
+                # tee branches read the piped dataset, nested inputs start a stream
+                stack.append(
+                    (
+                        nested_steps,
+                        f"{location} > {kind} {n + 1} > ",
+                        stream_type if cmd == "tee" else None,
+                        cmd != "tee",
+                    )
+                )
+            # the type of the output of an unknown step is not known
+            stream_type = usage["output"] if usage else None
+
+    if not found:
+        return steps, []
+
+    # only pipelines with issues are copied to be annotated
+    annotated = copy_steps(steps)
+    copies = {id(a): b for a, b in zip(iter_steps(steps), iter_steps(annotated))}
+    issues = []
+    for step, location, arg, message in found:
+        copies[id(step)].setdefault("invalid", []).append(
+            {"arg": arg, "message": message}
+        )
+        arg_text = None
+        if arg is not None:
+            arg_text = _flag(step["args"][arg]) or step["args"][arg]["value"]
+        issues.append(
+            {
+                "location": location,
+                "step": get_command(step),
+                "arg": arg_text,
+                "message": message,
+            }
+        )
+    return annotated, issues
+
+
+def format_issues(issues: List[Dict]) -> str:
+    """
+    Format validation issues as a text report
+    """
+    if not issues:
+        return f"No issues found (GDAL {GDAL_VERSION} usage)"
+    return "\n".join(f"{issue['location']}: {issue['message']}" for issue in issues)
@@ -0,0 +1,46 @@
+"""
+Generate the standalone LALR parser module from gdalgviz/pipeline.lark
+
+The generated module is committed and packaged with gdalgviz so the grammar
+does not need to be compiled (or lark installed) at runtime. Rerun this script
+whenever pipeline.lark changes:
+
+    python scripts/generate_parser.py
+"""
+
+import hashlib
+import io
+from pathlib import Path
+
+from lark import Lark
+from lark.tools.standalone import gen_standalone
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "gdalgviz"
+GRAMMAR_FN = PACKAGE_DIR / "pipeline.lark"
+OUTPUT_FN = PACKAGE_DIR / "_pipeline_parser.py"
+
+
+def grammar_hash(grammar: str) -> str:
+    """
+    Hash the grammar text, ignoring line ending differences between platforms
+    """
+    normalized = grammar.replace("\r\n", "\n")
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def generate(grammar_fn: Path = GRAMMAR_FN, output_fn: Path = OUTPUT_FN) -> None:
+    grammar = grammar_fn.read_text(encoding="utf-8")
+    lark_inst = Lark(grammar, parser="lalr", lexer="contextual")
+
+    out = io.StringIO()
+    out.write(f"# Generated by scripts/generate_parser.py from {grammar_fn.name}\n")
+    out.write("# Do not edit by hand - rerun the script when the grammar changes\n")
+    out.write(f'GRAMMAR_SHA256 = "{grammar_hash(grammar)}"\n')
+    gen_standalone(lark_inst, out=out)
+
+    output_fn.write_text(out.getvalue(), encoding="utf-8", newline="\n")
+
+
+if __name__ == "__main__":
+    generate()
+    print(f"Wrote {OUTPUT_FN}")
@@ -0,0 +1,73 @@
+"""
+Generate the bundled usage index of GDAL pipeline steps, used to validate
+pipelines without GDAL, from the --json-usage output of the installed GDAL
+
+The generated module is committed and packaged with gdalgviz. Rerun this
+script with a newer GDAL on the PATH to update it:
+
+    python scripts/generate_usage.py
+    python scripts/generate_usage.py --gdal /opt/gdal/bin/gdal
+"""
+
+import argparse
+import json
+import pprint
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+from gdalgviz.validate import PIPELINE_TYPES, UsageIndex, compile_usage
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "gdalgviz"
+OUTPUT_FN = PACKAGE_DIR / "_gdal_usage.py"
+HEADER = [
+    "# Generated by scripts/generate_usage.py from gdal ... pipeline --json-usage",
+    "# Do not edit by hand - rerun the script to update to a newer GDAL",
+]
+
+
+def json_usage(gdal: str, pipeline_type: str) -> Dict:
+    result = subprocess.run(
+        [gdal, pipeline_type, "pipeline", "--json-usage"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def gdal_version(gdal: str) -> str:
+    # e.g. "GDAL 3.12.0 "Chicoutimi", released 2025/11/03"
+    result = subprocess.run(
+        [gdal, "--version"], check=True, capture_output=True, text=True
+    )
+    return result.stdout.split(",")[0].split()[1]
+
+
+def write_module(
+    usage: UsageIndex,
+    version: str,
+    output_fn: Path = OUTPUT_FN,
+    header: List[str] = HEADER,
+) -> None:
+    lines = header + [
+        "# Arguments are (type, min values, max values, packed, repeated)",
+        f'GDAL_VERSION = "{version}"',
+        f"USAGE: dict = {pprint.pformat(usage, width=88, sort_dicts=True)}",
+    ]
+    output_fn.write_text("\n".join(lines) + "\n", encoding="utf-8", newline="\n")
+
+
+def generate(gdal: str = "gdal", output_fn: Path = OUTPUT_FN) -> None:
+    usage: UsageIndex = {}
+    for pipeline_type in PIPELINE_TYPES:
+        usage.update(compile_usage(json_usage(gdal, pipeline_type)))
+    write_module(usage, gdal_version(gdal), output_fn)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gdal", default="gdal", help="Path to the gdal program")
+    args = parser.parse_args()
+    generate(args.gdal)
+    print(f"Wrote {OUTPUT_FN}")
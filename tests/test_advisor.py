@@ -0,0 +1,93 @@
+import pytest
+
+from gdalgviz.advisor import advise_materialize, format_advice, impact_class
+from gdalgviz.main import detect_pipeline_type, workflow_diagram
+from gdalgviz.parser import parse_pipeline
+
+TEE_PIPELINE = (
+    "gdal raster pipeline ! read a.tif ! reproject --dst-crs=EPSG:3857 ! slope "
+    "! tee [ write slope.tif ] ! hillshade ! write out.tif"
+)
+SHARED_PIPELINE = (
+    "gdal raster pipeline ! read x.tif ! reproject --dst-crs=EPSG:3857 "
+    "! blend --overlay [ read x.tif ! reproject --dst-crs=EPSG:3857 ! hillshade ] "
+    "! write out.tif"
+)
+
+
+def _advice(pipeline: str) -> list:
+    return advise_materialize(parse_pipeline(pipeline))[1]
+
+
+@pytest.mark.parametrize(
+    "recomputed,extra_runs,expected",
+    [
+        (["reproject"], 1, "high"),
+        (["slope"], 1, "medium"),
+        (["slope", "aspect"], 1, "high"),
+        (["slope"], 2, "high"),
+        (["select"], 3, "low"),
+    ],
+)
+def test_impact_class(recomputed, extra_runs, expected):
+    assert impact_class(recomputed, extra_runs) == expected
+
+
+def test_tee_fan_out():
+    steps, advice = advise_materialize(parse_pipeline(TEE_PIPELINE))
+    assert len(advice) == 1
+    assert advice[0]["location"] == "step 3 (slope)"
+    assert advice[0]["recomputed"] == ["reproject", "slope"]
+    assert advice[0]["runs"] == 2
+    assert advice[0]["impact"] == "high"
+    # the step to materialize after is annotated
+    assert steps[3]["materialize"]["impact"] == "high"
+    assert "materialize" not in parse_pipeline(TEE_PIPELINE)[3]
+
+
+@pytest.mark.parametrize(
+    "pipeline",
+    [
+        # already materialized
+        "gdal raster pipeline ! read a.tif ! reproject ! materialize "
+        "! tee [ write a.tif ] ! write b.tif",
+        # tee is the last step, so it has a single consumer
+        "gdal raster pipeline ! read a.tif ! reproject ! tee [ write a.tif ]",
+        # nothing expensive upstream
+        "gdal raster pipeline ! read a.tif ! select 1 ! tee [ write a.tif ] "
+        "! write b.tif",
+    ],
+)
+def test_no_advice(pipeline):
+    assert _advice(pipeline) == []
+
+
+def test_nested_tee_inherits_upstream():
+    advice = _advice(
+        "gdal raster pipeline ! read a.tif ! reproject "
+        "! tee [ select 1 ! tee [ write a.tif ] ! write b.tif ] ! write c.tif"
+    )
+    # materializing before the first tee also covers the nested one
+    assert [a["location"] for a in advice] == ["step 2 (reproject)"]
+
+
+def test_shared_streams():
+    advice = _advice(SHARED_PIPELINE)
+    assert len(advice) == 1
+    assert advice[0]["location"] == "step 2 (reproject)"
+    assert "step 3 (blend) > input 1" in advice[0]["reason"]
+
+
+def test_format_advice():
+    report = format_advice(_advice(TEE_PIPELINE))
+    assert report.startswith("[high] materialize after step 3 (slope):")
+    assert format_advice([]) == "No materialize suggestions"
+
+
+def test_diagram_advice_note():
+    steps = parse_pipeline(TEE_PIPELINE)
+    source = workflow_diagram(
+        steps, "svg", detect_pipeline_type(steps), advise=True
+    ).source
+    assert '"2-materialize" [label="materialize?\\nhigh impact"' in source
+    assert '2 -> "2-materialize" [arrowhead=none style=dashed]' in source
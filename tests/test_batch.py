@@ -0,0 +1,189 @@
+import json
+import re
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from gdalgviz import cli
+from gdalgviz.batch import _split_svgs, render_batch
+
+PIPELINES = [
+    "gdal vector pipeline ! read in.gpkg ! reproject --dst-crs=EPSG:32632",
+    "gdal raster pipeline ! read in.tif ! slope --unit percent ! write out.tif",
+    "gdal raster pipeline ! read FAIL.tif ! write out.tif",
+    "gdal pipeline read a.tif ! blend --overlay [ read b.tif ] ! write c.tif",
+    "gdal pipeline ! read in.tif ! hillshade ! write out.tif",
+]
+
+# stands in for dot: one SVG per input graph, failing if any graph contains FAIL
+FAKE_DOT = """
+import re
+with open(sys.argv[0] + ".calls", "a") as f:
+    f.write("x")
+graphs = re.findall(r"digraph.*?\\n}", sys.stdin.read(), re.DOTALL)
+if any("FAIL" in g for g in graphs):
+    sys.exit("syntax error")
+for i, graph in enumerate(graphs):
+    sys.stdout.write(f'<?xml version="1.0"?>\\n<svg><!-- {len(graph)} --></svg>\\n')
+"""
+
+posix_only = pytest.mark.skipif(
+    sys.platform == "win32", reason="fake layout engines are shell scripts"
+)
+
+
+@pytest.fixture
+def fake_dot(tmp_path):
+    engine = tmp_path / "fake-dot"
+    engine.write_text(f"#!{sys.executable}\nimport sys\n{FAKE_DOT}")
+    engine.chmod(0o755)
+    return engine
+
+
+def test_split_svgs():
+    output = (
+        b'<?xml version="1.0"?>\n<svg>1</svg>\n<?xml version="1.0"?>\n<svg>2</svg>\n'
+    )
+    assert _split_svgs(output) == [
+        b'<?xml version="1.0"?>\n<svg>1</svg>',
+        b'<?xml version="1.0"?>\n<svg>2</svg>',
+    ]
+
+
+@posix_only
+def test_render_batch(tmp_path, fake_dot):
+    jobs = [(p, str(tmp_path / f"{i}.svg")) for i, p in enumerate(PIPELINES) if i != 2]
+    errors = render_batch(jobs, chunk_size=10, engine=str(fake_dot))
+
+    assert errors == {}
+    assert fake_dot.with_suffix(".calls").read_text() == "x"
+    for _, output_fn in jobs:
+        assert open(output_fn).read().startswith('<?xml version="1.0"?>\n<svg>')
+
+
+@posix_only
+def test_render_batch_isolates_failures(tmp_path, fake_dot):
+    jobs = [(p, str(tmp_path / f"{i}.svgz")) for i, p in enumerate(PIPELINES)]
+    jobs.append(("not a pipeline [", str(tmp_path / "invalid.svg")))
+    errors = render_batch(jobs, chunk_size=10, engine=str(fake_dot))
+
+    assert sorted(errors) == [str(tmp_path / "2.svgz"), str(tmp_path / "invalid.svg")]
+    for i in (0, 1, 3, 4):
+        assert (tmp_path / f"{i}.svgz").exists()
+    assert not (tmp_path / "2.svgz").exists()
+
+
+@posix_only
+def test_render_batch_manifest(tmp_path, fake_dot):
+    jobs = [
+        (PIPELINES[0], str(tmp_path / "a.svg")),
+        (PIPELINES[1], str(tmp_path / "b.svg")),
+    ]
+    manifest_fn = tmp_path / "manifest.json"
+    render_batch(jobs, engine=str(fake_dot), manifest=str(manifest_fn))
+    mtime = (tmp_path / "a.svg").stat().st_mtime_ns
+
+    render_batch(
+        jobs, engine=str(fake_dot), skip_unchanged=True, manifest=str(manifest_fn)
+    )
+    assert (tmp_path / "a.svg").stat().st_mtime_ns == mtime
+    outputs = json.loads(manifest_fn.read_text())["outputs"]
+    assert sorted(outputs) == ["a.svg", "b.svg"]
+
+
+def test_render_batch_chunk_limits(tmp_path):
+    """Test that the limits of each diagram are scaled to the size of a chunk."""
+    jobs = [(p, str(tmp_path / f"{i}.svg")) for i, p in enumerate(PIPELINES[:4])]
+
+    def fake_render_source(source, *args, **limits):
+        # one SVG per graph
+        return b'<?xml version="1.0"?>\n<svg></svg>\n' * source.count("digraph")
+
+    with patch("gdalgviz.batch.render_source") as mock_render:
+        mock_render.side_effect = fake_render_source
+        render_batch(jobs, timeout=2, max_memory=100, max_cpu_time=1)
+    assert mock_render.call_args.kwargs == {
+        "engine": "dot",
+        "timeout": 8,
+        "max_memory": 100,
+        "max_cpu_time": 4,
+    }
+
+
+@posix_only
+def test_render_batch_interactive(tmp_path, fake_dot):
+    jobs = [(PIPELINES[0], str(tmp_path / "a.svg"))]
+    jobs.append((PIPELINES[1], str(tmp_path / "b.mmd")))
+    errors = render_batch(jobs, engine=str(fake_dot), interactive=True)
+    assert "<script" in (tmp_path / "a.svg").read_text()
+    assert list(errors) == [str(tmp_path / "b.mmd")]
+
+
+def test_render_batch_invalid_format(tmp_path):
+    errors = render_batch([(PIPELINES[0], str(tmp_path / "out.png"))])
+    assert list(errors) == [str(tmp_path / "out.png")]
+
+
+def test_batch_cli(tmp_path):
+    input_files = []
+    for i, pipeline in enumerate(PIPELINES[:2]):
+        input_file = tmp_path / f"pipeline{i}.gdalg.json"
+        input_file.write_text(f'{{"command_line": "{pipeline}"}}')
+        input_files.append(str(input_file))
+
+    output_dir = tmp_path / "out"
+    with patch("gdalgviz.cli.render_batch") as mock_batch:
+        mock_batch.return_value = {}
+        exit_code = cli.main(
+            [
+                "batch",
+                *input_files,
+                "--output-dir",
+                str(output_dir),
+                "--chunk-size",
+                "5",
+            ]
+        )
+    assert exit_code == 0
+    mock_batch.assert_called_once_with(
+        [
+            (PIPELINES[0], str(output_dir / "pipeline0.svg")),
+            (PIPELINES[1], str(output_dir / "pipeline1.svg")),
+        ],
+        chunk_size=5,
+        minify=False,
+        timeout=None,
+        vertical=False,
+        fontname="Helvetica",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        gallery=None,
+        gallery_inline=False,
+    )
+
+
+@posix_only
+def test_render_batch_gallery(tmp_path, fake_dot):
+    jobs = [(p, str(tmp_path / "out" / f"{i}.svg")) for i, p in enumerate(PIPELINES)]
+    jobs[1] = (PIPELINES[1], str(tmp_path / "out" / "1.svgz"))
+    (tmp_path / "out").mkdir()
+    gallery_fn = tmp_path / "index.html"
+    render_batch(jobs, engine=str(fake_dot), gallery=str(gallery_fn))
+
+    page = gallery_fn.read_text()
+    entries = json.loads(re.search(r'type="application/json">(.*?)</script>', page)[1])
+    assert [entry["name"] for entry in entries] == ["1.svgz", "0.svg", "3.svg", "4.svg"]
+    assert [entry["group"] for entry in entries] == [
+        "raster",
+        "vector",
+        "other",
+        "other",
+    ]
+    assert entries[1]["src"] == "out/0.svg"
+    assert entries[1]["svg"] is None
+    # compressed diagrams are embedded in the page
+    assert entries[0]["svg"].startswith("<svg>")
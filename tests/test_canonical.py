@@ -0,0 +1,164 @@
+"""
+Round-trip property tests for the canonical form: for any canonical steps x,
+parse_pipeline(serialize_pipeline(x)) == x
+"""
+
+import json
+import random
+
+import pytest
+
+from gdalgviz._pipeline_parser import UnexpectedInput
+from gdalgviz.canonical import (
+    canonical_pipeline,
+    canonical_steps,
+    quote_value,
+    serialize_pipeline,
+    to_gdalg,
+)
+from gdalgviz.parser import ParseLimitError, parse_pipeline
+
+COMMANDS = ["read", "write", "reproject", "blend", "tee", "color-map", "edit"]
+FLAGS = ["o", "r", "z", "overwrite", "dst-crs", "co", "x2"]
+# pieces of values, including characters that need quoting and escaped quotes
+VALUE_PIECES = ["a", "in.tif", "EPSG:3857", "A=B", "-5", " ", "!", "[", "]"]
+VALUE_PIECES += ["=", "'", '\\"', "\\\\", "\t", "é"]
+
+
+def random_value(rng):
+    return "".join(rng.choices(VALUE_PIECES, k=rng.randint(0, 5)))
+
+
+def random_arg(rng):
+    kind = rng.choice(["positional", "short_arg", "long_arg"])
+    value = random_value(rng)
+    if kind == "positional":
+        return {"type": kind, "value": value}
+    flag = rng.choice([f for f in FLAGS if (len(f) == 1) == (kind == "short_arg")])
+    return {"type": kind, "flag": flag, "value": rng.choice([None, value])}
+
+
+def random_steps(rng, depth=0):
+    steps = []
+    for _ in range(rng.randint(1, 4)):
+        step = {
+            "command": rng.choice(COMMANDS),
+            "args": [random_arg(rng) for _ in range(rng.randint(0, 4))],
+        }
+        if depth < 3 and rng.random() < 0.3:
+            step["nested"] = [
+                {"type": "nested", "pipeline": random_steps(rng, depth + 1)}
+                for _ in range(rng.randint(1, 2))
+            ]
+        steps.append(step)
+    return steps
+
+
+def test_round_trip():
+    rng = random.Random(1234)
+    for _ in range(1000):
+        steps = canonical_steps(random_steps(rng))
+        command_line = serialize_pipeline(steps)
+        assert parse_pipeline(command_line) == steps, command_line
+        assert canonical_steps(steps) == steps
+
+
+def test_round_trip_fuzz():
+    rng = random.Random(5678)
+    alphabet = ['"a b"', "'c'", "[", "]", "!", " ", "-x", "--y", "=", "z", "read"]
+    parsed = 0
+    for _ in range(1000):
+        tokens = rng.choices(alphabet, k=rng.randint(1, 30))
+        try:
+            steps = parse_pipeline("gdal pipeline ! read " + "".join(tokens))
+        except (UnexpectedInput, ParseLimitError):
+            continue
+        parsed += 1
+        canonical = canonical_steps(steps)
+        assert parse_pipeline(serialize_pipeline(canonical)) == canonical
+    assert parsed > 30
+
+
+@pytest.mark.parametrize(
+    "pipeline",
+    [
+        "gdal raster pipeline ! read in.tif ! reproject --dst-crs=EPSG:3857 -r cubic",
+        "gdal raster pipeline read in.tif ! reproject --dst-crs EPSG:3857 -r cubic",
+        "GDAL Raster Pipeline !  read 'in.tif'  !  reproject -r \"cubic\" --dst-crs=EPSG:3857",
+        'gdal  raster  pipeline ! read "in.tif" ! reproject -r cubic --dst-crs "EPSG:3857"',
+    ],
+)
+def test_equivalent_pipelines(pipeline):
+    assert canonical_pipeline(pipeline) == (
+        "gdal raster pipeline ! read in.tif ! reproject --dst-crs EPSG:3857 -r cubic"
+    )
+
+
+def test_canonical_nested():
+    pipeline = (
+        "read a.tif ! blend --overlay [ read b.tif ] in.tif "
+        "! tee [ write --overwrite c.tif ] ! write d.tif"
+    )
+    # a flag without a value is never followed by a positional argument
+    assert canonical_pipeline(pipeline) == (
+        "gdal pipeline ! read a.tif ! blend in.tif --overlay [ read b.tif ] "
+        "! tee [ write --overwrite c.tif ] ! write d.tif"
+    )
+    steps = canonical_steps(parse_pipeline(pipeline))
+    assert parse_pipeline(canonical_pipeline(pipeline)) == steps
+
+
+def test_canonical_boolean_flag():
+    """
+    A boolean flag followed by a positional argument is written the way
+    GDAL reads it, not as --overwrite=o.tif
+    """
+    pipeline = "gdal raster pipeline ! read a.tif ! write --overwrite o.tif"
+    assert canonical_pipeline(pipeline) == pipeline
+    assert parse_pipeline(canonical_pipeline(pipeline)) == canonical_steps(
+        parse_pipeline(pipeline)
+    )
+
+
+def test_canonical_steps_drops_annotations():
+    steps = parse_pipeline("gdal pipeline ! read a.tif ! tee [ write b.tif ]")
+    steps[1]["hash"] = "abc"
+    steps[2]["nested"]["pipeline"] = [steps[2]["nested"]["pipeline"]]
+    canonical = canonical_steps(steps)
+    assert "hash" not in canonical[1]
+    assert canonical[2]["nested"]["pipeline"] == {
+        "command": "write",
+        "args": [{"type": "positional", "value": "b.tif"}],
+    }
+    assert steps[1]["hash"] == "abc"
+
+
+def test_quote_value():
+    assert quote_value("in.tif") == "in.tif"
+    assert quote_value("a b") == '"a b"'
+    assert quote_value("-5") == '"-5"'
+    assert quote_value("") == '""'
+    assert quote_value('say "hi"') == "'say \"hi\"'"
+    with pytest.raises(ValueError):
+        quote_value("a \" ' b")
+
+
+def test_serialize_deep_nesting():
+    step = {"command": "read", "args": [{"type": "positional", "value": "b"}]}
+    for _ in range(10000):
+        step = {
+            "command": "blend",
+            "args": [],
+            "nested": {"type": "nested", "pipeline": step},
+        }
+    command_line = serialize_pipeline([step])
+    assert command_line.startswith("blend [ blend [ ")
+    assert command_line.endswith("read b" + " ]" * 10000)
+
+
+def test_to_gdalg():
+    gdalg = json.loads(to_gdalg("read  a.tif ! write  b.tif"))
+    assert gdalg == {
+        "type": "gdal_streamed_alg",
+        "command_line": "gdal pipeline ! read a.tif ! write b.tif",
+    }
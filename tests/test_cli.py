@@ -1,6 +1,8 @@
+import json
 from unittest.mock import patch
 from gdalgviz import cli
 from gdalgviz.main import DOCS_ROOT
+from gdalgviz.render import RenderLimitError
 import pytest
 
 PIPELINE_STR = "gdal vector pipeline ! read in.gpkg ! reproject --dst-crs=EPSG:32632"
@@ -22,6 +24,28 @@ def test_main_with_pipeline_string(tmp_path):
         docs_root=DOCS_ROOT,
         graph_attr={},
         node_attr={},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -43,6 +67,28 @@ def test_main_with_file(tmp_path):
         docs_root=DOCS_ROOT,
         graph_attr={},
         node_attr={},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=str(input_file),
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -81,6 +127,28 @@ def test_main_vertical_flag(tmp_path):
         docs_root=DOCS_ROOT,
         graph_attr={"bgcolor": "transparent"},
         node_attr={},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -110,6 +178,28 @@ def test_main_custom_font(tmp_path):
         docs_root=DOCS_ROOT,
         graph_attr={},
         node_attr={"fontsize": "12"},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -132,6 +222,28 @@ def test_main_custom_docs_root(tmp_path):
         docs_root=custom_root,
         graph_attr={},
         node_attr={},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -163,6 +275,28 @@ def test_main_all_options(tmp_path):
         docs_root=custom_root,
         graph_attr={},
         node_attr={},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -190,6 +324,28 @@ def test_main_custom_header_color(tmp_path):
         header_color="#ff0000",
         graph_attr={},
         node_attr={},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -227,6 +383,28 @@ def test_main_default_header_color(tmp_path):
         header_color="#cfe2ff",
         graph_attr={},
         node_attr={},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -256,6 +434,28 @@ def test_main_graph_and_node_attr(tmp_path):
         docs_root=DOCS_ROOT,
         graph_attr={"bgcolor": "transparent", "pad": "0.8"},
         node_attr={"fontsize": "12", "fontname": "Courier"},
+        minify=False,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
     )
 
 
@@ -275,3 +475,309 @@ def test_main_invalid_graph_attr(tmp_path):
             )
     assert exc_info.value.code != 0
     mock_generate.assert_not_called()
+
+
+def test_main_minify(tmp_path):
+    """Test that --minify is passed through to generate_diagram."""
+    output_file = tmp_path / "output.svgz"
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        exit_code = cli.main(["--pipeline", PIPELINE_STR, "--minify", str(output_file)])
+    assert exit_code == 0
+    mock_generate.assert_called_once_with(
+        pipeline=PIPELINE_STR,
+        output_fn=str(output_file),
+        vertical=False,
+        fontname="Helvetica",
+        header_color="#cfe2ff",
+        docs_root=DOCS_ROOT,
+        graph_attr={},
+        node_attr={},
+        minify=True,
+        timeout=None,
+        max_memory=None,
+        max_cpu_time=None,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
+    )
+
+
+def test_main_render_limits(tmp_path):
+    """Test that render limits are passed through to generate_diagram."""
+    output_file = tmp_path / "output.svg"
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        exit_code = cli.main(
+            [
+                "--pipeline",
+                PIPELINE_STR,
+                "--timeout",
+                "2.5",
+                "--max-memory",
+                "512",
+                "--max-cpu-time",
+                "10",
+                str(output_file),
+            ]
+        )
+    assert exit_code == 0
+    mock_generate.assert_called_once_with(
+        pipeline=PIPELINE_STR,
+        output_fn=str(output_file),
+        vertical=False,
+        fontname="Helvetica",
+        header_color="#cfe2ff",
+        docs_root=DOCS_ROOT,
+        graph_attr={},
+        node_attr={},
+        minify=False,
+        timeout=2.5,
+        max_memory=512,
+        max_cpu_time=10,
+        backend="subprocess",
+        max_arg_length=None,
+        max_label_length=None,
+        wrap_width=None,
+        skip_unchanged=True,
+        manifest=None,
+        advise=False,
+        show_costs=False,
+        cost_overrides=None,
+        timings=None,
+        heatmap="time",
+        resolve=False,
+        source_fn=None,
+        max_depth=8,
+        merge=False,
+        interactive=False,
+        page_size=None,
+        validate=False,
+    )
+
+
+def test_main_render_limit_exceeded(tmp_path, capsys):
+    """Test that a diagram still hitting a limit when simplified is an error."""
+    output_file = tmp_path / "output.svg"
+    with patch("gdalgviz.main.render_source") as mock_render:
+        mock_render.side_effect = RenderLimitError("dot exceeded the 1s timeout")
+        exit_code = cli.main(
+            ["--pipeline", PIPELINE_STR, "--timeout", "1", str(output_file)]
+        )
+    assert exit_code == 1
+    assert mock_render.call_count == 2
+    assert "dot exceeded the 1s timeout" in capsys.readouterr().err
+    assert not output_file.exists()
+
+
+def test_diff(tmp_path):
+    """Test the diff subcommand passes both pipelines to generate_diff_diagram."""
+    old_file = tmp_path / "old.txt"
+    new_file = tmp_path / "new.txt"
+    output_file = tmp_path / "diff.svg"
+    old_file.write_text(PIPELINE_STR)
+    new_file.write_text(PIPELINE_STR + " ! write out.gpkg")
+    with patch("gdalgviz.cli.generate_diff_diagram") as mock_diff:
+        mock_diff.return_value = {"changed": 0, "added": 1}
+        exit_code = cli.main(
+            ["diff", str(old_file), str(new_file), str(output_file), "--vertical"]
+        )
+    assert exit_code == 0
+    mock_diff.assert_called_once_with(
+        PIPELINE_STR,
+        PIPELINE_STR + " ! write out.gpkg",
+        str(output_file),
+        vertical=True,
+        fontname="Helvetica",
+        docs_root=DOCS_ROOT,
+    )
+
+
+def test_diff_missing_file(tmp_path):
+    """Test that diff returns error code 1 when an input file does not exist."""
+    old_file = tmp_path / "old.txt"
+    old_file.write_text(PIPELINE_STR)
+    with patch("gdalgviz.cli.generate_diff_diagram") as mock_diff:
+        exit_code = cli.main(
+            ["diff", str(old_file), str(tmp_path / "missing.txt"), "diff.svg"]
+        )
+    assert exit_code == 1
+    mock_diff.assert_not_called()
+
+
+def test_main_backend(tmp_path):
+    """Test that the backend option is passed through to generate_diagram."""
+    output_file = tmp_path / "output.svg"
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        cli.main(
+            ["--pipeline", PIPELINE_STR, "--backend", "inprocess", str(output_file)]
+        )
+    assert mock_generate.call_args.kwargs["backend"] == "inprocess"
+
+
+def test_main_advise(tmp_path, capsys):
+    """Test that --advise prints a report and fails when there are suggestions."""
+    output_file = tmp_path / "output.svg"
+    pipeline = (
+        "gdal raster pipeline ! read a.tif ! reproject --dst-crs=EPSG:3857 "
+        "! tee [ write b.tif ] ! write c.tif"
+    )
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        exit_code = cli.main(["--pipeline", pipeline, "--advise", str(output_file)])
+        assert mock_generate.call_args.kwargs["advise"] is True
+        assert exit_code == 1
+        assert "[high] materialize after step 2 (reproject)" in capsys.readouterr().out
+
+        exit_code = cli.main(["--pipeline", PIPELINE_STR, "--advise", str(output_file)])
+        assert exit_code == 0
+        assert "No materialize suggestions" in capsys.readouterr().out
+
+
+def test_main_cost_file(tmp_path):
+    """Test that a cost file is loaded and enables cost badges."""
+    output_file = tmp_path / "output.svg"
+    cost_file = tmp_path / "costs.json"
+    cost_file.write_text('{"reproject": {"weight": 12}}')
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        cli.main(
+            [
+                "--pipeline",
+                PIPELINE_STR,
+                "--cost-file",
+                str(cost_file),
+                str(output_file),
+            ]
+        )
+    kwargs = mock_generate.call_args.kwargs
+    assert kwargs["show_costs"] is True
+    assert kwargs["cost_overrides"] == {"reproject": {"weight": 12}}
+
+
+def test_main_invalid_cost_file(tmp_path):
+    cost_file = tmp_path / "costs.json"
+    cost_file.write_text('{"reproject": {"weight": -1}}')
+    with pytest.raises(SystemExit):
+        cli.main(
+            [
+                "--pipeline",
+                PIPELINE_STR,
+                "--cost-file",
+                str(cost_file),
+                str(tmp_path / "output.svg"),
+            ]
+        )
+
+
+def test_main_timings(tmp_path):
+    timings_file = tmp_path / "timings.json"
+    timings_file.write_text('{"1": {"time": 2, "memory": 100}}')
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        cli.main(
+            [
+                "--pipeline",
+                PIPELINE_STR,
+                "--timings",
+                str(timings_file),
+                "--heatmap",
+                "memory",
+                str(tmp_path / "output.svg"),
+            ]
+        )
+    kwargs = mock_generate.call_args.kwargs
+    assert kwargs["timings"] == {"1": {"time": 2, "memory": 100}}
+    assert kwargs["heatmap"] == "memory"
+
+
+def test_main_invalid_timings(tmp_path):
+    timings_file = tmp_path / "timings.json"
+    timings_file.write_text('{"99": 1.5}')
+    with pytest.raises(SystemExit):
+        cli.main(
+            [
+                "--pipeline",
+                PIPELINE_STR,
+                "--timings",
+                str(timings_file),
+                str(tmp_path / "output.svg"),
+            ]
+        )
+
+
+def test_main_timings_resolved(tmp_path):
+    """Test that timings are checked against the steps of referenced files."""
+    for name, command_line in [
+        ("dem.gdalg.json", "gdal raster pipeline ! read dem.tif ! hillshade"),
+        ("main.gdalg.json", "gdal raster pipeline ! read dem.gdalg.json ! write o.tif"),
+    ]:
+        (tmp_path / name).write_text(
+            json.dumps({"type": "gdal_streamed_alg", "command_line": command_line})
+        )
+    timings_file = tmp_path / "timings.json"
+    timings_file.write_text("[1, 2, 3, 4]")
+    args = [str(tmp_path / "main.gdalg.json"), str(tmp_path / "output.svg")]
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        cli.main(args + ["--timings", str(timings_file), "--resolve"])
+        assert mock_generate.call_args.kwargs["timings"] == [1, 2, 3, 4]
+        with pytest.raises(SystemExit):
+            cli.main(args + ["--timings", str(timings_file)])
+
+
+def test_main_checks_pass_resolved_steps(tmp_path):
+    """Test that the steps parsed and resolved for the checks are drawn."""
+    for name, command_line in [
+        ("dem.gdalg.json", "gdal raster pipeline ! read dem.tif ! hillshade"),
+        ("main.gdalg.json", "gdal raster pipeline ! read dem.gdalg.json ! write o.tif"),
+    ]:
+        (tmp_path / name).write_text(
+            json.dumps({"type": "gdal_streamed_alg", "command_line": command_line})
+        )
+    args = [str(tmp_path / "main.gdalg.json"), str(tmp_path / "output.svg")]
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        cli.main(args + ["--merge", "--resolve"])
+    kwargs = mock_generate.call_args.kwargs
+    assert kwargs["resolve"] is False
+    assert kwargs["pipeline"][1]["reference"]["status"] == "resolved"
+
+
+def test_main_interactive(tmp_path):
+    output_file = tmp_path / "output.svg"
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        cli.main(["--pipeline", PIPELINE_STR, "--interactive", str(output_file)])
+    assert mock_generate.call_args.kwargs["interactive"] is True
+
+
+def test_main_page_size(tmp_path):
+    output_file = tmp_path / "output.svg"
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        cli.main(["--pipeline", PIPELINE_STR, "--page-size", "5", str(output_file)])
+    assert mock_generate.call_args.kwargs["page_size"] == 5
+
+
+@pytest.mark.parametrize("page_size,output_fn", [("0", "out.svg"), ("5", "out.mmd")])
+def test_main_page_size_invalid(tmp_path, page_size, output_fn):
+    args = ["--pipeline", PIPELINE_STR, "--page-size", page_size]
+    with pytest.raises(SystemExit):
+        cli.main(args + [str(tmp_path / output_fn)])
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from gdalgviz.commands import COMMAND_COSTS, RASTER_COMMANDS, VECTOR_COMMANDS
+from gdalgviz.cost import (
+    CRITICAL_PARENT,
+    analyze_costs,
+    cost_level,
+    format_cost,
+    get_costs,
+    load_cost_overrides,
+)
+from gdalgviz.main import detect_pipeline_type, workflow_diagram
+from gdalgviz.parser import iter_steps, parse_pipeline
+
+BLEND_PIPELINE = (
+    "gdal raster pipeline ! read a.tif ! hillshade ! blend --overlay "
+    "[ read b.tif ! reproject --dst-crs=EPSG:3857 ] ! write c.tif"
+)
+
+
+def _critical(steps):
+    return [
+        (step["command"], step["critical"])
+        for step in iter_steps(steps)
+        if "critical" in step
+    ]
+
+
+def test_all_commands_have_costs():
+    commands = set(RASTER_COMMANDS) | set(VECTOR_COMMANDS)
+    missing = {
+        cmd.split()[0] for cmd in commands if cmd not in ("raster", "vector")
+    } - set(COMMAND_COSTS)
+    assert missing == set()
+
+
+def test_cost_level():
+    assert cost_level(1) == "low"
+    assert cost_level(3) == "medium"
+    assert cost_level(8) == "high"
+
+
+def test_format_cost():
+    assert format_cost(COMMAND_COSTS["viewshed"]) == "cpu · blocking · memory · 9"
+
+
+def test_critical_path_through_nested_input():
+    steps, total = analyze_costs(parse_pipeline(BLEND_PIPELINE))
+    # read b.tif (2) + reproject (8) + blend (2) + write (3)
+    assert total == 15
+    assert _critical(steps) == [
+        ("blend", 0),
+        ("read", CRITICAL_PARENT),
+        ("reproject", CRITICAL_PARENT),
+        ("write", CRITICAL_PARENT),
+    ]
+    assert steps[1]["cost"]["weight"] == 2
+    assert "critical" not in steps[1]
+
+
+def test_critical_path_through_tee_branch():
+    steps, total = analyze_costs(
+        parse_pipeline(
+            "gdal raster pipeline ! read a.tif ! tee [ viewshed --pos 1,2 ! write v.tif ] "
+            "! write b.tif"
+        )
+    )
+    assert total == 2 + 1 + 9 + 3
+    assert [cmd for cmd, _ in _critical(steps)] == ["read", "tee", "viewshed", "write"]
+    assert "critical" not in steps[-1]
+
+
+def test_cost_overrides(tmp_path):
+    cost_fn = tmp_path / "costs.json"
+    cost_fn.write_text(
+        json.dumps({"reproject": {"weight": 1}, "my-step": {"bound": "io"}})
+    )
+    overrides = load_cost_overrides(str(cost_fn))
+
+    costs = get_costs(overrides)
+    assert costs["reproject"] == {**COMMAND_COSTS["reproject"], "weight": 1}
+    assert costs["my-step"]["bound"] == "io"
+    assert COMMAND_COSTS["reproject"]["weight"] == 8
+
+    steps, _ = analyze_costs(parse_pipeline(BLEND_PIPELINE), overrides)
+    # the main flow is now the most expensive
+    assert [cmd for cmd, _ in _critical(steps)] == [
+        "read",
+        "hillshade",
+        "blend",
+        "write",
+    ]
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"read": {"speed": 1}},
+        {"read": {"bound": "gpu"}},
+        {"read": {"weight": 0}},
+        {"read": {"weight": "high"}},
+        {"read": 5},
+        [],
+    ],
+)
+def test_invalid_cost_overrides(tmp_path, overrides):
+    cost_fn = tmp_path / "costs.json"
+    cost_fn.write_text(json.dumps(overrides))
+    with pytest.raises(ValueError):
+        load_cost_overrides(str(cost_fn))
+
+
+def test_diagram_costs():
+    steps = parse_pipeline(BLEND_PIPELINE)
+    source = workflow_diagram(
+        steps, "svg", detect_pipeline_type(steps), show_costs=True
+    ).source
+    assert "cpu · streaming · memory · 8" in source
+    assert source.count('BORDER="3" COLOR="#dc3545"') == 4
+    # the main flow edge into blend is not on the critical path
+    assert "\t1 -> 2\n" in source
+    assert '\t4 -> 2 [color="#dc3545" penwidth=2.5]' in source
@@ -0,0 +1,115 @@
+from gdalgviz.diff import _matching_pairs, diff_pipelines, diff_summary
+from gdalgviz.hashing import hash_steps, pipeline_hash
+from gdalgviz.main import workflow_diagram
+from gdalgviz.parser import iter_steps, parse_pipeline
+
+OLD_PIPELINE = """gdal raster pipeline
+    ! read n43.tif
+    ! blend --operator=hsv-value --overlay [ read n43.tif ! hillshade -z 30 ]
+    ! tee [ write blended.tif ]
+    ! slope
+    ! write out.tif
+"""
+
+NEW_PIPELINE = """gdal raster pipeline
+    ! read n43.tif
+    ! blend --operator=hsv-value --overlay [ read n43.tif ! hillshade -z 45 ]
+    ! tee [ write blended.tif ]
+    ! aspect
+    ! write out.tif --overwrite
+"""
+
+
+def _statuses(steps: list) -> list:
+    return [(s["command"], s["diff"]) for s in iter_steps(steps)]
+
+
+def test_hash_steps():
+    steps = hash_steps(parse_pipeline(OLD_PIPELINE))
+    same = hash_steps(parse_pipeline(" ".join(OLD_PIPELINE.split())))
+    changed = hash_steps(parse_pipeline(NEW_PIPELINE))
+
+    assert [s["hash"] for s in steps] == [s["hash"] for s in same]
+    assert pipeline_hash(steps) == pipeline_hash(same)
+    assert pipeline_hash(steps) != pipeline_hash(changed)
+    # read n43.tif is unchanged, but the blend step hash covers its nested input
+    assert steps[1]["hash"] == changed[1]["hash"]
+    assert steps[2]["hash"] != changed[2]["hash"]
+    assert steps[2]["nested"]["hash"] != changed[2]["nested"]["hash"]
+
+
+def test_hash_steps_does_not_modify_input():
+    steps = parse_pipeline(OLD_PIPELINE)
+    hash_steps(steps)
+    assert "hash" not in steps[2]
+    assert "hash" not in steps[2]["nested"]
+
+
+def test_diff_pipelines():
+    merged = diff_pipelines(parse_pipeline(OLD_PIPELINE), parse_pipeline(NEW_PIPELINE))
+    assert _statuses(merged) == [
+        ("gdal", "unchanged"),
+        ("read", "unchanged"),
+        ("blend", "changed"),
+        ("read", "unchanged"),
+        ("hillshade", "changed"),
+        ("tee", "unchanged"),
+        ("write", "unchanged"),
+        ("slope", "removed"),
+        ("aspect", "added"),
+        ("write", "changed"),
+    ]
+    assert diff_summary(merged) == {
+        "changed": 3,
+        "added": 1,
+        "removed": 1,
+        "unchanged": 4,
+    }
+
+
+def test_diff_identical_pipelines():
+    steps = parse_pipeline(OLD_PIPELINE)
+    merged = diff_pipelines(steps, steps)
+    assert {status for _, status in _statuses(merged)} == {"unchanged"}
+
+
+def test_matching_pairs_uses_unique_anchors():
+    old = list("abcxdefy")
+    new = list("ydefabcx")
+    pairs = _matching_pairs(old, new)
+    assert all(old[i] == new[j] for i, j in pairs)
+    # the longest run of steps unique to both pipelines is kept
+    assert [old[i] for i, _ in pairs] == list("abcx")
+
+
+def test_matching_pairs_repeated_steps():
+    old = ["read", "edit", "edit", "write"]
+    new = ["read", "edit", "edit", "edit", "write"]
+    assert _matching_pairs(old, new) == [(0, 0), (1, 1), (2, 2), (3, 4)]
+
+
+def test_diff_long_pipelines():
+    old = "gdal raster pipeline ! read a.tif " + " ".join(
+        f"! edit --metadata=N={i}" for i in range(2000)
+    )
+    new = old.replace("N=1000 ", "N=changed ").replace(
+        "N=1500 ", "N=1500 ! fill-nodata "
+    )
+    summary = diff_summary(diff_pipelines(parse_pipeline(old), parse_pipeline(new)))
+    assert summary == {"changed": 1, "added": 1, "removed": 0, "unchanged": 2000}
+
+
+def test_stable_node_ids():
+    """
+    Inserting a step does not change the node ids of the other steps
+    """
+    old = workflow_diagram(parse_pipeline(OLD_PIPELINE), "svg", stable_ids=True)
+    new = workflow_diagram(
+        parse_pipeline(OLD_PIPELINE.replace("! slope", "! fill-nodata ! slope")),
+        "svg",
+        stable_ids=True,
+    )
+    old_ids = {line.split()[0] for line in old.body if "[label=" in line}
+    new_ids = {line.split()[0] for line in new.body if "[label=" in line}
+    assert len(new_ids - old_ids) == 1
+    assert old_ids < new_ids
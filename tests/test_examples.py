@@ -1,9 +1,10 @@
-from gdalgviz.main import generate_diagram, detect_pipeline_type
+from gdalgviz.main import generate_diagram, generate_diff_diagram, detect_pipeline_type
 from gdalgviz.parser import parse_pipeline
 from pathlib import Path
 import re
 import sys
 import json
+import gzip
 
 UPDATE_REFERENCES = "--update-references" in sys.argv
 OUTPUT_DIR = Path("./tests/output")
@@ -317,6 +318,33 @@ def test_all_options():
     assert_svg_equal(output_path, REFERENCE_DIR / "test_all_options.svg")
 
 
+def test_minified_svgz():
+    output_path = OUTPUT_DIR / "test_minified_svgz.svgz"
+    pipeline = (
+        "gdal raster pipeline ! read in.tif ! slope --unit percent ! write out.tif"
+    )
+    generate_diagram(pipeline, str(output_path), minify=True)
+    svg = gzip.decompress(output_path.read_bytes()).decode("utf-8")
+    assert "<!--" not in svg
+    assert "gdal_raster_slope.html" in svg
+
+
+def test_diff_diagram():
+    output_path = OUTPUT_DIR / "test_diff_diagram.svg"
+    old_pipeline = (
+        "gdal raster pipeline ! read in.tif ! slope --unit percent ! write out.tif"
+    )
+    new_pipeline = (
+        "gdal raster pipeline ! read in.tif ! aspect ! write out.tif --overwrite"
+    )
+    summary = generate_diff_diagram(old_pipeline, new_pipeline, str(output_path))
+    # the pipeline header is not counted as a step
+    assert summary == {"changed": 1, "added": 1, "removed": 1, "unchanged": 1}
+    svg = output_path.read_text(encoding="utf-8")
+    assert "#d1e7dd" in svg  # added
+    assert "#f8d7da" in svg  # removed
+
+
 def test_graph_and_node_attr():
     """Verify graph_attr and node_attr are passed through correctly"""
     output_path = OUTPUT_DIR / "test_graph_and_node_attr.svg"
@@ -360,5 +388,7 @@ if __name__ == "__main__":
     test_nested_output_vertical()
     test_nested_output_custom_colors()
     test_all_options()
+    test_minified_svgz()
+    test_diff_diagram()
     test_graph_and_node_attr()
     print("Done!")
@@ -0,0 +1,68 @@
+import json
+import re
+
+from gdalgviz.gallery import gallery_entry, gallery_html, search_text, write_gallery
+from gdalgviz.parser import parse_pipeline
+
+RASTER = "gdal raster pipeline ! read in.tif ! tee [ write --overwrite tee.tif ] ! slope --unit percent"
+VECTOR = "gdal vector pipeline ! read in.gpkg ! reproject --dst-crs=EPSG:32632"
+
+
+def _entries(page):
+    data = re.search(r'type="application/json">(.*?)</script>', page, re.DOTALL)[1]
+    return json.loads(data)
+
+
+def test_search_text():
+    text = search_text(parse_pipeline(RASTER))
+    assert text == "read in.tif tee write --overwrite tee.tif slope --unit percent"
+
+
+def test_gallery_entry(tmp_path):
+    entry = gallery_entry(
+        str(tmp_path / "svg" / "a.svg"),
+        parse_pipeline(VECTOR),
+        str(tmp_path / "index.html"),
+    )
+    assert entry["src"] == "svg/a.svg"
+    assert entry["group"] == "vector"
+    assert entry["commands"] == "read ! reproject"
+    assert "--dst-crs epsg:32632" in entry["search"]
+    assert entry["svg"] is None
+
+
+def test_gallery_entry_inline(tmp_path):
+    svg = b'<?xml version="1.0"?>\n<!DOCTYPE svg>\n<svg><title>x</title></svg>'
+    entry = gallery_entry("a.svg", parse_pipeline(VECTOR), "index.html", svg)
+    assert entry["svg"] == "<svg><title>x</title></svg>"
+
+
+def test_gallery_html():
+    entries = [
+        gallery_entry("b.svg", parse_pipeline(VECTOR), "index.html"),
+        gallery_entry("c.svg", parse_pipeline("gdal pipeline ! read x"), "index.html"),
+        gallery_entry("a.svg", parse_pipeline(RASTER), "index.html"),
+    ]
+    entries[0]["svg"] = "<svg><script></script></svg>"
+    page = gallery_html(entries, title="<Gallery>")
+
+    assert "<title>&lt;Gallery&gt;</title>" in page
+    # closing tags are escaped so the embedded data cannot end its script
+    assert page.count("</script>") == 2
+    assert [e["name"] for e in _entries(page)] == ["a.svg", "b.svg", "c.svg"]
+    assert _entries(page)[1]["svg"] == "<svg><script></script></svg>"
+
+
+def test_write_gallery(tmp_path):
+    gallery_fn = str(tmp_path / "index.html")
+    entries = [gallery_entry("a.svg", parse_pipeline(RASTER), gallery_fn)]
+    assert write_gallery(entries, gallery_fn)
+    assert not write_gallery(entries, gallery_fn, skip_unchanged=True)
+
+
+def test_gallery_many_entries():
+    entry = gallery_entry("a.svg", parse_pipeline(RASTER), "index.html")
+    page = gallery_html([dict(entry, name=f"{i}.svg") for i in range(10000)])
+    # entries are only turned into page elements as the page is scrolled
+    assert page.count("<figure") == 0
+    assert len(_entries(page)) == 10000
@@ -0,0 +1,90 @@
+import shutil
+import subprocess
+
+import pytest
+
+from gdalgviz import main
+from gdalgviz.interactive import INTERACTIVE_SCRIPT, add_interactivity
+from gdalgviz.parser import parse_pipeline
+from gdalgviz.postprocess import minify_svg
+
+PIPELINE = (
+    "gdal raster pipeline ! read a.tif "
+    "! blend --operator=multiply --overlay [ read b.tif ! slope ] "
+    "! tee [ write c.tif ] ! write out.tif"
+)
+
+SVG = b'<?xml version="1.0"?>\n<svg viewBox="0 0 10 10"><g class="node"/></svg>\n'
+
+
+def test_interactive_classes():
+    source = main.workflow_diagram(
+        parse_pipeline(PIPELINE), "svg", interactive=True
+    ).source
+    # blend and tee own a block each, and the steps of the blocks are in them
+    assert 'class="gdalg-owner-b0"' in source
+    assert 'class="gdalg-owner-b1"' in source
+    assert source.count('class="gdalg-in-b0"') == 2
+    assert source.count('class="gdalg-in-b1"') == 1
+
+
+def test_interactive_nested_blocks():
+    pipeline = (
+        "gdal raster pipeline ! read a.tif "
+        "! blend --overlay [ read b.tif ! blend --overlay [ read c.tif ] ] "
+        "! write out.tif"
+    )
+    source = main.workflow_diagram(
+        parse_pipeline(pipeline), "svg", interactive=True
+    ).source
+    # the inner blend is hidden with its outer block, and owns the inner one
+    assert 'class="gdalg-in-b0 gdalg-owner-b1"' in source
+    assert 'class="gdalg-in-b0 gdalg-in-b1"' in source
+
+
+def test_not_interactive():
+    source = main.workflow_diagram(parse_pipeline(PIPELINE), "svg").source
+    assert "gdalg-" not in source
+
+
+def test_add_interactivity():
+    svg = add_interactivity(SVG)
+    assert svg.startswith(SVG[:-7])
+    assert svg.endswith(b"]]></script>\n</svg>\n")
+    assert b"gdalg-in-" in svg
+
+
+def test_add_interactivity_not_svg():
+    with pytest.raises(ValueError):
+        add_interactivity(b"\x89PNG")
+
+
+@pytest.mark.parametrize("minify", [False, True])
+def test_script_syntax(tmp_path, minify):
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("node is not installed")
+    script = INTERACTIVE_SCRIPT
+    if minify:
+        script = minify_svg(script)
+    script = script.split("<![CDATA[")[1].split("]]>")[0]
+    script_fn = tmp_path / "script.js"
+    script_fn.write_text(script)
+    subprocess.run([node, "--check", str(script_fn)], check=True)
+
+
+def test_interactive_png(tmp_path):
+    with pytest.raises(ValueError):
+        main.generate_diagram(PIPELINE, str(tmp_path / "out.png"), interactive=True)
+
+
+def test_generate_diagram_interactive(tmp_path):
+    if shutil.which("dot") is None:
+        pytest.skip("Graphviz is not installed")
+    output_fn = tmp_path / "output.svg"
+    main.generate_diagram(PIPELINE, str(output_fn), interactive=True, minify=True)
+    svg = output_fn.read_text()
+    assert svg.rstrip().endswith("]]></script></svg>")
+    # graphviz escapes hyphens, which browsers decode in class names
+    assert 'class="node gdalg&#45;owner&#45;b0"' in svg
+    assert "<![CDATA[" in svg
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+from gdalgviz.main import (
+    fit_arg_texts,
+    step_label_html,
+    step_tooltip,
+    workflow_diagram,
+)
+from gdalgviz.parser import parse_pipeline
+
+REFERENCE_DIR = Path(__file__).parent / "reference"
+
+SQL_PIPELINE = (
+    'gdal vector pipeline ! read in.gpkg ! sql --sql "SELECT '
+    + ", ".join(f"field_{i}" for i in range(100))
+    + ' FROM layer" ! write out.gpkg'
+)
+
+
+def test_fit_arg_texts_unlimited():
+    texts = ["--sql SELECT 1", "-f GPKG"]
+    assert fit_arg_texts(texts) == (texts, False)
+
+
+def test_fit_arg_texts_max_arg_length():
+    texts, truncated = fit_arg_texts(["--sql SELECT * FROM layer", "-f"], 10)
+    assert texts == ["--sql S...", "-f"]
+    assert truncated
+
+
+def test_fit_arg_texts_max_label_length():
+    texts, truncated = fit_arg_texts(
+        ["--format GPKG", "--layer roads", "--overwrite", "--update"],
+        max_label_length=20,
+    )
+    assert texts == ["--format GPKG", "--la...", "(2 more)"]
+    assert truncated
+
+
+def test_step_label_html_wraps():
+    args = [{"type": "long_arg", "flag": "sql", "value": "SELECT a, b FROM <c>"}]
+    label = step_label_html("sql", args, wrap_width=12)
+    assert '--sql SELECT<BR ALIGN="LEFT"/>a, b FROM<BR ALIGN="LEFT"/>&lt;c&gt;' in label
+
+
+def test_step_tooltip_escapes_backslashes():
+    tooltip = step_tooltip("read", ["C:\\Nodes\\in.gpkg"])
+    assert tooltip == "read\\nC:\\\\Nodes\\\\in.gpkg"
+
+
+def test_truncated_node_has_tooltip():
+    steps = parse_pipeline(SQL_PIPELINE)
+    source = workflow_diagram(steps, "svg", "vector", max_arg_length=40).source
+    assert "FROM layer</TD>" not in source
+    assert 'tooltip="sql\\n--sql SELECT field_0' in source
+    # nodes that fit keep the documentation link as their tooltip
+    assert 'tooltip="https://gdal.org/en/latest/programs/gdal_vector_read.html"' in (
+        source
+    )
+
+
+def test_label_budget_shrinks_labels():
+    steps = json.loads((REFERENCE_DIR / "test_expressions.json").read_text())
+    full = workflow_diagram(steps, "svg", "raster").source
+    budgeted = workflow_diagram(steps, "svg", "raster", max_arg_length=20).source
+    assert "DEFAULT=NO_DATA</TD>" in full
+    assert "DEFAULT=NO_DATA</TD>" not in budgeted
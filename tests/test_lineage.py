@@ -0,0 +1,165 @@
+import json
+import os
+from unittest.mock import patch
+
+from gdalgviz import cli
+from gdalgviz.lineage import (
+    build_index,
+    dataset_index,
+    iter_catalog_files,
+    lineage_diagram,
+    load_index,
+    neighbourhood,
+    save_index,
+)
+
+
+def _write_gdalg(path, command_line):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"command_line": command_line}))
+    return str(path)
+
+
+def _catalog(tmp_path):
+    """
+    dem.tif -> reproject -> dem-3857.tif -> hillshade -> hillshade.tif -> tiles
+    with the tiles pipeline reading a streamed pipeline file
+    """
+    return [
+        _write_gdalg(
+            tmp_path / "reproject.gdalg.json",
+            "gdal raster pipeline ! read dem.tif ! reproject --dst-crs=EPSG:3857 "
+            "! write dem-3857.tif",
+        ),
+        _write_gdalg(
+            tmp_path / "terrain" / "hillshade.gdalg.json",
+            "gdal raster pipeline ! read ../dem-3857.tif ! hillshade "
+            "! tee [ write hillshade.tif ] ! write slope.tif",
+        ),
+        _write_gdalg(
+            tmp_path / "colour.gdalg.json",
+            "gdal raster pipeline ! read terrain/hillshade.tif ! color-map",
+        ),
+        _write_gdalg(
+            tmp_path / "tiles.gdalg.json",
+            "gdal raster pipeline ! read colour.gdalg.json ! write tiles.mbtiles",
+        ),
+        _write_gdalg(
+            tmp_path / "other.gdalg.json", "gdal raster pipeline ! read x.tif"
+        ),
+    ]
+
+
+def test_build_index(tmp_path):
+    index = build_index(_catalog(tmp_path), str(tmp_path))
+    pipelines = index["pipelines"]
+    assert sorted(pipelines) == [
+        "colour.gdalg.json",
+        "other.gdalg.json",
+        "reproject.gdalg.json",
+        "terrain/hillshade.gdalg.json",
+        "tiles.gdalg.json",
+    ]
+    hillshade = pipelines["terrain/hillshade.gdalg.json"]
+    assert hillshade["commands"] == ["read", "hillshade", "tee", "write"]
+    assert hillshade["reads"] == [["dem-3857.tif", "1"]]
+    assert hillshade["writes"] == [
+        ["terrain/hillshade.tif", "3.1.1"],
+        ["terrain/slope.tif", "4"],
+    ]
+
+    producers, consumers = dataset_index(index)
+    assert producers["dem-3857.tif"] == [("reproject.gdalg.json", "3")]
+    assert consumers["colour.gdalg.json"] == [("tiles.gdalg.json", "1")]
+    assert producers["colour.gdalg.json"] == [("colour.gdalg.json", "")]
+
+
+def test_build_index_incremental(tmp_path):
+    fns = _catalog(tmp_path)
+    index = build_index(fns, str(tmp_path))
+
+    with patch("gdalgviz.lineage.parse_pipeline") as mock_parse:
+        assert build_index(fns, str(tmp_path), index) == index
+        mock_parse.assert_not_called()
+
+    # touched files are hashed but not parsed again
+    os.utime(fns[0], ns=(0, 0))
+    with patch("gdalgviz.lineage.parse_pipeline") as mock_parse:
+        updated = build_index(fns[:-1], str(tmp_path), index)
+        mock_parse.assert_not_called()
+    assert "other.gdalg.json" not in updated["pipelines"]
+
+    _write_gdalg(tmp_path / "other.gdalg.json", "gdal raster pipeline ! read y.tif")
+    updated = build_index(fns, str(tmp_path), index)
+    assert updated["pipelines"]["other.gdalg.json"]["reads"] == [["y.tif", "1"]]
+
+
+def test_build_index_invalid(tmp_path):
+    fn = tmp_path / "broken.gdalg.json"
+    fn.write_text("{")
+    index = build_index([str(fn)], str(tmp_path))
+    assert "error" in index["pipelines"]["broken.gdalg.json"]
+
+
+def test_save_and_load_index(tmp_path):
+    index_fn = str(tmp_path / "lineage.json")
+    assert load_index(index_fn)["pipelines"] == {}
+    index = build_index(_catalog(tmp_path), str(tmp_path))
+    assert save_index(index, index_fn)
+    assert not save_index(index, index_fn)
+    assert load_index(index_fn) == index
+
+
+def test_iter_catalog_files(tmp_path):
+    fns = _catalog(tmp_path)
+    (tmp_path / "notes.json").write_text("{}")
+    assert sorted(iter_catalog_files([str(tmp_path)])) == sorted(fns)
+
+
+def test_neighbourhood(tmp_path):
+    index = build_index(_catalog(tmp_path), str(tmp_path))
+    pipelines, datasets = neighbourhood(index, "terrain/hillshade.tif")
+    assert pipelines == {
+        "reproject.gdalg.json",
+        "terrain/hillshade.gdalg.json",
+        "colour.gdalg.json",
+        "tiles.gdalg.json",
+    }
+    assert "tiles.mbtiles" in datasets
+    assert "x.tif" not in datasets
+
+    pipelines, _ = neighbourhood(index, "terrain/hillshade.tif", depth=1)
+    assert pipelines == {"terrain/hillshade.gdalg.json", "colour.gdalg.json"}
+
+
+def test_lineage_diagram(tmp_path):
+    index = build_index(_catalog(tmp_path), str(tmp_path))
+    source = lineage_diagram(index, "dem-3857.tif", depth=1).source
+    assert "reproject.gdalg.json" in source
+    assert "hillshade.gdalg.json" in source
+    assert "tiles.gdalg.json" not in source
+    assert 'fillcolor="#ffe69c"' in source
+
+    # pipeline files read by other pipelines are linked directly
+    source = lineage_diagram(index).source
+    assert source.count("shape=cylinder") == 6
+
+
+def test_lineage_main(tmp_path):
+    _catalog(tmp_path)
+    index_fn = tmp_path / "lineage.json"
+    with patch("gdalgviz.lineage.Digraph.render") as mock_render:
+        exit_code = cli.main(
+            [
+                "lineage",
+                str(tmp_path),
+                str(tmp_path / "lineage.svg"),
+                "--index",
+                str(index_fn),
+                "--dataset",
+                str(tmp_path / "dem.tif"),
+            ]
+        )
+    assert exit_code == 0
+    mock_render.assert_called_once()
+    assert len(load_index(str(index_fn))["pipelines"]) == 5
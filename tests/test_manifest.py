@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gdalgviz import __version__, main
+from gdalgviz.manifest import (
+    content_hash,
+    input_hash,
+    load_manifest,
+    manifest_entry,
+    update_manifest,
+)
+from gdalgviz.parser import parse_pipeline
+from gdalgviz.postprocess import write_if_changed
+
+PIPELINE_STR = "gdal vector pipeline ! read in.gpkg ! reproject --dst-crs=EPSG:32632"
+
+
+def _age(path):
+    """
+    Set an old modification time, so a rewrite would be detected
+    """
+    os.utime(path, ns=(0, 0))
+
+
+def test_write_if_changed(tmp_path):
+    output_fn = tmp_path / "output.svg"
+    assert write_if_changed(b"<svg/>", str(output_fn))
+    _age(output_fn)
+
+    assert not write_if_changed(b"<svg/>", str(output_fn))
+    assert output_fn.stat().st_mtime_ns == 0
+
+    assert write_if_changed(b"<svg></svg>", str(output_fn))
+    assert output_fn.read_bytes() == b"<svg></svg>"
+
+
+def test_input_hash():
+    steps = parse_pipeline(PIPELINE_STR)
+    assert input_hash(PIPELINE_STR) == content_hash(PIPELINE_STR.encode("utf-8"))
+    assert input_hash(steps) == input_hash(parse_pipeline(PIPELINE_STR))
+    assert input_hash(steps) != input_hash(PIPELINE_STR)
+    assert input_hash(PIPELINE_STR, {"vertical": True}) != input_hash(PIPELINE_STR)
+
+
+def test_update_manifest(tmp_path):
+    manifest_fn = tmp_path / "manifest.json"
+    entry = manifest_entry(b"<svg/>", PIPELINE_STR)
+    assert entry["gdalgviz_version"] == __version__
+
+    assert update_manifest(str(manifest_fn), {str(tmp_path / "b" / "x.svg"): entry})
+    assert update_manifest(str(manifest_fn), {str(tmp_path / "a.svg"): entry})
+    _age(manifest_fn)
+    assert not update_manifest(str(manifest_fn), {str(tmp_path / "a.svg"): entry})
+
+    # paths are relative to the manifest and sorted
+    assert list(load_manifest(str(manifest_fn))) == ["a.svg", "b/x.svg"]
+    assert json.loads(manifest_fn.read_text())["manifest_version"] == 1
+
+
+def test_update_manifest_concurrently(tmp_path):
+    manifest_fn = tmp_path / "manifest.json"
+    entry = manifest_entry(b"<svg/>", PIPELINE_STR)
+
+    def update(i):
+        return update_manifest(str(manifest_fn), {str(tmp_path / f"{i}.svg"): entry})
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(update, range(50)))
+
+    # no update is lost, and no temporary or lock files are left behind
+    assert len(load_manifest(str(manifest_fn))) == 50
+    assert [p.name for p in tmp_path.iterdir()] == ["manifest.json"]
+
+
+def test_generate_diagram_skip_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "render_source", lambda *args, **kwargs: b"<svg/>")
+    output_fn = tmp_path / "output.svg"
+    manifest_fn = tmp_path / "manifest.json"
+    # identical files are not rewritten by default
+    options = dict(manifest=str(manifest_fn))
+
+    main.generate_diagram(PIPELINE_STR, str(output_fn), **options)
+    _age(output_fn)
+    main.generate_diagram(PIPELINE_STR, str(output_fn), **options)
+
+    assert output_fn.stat().st_mtime_ns == 0
+    entry = load_manifest(str(manifest_fn))["output.svg"]
+    assert entry["hash"] == content_hash(b"<svg/>")
+    assert entry["gdalgviz_version"] == __version__
+
+    # the options are part of the input
+    main.generate_diagram(PIPELINE_STR, str(output_fn), vertical=True, **options)
+    assert load_manifest(str(manifest_fn))["output.svg"]["input_hash"] != (
+        entry["input_hash"]
+    )
+
+
+def test_rendering_is_deterministic(tmp_path):
+    """
+    Skipping unchanged files relies on identical input giving identical output
+    """
+    if shutil.which("dot") is None:
+        pytest.skip("Graphviz is not installed")
+    outputs = []
+    for name in ("a.svgz", "b.svgz"):
+        output_fn = tmp_path / name
+        main.generate_diagram(PIPELINE_STR, str(output_fn), stable_ids=True)
+        outputs.append(output_fn.read_bytes())
+    assert outputs[0] == outputs[1]
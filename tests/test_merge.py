@@ -0,0 +1,72 @@
+import re
+from unittest.mock import patch
+
+from gdalgviz import cli
+from gdalgviz.main import workflow_diagram
+from gdalgviz.merge import format_merged, merge_subpipelines
+from gdalgviz.parser import iter_steps, parse_pipeline
+
+PIPELINE = (
+    "gdal raster pipeline ! read a.tif "
+    "! blend --overlay [ read dem.tif ! reproject --dst-crs=EPSG:3857 ] "
+    "! blend [ read dem.tif ! reproject --dst-crs=EPSG:3857 ] [ read b.tif ] "
+    "! blend [ read b.tif ] ! tee [ write x.tif ] [ write x.tif ] ! write c.tif"
+)
+
+
+def _edges(g):
+    return re.findall(r"^\t(\S+) -> (\S+)", g.source, re.MULTILINE)
+
+
+def test_merge_subpipelines():
+    steps = parse_pipeline(PIPELINE)
+    merged_steps, merged = merge_subpipelines(steps)
+    assert merged == [
+        {"location": "3.1", "source": "2.1", "steps": 2, "reads": ["dem.tif"]},
+        {"location": "4.1", "source": "3.2", "steps": 1, "reads": ["b.tif"]},
+    ]
+    assert merged_steps[3]["merged"] == {0: "merged-0"}
+    assert merged_steps[4]["merged"] == {0: "merged-1"}
+    # the input is not modified
+    assert not any("merged" in step for step in iter_steps(steps))
+
+
+def test_merge_diagram():
+    steps = parse_pipeline(PIPELINE)
+    unmerged = workflow_diagram(steps, "svg", "raster")
+    g = workflow_diagram(steps, "svg", "raster", merge=True)
+    assert g.source.count("label=<") == unmerged.source.count("label=<") - 3
+    edges = _edges(g)
+    # the first copy of each repeated input feeds every step using it
+    assert edges.count(('"merged-0"', "1")) == 1
+    assert edges.count(('"merged-0"', "4")) == 1
+    assert ('"merged-1"', "4") in edges
+    assert ('"merged-1"', "6") in edges
+    # tee branches are side outputs and are never merged
+    assert g.source.count("x.tif") == 2
+
+
+def test_merge_stable_ids():
+    steps = parse_pipeline(PIPELINE)
+    g = workflow_diagram(steps, "svg", "raster", merge=True, stable_ids=True)
+    # declared once, with one incoming and two outgoing edges
+    assert g.source.count("merged-0") == 4
+
+
+def test_format_merged():
+    _, merged = merge_subpipelines(parse_pipeline(PIPELINE))
+    assert format_merged(merged).splitlines() == [
+        "Merged 2 repeated nested pipelines, removing 3 nodes and 2 repeated reads",
+        "  step 3.1 repeats step 2.1 (2 steps, reads dem.tif)",
+        "  step 4.1 repeats step 3.2 (1 steps, reads b.tif)",
+    ]
+    assert format_merged([]) == "No repeated nested pipelines"
+
+
+def test_merge_main(capsys):
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        exit_code = cli.main(["--pipeline", PIPELINE, "out.svg", "--merge"])
+    assert exit_code == 0
+    assert mock_generate.call_args.kwargs["merge"] is True
+    assert "removing 3 nodes" in capsys.readouterr().out
@@ -0,0 +1,147 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from gdalgviz import cli
+from gdalgviz.batch import render_batch
+from gdalgviz.mermaid import generate_mermaid, mermaid_flowchart, mermaid_label
+from gdalgviz.parser import parse_pipeline
+from gdalgviz.resolve import resolve_references
+
+PIPELINE = (
+    "gdal raster pipeline ! read a.tif "
+    "! blend --operator=multiply --overlay [ read b.tif ! slope ] "
+    "! tee [ write c.tif ] ! write out.tif"
+)
+
+
+def _edges(text):
+    return [line.strip() for line in text.splitlines() if "->" in line]
+
+
+def test_mermaid_flowchart():
+    text = mermaid_flowchart(parse_pipeline(PIPELINE), "raster")
+    lines = text.splitlines()
+    assert lines[0] == "flowchart LR"
+    assert '    n0["<b>read</b><br/>a.tif"]' in lines
+    # the nested input feeds into blend, the tee branch is a side output
+    assert _edges(text) == [
+        "n0 --> n1",
+        "n2 --> n3",
+        "n3 --> n1",
+        "n1 --> n4",
+        "n4 --> n5",
+        "n4 --> n6",
+    ]
+    url = "https://gdal.org/en/latest/programs/gdal_raster_blend.html"
+    assert f'    click n1 href "{url}" _blank' in lines
+    # tee has no docs page
+    assert not any(line.startswith("    click n4 ") for line in lines)
+
+
+def test_mermaid_flowchart_options():
+    text = mermaid_flowchart(
+        parse_pipeline(PIPELINE),
+        vertical=True,
+        fontname="Arial",
+        header_color="#ffffff",
+        docs_root="https://example.com/docs/",
+        max_arg_length=10,
+    )
+    lines = text.splitlines()
+    assert lines[0] == '%%{init: {"themeVariables": {"fontFamily": "Arial"}}}%%'
+    assert lines[1:3] == ["flowchart TB", "    classDef default fill:#ffffff"]
+    # elided arguments are shown in full in the tooltip
+    assert (
+        '    click n1 href "https://example.com/docs/gdal_raster_blend.html" '
+        '"blend --operator multiply --overlay" _blank'
+    ) in lines
+
+
+def test_mermaid_label():
+    pipeline = """gdal pipeline ! read "a <b> #1.tif" --oo 'A="x&y"'"""
+    args = parse_pipeline(pipeline)[1]["args"]
+    assert mermaid_label("read", args) == (
+        "<b>read</b><br/>a #lt;b#gt; #35;1.tif<br/>--oo A=#quot;x#amp;y#quot;"
+    )
+    args = parse_pipeline("gdal pipeline ! read --sql=abcdefghij")[1]["args"]
+    assert mermaid_label("read", args, wrap_width=5) == (
+        "<b>read</b><br/>--sql<br/>abcde<br/>fghij"
+    )
+
+
+def test_mermaid_merge():
+    pipeline = (
+        "gdal raster pipeline ! read a.tif ! blend --overlay [ read dem.tif ] "
+        "! blend --overlay [ read dem.tif ] ! write out.tif"
+    )
+    text = mermaid_flowchart(parse_pipeline(pipeline), merge=True)
+    assert text.count("<b>read</b><br/>dem.tif") == 1
+    assert "n2 --> n3" in _edges(text)
+
+
+def test_mermaid_resolved_reference(tmp_path):
+    (tmp_path / "dem.gdalg.json").write_text(
+        json.dumps(
+            {
+                "type": "gdal_streamed_alg",
+                "command_line": "gdal raster pipeline ! read dem.tif ! hillshade",
+            }
+        )
+    )
+    steps = parse_pipeline(
+        "gdal raster pipeline ! read dem.gdalg.json ! blend --overlay "
+        "[ read dem.gdalg.json ] ! write out.tif"
+    )
+    steps = resolve_references(steps, str(tmp_path / "main.txt"))
+    text = mermaid_flowchart(steps)
+    lines = text.splitlines()
+    start = lines.index('    subgraph cn0["dem.gdalg.json"]')
+    assert lines[start + 1 : start + 4] == [
+        '        n1["<b>read</b><br/>dem.tif"]',
+        '        n2["<b>hillshade</b>"]',
+        "    end",
+    ]
+    # the second read links to the steps drawn in the subgraph
+    assert "n2 -.-> n4" in _edges(text)
+
+
+@pytest.mark.parametrize("extension", ["mmd", "md"])
+def test_generate_mermaid(tmp_path, extension):
+    output_fn = tmp_path / f"out.{extension}"
+    manifest_fn = tmp_path / "manifest.json"
+    generate_mermaid(PIPELINE, str(output_fn), manifest=str(manifest_fn))
+    text = output_fn.read_text()
+    if extension == "md":
+        assert text.startswith("```mermaid\nflowchart LR\n")
+        assert text.endswith("```\n")
+    else:
+        assert text.startswith("flowchart LR\n")
+    assert f"out.{extension}" in json.loads(manifest_fn.read_text())["outputs"]
+
+
+def test_generate_mermaid_invalid_format(tmp_path):
+    with pytest.raises(ValueError):
+        generate_mermaid(PIPELINE, str(tmp_path / "out.svg"))
+
+
+def test_render_batch_mermaid(tmp_path):
+    jobs = [
+        (PIPELINE, str(tmp_path / "a.mmd")),
+        ("gdal raster pipeline ! read [", str(tmp_path / "b.mmd")),
+    ]
+    # no dot process is started for Mermaid output
+    with patch("gdalgviz.batch.render_source") as mock_render:
+        errors = render_batch(jobs, fontname="Helvetica")
+    mock_render.assert_not_called()
+    assert list(errors) == [str(tmp_path / "b.mmd")]
+    assert "flowchart LR" in (tmp_path / "a.mmd").read_text()
+
+
+def test_main_mermaid(tmp_path):
+    output_fn = tmp_path / "output.mmd"
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        assert cli.main(["--pipeline", PIPELINE, str(output_fn), "--vertical"]) == 0
+    mock_generate.assert_not_called()
+    assert "flowchart TB" in output_fn.read_text()
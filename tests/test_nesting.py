@@ -0,0 +1,127 @@
+"""
+Graph construction for deeply nested pipelines and steps with several
+nested inputs
+"""
+
+import json
+import re
+import sys
+
+import pytest
+
+from gdalgviz.main import workflow_diagram
+from gdalgviz.parser import copy_steps, iter_step_paths, iter_steps, parse_pipeline
+from gdalgviz.resolve import MISSING, RESOLVED, resolve_references
+
+# deeper than the default recursion limit
+DEPTH = max(10000, sys.getrecursionlimit() * 2)
+# options annotating or rewriting the steps before they are drawn, checked
+# on pipelines nested OPTIONS_DEPTH levels deep
+OPTIONS_DEPTH = 5000
+DIAGRAM_OPTIONS = [
+    {"stable_ids": True},
+    {"merge": True},
+    {"show_costs": True},
+    {"advise": True},
+    {"validate": True},
+    {"timings": [1] * (2 * OPTIONS_DEPTH + 2)},
+]
+
+
+def _read(fn):
+    return {"command": "read", "args": [{"type": "positional", "value": fn}]}
+
+
+def nested_blends(depth):
+    """
+    Build the steps of read a ! blend [ read b ! blend [ read b ! ... ] ]
+    directly, as the parser limits nesting depth
+    """
+    step = _read("b")
+    for _ in range(depth):
+        step = {
+            "command": "blend",
+            "args": [],
+            "nested": {"type": "nested", "pipeline": [_read("b"), step]},
+        }
+    return [_read("a"), step]
+
+
+def _edges(g):
+    return re.findall(r"^\t(\S+) -> (\S+)", g.source, re.MULTILINE)
+
+
+def test_multiple_nested_inputs():
+    steps = parse_pipeline(
+        "gdal raster pipeline ! read a.tif ! blend --overlay [ read b.tif ] "
+        "[ read c.tif ! reproject ] ! write d.tif"
+    )
+    g = workflow_diagram(steps, "svg", "raster")
+    assert _edges(g) == [("0", "1"), ("2", "1"), ("3", "4"), ("4", "1"), ("1", "5")]
+
+
+def test_multiple_tee_branches():
+    steps = parse_pipeline(
+        "gdal raster pipeline ! read a.tif ! tee [ write b.tif ] "
+        "[ reproject ! write c.tif ] ! write d.tif"
+    )
+    g = workflow_diagram(steps, "svg", "raster")
+    assert _edges(g) == [("0", "1"), ("1", "2"), ("1", "3"), ("3", "4"), ("1", "5")]
+
+
+def test_deep_nesting():
+    steps = nested_blends(DEPTH)
+    g = workflow_diagram(steps, "svg", "raster")
+    assert g.source.count("label=<") == 2 * DEPTH + 2
+    assert len(_edges(g)) == 2 * DEPTH + 1
+
+    paths = [path for path, _ in iter_step_paths(steps)]
+    assert len(paths) == len(list(iter_steps(steps))) == 2 * DEPTH + 2
+    assert paths[:4] == ["1", "2", "2.1.1", "2.1.2"]
+    assert paths[-1] == "2" + ".1.2" * DEPTH
+
+
+@pytest.mark.parametrize("options", DIAGRAM_OPTIONS, ids=lambda o: next(iter(o)))
+def test_deep_nesting_options(options):
+    steps = nested_blends(OPTIONS_DEPTH)
+    g = workflow_diagram(steps, "svg", "raster", **options)
+    assert g.source.count("label=<") == 2 * OPTIONS_DEPTH + 2
+
+
+def test_deep_nesting_resolve(tmp_path):
+    """
+    GDALG reads are resolved in deeply nested pipelines, and through long
+    chains of files reading each other
+    """
+    chain = sys.getrecursionlimit() + 100
+    for i in range(chain):
+        (tmp_path / f"{i}.gdalg.json").write_text(
+            json.dumps(
+                {"command_line": f"gdal raster pipeline ! read {i + 1}.gdalg.json"}
+            )
+        )
+    steps = nested_blends(OPTIONS_DEPTH)
+    *_, innermost = iter_steps(steps)
+    innermost["args"][0]["value"] = "0.gdalg.json"
+    resolved = resolve_references(
+        steps, str(tmp_path / "main.gdalg.json"), max_depth=chain + 1
+    )
+    statuses = [
+        s["reference"]["status"] for s in iter_steps(resolved) if "reference" in s
+    ]
+    assert statuses == [RESOLVED] * chain + [MISSING]
+    g = workflow_diagram(resolved, "svg", "raster")
+    assert g.source.count("label=<") == 2 * OPTIONS_DEPTH + 2 + chain
+
+
+def test_copy_steps():
+    steps = nested_blends(DEPTH)
+    copied = copy_steps(steps)
+    pairs = list(zip(iter_steps(steps), iter_steps(copied)))
+    assert len(pairs) == 2 * DEPTH + 2
+    assert all(a is not b and a["args"] == b["args"] for a, b in pairs)
+    # shared objects stay shared
+    args = [{"type": "positional", "value": "a.tif"}]
+    copied = copy_steps([{"command": "read", "args": args}] * 2)
+    assert copied[0] is copied[1]
+    assert copied[0]["args"] is not args
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+from gdalgviz import PipelineDiagram
+
+PIPELINE_STR = "gdal vector pipeline ! read in.gpkg ! reproject --dst-crs=EPSG:32632"
+
+
+def test_pipeline_diagram_is_lazy():
+    with (
+        patch("gdalgviz.notebook.parse_pipeline") as mock_parse,
+        patch("gdalgviz.notebook.render_steps") as mock_render,
+    ):
+        diagrams = [PipelineDiagram(PIPELINE_STR) for _ in range(10)]
+        repr(diagrams[0])
+    mock_parse.assert_not_called()
+    mock_render.assert_not_called()
+
+
+def test_pipeline_diagram_cache():
+    with patch("gdalgviz.notebook.render_steps") as mock_render:
+        mock_render.return_value = b"<svg/>"
+        diagram = PipelineDiagram(PIPELINE_STR, vertical=True)
+        assert diagram._repr_svg_() == "<svg/>"
+        bundle = diagram._repr_mimebundle_()
+        assert bundle["image/svg+xml"] == "<svg/>"
+        assert mock_render.call_count == 1
+        assert mock_render.call_args.kwargs["vertical"] is True
+
+        # each style is rendered once, sharing the parsed steps
+        restyled = diagram.style(fontname="Courier")
+        restyled._repr_svg_()
+        restyled._repr_svg_()
+        assert restyled.steps is diagram.steps
+        assert mock_render.call_count == 2
+        assert mock_render.call_args.kwargs["fontname"] == "Courier"
+
+        diagram.style(vertical=True)._repr_svg_()
+        assert mock_render.call_count == 2
+
+
+def test_pipeline_diagram_save(tmp_path):
+    with patch("gdalgviz.notebook.render_steps") as mock_render:
+        mock_render.return_value = b"<svg>\n  <g/>\n</svg>"
+        diagram = PipelineDiagram(PIPELINE_STR)
+        diagram.save(str(tmp_path / "diagram.svg"), minify=True)
+    assert (tmp_path / "diagram.svg").read_bytes() == b"<svg><g/></svg>"
@@ -0,0 +1,157 @@
+import json
+import shutil
+
+import pytest
+
+from gdalgviz import main
+from gdalgviz.main import (
+    NEXT_PAGE_ID,
+    PREVIOUS_PAGE_ID,
+    generate_diagram,
+    page_fn,
+    paginate_steps,
+    workflow_diagram,
+)
+from gdalgviz.parser import get_command, is_pipeline_header, iter_steps, parse_pipeline
+from gdalgviz.resolve import resolve_references
+
+PIPELINE = (
+    "gdal raster pipeline ! read a.tif ! reproject --dst-crs=EPSG:3857 "
+    "! blend --overlay [ read b.tif ! slope ! hillshade ] ! fill-nodata "
+    "! clip --bbox=0,0,1,1 ! write out.tif"
+)
+
+
+def _url(number):
+    return f"out-{number}.svg"
+
+
+def _commands(steps):
+    return [get_command(step) for step in iter_steps(steps[1:])]
+
+
+def test_page_fn():
+    assert page_fn("diagrams/out.svg", 2) == "diagrams/out-2.svg"
+
+
+def test_paginate_steps():
+    pages = paginate_steps(parse_pipeline(PIPELINE), 3, _url)
+    # blend is kept on the same page as its nested pipeline, so has a page of its own
+    assert [_commands(steps) for steps, _ in pages] == [
+        ["read", "reproject"],
+        ["blend", "read", "slope", "hillshade"],
+        ["fill-nodata", "clip", "write"],
+    ]
+    # each page keeps the pipeline header
+    assert all(is_pipeline_header(steps[0]) for steps, _ in pages)
+    assert [page for _, page in pages] == [
+        {"number": 1, "previous": None, "next": (2, "out-2.svg"), "elsewhere": {}},
+        {
+            "number": 2,
+            "previous": (1, "out-1.svg"),
+            "next": (3, "out-3.svg"),
+            "elsewhere": {},
+        },
+        {"number": 3, "previous": (2, "out-2.svg"), "next": None, "elsewhere": {}},
+    ]
+
+
+def test_paginate_steps_single_page():
+    steps = parse_pipeline(PIPELINE)
+    pages = paginate_steps(steps, 100, _url)
+    assert len(pages) == 1
+    assert pages[0][0] == steps
+
+
+def test_paginate_steps_invalid():
+    with pytest.raises(ValueError):
+        paginate_steps(parse_pipeline(PIPELINE), 0, _url)
+
+
+def test_paginate_steps_elsewhere(tmp_path):
+    (tmp_path / "dem.gdalg.json").write_text(
+        json.dumps(
+            {
+                "type": "gdal_streamed_alg",
+                "command_line": "gdal raster pipeline ! read dem.tif ! hillshade",
+            }
+        )
+    )
+    steps = parse_pipeline(
+        "gdal raster pipeline ! read dem.gdalg.json ! slope ! fill-nodata "
+        "! blend --overlay [ read dem.gdalg.json ] ! write out.tif"
+    )
+    steps = resolve_references(steps, str(tmp_path / "main.txt"))
+    pages = paginate_steps(steps, 4, _url)
+    assert len(pages) == 2
+    # the second read links to the page the referenced file is expanded on
+    source_id = steps[1]["reference"]["source_id"]
+    assert pages[1][1]["elsewhere"] == {source_id: (1, "out-1.svg")}
+    source = workflow_diagram(pages[1][0], "svg", page=pages[1][1]).source
+    assert f'"{source_id}" [label="expanded on\\npage 1"' in source
+
+
+def test_workflow_diagram_page():
+    steps, page = paginate_steps(parse_pipeline(PIPELINE), 3, _url)[1]
+    source = workflow_diagram(steps, "svg", "raster", page=page).source
+    assert f'"{PREVIOUS_PAGE_ID}" [label="continued from\\npage 1"' in source
+    assert 'URL="out-1.svg"' in source
+    assert f'"{PREVIOUS_PAGE_ID}" -> ' in source
+    assert f' -> "{NEXT_PAGE_ID}"' in source
+
+
+def test_workflow_diagram_last_page():
+    steps, page = paginate_steps(parse_pipeline(PIPELINE), 3, _url)[2]
+    source = workflow_diagram(steps, "svg", "raster", page=page).source
+    assert PREVIOUS_PAGE_ID in source
+    assert NEXT_PAGE_ID not in source
+
+
+def _require_dot():
+    if shutil.which("dot") is None:
+        pytest.skip("Graphviz is not installed")
+
+
+def test_generate_diagram_pages(tmp_path):
+    _require_dot()
+    output_fn = tmp_path / "out.svg"
+    manifest_fn = tmp_path / "manifest.json"
+    generate_diagram(PIPELINE, str(output_fn), page_size=3, manifest=str(manifest_fn))
+    assert not output_fn.exists()
+    for number in (1, 2, 3):
+        assert (tmp_path / f"out-{number}.svg").read_text().startswith("<?xml")
+    assert 'xlink:href="out-3.svg"' in (tmp_path / "out-2.svg").read_text()
+    outputs = json.loads(manifest_fn.read_text())["outputs"]
+    assert {"out-1.svg", "out-2.svg", "out-3.svg"} <= set(outputs)
+
+
+def test_generate_diagram_single_page(tmp_path):
+    _require_dot()
+    output_fn = tmp_path / "out.svg"
+    generate_diagram(PIPELINE, str(output_fn), page_size=100)
+    assert output_fn.exists()
+    assert not (tmp_path / "out-1.svg").exists()
+
+
+def test_generate_diagram_removes_stale_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "render_source", lambda *args, **kwargs: b"<svg/>")
+    output_fn = tmp_path / "out.svg"
+    manifest_fn = tmp_path / "manifest.json"
+    options = dict(page_size=3, manifest=str(manifest_fn))
+
+    generate_diagram(PIPELINE, str(output_fn), **options)
+    assert (tmp_path / "out-3.svg").exists()
+    # the pipeline is shorter, so its last page is no longer written
+    shorter = (
+        "gdal raster pipeline ! read a.tif ! reproject --dst-crs=EPSG:3857 "
+        "! fill-nodata ! clip --bbox=0,0,1,1 ! write out.tif"
+    )
+    generate_diagram(shorter, str(output_fn), **options)
+    assert (tmp_path / "out-2.svg").exists()
+    assert not (tmp_path / "out-3.svg").exists()
+    assert "out-3.svg" not in json.loads(manifest_fn.read_text())["outputs"]
+
+    # all pages are removed when the pipeline fits in a single diagram
+    generate_diagram(PIPELINE, str(output_fn), page_size=100, manifest=str(manifest_fn))
+    assert sorted(path.name for path in tmp_path.glob("*.svg")) == ["out.svg"]
+    assert set(json.loads(manifest_fn.read_text())["outputs"]) == {"out.svg"}
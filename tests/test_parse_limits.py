@@ -0,0 +1,117 @@
+"""
+Fuzz and scaling tests for parsing untrusted pipelines. Pathological inputs
+must fail with a clear error, and parse time must grow near-linearly with
+their size
+"""
+
+import random
+import time
+
+import pytest
+
+from gdalgviz._pipeline_parser import UnexpectedInput
+from gdalgviz.parser import (
+    MAX_NESTING_DEPTH,
+    ParseLimitError,
+    nesting_depth,
+    normalize_pipeline,
+    parse_pipeline,
+)
+
+# an input SCALE times larger must take well under SCALE ** 2 times as long
+SIZE = 1000
+SCALE = 8
+MAX_RATIO = 24
+
+PATHOLOGICAL = {
+    "prefix whitespace": lambda n: "gdal pipeline" + " " * n + "!",
+    "unterminated quote": lambda n: 'gdal pipeline ! read "' + "a" * n,
+    "escaped quotes": lambda n: 'gdal pipeline ! read "' + '\\"' * n,
+    "many quotes": lambda n: "gdal pipeline ! read " + '"a ' * n,
+    "open brackets": lambda n: "gdal pipeline ! read a " + "[ " * n,
+    "unclosed nesting": lambda n: "gdal pipeline ! read a" + " [ read b" * n,
+    "long bare value": lambda n: "gdal pipeline ! read " + "a" * n,
+    "many steps": lambda n: "gdal pipeline ! read a" + " ! reproject -d x" * n,
+    "many bangs": lambda n: "gdal pipeline ! read a " + "!" * n,
+    "many flags": lambda n: "gdal pipeline ! read a " + "--x=" * n,
+}
+
+
+def _parse_time(command_line):
+    """
+    Return the best of three parse times, and the outcome
+    """
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        try:
+            parse_pipeline(command_line)
+            outcome = "ok"
+        except (UnexpectedInput, ParseLimitError) as e:
+            outcome = type(e).__name__
+        times.append(time.perf_counter() - start)
+    return min(times), outcome
+
+
+@pytest.mark.parametrize("name", PATHOLOGICAL)
+def test_parse_time_scales_linearly(name):
+    generate = PATHOLOGICAL[name]
+    small, _ = _parse_time(generate(SIZE))
+    large, _ = _parse_time(generate(SIZE * SCALE))
+    # ignore timer noise on inputs that are rejected almost immediately
+    assert large < max(small * MAX_RATIO, 0.05), (name, small, large)
+
+
+def test_fuzz():
+    rng = random.Random(1234)
+    alphabet = ['"', "'", "\\", "[", "]", "!", " ", "-", "=", "a", "read", "tee"]
+    for _ in range(500):
+        tokens = rng.choices(alphabet, k=rng.randint(1, 60))
+        command_line = "gdal pipeline ! " + "".join(tokens)
+        try:
+            parse_pipeline(command_line, timeout=1)
+        except (UnexpectedInput, ParseLimitError):
+            pass
+
+
+def test_normalize_pipeline_whitespace():
+    assert normalize_pipeline("gdal pipeline  read a") == "gdal pipeline  ! read a"
+    assert normalize_pipeline("gdal pipeline  ! read a") == "gdal pipeline  ! read a"
+    assert normalize_pipeline("gdal pipeline   ") == "gdal pipeline   ! "
+
+
+def test_nesting_depth():
+    assert nesting_depth("read a ! blend [ read b [ read c ] ] [ read d ]") == 2
+    assert nesting_depth('read "[[[" ! tee [ write x ]') == 1
+    assert nesting_depth('read "a\\" [ [" ! tee [ write x ]') == 1
+    assert nesting_depth("read 'unterminated [ [") == 0
+
+
+def test_max_depth():
+    def nested(depth):
+        return (
+            "gdal pipeline ! read a"
+            + " ! blend --overlay [ read b" * depth
+            + " ]" * depth
+        )
+
+    assert len(parse_pipeline(nested(MAX_NESTING_DEPTH))) == 3
+    with pytest.raises(ParseLimitError, match="levels deep"):
+        parse_pipeline(nested(MAX_NESTING_DEPTH + 1))
+    # deeply nested input fails fast instead of exhausting the stack
+    with pytest.raises(ParseLimitError):
+        parse_pipeline(nested(5000))
+    assert len(parse_pipeline(nested(40), max_depth=40)) == 3
+
+
+def test_max_length():
+    with pytest.raises(ParseLimitError, match="characters long"):
+        parse_pipeline("gdal pipeline ! read " + "a" * 100, max_length=50)
+
+
+def test_timeout():
+    command_line = "gdal pipeline ! read a" + " ! reproject -d x" * 20000
+    with pytest.raises(ParseLimitError, match="longer than"):
+        parse_pipeline(command_line, timeout=0.001)
+    steps = "gdal pipeline ! read a ! tee [ write b ] ! write c"
+    assert parse_pipeline(steps, timeout=5) == parse_pipeline(steps)
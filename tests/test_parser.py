@@ -0,0 +1,39 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from gdalgviz import _pipeline_parser
+from gdalgviz.parser import get_parser, normalize_pipeline
+
+GRAMMAR_FN = Path(__file__).resolve().parent.parent / "gdalgviz" / "pipeline.lark"
+
+PIPELINES = [
+    "gdal vector pipeline ! read in.gpkg ! reproject --dst-crs=EPSG:32632 ! select --fields fid,geom",
+    "gdal raster pipeline read n43.tif ! tee [ write colored.tif --overwrite ] ! write out.tif",
+    'gdal pipeline ! read input.tif ! reclassify -m "[0,15)=NO_DATA; [15,20)=1" ! write out.gdb',
+    "gdal pipeline read a.tif ! blend --overlay [ read b.tif ! hillshade -z 30 ] ! write c.tif",
+]
+
+
+def test_generated_parser_matches_grammar():
+    """
+    Fail if pipeline.lark has changed without rerunning scripts/generate_parser.py
+    """
+    grammar = GRAMMAR_FN.read_text(encoding="utf-8").replace("\r\n", "\n")
+    grammar_hash = hashlib.sha256(grammar.encode("utf-8")).hexdigest()
+    assert _pipeline_parser.GRAMMAR_SHA256 == grammar_hash, (
+        "gdalgviz/_pipeline_parser.py is out of date with pipeline.lark - "
+        "run: python scripts/generate_parser.py"
+    )
+
+
+@pytest.mark.parametrize("pipeline", PIPELINES)
+def test_generated_parser_matches_lark(pipeline):
+    """
+    The standalone parser builds the same tree as compiling the grammar with lark
+    """
+    lark = pytest.importorskip("lark")
+    command_line = normalize_pipeline(pipeline)
+    expected = lark.Lark.open(str(GRAMMAR_FN), parser="lalr").parse(command_line)
+    assert get_parser().parse(command_line).pretty() == expected.pretty()
@@ -0,0 +1,76 @@
+import gzip
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from gdalgviz.postprocess import encode_svg, minify_svg
+
+REFERENCE_SVG = Path("./tests/reference/test_nested_output.svg")
+XLINK = "{http://www.w3.org/1999/xlink}"
+
+
+def _links(svg: str) -> list:
+    root = ET.fromstring(svg.encode("utf-8"))
+    return [
+        (a.get(f"{XLINK}href"), a.get(f"{XLINK}title"), a.get("target"))
+        for a in root.iter("{http://www.w3.org/2000/svg}a")
+    ]
+
+
+def test_minify_svg():
+    svg = REFERENCE_SVG.read_text(encoding="utf-8")
+    minified = minify_svg(svg)
+
+    assert len(minified) < len(svg)
+    assert "<!--" not in minified
+    assert "<!DOCTYPE" not in minified
+    assert "\n" not in minified
+    # fonts are set once on the root element and inherited
+    assert minified.count('font-family="Helvetica,sans-Serif"') == 1
+    assert minified.startswith(
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?><svg '
+    )
+
+
+def test_minify_svg_keeps_links():
+    svg = REFERENCE_SVG.read_text(encoding="utf-8")
+    links = _links(svg)
+    assert links
+    assert _links(minify_svg(svg)) == links
+
+
+def test_minify_svg_rounds_coordinates():
+    svg = '<svg viewBox="0.00 0.00 683.25 319.50"><path d="M52.91,-202.75C60.32,-0.01"/></svg>'
+    assert (
+        minify_svg(svg)
+        == '<svg viewBox="0 0 683.2 319.5"><path d="M52.9,-202.8C60.3,0"/></svg>'
+    )
+
+
+def test_minify_svg_keeps_text_content():
+    svg = (
+        '<svg\n width="10pt">\n<title>a\n  b</title>\n'
+        "<text>first\n  second</text>\n"
+        "<script><![CDATA[\nvar a = 1;\n  // comment\nvar b = a > 0;\n]]></script>\n</svg>"
+    )
+    assert minify_svg(svg) == (
+        '<svg width="10pt"><title>a\n  b</title><text>first\n  second</text>'
+        "<script><![CDATA[\nvar a = 1;\n  // comment\nvar b = a > 0;\n]]></script></svg>"
+    )
+
+
+def test_minify_svg_font_with_backslash():
+    svg = (
+        '<svg><text font-family="C:\\fonts\\1">a</text>'
+        '<text font-family="C:\\fonts\\1">b</text></svg>'
+    )
+    assert minify_svg(svg) == (
+        '<svg font-family="C:\\fonts\\1"><text>a</text><text>b</text></svg>'
+    )
+
+
+def test_encode_svgz():
+    svg = REFERENCE_SVG.read_bytes()
+    data = encode_svg(svg, "output.svgz", minify=True)
+
+    assert len(data) < len(svg)
+    assert gzip.decompress(data).decode("utf-8") == minify_svg(svg.decode("utf-8"))
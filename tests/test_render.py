@@ -0,0 +1,143 @@
+import logging
+import subprocess
+import sys
+
+import pytest
+from graphviz import ExecutableNotFound
+
+from gdalgviz import main, render
+from gdalgviz.render import RenderLimitError, render_source
+
+PIPELINE_STR = (
+    'gdal vector pipeline ! read in.gpkg ! sql --sql "'
+    + "SELECT * FROM layer WHERE name = 'x' " * 20
+    + '" ! write out.gpkg'
+)
+
+posix_only = pytest.mark.skipif(
+    sys.platform == "win32", reason="fake layout engines are shell scripts"
+)
+
+
+def _fake_engine(tmp_path, body: str) -> str:
+    """
+    Create an executable standing in for the dot binary
+    """
+    engine = tmp_path / "fake-dot"
+    engine.write_text(f"#!{sys.executable}\nimport sys\n{body}\n")
+    engine.chmod(0o755)
+    return str(engine)
+
+
+@posix_only
+def test_render_source(tmp_path):
+    engine = _fake_engine(tmp_path, "sys.stdout.write(sys.stdin.read().upper())")
+    assert render_source("digraph {}", "svg", engine=engine) == b"DIGRAPH {}"
+
+
+@posix_only
+def test_render_source_timeout(tmp_path):
+    engine = _fake_engine(tmp_path, "import time\ntime.sleep(10)")
+    with pytest.raises(RenderLimitError):
+        render_source("digraph {}", "svg", engine=engine, timeout=0.5)
+
+
+@posix_only
+def test_render_source_cpu_limit(tmp_path):
+    engine = _fake_engine(tmp_path, "while True:\n    pass")
+    with pytest.raises(RenderLimitError):
+        render_source("digraph {}", "svg", engine=engine, max_cpu_time=1, timeout=20)
+
+
+@posix_only
+def test_render_source_ulimit(tmp_path, monkeypatch):
+    """
+    Without prlimit (e.g. on macOS) the limits are applied with ulimit
+    """
+    monkeypatch.delattr(render.resource, "prlimit", raising=False)
+    engine = _fake_engine(tmp_path, "sys.stdout.write(sys.stdin.read().upper())")
+    output = render_source("digraph {}", "svg", engine=engine, max_memory=1024)
+    assert output == b"DIGRAPH {}"
+    engine = _fake_engine(tmp_path, "while True:\n    pass")
+    with pytest.raises(RenderLimitError):
+        render_source("digraph {}", "svg", engine=engine, max_cpu_time=1, timeout=20)
+    with pytest.raises(ExecutableNotFound):
+        render_source("digraph {}", "svg", engine=str(tmp_path / "x"), max_cpu_time=1)
+
+
+@posix_only
+def test_render_source_error_with_limits(tmp_path):
+    """
+    Other failures are not reported as limits, whatever their message
+    """
+    engine = _fake_engine(tmp_path, "sys.stderr.write('out of memory')\nsys.exit(1)")
+    with pytest.raises(subprocess.CalledProcessError):
+        render_source("digraph {}", "svg", engine=engine, max_memory=1024)
+
+
+def test_generate_diagram_degrades(tmp_path, monkeypatch, caplog):
+    """
+    When the layout hits a limit the diagram is rendered again more cheaply
+    """
+    sources = []
+
+    def fake_render_source(source, output_format, engine="dot", **limits):
+        sources.append(source)
+        if len(sources) == 1:
+            raise RenderLimitError("dot exceeded the 1s timeout")
+        return b"<svg></svg>"
+
+    monkeypatch.setattr(main, "render_source", fake_render_source)
+    output_fn = tmp_path / "output.svg"
+    with caplog.at_level(logging.WARNING):
+        main.generate_diagram(PIPELINE_STR, str(output_fn), timeout=1)
+
+    assert output_fn.read_bytes() == b"<svg></svg>"
+    assert "rendering a simplified diagram" in caplog.text
+    assert "splines=line" not in sources[0]
+    assert "splines=line" in sources[1]
+    # labels are truncated, with the full arguments kept in the tooltip
+    assert "...</TD>" not in sources[0]
+    assert "...</TD>" in sources[1]
+    assert 'tooltip="sql\\n--sql' in sources[1]
+
+
+def test_step_label_html_truncates_args():
+    args = [{"type": "long_arg", "flag": "sql", "value": "SELECT * FROM <layer>"}]
+    label = main.step_label_html("sql", args, max_arg_length=12)
+    assert "--sql SEL..." in label
+    assert "&lt;layer" not in label
+
+
+def test_render_source_unknown_backend():
+    with pytest.raises(ValueError):
+        render_source("digraph {}", "svg", backend="wasm")
+
+
+@posix_only
+def test_inprocess_falls_back_without_pygraphviz(tmp_path, monkeypatch):
+    monkeypatch.setattr(render, "pygraphviz", None)
+    engine = _fake_engine(tmp_path, "sys.stdout.write('subprocess')")
+    output = render_source("digraph {}", "svg", engine=engine, backend="inprocess")
+    assert output == b"subprocess"
+
+
+@posix_only
+def test_inprocess_falls_back_with_limits(tmp_path):
+    """
+    Limits can only be enforced on a separate process
+    """
+    engine = _fake_engine(tmp_path, "sys.stdout.write('subprocess')")
+    output = render_source(
+        "digraph {}", "svg", engine=engine, timeout=10, backend="inprocess"
+    )
+    assert output == b"subprocess"
+
+
+def test_generate_diagram_inprocess(tmp_path):
+    pytest.importorskip("pygraphviz")
+    output_fn = tmp_path / "output.svg"
+    main.generate_diagram(PIPELINE_STR, str(output_fn), backend="inprocess")
+    svg = output_fn.read_text()
+    assert svg.rstrip().endswith("</svg>")
+    assert "sql" in svg
@@ -0,0 +1,127 @@
+import json
+import logging
+
+from gdalgviz.main import workflow_diagram
+from gdalgviz.parser import get_command, iter_steps, parse_pipeline
+from gdalgviz.resolve import (
+    CYCLE,
+    DEPTH,
+    MISSING,
+    RESOLVED,
+    SHARED,
+    gdalg_reference,
+    resolve_references,
+)
+
+
+def _write_gdalg(path, command_line):
+    path.write_text(
+        json.dumps({"type": "gdal_streamed_alg", "command_line": command_line})
+    )
+    return path
+
+
+def _references(steps):
+    return [
+        (step["reference"]["path"], step["reference"]["status"])
+        for step in iter_steps(steps)
+        if "reference" in step
+    ]
+
+
+def test_gdalg_reference():
+    steps = parse_pipeline(
+        "gdal raster pipeline ! read a.GDALG.json ! write b.gdalg.json"
+    )
+    assert gdalg_reference(steps[1]) == "a.GDALG.json"
+    assert gdalg_reference(steps[2]) is None
+    steps = parse_pipeline("gdal raster pipeline ! read --input=sub/a.gdalg.json")
+    assert gdalg_reference(steps[1]) == "sub/a.gdalg.json"
+    steps = parse_pipeline("gdal raster pipeline ! read a.tif")
+    assert gdalg_reference(steps[1]) is None
+
+
+def test_resolve_references(tmp_path):
+    (tmp_path / "sub").mkdir()
+    _write_gdalg(
+        tmp_path / "sub" / "dem.gdalg.json", "gdal raster pipeline ! read dem.tif"
+    )
+    _write_gdalg(
+        tmp_path / "hillshade.gdalg.json",
+        "gdal raster pipeline ! read sub/dem.gdalg.json ! hillshade",
+    )
+    source_fn = _write_gdalg(
+        tmp_path / "main.gdalg.json",
+        "gdal raster pipeline ! read hillshade.gdalg.json ! write out.tif",
+    )
+    steps = parse_pipeline(json.loads(source_fn.read_text())["command_line"])
+    resolved = resolve_references(steps, str(source_fn))
+
+    assert [get_command(step) for step in iter_steps(resolved[1:])] == [
+        "read",
+        "read",
+        "read",
+        "hillshade",
+        "write",
+    ]
+    assert _references(resolved) == [
+        ("hillshade.gdalg.json", RESOLVED),
+        ("sub/dem.gdalg.json", RESOLVED),
+    ]
+    # the original steps are not modified
+    assert "nested" not in steps[1]
+
+
+def test_resolve_shared_references(tmp_path):
+    _write_gdalg(
+        tmp_path / "dem.gdalg.json",
+        "gdal raster pipeline ! read dem.tif ! reproject --dst-crs=EPSG:3857",
+    )
+    steps = parse_pipeline(
+        "gdal raster pipeline ! read dem.gdalg.json ! blend --overlay "
+        "[ read dem.gdalg.json ! hillshade ] ! write out.tif"
+    )
+    memo = {}
+    resolved = resolve_references(steps, str(tmp_path / "main.txt"), memo=memo)
+    assert len(memo) == 1
+    assert _references(resolved) == [
+        ("dem.gdalg.json", RESOLVED),
+        ("dem.gdalg.json", SHARED),
+    ]
+
+    source = workflow_diagram(resolved, "svg").source
+    # the file is drawn once in a cluster, and linked to the second read
+    assert source.count("<B>reproject</B>") == 1
+    assert 'subgraph "cluster_gdalg-1"' in source
+    assert '"gdalg-1" -> 0' in source
+    assert '"gdalg-1" -> 4 [style=dashed]' in source
+
+
+def test_resolve_cycle(tmp_path, caplog):
+    _write_gdalg(tmp_path / "a.gdalg.json", "gdal raster pipeline ! read b.gdalg.json")
+    source_fn = _write_gdalg(
+        tmp_path / "b.gdalg.json", "gdal raster pipeline ! read a.gdalg.json"
+    )
+    steps = parse_pipeline("gdal raster pipeline ! read a.gdalg.json")
+    with caplog.at_level(logging.WARNING):
+        resolved = resolve_references(steps, str(source_fn))
+    assert _references(resolved) == [
+        ("a.gdalg.json", RESOLVED),
+        ("b.gdalg.json", CYCLE),
+    ]
+    assert "circular reference" in caplog.text
+
+
+def test_resolve_depth_and_missing(tmp_path):
+    _write_gdalg(tmp_path / "a.gdalg.json", "gdal raster pipeline ! read b.gdalg.json")
+    _write_gdalg(tmp_path / "b.gdalg.json", "gdal raster pipeline ! read c.tif")
+    steps = parse_pipeline(
+        "gdal raster pipeline ! read a.gdalg.json ! blend --overlay "
+        "[ read missing.gdalg.json ]"
+    )
+    resolved = resolve_references(steps, str(tmp_path / "main.txt"), max_depth=1)
+    assert _references(resolved) == [
+        ("a.gdalg.json", RESOLVED),
+        ("b.gdalg.json", DEPTH),
+        ("missing.gdalg.json", MISSING),
+    ]
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+
+import pytest
+
+from gdalgviz import cli
+from gdalgviz.commands import OTHER_FAMILY, command_family
+from gdalgviz.stats import catalog_stats, format_stats, stats_report
+
+PIPELINES = {
+    "a.gdalg.json": "gdal raster pipeline ! read a.tif ! reproject --dst-crs=EPSG:3857 -r cubic ! write out.tif",
+    "b.gdalg.json": "gdal raster pipeline ! read a.tif ! blend --overlay [ read b.tif ! blend --overlay [ read c.tif ] ] ! write out.tif",
+    "c.gdalg.json": "gdal vector pipeline ! read in.gpkg ! reproject --dst-crs=EPSG:4326 ! write out.gpkg",
+    "d.gdalg.json": "gdal pipeline ! read in.tif ! tee [ write x.tif ] ! write out.tif",
+}
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name, command_line in PIPELINES.items():
+        path = tmp_path / ("sub" if name == "d.gdalg.json" else "") / name
+        path.write_text(
+            json.dumps({"type": "gdal_streamed_alg", "command_line": command_line})
+        )
+    (tmp_path / "bad.gdalg.json").write_text('{"command_line": "gdal pipeline ! ["}')
+    # not part of the catalog
+    (tmp_path / "notes.json").write_text("{")
+    return tmp_path
+
+
+def test_command_family():
+    assert command_family("hillshade") == "raster"
+    assert command_family("buffer") == "vector"
+    assert command_family("mdim convert") == "mdim"
+    assert command_family("read", "vector") == "vector"
+    assert command_family("tee") == OTHER_FAMILY
+
+
+def test_catalog_stats(catalog):
+    report = stats_report(catalog_stats([str(catalog)], workers=1))
+    assert (report["pipelines"], report["steps"], report["failed"]) == (4, 16, 1)
+    assert report["errors"][0]["path"].endswith("bad.gdalg.json")
+
+    commands = {(c["family"], c["command"]): c for c in report["commands"]}
+    assert commands["raster", "read"]["steps"] == 4
+    assert commands["raster", "read"]["pipelines"] == 2
+    assert commands["vector", "reproject"]["flags"] == [
+        {"flag": "--dst-crs", "uses": 1, "pipelines": 1}
+    ]
+    assert [f["flag"] for f in commands["raster", "reproject"]["flags"]] == [
+        "--dst-crs",
+        "-r",
+    ]
+    # steps of an untyped pipeline are counted in the family of their command
+    assert commands[OTHER_FAMILY, "tee"]["steps"] == 1
+    assert report["families"][0] == {"family": "raster", "steps": 9, "pipelines": 2}
+
+    assert report["longest"][0] == {"path": str(catalog / "b.gdalg.json"), "steps": 6}
+    assert report["deepest"][0] == {"path": str(catalog / "b.gdalg.json"), "depth": 2}
+    assert report["most_inputs"][0] == {
+        "path": str(catalog / "b.gdalg.json"),
+        "inputs": 3,
+    }
+
+
+def test_catalog_stats_workers(catalog):
+    serial = stats_report(catalog_stats([str(catalog)], workers=1))
+    # rankings break ties by path, so the result does not depend on the
+    # order chunks are finished in
+    parallel = stats_report(catalog_stats([str(catalog)], workers=2, chunk_size=1))
+    assert parallel == serial
+
+
+def test_catalog_stats_top(catalog):
+    report = stats_report(catalog_stats([str(catalog)], workers=1, top=2))
+    assert len(report["longest"]) == 2
+    assert report["longest"][1]["path"] == str(catalog / "sub" / "d.gdalg.json")
+
+
+def test_format_stats_csv(catalog):
+    text = format_stats(catalog_stats([str(catalog)], workers=1), "csv")
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert rows[0] == {
+        "section": "total",
+        "family": "",
+        "command": "pipelines",
+        "flag": "",
+        "path": "",
+        "value": "4",
+        "pipelines": "",
+    }
+    flag = next(row for row in rows if row["flag"] == "-r")
+    assert (flag["section"], flag["command"], flag["value"]) == (
+        "flag",
+        "reproject",
+        "1",
+    )
+    assert {row["section"] for row in rows} == {
+        "total",
+        "family",
+        "command",
+        "flag",
+        "longest",
+        "deepest",
+        "most_inputs",
+        "error",
+    }
+
+
+def test_format_stats_invalid():
+    with pytest.raises(ValueError):
+        format_stats(catalog_stats([], workers=1), "xml")
+
+
+def test_stats_cli(catalog, capsys):
+    output_fn = catalog / "stats.json"
+    args = [str(catalog), "--output", str(output_fn), "--workers", "1"]
+    assert cli.main(["stats"] + args) == 0
+    assert json.loads(output_fn.read_text())["pipelines"] == 4
+    assert "Counted 4 pipelines, 1 failed" in capsys.readouterr().err
+
+
+def test_stats_cli_missing_file(tmp_path):
+    assert cli.main(["stats", str(tmp_path / "missing.json")]) == 1
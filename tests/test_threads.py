@@ -0,0 +1,61 @@
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gdalgviz.main import detect_pipeline_type, generate_diagram, workflow_diagram
+from gdalgviz.parser import parse_pipeline
+
+PIPELINES = [
+    "gdal vector pipeline ! read in.gpkg ! reproject --dst-crs=EPSG:32632 ! select --fields fid,geom",
+    "gdal raster pipeline read n43.tif ! color-map --color-map color_file.txt ! tee [ write colored.tif --overwrite ] ! blend --operator=hsv-value --overlay [ read n43.tif ! hillshade -z 30 ! tee [ write hillshade.tif ] ] ! write out.tif",
+    'gdal pipeline ! read input.tif ! slope --unit percent ! reclassify -m "[0,15)=NO_DATA; [15,20)=1" ! polygonize -c ! write out.gdb',
+    "gdal pipeline read a.tif ! blend --overlay [ read b.tif ] ! write c.tif",
+]
+THREADS = 16
+REPEATS = 50
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    """
+    Switch between threads as often as possible to expose races
+    """
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def build_source(pipeline: str) -> str:
+    steps = parse_pipeline(pipeline)
+    diagram = workflow_diagram(steps, "svg", detect_pipeline_type(steps))
+    return diagram.source
+
+
+def test_concurrent_graph_build(frequent_thread_switches):
+    expected = [build_source(p) for p in PIPELINES]
+    jobs = PIPELINES * REPEATS
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(build_source, jobs))
+
+    assert results == expected * REPEATS
+
+
+@pytest.mark.skipif(shutil.which("dot") is None, reason="Graphviz is not installed")
+def test_concurrent_render(tmp_path, frequent_thread_switches):
+    def render(job: tuple) -> bytes:
+        i, pipeline = job
+        output_fn = tmp_path / f"{i}.svg"
+        generate_diagram(pipeline, str(output_fn), timeout=60)
+        return output_fn.read_bytes()
+
+    expected = [render((f"serial-{i}", p)) for i, p in enumerate(PIPELINES)]
+    jobs = list(enumerate(PIPELINES * 5))
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(render, jobs))
+
+    assert results == expected * 5
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from gdalgviz.main import workflow_diagram
+from gdalgviz.parser import iter_step_paths, parse_pipeline
+from gdalgviz.timings import (
+    HEAT_COLD,
+    apply_timings,
+    format_timing,
+    heat_color,
+    load_timings,
+)
+
+BLEND_PIPELINE = (
+    "gdal raster pipeline ! read a.tif ! hillshade ! blend --overlay "
+    "[ read b.tif ! reproject --dst-crs=EPSG:3857 ] ! write c.tif"
+)
+
+
+def test_iter_step_paths():
+    steps = parse_pipeline(BLEND_PIPELINE)
+    paths = [(path, step["command"]) for path, step in iter_step_paths(steps[1:])]
+    assert paths == [
+        ("1", "read"),
+        ("2", "hillshade"),
+        ("3", "blend"),
+        ("3.1.1", "read"),
+        ("3.1.2", "reproject"),
+        ("4", "write"),
+    ]
+
+
+def test_apply_timings_by_path():
+    steps = parse_pipeline(BLEND_PIPELINE)
+    annotated = apply_timings(
+        steps, {"2": {"time": 1, "memory": 300}, "3.1.2": {"time": 3, "memory": 100}}
+    )
+    timings = {
+        path: step["timing"]
+        for path, step in iter_step_paths(annotated[1:])
+        if "timing" in step
+    }
+    assert timings == {
+        "2": {
+            "time": 1.0,
+            "memory": 300.0,
+            "time_share": 0.25,
+            "memory_share": 0.75,
+            "heat": 1 / 3,
+        },
+        "3.1.2": {
+            "time": 3.0,
+            "memory": 100.0,
+            "time_share": 0.75,
+            "memory_share": 0.25,
+            "heat": 1.0,
+        },
+    }
+    # the original steps are not modified
+    assert not any("timing" in step for _, step in iter_step_paths(steps[1:]))
+
+
+def test_apply_timings_list():
+    steps = parse_pipeline(BLEND_PIPELINE)
+    measured = [1, 1, None, 1, 4, 1]
+    annotated = apply_timings(steps, measured, heatmap="memory")
+    paths = dict(iter_step_paths(annotated[1:]))
+    assert "timing" not in paths["3"]
+    assert paths["3.1.2"]["timing"]["time_share"] == 0.5
+    # memory was not measured
+    assert paths["3.1.2"]["timing"]["heat"] == 0.0
+
+    # a leading entry for the pipeline header is ignored
+    with_header = apply_timings(steps, [None] + measured)
+    assert dict(iter_step_paths(with_header[1:]))["1"]["timing"]["time"] == 1.0
+
+
+@pytest.mark.parametrize(
+    "timings",
+    [
+        [1, 2],
+        {"7": 1},
+        {"1": -1},
+        {"1": {"cpu": 1}},
+        {"1": "fast"},
+    ],
+)
+def test_apply_timings_invalid(timings):
+    with pytest.raises(ValueError):
+        apply_timings(parse_pipeline(BLEND_PIPELINE), timings)
+
+
+def test_apply_timings_invalid_heatmap():
+    with pytest.raises(ValueError):
+        apply_timings(parse_pipeline(BLEND_PIPELINE), {}, heatmap="disk")
+
+
+def test_load_timings(tmp_path):
+    fn = tmp_path / "timings.json"
+    fn.write_text(json.dumps({"1": 0.5}))
+    assert load_timings(str(fn)) == {"1": 0.5}
+
+    fn.write_text("0.5")
+    with pytest.raises(ValueError):
+        load_timings(str(fn))
+
+
+def test_heat_color():
+    assert heat_color(0) == "#{:02x}{:02x}{:02x}".format(*HEAT_COLD)
+    assert heat_color(1) == "#d94801"
+    assert heat_color(2) == heat_color(1)
+
+
+def test_format_timing():
+    timing = {"time": 0.25, "time_share": 0.1, "memory": 2048, "memory_share": 0.5}
+    assert format_timing(timing) == ["250 ms (10%)", "2.0 GB (50%)"]
+    assert format_timing({"time": 90, "time_share": 1}) == ["90.0 s (100%)"]
+
+
+def test_workflow_diagram_timings():
+    steps = parse_pipeline(BLEND_PIPELINE)
+    source = workflow_diagram(
+        steps, "svg", timings={"2": 1, "3.1.2": {"time": 3, "memory": 512}}
+    ).source
+    assert 'BGCOLOR="#d94801"' in source
+    assert "3.0 s (75%) · 512 MB (100%)" in source
+    assert 'tooltip="reproject\\n3.0 s (75%)\\n512 MB (100%)"' in source
+    assert 'tooltip="hillshade\\n1.0 s (25%)"' in source
@@ -0,0 +1,295 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from gdalgviz import cli
+from gdalgviz._gdal_usage import USAGE
+from gdalgviz.main import workflow_diagram
+from gdalgviz.parser import parse_file, parse_pipeline
+from gdalgviz.validate import (
+    ANYWHERE,
+    FIRST,
+    INVALID_COLOR,
+    LAST,
+    compile_usage,
+    format_issues,
+    validate_pipeline,
+)
+
+# an excerpt of gdal raster pipeline --json-usage
+JSON_USAGE = {
+    "full_path": ["gdal", "raster", "pipeline"],
+    "pipeline_algorithms": [
+        {
+            "name": "read",
+            "input_arguments": [
+                {
+                    "name": "input",
+                    "type": "dataset",
+                    "required": True,
+                    "positional": True,
+                    "dataset_type": ["raster"],
+                },
+            ],
+        },
+        {
+            "name": "calc",
+            "input_arguments": [
+                {"name": "input", "type": "dataset_list", "dataset_type": ["raster"]},
+                {
+                    "name": "calc",
+                    "type": "string_list",
+                    "required": True,
+                    "packed_values_allowed": False,
+                    "repeated_arg_allowed": True,
+                    "min_count": 1,
+                    "max_count": 2147483647,
+                },
+            ],
+        },
+        {
+            "name": "polygonize",
+            "output_arguments": [
+                {"name": "output", "type": "dataset", "dataset_type": ["vector"]}
+            ],
+        },
+        {
+            "name": "reproject",
+            "input_arguments": [
+                {"name": "dst-crs", "type": "string", "short_name": "d"},
+                {
+                    "name": "resampling",
+                    "type": "string",
+                    "short_name": "r",
+                    "choices": ["nearest", "cubic"],
+                },
+                {
+                    "name": "size",
+                    "type": "integer_list",
+                    "packed_values_allowed": True,
+                    "repeated_arg_allowed": False,
+                    "min_count": 2,
+                    "max_count": 2,
+                },
+            ],
+        },
+        {
+            "name": "write",
+            "output_arguments": [
+                {
+                    "name": "output",
+                    "type": "dataset",
+                    "required": True,
+                    "positional": True,
+                    "dataset_type": ["raster"],
+                },
+                {"name": "output-format", "type": "string", "aliases": ["of"]},
+            ],
+        },
+    ],
+}
+
+
+def _messages(pipeline, **kwargs):
+    _, issues = validate_pipeline(parse_pipeline(pipeline), **kwargs)
+    return [f"{issue['location']}: {issue['message']}" for issue in issues]
+
+
+def test_compile_usage():
+    usage = compile_usage(JSON_USAGE)["raster"]
+    assert [usage[step]["position"] for step in usage] == [
+        FIRST,
+        ANYWHERE,
+        None,
+        None,
+        LAST,
+    ]
+    assert usage["polygonize"]["output"] == "vector"
+    assert usage["calc"]["required"] == ("calc",)
+    assert usage["calc"]["args"]["calc"] == ("string_list", 1, None, False, True)
+    reproject = usage["reproject"]
+    assert reproject["flags"] == {
+        "--dst-crs": "dst-crs",
+        "-d": "dst-crs",
+        "--resampling": "resampling",
+        "-r": "resampling",
+        "--size": "size",
+    }
+    assert reproject["args"]["size"] == ("integer_list", 2, 2, True, False)
+    assert reproject["choices"] == {"resampling": ("nearest", "cubic")}
+    assert usage["write"]["flags"]["--of"] == "output-format"
+
+
+def test_compile_usage_bundled():
+    """
+    The bundled index has the entries compile_usage builds from the
+    --json-usage output of GDAL
+    """
+    with open("tests/fixtures/raster_pipeline_json_usage.json") as f:
+        usage = compile_usage(json.load(f))["raster"]
+    assert list(usage) == ["read", "reproject", "write"]
+    for step, step_usage in usage.items():
+        assert step_usage == USAGE["raster"][step]
+
+
+def test_compiled_usage_index():
+    usage_index = compile_usage(JSON_USAGE)
+    assert _messages(
+        "gdal raster pipeline ! calc --calc A ! reproject -d EPSG:4326 "
+        "--size=10,x ! polygonize ! write out.tif",
+        usage_index=usage_index,
+    ) == [
+        "step 2 (reproject): --size expects an integer, not 'x'",
+        # polygonize outputs a vector dataset
+        "step 4 (write): write is not a vector step",
+    ]
+
+
+@pytest.mark.parametrize("fn", ["examples/tee.json", "examples/raster.json"])
+def test_validate_examples(fn):
+    steps = parse_pipeline(parse_file(fn))
+    annotated, issues = validate_pipeline(steps)
+    assert issues == []
+    # valid pipelines are not copied
+    assert annotated is steps
+
+
+def test_validate_arguments():
+    pipeline = (
+        "gdal raster pipeline ! read a.tif ! reproject --dst-cr EPSG:4326 -r cubc "
+        "--size 10 --resolution=1,1 --resolution=2,2 ! hillshade -z high "
+        "! set-type ! write out.tif --co A=1,B=2 --co C=3 -f"
+    )
+    assert _messages(pipeline) == [
+        "step 2 (reproject): unknown argument --dst-cr, did you mean --dst-crs?",
+        "step 2 (reproject): -r must be one of nearest, bilinear, cubic, "
+        "cubicspline, lanczos, average, rms, mode, min, max, med, q1, q3, sum, "
+        "not 'cubc'",
+        "step 2 (reproject): --size expects 2 values",
+        "step 2 (reproject): --resolution is given more than once",
+        "step 3 (hillshade): -z expects a number, not 'high'",
+        "step 4 (set-type): --output-data-type is required",
+        "step 5 (write): -f expects a value",
+    ]
+
+
+def test_validate_short_names():
+    # e.g. -j is the short name of --num-threads, not an alias --j
+    assert (
+        _messages(
+            "gdal raster pipeline ! read a.tif ! reproject -d EPSG:4326 -j 4 "
+            "! write out.tif"
+        )
+        == []
+    )
+    assert _messages("gdal raster pipeline ! read a.tif ! reproject --j 4") == [
+        "step 2 (reproject): unknown argument --j, did you mean -j?"
+    ]
+
+
+def test_validate_subcommands():
+    # e.g. geom buffer is checked as the buffer step
+    assert (
+        _messages(
+            "gdal vector pipeline ! read a.gpkg ! geom buffer 10 --endcap-style flat "
+            "! geom set-type --geometry-type POINT ! write out.gpkg"
+        )
+        == []
+    )
+    steps = parse_pipeline(
+        "gdal vector pipeline ! read a.gpkg ! geom buffer 10 --side up "
+        "! geom bufer 10 ! geom ! write out.gpkg"
+    )
+    annotated, issues = validate_pipeline(steps)
+    assert annotated[2]["invalid"] == [
+        {"arg": 2, "message": "--side must be one of both, left, right, not 'up'"}
+    ]
+    assert [issue["message"] for issue in issues[1:]] == [
+        "unknown geom sub-command bufer, did you mean buffer?",
+        "geom needs one of the sub-commands buffer, explode-collections, "
+        "make-valid, segmentize, set-type, simplify, swap-xy",
+    ]
+
+
+def test_validate_order():
+    pipeline = (
+        "gdal raster pipeline ! slope ! read a.tif "
+        "! blend --overlay [ hillshade ] ! tee [ write b.tif ] "
+        "! write c.tif ! buffer 10"
+    )
+    assert _messages(pipeline) == [
+        "step 1 (slope): a pipeline cannot start with slope",
+        "step 2 (read): read must be the first step",
+        "step 5 (write): write must be the last step",
+        "step 6 (buffer): buffer is not a raster step",
+        # nested inputs start a new stream, tee branches read the piped one
+        "step 3 (blend) > input 1 > step 1 (hillshade): "
+        "a pipeline cannot start with hillshade",
+    ]
+
+
+def test_validate_stream_types():
+    # zonal statistics of a raster are written as a vector dataset
+    assert (
+        _messages(
+            "gdal raster pipeline ! read a.tif ! zonal-stats --zones z.gpkg "
+            "--stat=mean,median ! write out.gpkg --lco A=B"
+        )
+        == []
+    )
+    # steps of untyped pipelines are checked against both types
+    assert _messages(
+        "gdal pipeline ! read a.gpkg ! reproject --dst-crs EPSG:4326 ! buffer 10 "
+        "! write out.gpkg"
+    ) == ["step 3 (buffer): buffer is not a raster step"]
+    assert _messages("gdal vector pipeline ! read a.gpkg ! slpe") == [
+        "step 2 (slpe): unknown step slpe, did you mean slope?"
+    ]
+
+
+def test_validate_annotations():
+    steps = parse_pipeline(
+        "gdal raster pipeline ! read a.tif ! reproject -d EPSG:4326 --bad ! hillshade"
+    )
+    annotated, issues = validate_pipeline(steps)
+    assert annotated[2]["invalid"] == [{"arg": 1, "message": "unknown argument --bad"}]
+    assert issues[0]["arg"] == "--bad"
+    assert "invalid" not in steps[2]
+
+    source = workflow_diagram(steps, "svg", "raster", validate=True).source
+    assert f'<TD BGCOLOR="{INVALID_COLOR}" ALIGN="LEFT">--bad</TD>' in source
+    assert "unknown argument --bad" in source
+    assert INVALID_COLOR not in workflow_diagram(steps, "svg", "raster").source
+
+
+def test_format_issues():
+    assert format_issues([]).startswith("No issues found")
+
+
+def test_main_validate(tmp_path, capsys):
+    pipeline = "gdal raster pipeline ! read a.tif ! reproject --dst-cr EPSG:4326"
+    output_file = tmp_path / "output.svg"
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        exit_code = cli.main(["--pipeline", pipeline, "--validate", str(output_file)])
+    assert exit_code == 1
+    assert mock_generate.call_args.kwargs["validate"] is True
+    assert "did you mean --dst-crs?" in capsys.readouterr().out
+
+
+def test_main_validate_resolved(tmp_path, capsys):
+    """Test that the steps of referenced files are validated with --resolve."""
+    for name, command_line in [
+        ("dem.gdalg.json", "gdal raster pipeline ! read dem.tif ! hillshade --bad"),
+        ("main.gdalg.json", "gdal raster pipeline ! read dem.gdalg.json ! write o.tif"),
+    ]:
+        (tmp_path / name).write_text(
+            json.dumps({"type": "gdal_streamed_alg", "command_line": command_line})
+        )
+    args = [str(tmp_path / "main.gdalg.json"), str(tmp_path / "output.svg")]
+    with patch("gdalgviz.cli.generate_diagram") as mock_generate:
+        mock_generate.return_value = 0
+        assert cli.main(args + ["--validate"]) == 0
+        assert cli.main(args + ["--validate", "--resolve"]) == 1
+    assert "unknown argument --bad" in capsys.readouterr().out